@@ -19,6 +19,7 @@ from app.edgar.research_worker import (
     is_research_worker_running
 )
 from app.edgar.deal_research_generator import create_research_generator
+from app.edgar.filing_cache import get_filing_cache
 from app.utils.timezone import convert_to_cst
 
 logger = logging.getLogger(__name__)
@@ -474,6 +475,19 @@ async def get_research_status():
     )
 
 
+@router.get("/filing-queue/stats")
+async def get_filing_queue_stats(hours: int = 24):
+    """Filing queue depth and RSS publish -> staged deal latency"""
+    from ..main import get_db
+    return await get_db().filing_queue_stats(hours=hours)
+
+
+@router.get("/filing-cache/stats")
+async def get_filing_cache_stats():
+    """Hit rates and bytes saved by the shared filing document cache"""
+    return get_filing_cache().stats()
+
+
 @router.post("/staged-deals/{deal_id}/unapprove")
 async def unapprove_staged_deal(deal_id: str):
     """Unapprove a deal and send it back to staging area"""
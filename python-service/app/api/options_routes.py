@@ -55,6 +55,8 @@ logger = logging.getLogger(__name__)
 # When true, relay endpoints try Polygon REST first and fall back to IB relay.
 # Set POLYGON_PRIMARY=false to disable (e.g. if Polygon key expires).
 POLYGON_PRIMARY = os.environ.get("POLYGON_PRIMARY", "true").lower() != "false"
+# Concurrent partition fetches for /fetch-chain (1 = follow next_url serially)
+_POLYGON_CHAIN_FAN_OUT = int(os.environ.get("POLYGON_CHAIN_FAN_OUT", "6"))
 
 router = APIRouter(prefix="/options", tags=["options"])
 
@@ -168,8 +170,13 @@ def _assess_cached_execution_telemetry(provider: Any) -> tuple[bool, Optional[st
 
 def _merge_live_quotes_from_provider(result: dict, provider: Any, telemetry_at: float) -> None:
     """Prefer fresher live quote pushes over the telemetry snapshot copy."""
-    live_quotes = getattr(provider, "_live_quotes", None)
-    live_quotes_at = getattr(provider, "_live_quotes_at", 0)
+    book = getattr(provider, "_live_quote_book", None)
+    if book is not None and book.quotes:
+        live_quotes = book.snapshot()
+        live_quotes_at = book.as_of
+    else:
+        live_quotes = getattr(provider, "_live_quotes", None)
+        live_quotes_at = getattr(provider, "_live_quotes_at", 0)
     if live_quotes and live_quotes_at > telemetry_at:
         result["quote_snapshot"] = live_quotes
         result["quotes_age_ms"] = int((time.time() - live_quotes_at) * 1000)
@@ -1012,6 +1019,7 @@ async def _polygon_fetch_chain(
         expiration_date_lte=exp_lte,
         strike_gte=strike_gte,
         strike_lte=strike_lte,
+        max_concurrency=_POLYGON_CHAIN_FAN_OUT,
     )
     timer.stage("polygon_chain")
 
@@ -18,6 +18,7 @@ import os
 import sys
 import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Any
 from datetime import datetime
@@ -28,6 +29,11 @@ import httpx
 
 from app.utils.timing import RequestTimer
 
+try:
+    import msgpack
+except ImportError:  # binary quote framing is optional; JSON always works
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
@@ -42,6 +48,7 @@ HEARTBEAT_INTERVAL_SECONDS = 30  # Longer interval to avoid timeout during long
 # Priority 1: Account-specific, never delayed, never routed to a foreign agent
 ACCOUNT_REQUESTS = frozenset({
     "get_positions", "get_open_orders", "place_order", "modify_order", "cancel_order",
+    "get_ma_positions", "get_ib_executions",
 })
 # Priority 2: Scan requests that consume IB market data lines (throttled when borrowing)
 SCAN_REQUESTS = frozenset({
@@ -49,7 +56,7 @@ SCAN_REQUESTS = frozenset({
 })
 # Priority 3: Lightweight status checks, no market-data-line impact
 STATUS_REQUESTS = frozenset({
-    "ib_status", "check_availability", "ib_reconnect",
+    "ib_status", "check_availability", "ib_reconnect", "ib_disconnect",
 })
 # Execution control requests: only routed to the user's own agent
 EXECUTION_REQUESTS = frozenset({
@@ -60,6 +67,30 @@ EXECUTION_REQUESTS = frozenset({
     "agent_restart",
 })
 
+# ── Per-provider request scheduling ──
+# Requests to one agent are queued per class and dispatched by weighted fair
+# (stride) scheduling whenever the agent has a free in-flight slot. The last
+# _PRIORITY_RESERVED_SLOTS slots are only usable by account/execution
+# requests, so scans and status polls can never delay an order.
+_SCHEDULER_CLASSES = ("account", "execution", "status", "scan")
+_SCHEDULER_WEIGHTS = {"account": 8, "execution": 8, "status": 4, "scan": 1}
+_PROVIDER_MAX_IN_FLIGHT = int(os.environ.get("RELAY_PROVIDER_MAX_IN_FLIGHT", "12"))
+_PRIORITY_RESERVED_SLOTS = 2
+# Backpressure: concurrent scans allowed per this many free market data lines
+_SCAN_LINES_PER_REQUEST = 20
+_MAX_CONCURRENT_SCANS = 4
+
+
+def request_class(request_type: str) -> str:
+    """Scheduler class of a relay request type (unknown types count as status)."""
+    if request_type in ACCOUNT_REQUESTS:
+        return "account"
+    if request_type in EXECUTION_REQUESTS:
+        return "execution"
+    if request_type in SCAN_REQUESTS:
+        return "scan"
+    return "status"
+
 
 async def validate_api_key(api_key: str) -> Optional[str]:
     """
@@ -93,6 +124,265 @@ async def validate_api_key(api_key: str) -> Optional[str]:
     return None
 
 
+# execution_quotes protocol version understood by this relay (see
+# standalone_agent/quote_push.py). v1 = full JSON snapshot per push.
+QUOTE_PROTOCOL_VERSION = 2
+
+
+class LiveQuoteBook:
+    """Relay-side copy of an agent's quote cache, built from v2 quote frames.
+
+    Keyframes replace the book; delta frames merge changed fields, skipping
+    any key whose ``seq`` does not advance. ``mid`` is derived on merge and
+    ``age_seconds`` on read, relative to the agent's push timestamp, so
+    ``snapshot()`` matches the v1 ``get_all_serialized()`` payload.
+    """
+
+    def __init__(self):
+        self.quotes: Dict[str, dict] = {}
+        self.seqs: Dict[str, int] = {}
+        self.frame_seq = 0
+        self.as_of = 0.0
+        self.synced = False
+        self.keyframe_requested = False
+
+    def apply(self, frame: dict) -> bool:
+        """Merge a frame. Returns True if the agent should be asked for a keyframe."""
+        frame_seq = int(frame.get("frame_seq") or 0)
+        if frame.get("frame") == "key":
+            self.quotes = {}
+            self.seqs = {}
+            self.synced = True
+            self.keyframe_requested = False
+        elif frame_seq != self.frame_seq + 1:
+            self.synced = False
+        for key, fields in (frame.get("quotes") or {}).items():
+            seq = int(fields.get("seq") or 0)
+            if key in self.quotes and seq <= self.seqs.get(key, 0):
+                continue
+            quote = self.quotes.setdefault(key, {})
+            quote.update(fields)
+            quote.pop("seq", None)
+            quote["mid"] = self._mid(quote)
+            self.seqs[key] = seq
+        for key in frame.get("removed") or ():
+            self.quotes.pop(key, None)
+            self.seqs.pop(key, None)
+        self.frame_seq = frame_seq
+        self.as_of = frame.get("timestamp") or time.time()
+        if not self.synced and not self.keyframe_requested:
+            self.keyframe_requested = True
+            return True
+        return False
+
+    @staticmethod
+    def _mid(quote: dict) -> float:
+        # Same rule as Quote.mid in standalone_agent/quote_cache.py
+        bid = quote.get("bid") or 0.0
+        ask = quote.get("ask") or 0.0
+        if bid > 0 and ask > 0:
+            return (bid + ask) / 2.0
+        last = quote.get("last") or 0.0
+        return last if last > 0 else 0.0
+
+    def snapshot(self) -> Dict[str, dict]:
+        """All quotes in the v1 ``quote_snapshot`` shape."""
+        snapshot = {}
+        for key, quote in self.quotes.items():
+            item = dict(quote)
+            timestamp = item.get("timestamp") or 0.0
+            item["age_seconds"] = round(self.as_of - timestamp, 2) if timestamp > 0 else None
+            snapshot[key] = item
+        return snapshot
+
+
+async def _receive_provider_message(websocket: WebSocket) -> tuple:
+    """Receive one provider message: JSON text, or a msgpack binary frame.
+
+    Returns (message, size of the frame on the wire).
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return msgpack.unpackb(message["bytes"], raw=False), len(message["bytes"])
+    return json.loads(message["text"]), len(message["text"].encode("utf-8"))
+
+
+class _Ticket:
+    __slots__ = ("request_class", "external", "enqueued_at", "deadline", "granted")
+
+    def __init__(self, request_class: str, external: bool, deadline: float, granted: asyncio.Future):
+        self.request_class = request_class
+        self.external = external
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.granted = granted
+
+
+class DispatchTimeout(Exception):
+    """A request's deadline passed while it was still queued for dispatch."""
+
+
+class ProviderScheduler:
+    """Admission control for requests sent to one provider.
+
+    ``acquire()`` queues the caller in its class and returns once the
+    request may be sent; ``release()`` frees its slot when the response (or
+    an error) arrives. Dispatch order among backlogged classes follows
+    stride scheduling over _SCHEDULER_WEIGHTS; within a class it is FIFO.
+
+    Limits: at most ``max_in_flight`` requests in flight; status and scan
+    requests leave _PRIORITY_RESERVED_SLOTS of those free; scans are capped
+    by free market data lines (``set_available_scan_lines``) and external
+    scans on an execution-active agent run one at a time.
+    """
+
+    def __init__(self, max_in_flight: int = _PROVIDER_MAX_IN_FLIGHT, available_scan_lines: int = 90):
+        self.max_in_flight = max(_PRIORITY_RESERVED_SLOTS + 1, max_in_flight)
+        self.available_scan_lines = available_scan_lines
+        self._queues: Dict[str, deque] = {c: deque() for c in _SCHEDULER_CLASSES}
+        self._in_flight: Dict[str, int] = {c: 0 for c in _SCHEDULER_CLASSES}
+        self._external_scans = 0
+        self._pass: Dict[str, float] = {c: 0.0 for c in _SCHEDULER_CLASSES}
+        self._virtual_time = 0.0
+        self._dispatched: Dict[str, int] = {c: 0 for c in _SCHEDULER_CLASSES}
+        self._expired: Dict[str, int] = {c: 0 for c in _SCHEDULER_CLASSES}
+        self._waits: Dict[str, deque] = {c: deque(maxlen=256) for c in _SCHEDULER_CLASSES}
+        self._max_wait: Dict[str, float] = {c: 0.0 for c in _SCHEDULER_CLASSES}
+        self._closed = False
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def scan_capacity(self) -> int:
+        """Concurrent scans the agent's free market data lines allow right now.
+
+        Never below one: with no free lines a scan still goes out (the agent
+        batches it down to what it has) rather than queueing until its deadline.
+        """
+        return max(1, min(_MAX_CONCURRENT_SCANS, self.available_scan_lines // _SCAN_LINES_PER_REQUEST))
+
+    def set_available_scan_lines(self, lines: int) -> None:
+        self.available_scan_lines = lines
+        self._dispatch()
+
+    async def acquire(self, request_class: str, deadline: float, external: bool = False) -> _Ticket:
+        """Wait for a dispatch slot; raises DispatchTimeout at *deadline* (monotonic).
+
+        Raises ConnectionError if the provider disconnects first.
+        """
+        if self._closed:
+            raise ConnectionError("Provider disconnected")
+        ticket = _Ticket(request_class, external, deadline, asyncio.get_running_loop().create_future())
+        queue = self._queues[request_class]
+        if not queue:
+            # Class goes from idle to backlogged: no credit for time spent idle
+            self._pass[request_class] = max(self._pass[request_class], self._virtual_time)
+        queue.append(ticket)
+        self._dispatch()
+        try:
+            await asyncio.wait_for(ticket.granted, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._abandon(ticket)
+            self._expired[request_class] += 1
+            raise DispatchTimeout(
+                f"{request_class} request not dispatched within its deadline "
+                f"({self._in_flight[request_class]} in flight, {len(queue)} queued)"
+            ) from None
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+        return ticket
+
+    def close(self) -> None:
+        """Fail every queued request (provider disconnected)."""
+        self._closed = True
+        for queue in self._queues.values():
+            for ticket in queue:
+                if not ticket.granted.done():
+                    ticket.granted.set_exception(ConnectionError("Provider disconnected"))
+            queue.clear()
+
+    def release(self, ticket: _Ticket) -> None:
+        self._in_flight[ticket.request_class] -= 1
+        if ticket.external:
+            self._external_scans -= 1
+        self._dispatch()
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        if ticket.granted.done() and not ticket.granted.cancelled():
+            self.release(ticket)  # granted just as the caller gave up
+            return
+        try:
+            self._queues[ticket.request_class].remove(ticket)
+        except ValueError:
+            pass
+
+    def _next_eligible(self, request_class: str) -> Optional[_Ticket]:
+        queue = self._queues[request_class]
+        while queue and queue[0].granted.done():
+            queue.popleft()  # caller already gave up
+        if not queue:
+            return None
+        in_flight = self.in_flight
+        if in_flight >= self.max_in_flight:
+            return None
+        if request_class in ("status", "scan") and in_flight >= self.max_in_flight - _PRIORITY_RESERVED_SLOTS:
+            return None
+        if request_class != "scan":
+            return queue[0]
+        if self._in_flight["scan"] >= self.scan_capacity():
+            return None
+        for ticket in queue:
+            if not ticket.external or self._external_scans == 0:
+                return ticket
+        return None
+
+    def _dispatch(self) -> None:
+        while True:
+            best_class, best_ticket = None, None
+            for request_class in _SCHEDULER_CLASSES:
+                ticket = self._next_eligible(request_class)
+                if ticket is not None and (best_class is None or self._pass[request_class] < self._pass[best_class]):
+                    best_class, best_ticket = request_class, ticket
+            if best_ticket is None:
+                return
+            self._queues[best_class].remove(best_ticket)
+            self._virtual_time = self._pass[best_class]
+            self._pass[best_class] += 1.0 / _SCHEDULER_WEIGHTS[best_class]
+            self._in_flight[best_class] += 1
+            if best_ticket.external:
+                self._external_scans += 1
+            wait = time.monotonic() - best_ticket.enqueued_at
+            self._dispatched[best_class] += 1
+            self._waits[best_class].append(wait)
+            self._max_wait[best_class] = max(self._max_wait[best_class], wait)
+            best_ticket.granted.set_result(None)
+
+    def metrics(self) -> dict:
+        """Queue depth, in-flight and dispatch-wait stats per class."""
+        classes = {}
+        for c in _SCHEDULER_CLASSES:
+            waits = sorted(self._waits[c])
+            classes[c] = {
+                "queued": sum(1 for t in self._queues[c] if not t.granted.done()),
+                "in_flight": self._in_flight[c],
+                "dispatched": self._dispatched[c],
+                "expired": self._expired[c],
+                "avg_wait_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+                "max_wait_ms": round(self._max_wait[c] * 1000, 1),
+            }
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "scan_capacity": self.scan_capacity(),
+            "classes": classes,
+        }
+
+
 @dataclass
 class PendingRequest:
     """A request waiting for a response from a provider"""
@@ -101,6 +391,7 @@ class PendingRequest:
     payload: dict
     future: asyncio.Future
     created_at: float = field(default_factory=time.time)
+    response_bytes: int = 0  # wire size of the provider's response frame
 
 
 @dataclass
@@ -126,12 +417,13 @@ class DataProvider:
     execution_telemetry: Optional[dict] = field(default=None, repr=False)
     # Boot phase progress (set during agent startup, cleared on boot_complete or fresh telemetry)
     boot_phase: Optional[dict] = field(default=None, repr=False)
-    # Per-provider semaphore: limits concurrent external scan requests to 1
-    # when execution is active. Initialized post-creation (dataclass can't hold asyncio objects).
-    _external_scan_semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+    # Live quotes merged from v2 execution_quotes frames (v1 agents set _live_quotes instead)
+    _live_quote_book: Optional[LiveQuoteBook] = field(default=None, repr=False)
+    # Per-provider request scheduler (queues, weighted dispatch, scan backpressure)
+    _scheduler: Optional[ProviderScheduler] = field(default=None, repr=False)
 
     def __post_init__(self):
-        self._external_scan_semaphore = asyncio.Semaphore(1)
+        self._scheduler = ProviderScheduler(available_scan_lines=self.available_scan_lines)
 
 
 class ProviderRegistry:
@@ -205,6 +497,8 @@ class ProviderRegistry:
                         "disconnected_at": time.time(),
                     }
                 del self.providers[provider_id]
+                if provider._scheduler is not None:
+                    provider._scheduler.close()
                 logger.info(f"Provider unregistered: {provider_id} (state stashed)")
                 
                 # Cancel any pending requests that were routed to this provider
@@ -287,11 +581,12 @@ class ProviderRegistry:
         async with self._lock:
             self.pending_requests[request.request_id] = request
     
-    async def resolve_request(self, request_id: str, response: dict):
+    async def resolve_request(self, request_id: str, response: dict, response_bytes: int = 0):
         """Resolve a pending request with a response"""
         async with self._lock:
             if request_id in self.pending_requests:
                 req = self.pending_requests.pop(request_id)
+                req.response_bytes = response_bytes
                 if not req.future.done():
                     req.future.set_result(response)
     
@@ -328,6 +623,7 @@ class ProviderRegistry:
                     "execution_lines_held": p.execution_lines_held,
                     "available_scan_lines": p.available_scan_lines,
                     "accept_external_scans": p.accept_external_scans,
+                    "scheduler": p._scheduler.metrics() if p._scheduler else None,
                 }
                 for p in self.providers.values()
             ]
@@ -371,6 +667,11 @@ async def data_provider_websocket(websocket: WebSocket):
     4. Provider sends responses: {"type": "response", "request_id": "...", "success": true, "data": {...}}
     5. Provider sends heartbeats: {"type": "heartbeat"}
     6. Server acknowledges heartbeats: {"type": "heartbeat_ack"}
+    7. Provider pushes live quotes: {"type": "execution_quotes", ...} — a full
+       "quote_snapshot" (v1), or key/delta frames (v2, negotiated via
+       "quote_protocol" in the auth handshake; optionally msgpack-framed when
+       "encodings" includes "msgpack"). Server replies
+       {"type": "quote_keyframe_request"} when it detects a frame gap.
     """
     await websocket.accept()
     provider_id = None
@@ -410,10 +711,20 @@ async def data_provider_websocket(websocket: WebSocket):
         agent_version = auth_msg.get("version", "0.0.0")
         provider = await registry.register_provider(provider_id, websocket, user_id, agent_version=agent_version)
         
+        # Negotiate the execution_quotes protocol and framing. Older agents
+        # send neither field and keep the v1 full-snapshot JSON pushes.
+        quote_protocol = min(int(auth_msg.get("quote_protocol", 1) or 1), QUOTE_PROTOCOL_VERSION)
+        quote_encoding = (
+            "msgpack"
+            if msgpack is not None and "msgpack" in (auth_msg.get("encodings") or [])
+            else "json"
+        )
         await websocket.send_json({
             "type": "auth_response",
             "success": True,
-            "provider_id": provider_id
+            "provider_id": provider_id,
+            "quote_protocol": quote_protocol,
+            "encoding": quote_encoding,
         })
         
         logger.info(f"Provider {provider_id} authenticated for user {user_id} (agent v{agent_version})")
@@ -421,8 +732,8 @@ async def data_provider_websocket(websocket: WebSocket):
         # Main message loop
         while True:
             try:
-                msg = await asyncio.wait_for(
-                    websocket.receive_json(),
+                msg, msg_bytes = await asyncio.wait_for(
+                    _receive_provider_message(websocket),
                     timeout=HEARTBEAT_INTERVAL_SECONDS * 2
                 )
                 
@@ -436,10 +747,12 @@ async def data_provider_websocket(websocket: WebSocket):
                     # Provider is responding to a request
                     request_id = msg.get("request_id")
                     if msg.get("success"):
-                        await registry.resolve_request(request_id, msg.get("data", {}))
+                        await registry.resolve_request(request_id, msg.get("data", {}), msg_bytes)
                     else:
                         # Return error as data so callers can show the agent's message (e.g. relay_test_futures rewrite)
-                        await registry.resolve_request(request_id, {"error": msg.get("error", "Unknown error")})
+                        await registry.resolve_request(
+                            request_id, {"error": msg.get("error", "Unknown error")}, msg_bytes
+                        )
                 
                 elif msg_type == "ib_accounts":
                     # Agent reports which IB accounts it manages
@@ -452,6 +765,7 @@ async def data_provider_websocket(websocket: WebSocket):
                     provider.execution_active = bool(msg.get("execution_active", False))
                     provider.execution_lines_held = int(msg.get("execution_lines_held", 0))
                     provider.available_scan_lines = int(msg.get("available_scan_lines", 90))
+                    provider._scheduler.set_available_scan_lines(provider.available_scan_lines)
                     provider.accept_external_scans = bool(msg.get("accept_external_scans", True))
                     # IB connection status (sent since agent v1.19.2)
                     ib_conn = msg.get("ib_connected")
@@ -499,10 +813,20 @@ async def data_provider_websocket(websocket: WebSocket):
                     )
                 
                 elif msg_type == "execution_quotes":
-                    # Fast-path: agent pushes live quote snapshots every ~2s
+                    # Fast-path: agent pushes live quotes every ~2s
                     # Merge into cached telemetry for fresh Book tab data
-                    provider._live_quotes = msg.get("quote_snapshot", {})
-                    provider._live_quotes_at = msg.get("timestamp", time.time())
+                    if msg.get("v", 1) >= 2:
+                        if provider._live_quote_book is None:
+                            provider._live_quote_book = LiveQuoteBook()
+                        if provider._live_quote_book.apply(msg):
+                            logger.info(
+                                f"Provider {provider_id} quote frame gap "
+                                f"(frame_seq={msg.get('frame_seq')}), requesting keyframe"
+                            )
+                            await websocket.send_json({"type": "quote_keyframe_request"})
+                    else:
+                        provider._live_quotes = msg.get("quote_snapshot", {})
+                        provider._live_quotes_at = msg.get("timestamp", time.time())
 
                 elif msg_type == "account_event":
                     # Agent pushes order fill/status events for near-real-time UI
@@ -642,11 +966,12 @@ async def send_request_to_provider(
         )
 
     # ── Priority-aware throttling for scan requests on execution-active agents ──
-    is_scan = request_type in SCAN_REQUESTS
+    req_class = request_class(request_type)
+    is_scan = req_class == "scan"
     # Treat requests as "borrowing" when the requesting user is different from
     # the provider's owner, OR when no user_id was provided (anonymous/legacy).
     is_borrowing = (user_id is None) or (provider.user_id != user_id)
-    use_semaphore = False
+    external_scan = False
 
     if is_scan and is_borrowing and provider.execution_active:
         # External user borrowing an execution-active agent
@@ -661,72 +986,87 @@ async def send_request_to_provider(
             )
         # Annotate payload so the agent can throttle batch size
         payload = {**payload, "_priority": "external", "_max_batch_size": provider.available_scan_lines}
-        use_semaphore = True
+        external_scan = True  # dispatched one at a time by the scheduler
     elif is_scan and provider.execution_active:
         # Own user's scan while execution is active -- annotate but don't gate
         payload = {**payload, "_priority": "owner", "_max_batch_size": provider.available_scan_lines}
 
-    async def _do_send() -> dict:
-        """Inner send logic (may be wrapped with semaphore)."""
-        request_id = str(uuid.uuid4())
-        future = asyncio.get_event_loop().create_future()
-
-        pending = PendingRequest(
-            request_id=request_id,
-            request_type=request_type,
-            payload=payload,
-            future=future
+    # One deadline covers queueing and the provider round trip
+    deadline = time.monotonic() + timeout
+    scheduler = provider._scheduler
+    try:
+        ticket = await scheduler.acquire(req_class, deadline, external=external_scan)
+    except DispatchTimeout as exc:
+        timer.stage("queue_timeout")
+        timer.finish(extra={"timeout": timeout, "status": "queue_timeout", "class": req_class})
+        raise HTTPException(
+            status_code=504,
+            detail=f"Request to IB data provider timed out after {timeout}s: {exc}",
+        )
+    except ConnectionError:
+        timer.stage("provider_gone")
+        timer.finish(extra={"timeout": timeout, "status": "provider_gone", "class": req_class})
+        raise HTTPException(
+            status_code=503,
+            detail="IB data provider disconnected before the request could be sent.",
         )
+    timer.stage("queue_wait")
 
+    request_id = str(uuid.uuid4())
+    future = asyncio.get_running_loop().create_future()
+
+    pending = PendingRequest(
+        request_id=request_id,
+        request_type=request_type,
+        payload=payload,
+        future=future
+    )
+
+    try:
+        # Inside the try: a cancel while waiting on the registry lock must still release the slot
         await registry.add_pending_request(pending)
 
-        try:
-            # Send request to provider
-            payload_bytes = len(json.dumps(payload).encode())
-            await provider.websocket.send_json({
-                "type": "request",
-                "request_id": request_id,
-                "request_type": request_type,
-                "payload": payload
-            })
-            timer.stage("ws_send")
-
-            # Wait for response
-            result = await asyncio.wait_for(future, timeout=timeout)
-            response_bytes = len(json.dumps(result).encode()) if result else 0
-            timer.stage("response_wait")
-            timer.finish(extra={
-                "timeout": timeout,
-                "payload_bytes": payload_bytes,
-                "response_bytes": response_bytes,
-                "borrowing": is_borrowing,
-                "execution_active": provider.execution_active,
-            })
-            return result
+        # Serialize once: the text frame is also the size we report
+        message = json.dumps({
+            "type": "request",
+            "request_id": request_id,
+            "request_type": request_type,
+            "payload": payload
+        }, separators=(",", ":"), ensure_ascii=False)
+        await provider.websocket.send_text(message)
+        timer.stage("ws_send")
 
-        except asyncio.TimeoutError:
-            timer.stage("timeout")
-            timer.finish(extra={"timeout": timeout, "status": "timeout"})
-            await registry.fail_request(request_id, "Request timeout")
-            raise HTTPException(
-                status_code=504,
-                detail=f"Request to IB data provider timed out after {timeout}s"
-            )
-        except Exception as e:
-            timer.stage("error")
-            timer.finish(extra={"timeout": timeout, "status": "error"})
-            await registry.fail_request(request_id, str(e))
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error communicating with IB data provider: {str(e)}"
-            )
+        # Wait for response
+        result = await asyncio.wait_for(future, timeout=max(0.0, deadline - time.monotonic()))
+        timer.stage("response_wait")
+        timer.finish(extra={
+            "timeout": timeout,
+            "payload_bytes": len(message.encode("utf-8")),
+            "response_bytes": pending.response_bytes,
+            "borrowing": is_borrowing,
+            "execution_active": provider.execution_active,
+            "class": req_class,
+        })
+        return result
 
-    if use_semaphore and provider._external_scan_semaphore is not None:
-        # Serialize external scan requests: one at a time per execution-active provider
-        async with provider._external_scan_semaphore:
-            return await _do_send()
-    else:
-        return await _do_send()
+    except asyncio.TimeoutError:
+        timer.stage("timeout")
+        timer.finish(extra={"timeout": timeout, "status": "timeout"})
+        await registry.fail_request(request_id, "Request timeout")
+        raise HTTPException(
+            status_code=504,
+            detail=f"Request to IB data provider timed out after {timeout}s"
+        )
+    except Exception as e:
+        timer.stage("error")
+        timer.finish(extra={"timeout": timeout, "status": "error"})
+        await registry.fail_request(request_id, str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error communicating with IB data provider: {str(e)}"
+        )
+    finally:
+        scheduler.release(ticket)
 
 
 @router.get("/provider-status")
@@ -140,6 +140,32 @@ class EdgarDatabase:
             )
             return dict(row) if row else None
 
+    async def get_filing_by_accession(self, accession_number: str) -> Optional[Dict[str, Any]]:
+        """Get filing id, status and stored detection results by accession number"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''SELECT filing_id, status, is_ma_relevant, confidence_score, detected_keywords, reasoning
+                   FROM edgar_filings WHERE accession_number = $1''',
+                accession_number
+            )
+            return dict(row) if row else None
+
+    async def get_staged_deal_for_filing(self, filing_id: str) -> Optional[Dict[str, Any]]:
+        """Staged deal created from a filing, with whether its research is queued and alert sent"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''SELECT sd.staged_deal_id, sd.target_name, sd.acquirer_name, sd.deal_value,
+                          sd.confidence_score, sd.alert_sent,
+                          EXISTS (SELECT 1 FROM research_queue rq
+                                  WHERE rq.staged_deal_id = sd.staged_deal_id) AS research_queued
+                   FROM staged_deals sd
+                   WHERE sd.source_filing_id = $1
+                   ORDER BY sd.created_at
+                   LIMIT 1''',
+                filing_id
+            )
+            return dict(row) if row else None
+
     async def check_duplicate_deal(
         self,
         target_name: str,
@@ -386,3 +412,123 @@ class EdgarDatabase:
                 filing_id, staged_deal_id, reported_by, notes
             )
             return false_negative_id
+
+    # ------------------------------------------------------------------
+    # Filing work queue (edgar_filing_queue)
+    # ------------------------------------------------------------------
+
+    async def enqueue_filings(self, filings: List[Dict[str, Any]]) -> List[str]:
+        """Queue filings for processing; returns accession numbers that were new.
+
+        Each item has accession_number, filing (JSON text) and published_at.
+        Accessions already queued by this or another process are ignored.
+        """
+        if not filings:
+            return []
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''INSERT INTO edgar_filing_queue (accession_number, filing, published_at)
+                   SELECT a, f::jsonb, p
+                   FROM unnest($1::text[], $2::text[], $3::timestamptz[]) AS t(a, f, p)
+                   ON CONFLICT (accession_number) DO NOTHING
+                   RETURNING accession_number''',
+                [f["accession_number"] for f in filings],
+                [f["filing"] for f in filings],
+                [f["published_at"] for f in filings]
+            )
+            return [row["accession_number"] for row in rows]
+
+    async def claim_filing(self, worker_id: str, lock_timeout_seconds: float) -> Optional[Dict[str, Any]]:
+        """Claim the next ready filing, or one whose claim is older than lock_timeout_seconds
+
+        A stale claim means the worker holding it crashed or was redeployed.
+        Uses FOR UPDATE SKIP LOCKED so concurrent workers (in this process or
+        other replicas) never claim the same row.
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''UPDATE edgar_filing_queue q
+                   SET status = 'processing', attempts = q.attempts + 1,
+                       locked_by = $1, locked_at = NOW(),
+                       started_at = COALESCE(q.started_at, NOW())
+                   WHERE q.accession_number = (
+                       SELECT accession_number FROM edgar_filing_queue
+                       WHERE (status = 'pending' AND next_attempt_at <= NOW())
+                          OR (status = 'processing'
+                              AND locked_at < NOW() - make_interval(secs => $2))
+                       ORDER BY next_attempt_at
+                       LIMIT 1
+                       FOR UPDATE SKIP LOCKED
+                   )
+                   RETURNING q.accession_number, q.filing::text AS filing, q.attempts,
+                             q.published_at, q.enqueued_at''',
+                worker_id, lock_timeout_seconds
+            )
+            return dict(row) if row else None
+
+    async def complete_filing(self, accession_number: str, worker_id: str, staged_deal: bool) -> Optional[Dict[str, Any]]:
+        """Mark a claimed filing done; returns its pipeline timestamps"""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''UPDATE edgar_filing_queue
+                   SET status = 'done', completed_at = NOW(), locked_by = NULL, locked_at = NULL,
+                       last_error = NULL,
+                       staged_deal_at = CASE WHEN $3 THEN NOW() ELSE NULL END
+                   WHERE accession_number = $1 AND locked_by = $2
+                   RETURNING published_at, enqueued_at, started_at, completed_at''',
+                accession_number, worker_id, staged_deal
+            )
+            return dict(row) if row else None
+
+    async def retry_filing(
+        self,
+        accession_number: str,
+        worker_id: str,
+        error: str,
+        delay_seconds: Optional[float]
+    ):
+        """Release a failed filing for retry after delay_seconds, or fail it for good if None"""
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                '''UPDATE edgar_filing_queue
+                   SET status = CASE WHEN $4::float8 IS NULL THEN 'failed' ELSE 'pending' END,
+                       next_attempt_at = NOW() + make_interval(secs => COALESCE($4::float8, 0)),
+                       locked_by = NULL, locked_at = NULL, last_error = $3
+                   WHERE accession_number = $1 AND locked_by = $2''',
+                accession_number, worker_id, error[:2000], delay_seconds
+            )
+
+    async def filing_queue_stats(self, hours: int = 24) -> Dict[str, Any]:
+        """Queue depth and RSS publish -> staged deal latency over the last N hours"""
+        async with self.pool.acquire() as conn:
+            counts = await conn.fetch(
+                '''SELECT status, COUNT(*) AS n FROM edgar_filing_queue
+                   WHERE status IN ('pending', 'processing') OR enqueued_at > NOW() - make_interval(hours => $1)
+                   GROUP BY status''',
+                hours
+            )
+            latency = await conn.fetchrow(
+                '''SELECT
+                     COUNT(*) FILTER (WHERE completed_at IS NOT NULL) AS completed,
+                     COUNT(staged_deal_at) AS staged_deals,
+                     percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM enqueued_at - published_at)) AS publish_to_enqueue_p50,
+                     percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM started_at - enqueued_at)) AS queue_wait_p50,
+                     percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM started_at - enqueued_at)) AS queue_wait_p95,
+                     percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM completed_at - published_at)) AS publish_to_done_p50,
+                     percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM completed_at - published_at)) AS publish_to_done_p95,
+                     percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM staged_deal_at - published_at)) AS publish_to_staged_deal_p50,
+                     percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM staged_deal_at - published_at)) AS publish_to_staged_deal_p95
+                   FROM edgar_filing_queue
+                   WHERE enqueued_at > NOW() - make_interval(hours => $1)''',
+                hours
+            )
+            return {
+                "hours": hours,
+                "by_status": {row["status"]: row["n"] for row in counts},
+                "latency_seconds": {
+                    k: (round(float(v), 1) if v is not None else None)
+                    for k, v in dict(latency).items() if k not in ("completed", "staged_deals")
+                },
+                "completed": latency["completed"],
+                "staged_deals": latency["staged_deals"],
+            }
@@ -4,7 +4,7 @@ import json
 import logging
 from typing import Dict, Any, Optional
 from anthropic import Anthropic
-import httpx
+from app.edgar.filing_cache import get_filing_cache
 from app.services.ticker_lookup import get_ticker_lookup_service
 
 logger = logging.getLogger(__name__)
@@ -19,69 +19,7 @@ class DealResearchGenerator:
     async def fetch_filing_content(self, filing_url: str) -> str:
         """Fetch the filing content from EDGAR, parsing index pages if necessary"""
         try:
-            # SEC requires proper User-Agent header
-            headers = {
-                "User-Agent": "M&A Intelligence Platform research@example.com",
-                "Accept-Encoding": "gzip, deflate",
-                "Host": "www.sec.gov"
-            }
-            async with httpx.AsyncClient(timeout=60.0, headers=headers, follow_redirects=True) as client:
-                # If URL is an index page, parse it to find the primary document
-                if filing_url.endswith('-index.htm') or '/Archives/edgar/data/' in filing_url and filing_url.endswith('.htm'):
-                    logger.info(f"Detected index page, parsing to find primary document: {filing_url}")
-                    index_response = await client.get(filing_url)
-                    index_response.raise_for_status()
-                    index_html = index_response.text
-
-                    # Parse index to find primary document link
-                    # Look for patterns like: <td>MERGER AGREEMENT</td> or <td>8-K</td>
-                    # followed by a link to .htm or .txt file
-                    import re
-
-                    # Try to find primary document - look for common patterns
-                    # Pattern 1: Look for iXBRL viewer links and extract the doc parameter
-                    ixbrl_match = re.search(r'href="/ix\?doc=(/Archives/[^"]+\.htm)"', index_html)
-
-                    if ixbrl_match:
-                        # Extract the actual document path from the iXBRL viewer URL
-                        # This is an absolute path, so we build URL from SEC root
-                        doc_path = ixbrl_match.group(1)
-                        doc_url = f"https://www.sec.gov{doc_path}"
-                        logger.info(f"Found primary document (iXBRL): {doc_url}")
-
-                        # Fetch the actual document
-                        response = await client.get(doc_url)
-                        response.raise_for_status()
-                        return response.text[:200000]  # Increased limit for actual content
-
-                    # Pattern 2: Look for links with Type column containing form type
-                    primary_doc_match = re.search(r'<a href="([^"]+\.htm)"[^>]*>\s*(?:Primary Document|MERGER AGREEMENT|8-K|DEFM14A|SC 13D|SC TO)', index_html, re.IGNORECASE)
-
-                    if not primary_doc_match:
-                        # Pattern 3: Look for first .htm file that's not index or XML
-                        primary_doc_match = re.search(r'<a href="((?!.*index)[^"]+\.htm)"', index_html)
-
-                    if primary_doc_match:
-                        doc_filename = primary_doc_match.group(1)
-                        # Remove leading slash if present to avoid double slashes
-                        doc_filename = doc_filename.lstrip('/')
-                        # Build full URL relative to index page
-                        base_url = filing_url.rsplit('/', 1)[0]
-                        doc_url = f"{base_url}/{doc_filename}"
-                        logger.info(f"Found primary document: {doc_url}")
-
-                        # Fetch the actual document
-                        response = await client.get(doc_url)
-                        response.raise_for_status()
-                        return response.text[:200000]  # Increased limit for actual content
-                    else:
-                        logger.warning(f"Could not find primary document in index, using index content")
-                        return index_html[:100000]
-                else:
-                    # Direct filing URL
-                    response = await client.get(filing_url)
-                    response.raise_for_status()
-                    return response.text[:200000]
+            return await get_filing_cache().get_html(filing_url, max_chars=200000)
         except Exception as e:
             logger.error(f"Failed to fetch filing from {filing_url}: {e}")
             raise
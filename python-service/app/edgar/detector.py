@@ -1,12 +1,14 @@
 """M&A relevance detection using LLM and keyword analysis"""
 import logging
 import re
+from collections import Counter
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-import httpx
 from anthropic import Anthropic
+from .filing_cache import FilingCache, get_filing_cache
 from .models import EdgarFiling, MADetectionResult
 from app.services.ticker_lookup import get_ticker_lookup_service
+from app.utils.keyword_matcher import KeywordHits, KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -156,168 +158,119 @@ RETROSPECTIVE_COMMUNICATION_KEYWORDS = [
 ]
 
 
-class MADetector:
-    """Detects M&A relevance in EDGAR filings"""
+# Filing metadata (SGML header) markers; excerpts near these are skipped
+EXCERPT_METADATA_PATTERNS = [
+    r'ACCESSION NUMBER:',
+    r'CONFORMED SUBMISSION TYPE:',
+    r'PUBLIC DOCUMENT COUNT:',
+    r'CONFORMED PERIOD OF REPORT:',
+    r'FILED AS OF DATE:',
+    r'DATE AS OF CHANGE:',
+    r'FILER:',
+    r'COMPANY DATA:',
+    r'COMPANY CONFORMED NAME:',
+    r'CENTRAL INDEX KEY:',
+    r'STANDARD INDUSTRIAL CLASSIFICATION:',
+    r'IRS EMPLOYER IDENTIFICATION',
+    r'STATE OF INCORPORATION:',
+    r'FISCAL YEAR END:',
+    r'FILING VALUES:',
+    r'FORM TYPE:',
+    r'SEC ACT:',
+    r'SEC FILE NUMBER:',
+    r'FILM NUMBER:',
+    r'\d{10,}\.txt',  # Numeric filenames
+    r'\d{4}-\d{2}-\d{2}\.sgml',  # SGML files
+]
+_EXCERPT_METADATA_RE = re.compile('|'.join(EXCERPT_METADATA_PATTERNS), re.IGNORECASE)
 
-    def __init__(self, anthropic_api_key: str):
-        self.anthropic = Anthropic(api_key=anthropic_api_key)
-        # SEC requires User-Agent header with contact info
-        headers = {
-            "User-Agent": "M&A Tracker yourname@company.com",
-            "Accept-Encoding": "gzip, deflate",
-            "Host": "www.sec.gov"
-        }
-        self.client = httpx.AsyncClient(timeout=60.0, headers=headers)
+# Every keyword list above, scanned in one pass over the lowercased filing text
+FILING_KEYWORD_MATCHER = KeywordMatcher(
+    MA_KEYWORDS + HISTORICAL_REFERENCE_KEYWORDS + NON_US_COMPANY_KEYWORDS + RETROSPECTIVE_COMMUNICATION_KEYWORDS
+)
 
-    async def fetch_primary_document_url(self, index_url: str) -> str:
-        """Parse index page to find the primary document URL"""
-        try:
-            response = await self.client.get(index_url)
-            response.raise_for_status()
-
-            # Parse HTML to find document links
-            # Primary document is usually the first .htm or .txt file in the table
-            html = response.text
-
-            # Look for table rows with document links
-            # Pattern: <a href="FILENAME.htm">FILENAME.htm</a>
-            # Also handle iXBRL format: <a href="/ix?doc=/Archives/.../file.htm">
-            # Exclude index.htm and -index.htm files
-            doc_pattern = r'<a href="([^"]+\.(?:htm|html|txt))"'
-            all_matches = re.findall(doc_pattern, html, re.IGNORECASE)
-
-            # Extract actual document paths from iXBRL /ix?doc= URLs
-            ixbrl_pattern = r'/ix\?doc=(/Archives/[^"]+\.(?:htm|html))'
-            ixbrl_matches = re.findall(ixbrl_pattern, html, re.IGNORECASE)
-            all_matches.extend(ixbrl_matches)
-
-            # Filter to keep only filing documents (exclude index files and navigation links)
-            # Get the filing directory path (everything before the index filename)
-            filing_dir = index_url.rsplit('/', 1)[0]
-
-            matches = []
-            for match in all_matches:
-                filename = match.split('/')[-1].lower()  # Get just the filename
-
-                # Skip index files
-                if filename.endswith('index.htm') or filename.endswith('index.html'):
-                    continue
 
-                # Skip empty matches
-                if not match or not filename:
-                    continue
+def _is_word_char(ch: Optional[str]) -> bool:
+    """Same notion of a word character as re's \\b on str patterns"""
+    return ch is not None and (ch.isalnum() or ch == '_')
 
-                # For absolute paths (starting with /), check if file is in the same directory as index
-                if match.startswith('/'):
-                    full_url = f"https://www.sec.gov{match}"
-                    # Must be in the filing directory (not a parent dir, subdirectory, or navigation link)
-                    # Extract directory from the match
-                    match_dir = full_url.rsplit('/', 1)[0]
-                    if match_dir != filing_dir:
-                        continue
-                else:
-                    # Relative path - should be just a filename, not a path with directories
-                    if '/' in match:
-                        continue
 
-                matches.append(match)
+class FilingKeywordScan:
+    """Keyword offsets for one filing text, shared by the detection checks
 
-            if matches:
-                # For 8-K filings, prefer the document with "_8k" in the name
-                # Prefer .htm/.html over .txt (HTML is formatted better for parsing)
-                primary_doc = None
-
-                # First try: Find _8k.htm or d8k.htm document (most reliable pattern)
-                for match in matches:
-                    match_lower = match.lower()
-                    if (('_8k' in match_lower or 'd8k' in match_lower) and
-                        match_lower.endswith(('.htm', '.html'))):
-                        primary_doc = match
-                        break
-
-                # Second try: Find _8k or d8k document (any format)
-                if not primary_doc:
-                    for match in matches:
-                        match_lower = match.lower()
-                        if '_8k' in match_lower or 'd8k' in match_lower:
-                            primary_doc = match
-                            break
-
-                # Third try: Find non-exhibit .htm/.html document
-                if not primary_doc:
-                    for match in matches:
-                        if '_ex' not in match.lower() and match.lower().endswith(('.htm', '.html')):
-                            primary_doc = match
-                            break
-
-                # Fourth try: Find non-exhibit document (any format)
-                if not primary_doc:
-                    for match in matches:
-                        if '_ex' not in match.lower():
-                            primary_doc = match
-                            break
-
-                # Fallback: Just use first match
-                if not primary_doc:
-                    primary_doc = matches[0]
-
-                # If href is absolute path (starts with /), use SEC base domain
-                if primary_doc.startswith('/'):
-                    return f"https://www.sec.gov{primary_doc}"
-                else:
-                    # Relative path - append to base URL
-                    base_url = index_url.rsplit('/', 1)[0]
-                    return f"{base_url}/{primary_doc}"
+    Offsets are into ``text.lower()``. When lowercasing changes the text's
+    length (a handful of non-ASCII capitals do), checks that slice the
+    original text fall back to slicing it, so results stay the same.
+    """
 
-            logger.warning(f"No primary document found in index: {index_url}")
-            return index_url  # Fallback to index URL
+    def __init__(self, text: str):
+        self.text = text
+        self.text_lower = text.lower()
+        self.hits: KeywordHits = FILING_KEYWORD_MATCHER.scan(self.text_lower)
+        self.aligned = len(self.text_lower) == len(text)
+
+    def present_in_prefix(self, keywords: List[str], window: int) -> Optional[str]:
+        """First keyword (list order) found in ``text[:window].lower()``"""
+        if self.aligned:
+            return self.hits.first_present(keywords, end=window)
+        prefix = self.text[:window].lower()
+        return next((k for k in keywords if k in prefix), None)
 
+    def occurs_in_window(self, keyword: str, start: int, end: int) -> bool:
+        """Whether ``keyword`` is in ``text[start:end].lower()``"""
+        if self.aligned:
+            return self.hits.occurs_between(keyword, start, end)
+        return keyword in self.text[start:end].lower()
+
+
+class MADetector:
+    """Detects M&A relevance in EDGAR filings"""
+
+    def __init__(self, anthropic_api_key: str, filing_cache: Optional[FilingCache] = None):
+        self.anthropic = Anthropic(api_key=anthropic_api_key)
+        # Filing downloads (and their SEC HTTP client) live in the shared cache
+        self.filing_cache = filing_cache or get_filing_cache()
+
+    async def fetch_primary_document_url(self, index_url: str) -> str:
+        """Parse index page to find the primary document URL"""
+        try:
+            doc = await self.filing_cache.get_document(index_url)
+            return doc.url
         except Exception as e:
             logger.error(f"Failed to parse index page {index_url}: {e}")
             return index_url  # Fallback to index URL
 
     async def fetch_filing_text(self, filing_url: str, max_chars: int = 50000) -> str:
-        """Fetch filing text from SEC EDGAR"""
+        """Fetch filing text from SEC EDGAR (via the shared filing cache)"""
         try:
-            # If this is an index page, get the primary document URL
-            if '-index.htm' in filing_url:
-                filing_url = await self.fetch_primary_document_url(filing_url)
-                logger.info(f"Resolved primary document: {filing_url}")
-
-            response = await self.client.get(filing_url)
-            response.raise_for_status()
-
-            # Extract text from HTML (basic parsing)
-            text = response.text
-            # Remove HTML tags
-            text = re.sub(r'<[^>]+>', ' ', text)
-            # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text)
-
-            # Limit to first N characters for efficiency
-            return text[:max_chars]
+            return await self.filing_cache.get_text(filing_url, max_chars=max_chars)
         except Exception as e:
             logger.error(f"Failed to fetch filing text from {filing_url}: {e}")
             return ""
 
-    def keyword_scan(self, text: str) -> List[str]:
-        """Quick keyword scan for M&A terms"""
-        text_lower = text.lower()
-        detected = []
-
-        for keyword in MA_KEYWORDS:
-            if keyword in text_lower:
-                detected.append(keyword)
+    def scan_keywords(self, text: str) -> FilingKeywordScan:
+        """One pass over the filing for every detector keyword list"""
+        return FilingKeywordScan(text)
 
-        return detected
+    def keyword_scan(self, text: str, scan: Optional[FilingKeywordScan] = None) -> List[str]:
+        """Quick keyword scan for M&A terms"""
+        scan = scan or self.scan_keywords(text)
+        return [keyword for keyword in MA_KEYWORDS if keyword in scan.hits]
 
-    def extract_matched_text_excerpt(self, text: str, detected_keywords: List[str], max_length: int = 500) -> Optional[str]:
+    def extract_matched_text_excerpt(
+        self,
+        text: str,
+        detected_keywords: List[str],
+        max_length: int = 500,
+        scan: Optional[FilingKeywordScan] = None
+    ) -> Optional[str]:
         """Extract a text excerpt showing where M&A keywords were found
 
         Args:
             text: Full filing text
             detected_keywords: List of keywords that were detected
             max_length: Maximum length of excerpt to return
+            scan: Keyword offsets from scan_keywords(text), if already computed
 
         Returns:
             Text excerpt showing context around first matched keyword, or None if no keywords
@@ -325,69 +278,44 @@ class MADetector:
         if not detected_keywords or not text:
             return None
 
-        # Metadata patterns to avoid (filing headers, SGML, etc.)
-        metadata_patterns = [
-            r'ACCESSION NUMBER:',
-            r'CONFORMED SUBMISSION TYPE:',
-            r'PUBLIC DOCUMENT COUNT:',
-            r'CONFORMED PERIOD OF REPORT:',
-            r'FILED AS OF DATE:',
-            r'DATE AS OF CHANGE:',
-            r'FILER:',
-            r'COMPANY DATA:',
-            r'COMPANY CONFORMED NAME:',
-            r'CENTRAL INDEX KEY:',
-            r'STANDARD INDUSTRIAL CLASSIFICATION:',
-            r'IRS EMPLOYER IDENTIFICATION',
-            r'STATE OF INCORPORATION:',
-            r'FISCAL YEAR END:',
-            r'FILING VALUES:',
-            r'FORM TYPE:',
-            r'SEC ACT:',
-            r'SEC FILE NUMBER:',
-            r'FILM NUMBER:',
-            r'\d{10,}\.txt',  # Numeric filenames
-            r'\d{4}-\d{2}-\d{2}\.sgml',  # SGML files
-        ]
+        scan = scan or self.scan_keywords(text)
+        detected_lower = [kw.lower() for kw in detected_keywords]
 
-        # Find all occurrences of keywords, scoring by context quality
-        text_lower = text.lower()
+        # Score every occurrence by how many detected keywords share its context
+        counts = Counter(detected_lower)
+        by_offsets = scan.aligned and all(scan.hits.compiled(kw) for kw in counts)
         candidates = []
 
-        for keyword in detected_keywords:
-            pos = 0
-            while True:
-                pos = text_lower.find(keyword.lower(), pos)
-                if pos == -1:
-                    break
-
-                # Check if this position is in metadata (skip if so)
+        for keyword, keyword_lower in zip(detected_keywords, detected_lower):
+            for pos in scan.hits.starts(keyword_lower):
                 context_start = max(0, pos - 200)
                 context_end = min(len(text), pos + 200)
-                context = text[context_start:context_end]
-
-                # Score this match - penalize if near metadata
-                in_metadata = any(re.search(pattern, context, re.IGNORECASE) for pattern in metadata_patterns)
-
-                if not in_metadata:
-                    # Calculate a quality score: prefer matches with more keywords nearby
-                    nearby_keyword_count = sum(1 for kw in detected_keywords if kw.lower() in context.lower())
-                    candidates.append({
-                        'pos': pos,
-                        'keyword': keyword,
-                        'quality_score': nearby_keyword_count,
-                        'in_metadata': in_metadata
-                    })
-
-                pos += 1
-
-        # If all candidates are in metadata, fall back to best one anyway
-        if not candidates:
-            return None
 
-        # Sort by quality score (descending), then by position (ascending)
+                # Calculate a quality score: prefer matches with more keywords nearby
+                if by_offsets:
+                    nearby = {kw for _, kw in scan.hits.hits_between(context_start, context_end) if kw in counts}
+                    nearby_keyword_count = sum(counts[kw] for kw in nearby)
+                else:
+                    nearby_keyword_count = sum(
+                        1 for kw in detected_lower if scan.occurs_in_window(kw, context_start, context_end)
+                    )
+                candidates.append({
+                    'pos': pos,
+                    'keyword': keyword,
+                    'quality_score': nearby_keyword_count,
+                    'context': (context_start, context_end)
+                })
+
+        # Sort by quality score (descending), then by position (ascending), and
+        # take the best match whose context is not in metadata (skip if so);
+        # only the leading candidates need the metadata check
         candidates.sort(key=lambda x: (-x['quality_score'], x['pos']))
-        best_match = candidates[0]
+        best_match = next(
+            (c for c in candidates if not _EXCERPT_METADATA_RE.search(text, *c['context'])),
+            None
+        )
+        if best_match is None:
+            return None
 
         first_match_pos = best_match['pos']
         first_keyword = best_match['keyword']
@@ -423,21 +351,27 @@ class MADetector:
 
         return excerpt
 
-    def detect_historical_reference(self, text: str, context_window: int = 2000) -> bool:
+    def detect_historical_reference(
+        self,
+        text: str,
+        context_window: int = 2000,
+        scan: Optional[FilingKeywordScan] = None
+    ) -> bool:
         """Detect if filing references a previously announced deal
 
         Args:
             text: Full filing text
             context_window: Number of characters to check from the beginning (default: 2000)
                            Historical references usually appear early in the document
+            scan: Keyword offsets from scan_keywords(text), if already computed
         """
         # Focus on the beginning of the document where historical references typically appear
-        text_to_check = text[:context_window].lower()
+        scan = scan or self.scan_keywords(text)
+        keyword = scan.present_in_prefix(HISTORICAL_REFERENCE_KEYWORDS, context_window)
 
-        for keyword in HISTORICAL_REFERENCE_KEYWORDS:
-            if keyword in text_to_check:
-                logger.info(f"Historical reference detected in first {context_window} chars: '{keyword}'")
-                return True
+        if keyword is not None:
+            logger.info(f"Historical reference detected in first {context_window} chars: '{keyword}'")
+            return True
 
         return False
 
@@ -445,7 +379,8 @@ class MADetector:
         self,
         text: str,
         detected_keywords: List[str],
-        context_radius: int = 300
+        context_radius: int = 300,
+        scan: Optional[FilingKeywordScan] = None
     ) -> bool:
         """Detect if historical references appear near M&A keywords
 
@@ -459,40 +394,43 @@ class MADetector:
             text: Full filing text
             detected_keywords: M&A keywords that were found
             context_radius: Characters before/after keyword to check (default: 300)
+            scan: Keyword offsets from scan_keywords(text), if already computed
         """
         if not detected_keywords:
             return False
 
-        text_lower = text.lower()
+        scan = scan or self.scan_keywords(text)
+        text_lower = scan.text_lower
+        hist_rank = {kw: i for i, kw in reversed(list(enumerate(HISTORICAL_REFERENCE_KEYWORDS)))}
 
         # Find positions of all M&A keywords
         for keyword in detected_keywords:
-            keyword_lower = keyword.lower()
-            pos = 0
-
-            while True:
-                pos = text_lower.find(keyword_lower, pos)
-                if pos == -1:
-                    break
-
-                # Extract context around this keyword
+            for pos in scan.hits.starts(keyword.lower()):
+                # Context around this keyword
                 start = max(0, pos - context_radius)
                 end = min(len(text), pos + len(keyword) + context_radius)
-                context = text_lower[start:end]
-
-                # Check if any historical reference keywords appear in this context
-                # Use word boundary regex to prevent substring false positives
-                for hist_keyword in HISTORICAL_REFERENCE_KEYWORDS:
-                    # Escape special regex chars and add word boundaries
-                    pattern = r'\b' + re.escape(hist_keyword) + r'\b'
-                    if re.search(pattern, context):
-                        logger.info(
-                            f"Historical reference '{hist_keyword}' found near M&A keyword '{keyword}' "
-                            f"(within {context_radius} chars)"
-                        )
-                        return True
 
-                pos += 1
+                # Historical reference keywords inside this context, with word
+                # boundaries as \b would see them in text_lower[start:end]
+                found = []
+                for hist_pos, hist_keyword in scan.hits.hits_between(start, end):
+                    rank = hist_rank.get(hist_keyword)
+                    if rank is None:
+                        continue
+                    hist_end = hist_pos + len(hist_keyword)
+                    before = text_lower[hist_pos - 1] if hist_pos > start else None
+                    after = text_lower[hist_end] if hist_end < end else None
+                    if (_is_word_char(before) != _is_word_char(hist_keyword[0])
+                            and _is_word_char(hist_keyword[-1]) != _is_word_char(after)):
+                        found.append(rank)
+
+                if found:
+                    hist_keyword = HISTORICAL_REFERENCE_KEYWORDS[min(found)]
+                    logger.info(
+                        f"Historical reference '{hist_keyword}' found near M&A keyword '{keyword}' "
+                        f"(within {context_radius} chars)"
+                    )
+                    return True
 
         return False
 
@@ -546,47 +484,59 @@ class MADetector:
 
         return False
 
-    def detect_non_us_company(self, filing_text: str, context_window: int = 3000) -> bool:
+    def detect_non_us_company(
+        self,
+        filing_text: str,
+        context_window: int = 3000,
+        scan: Optional[FilingKeywordScan] = None
+    ) -> bool:
         """Check if filing mentions a non-US company as the target
 
         Args:
             filing_text: Full filing text
             context_window: Number of characters from start to check (default 3000)
+            scan: Keyword offsets from scan_keywords(filing_text), if already computed
 
         Returns:
             True if non-US company indicators found, False otherwise
         """
-        text_lower = filing_text[:context_window].lower()
+        scan = scan or self.scan_keywords(filing_text)
+        keyword = scan.present_in_prefix(NON_US_COMPANY_KEYWORDS, context_window)
 
-        for keyword in NON_US_COMPANY_KEYWORDS:
-            if keyword in text_lower:
-                logger.info(
-                    f"Non-US company indicator '{keyword}' found in filing "
-                    f"(within first {context_window} chars) - likely foreign target"
-                )
-                return True
+        if keyword is not None:
+            logger.info(
+                f"Non-US company indicator '{keyword}' found in filing "
+                f"(within first {context_window} chars) - likely foreign target"
+            )
+            return True
 
         return False
 
-    def detect_retrospective_communication(self, filing_text: str, context_window: int = 2000) -> bool:
+    def detect_retrospective_communication(
+        self,
+        filing_text: str,
+        context_window: int = 2000,
+        scan: Optional[FilingKeywordScan] = None
+    ) -> bool:
         """Check if filing is a retrospective communication (graphic, social media post, etc.)
 
         Args:
             filing_text: Full filing text
             context_window: Number of characters from start to check (default 2000)
+            scan: Keyword offsets from scan_keywords(filing_text), if already computed
 
         Returns:
             True if retrospective communication indicators found, False otherwise
         """
-        text_lower = filing_text[:context_window].lower()
+        scan = scan or self.scan_keywords(filing_text)
+        keyword = scan.present_in_prefix(RETROSPECTIVE_COMMUNICATION_KEYWORDS, context_window)
 
-        for keyword in RETROSPECTIVE_COMMUNICATION_KEYWORDS:
-            if keyword in text_lower:
-                logger.info(
-                    f"Retrospective communication indicator '{keyword}' found in filing "
-                    f"(within first {context_window} chars) - likely social media/graphic filing"
-                )
-                return True
+        if keyword is not None:
+            logger.info(
+                f"Retrospective communication indicator '{keyword}' found in filing "
+                f"(within first {context_window} chars) - likely social media/graphic filing"
+            )
+            return True
 
         return False
 
@@ -770,8 +720,9 @@ class MADetector:
                 reasoning="Could not fetch filing text"
             )
 
-        # Quick keyword scan
-        detected_keywords = self.keyword_scan(filing_text)
+        # Quick keyword scan (one pass; the checks below reuse its offsets)
+        scan = self.scan_keywords(filing_text)
+        detected_keywords = self.keyword_scan(filing_text, scan=scan)
 
         # If no keywords, likely not M&A relevant
         if len(detected_keywords) == 0:
@@ -798,11 +749,14 @@ class MADetector:
         # Use larger context window for retrospective filing types
         context_window = 5000 if is_retrospective_filing else 2000
 
-        has_early_historical_ref = self.detect_historical_reference(filing_text, context_window=context_window)
+        has_early_historical_ref = self.detect_historical_reference(
+            filing_text, context_window=context_window, scan=scan
+        )
         has_contextual_historical_ref = self.detect_historical_reference_near_keywords(
             filing_text,
             detected_keywords,
-            context_radius=500  # Increased from 300 to catch more context
+            context_radius=500,  # Increased from 300 to catch more context
+            scan=scan
         )
 
         # NEW: Check for recent announcement dates (overrides historical reference detection)
@@ -1003,5 +957,4 @@ class MADetector:
 
 
     async def close(self):
-        """Clean up resources"""
-        await self.client.aclose()
+        """Clean up resources (the shared filing cache outlives the detector)"""
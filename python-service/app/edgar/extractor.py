@@ -1,4 +1,5 @@
 """Extract structured deal information from M&A filings using LLM"""
+import asyncio
 import logging
 import re
 import json
@@ -55,7 +56,10 @@ Return ONLY valid JSON (no markdown, no extra text):
 }}
 """
 
-            response = self.anthropic.messages.create(
+            # Sync client in a worker thread: keeps the event loop free for
+            # the other filing workers while this one waits on the model
+            response = await asyncio.to_thread(
+                self.anthropic.messages.create,
                 model="claude-sonnet-4-20250514",
                 max_tokens=1000,
                 messages=[{"role": "user", "content": prompt}]
@@ -0,0 +1,363 @@
+"""Accession-keyed cache of fetched EDGAR filing documents.
+
+A filing used to be downloaded up to four times: once by MADetector for
+detection, again for DealExtractor, and separately by the deal research
+generator and research worker, each re-resolving the index page. SEC filings
+are immutable once accepted, so the accession number is a stable content key
+for the index page's primary document; any other document in the filing
+(an exhibit, say) is keyed by accession plus file name:
+
+- an in-memory LRU tier bounded by FILING_CACHE_MEMORY_MB of UTF-8 document text
+- a gzip-compressed on-disk tier under FILING_CACHE_DIR, shared by restarts
+- concurrent requests for the same accession share one download
+
+The primary document is resolved from the index page once and stored with the
+document. html_to_text() converts incrementally and stops at ``max_chars``.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+from app.services.sec_ticker_index import SEC_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+FILING_CACHE_DIR = os.environ.get(
+    "FILING_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "ma-tracker-cache", "filings"),
+)
+FILING_CACHE_MEMORY_MB = float(os.environ.get("FILING_CACHE_MEMORY_MB", "64"))
+
+_TAG = re.compile(r'<[^>]+>')
+_WS = re.compile(r'\s+')
+_DASHED_ACCESSION = re.compile(r'(\d{10}-\d{2}-\d{6})')
+_PATH_ACCESSION = re.compile(r'/Archives/edgar/data/\d+/(\d{18})(?:/|$)')
+_INDEX_PAGE = re.compile(r'-index\.html?$', re.IGNORECASE)
+_UNSAFE_KEY_CHARS = re.compile(r'[^A-Za-z0-9._-]')
+
+# Characters of HTML converted per step by html_to_text
+_TEXT_WINDOW = 64 * 1024
+
+
+def html_to_text(html: str, max_chars: Optional[int] = None) -> str:
+    """Strip tags and collapse whitespace, stopping once ``max_chars`` is reached.
+
+    Equivalent to ``re.sub(r'\\s+', ' ', re.sub(r'<[^>]+>', ' ', html))[:max_chars]``
+    but works through the document in windows cut just after a ``>``, so no
+    tag spans two windows and the tail of a long filing is never converted.
+    """
+    parts = []
+    size = 0
+    prev_space = False
+    pos = 0
+    end = len(html)
+    while pos < end and (max_chars is None or size < max_chars):
+        cut = pos + _TEXT_WINDOW
+        if cut < end:
+            close = html.rfind('>', pos, cut)
+            if close < 0:
+                close = html.find('>', cut)
+            cut = close + 1 if close >= 0 else end
+        else:
+            cut = end
+        chunk = _WS.sub(' ', _TAG.sub(' ', html[pos:cut]))
+        if prev_space and chunk.startswith(' '):
+            chunk = chunk[1:]
+        if chunk:
+            parts.append(chunk)
+            size += len(chunk)
+            prev_space = chunk.endswith(' ')
+        pos = cut
+    text = ''.join(parts)
+    return text[:max_chars] if max_chars is not None else text
+
+
+def accession_from_url(url: str) -> Optional[str]:
+    """Dashed accession number (0001234567-25-000123) embedded in an EDGAR URL."""
+    match = _DASHED_ACCESSION.search(url)
+    if match:
+        return match.group(1)
+    match = _PATH_ACCESSION.search(url)
+    if match:
+        digits = match.group(1)
+        return f"{digits[:10]}-{digits[10:12]}-{digits[12:]}"
+    return None
+
+
+def select_primary_document(index_url: str, html: str) -> Optional[str]:
+    """Pick the primary document URL from a filing index page, or None."""
+    # Pattern: <a href="FILENAME.htm">FILENAME.htm</a>
+    # Also handle iXBRL format: <a href="/ix?doc=/Archives/.../file.htm">
+    doc_pattern = r'<a href="([^"]+\.(?:htm|html|txt))"'
+    all_matches = re.findall(doc_pattern, html, re.IGNORECASE)
+
+    ixbrl_pattern = r'/ix\?doc=(/Archives/[^"]+\.(?:htm|html))'
+    all_matches.extend(re.findall(ixbrl_pattern, html, re.IGNORECASE))
+
+    # Keep only documents in the filing's own directory, excluding index pages
+    filing_dir = index_url.rsplit('/', 1)[0]
+    matches = []
+    for match in all_matches:
+        filename = match.split('/')[-1].lower()
+        if not match or not filename:
+            continue
+        if filename.endswith('index.htm') or filename.endswith('index.html'):
+            continue
+        if match.startswith('/'):
+            if f"https://www.sec.gov{match}".rsplit('/', 1)[0] != filing_dir:
+                continue
+        elif '/' in match:
+            continue
+        matches.append(match)
+
+    if not matches:
+        return None
+
+    def first(predicate):
+        return next((m for m in matches if predicate(m.lower())), None)
+
+    # Prefer the 8-K body, then any non-exhibit document; HTML over text
+    primary_doc = (
+        first(lambda m: ('_8k' in m or 'd8k' in m) and m.endswith(('.htm', '.html')))
+        or first(lambda m: '_8k' in m or 'd8k' in m)
+        or first(lambda m: '_ex' not in m and m.endswith(('.htm', '.html')))
+        or first(lambda m: '_ex' not in m)
+        or matches[0]
+    )
+    if primary_doc.startswith('/'):
+        return f"https://www.sec.gov{primary_doc}"
+    return f"{filing_dir}/{primary_doc}"
+
+
+@dataclass
+class FilingDocument:
+    key: str  # accession number (plus file name for non-primary documents), or a URL hash
+    url: str  # resolved primary document URL
+    html: str
+    size: int = field(init=False)  # UTF-8 bytes of html
+
+    def __post_init__(self):
+        self.size = len(self.html.encode("utf-8"))
+
+
+class FilingCache:
+    """Two-tier (memory LRU + compressed disk) cache of filing documents."""
+
+    def __init__(
+        self,
+        cache_dir: str = FILING_CACHE_DIR,
+        memory_bytes: int = int(FILING_CACHE_MEMORY_MB * 1024 * 1024),
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.memory_bytes = memory_bytes
+        self._client = client
+        self._memory: "OrderedDict[str, FilingDocument]" = OrderedDict()
+        self._memory_size = 0
+        # document key -> accession key of the index entry that resolved to it
+        self._aliases: Dict[str, str] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.index_fetches = 0
+        self.bytes_fetched = 0
+        self.bytes_saved = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=60.0,
+                follow_redirects=True,
+                headers={"User-Agent": SEC_USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+            )
+        return self._client
+
+    @staticmethod
+    def key_for(url: str, accession: Optional[str] = None) -> str:
+        """The accession for a filing's index page, accession plus file name for a document in it."""
+        accession = accession or accession_from_url(url)
+        if accession is None:
+            return hashlib.sha256(url.encode()).hexdigest()[:32]
+        name = url.split('#', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+        if _INDEX_PAGE.search(name) or name == accession.replace('-', ''):
+            return accession
+        return f"{accession}_{_UNSAFE_KEY_CHARS.sub('_', name)}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    # -- memory tier --------------------------------------------------------
+
+    def _remember(self, doc: FilingDocument) -> None:
+        if doc.size > self.memory_bytes:
+            return
+        old = self._memory.pop(doc.key, None)
+        if old is not None:
+            self._memory_size -= old.size
+        self._memory[doc.key] = doc
+        self._memory_size += doc.size
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= evicted.size
+            doc_key = self.key_for(evicted.url)
+            if self._aliases.get(doc_key) == evicted.key:
+                del self._aliases[doc_key]
+
+    # -- disk tier ----------------------------------------------------------
+
+    def _read_disk(self, key: str) -> Optional[FilingDocument]:
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                cached = json.load(f)
+            return FilingDocument(key, cached["url"], cached["html"])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached filing {key}: {e}")
+            return None
+
+    def _write_disk(self, doc: FilingDocument) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(doc.key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump({"url": doc.url, "html": doc.html}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Could not persist filing {doc.key} to {self.cache_dir}: {e}")
+
+    # -- network ------------------------------------------------------------
+
+    async def _download(self, key: str, filing_url: str) -> FilingDocument:
+        client = self._get_client()
+        doc_url = filing_url
+        if '-index.htm' in filing_url:
+            response = await client.get(filing_url)
+            response.raise_for_status()
+            self.index_fetches += 1
+            self.bytes_fetched += len(response.content)
+            doc_url = select_primary_document(filing_url, response.text)
+            if doc_url is None:
+                logger.warning(f"No primary document found in index: {filing_url}")
+                doc_url = filing_url
+            else:
+                logger.info(f"Resolved primary document: {doc_url}")
+            if doc_url == filing_url:
+                return FilingDocument(key, doc_url, response.text)
+
+        response = await client.get(doc_url)
+        response.raise_for_status()
+        self.bytes_fetched += len(response.content)
+        return FilingDocument(key, doc_url, response.text)
+
+    async def _load(self, key: str, filing_url: str) -> FilingDocument:
+        doc = await asyncio.to_thread(self._read_disk, key)
+        if doc is not None:
+            self.disk_hits += 1
+            self.bytes_saved += doc.size
+        else:
+            self.misses += 1
+            doc = await self._download(key, filing_url)
+            await asyncio.to_thread(self._write_disk, doc)
+        self._remember(doc)
+        # Requests by the resolved document URL share the index entry
+        doc_key = self.key_for(doc.url)
+        if doc_key != key and doc.key in self._memory:
+            self._aliases[doc_key] = key
+        return doc
+
+    # -- public API ---------------------------------------------------------
+
+    async def get_document(self, filing_url: str, accession: Optional[str] = None) -> FilingDocument:
+        """The filing's primary document, fetched at most once per accession.
+
+        ``filing_url`` may be the filing index page or the document itself.
+        """
+        key = self.key_for(filing_url, accession)
+        key = self._aliases.get(key, key)
+        doc = self._memory.get(key)
+        if doc is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            self.bytes_saved += doc.size
+            return doc
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            doc = await asyncio.shield(pending)
+            self.memory_hits += 1
+            self.bytes_saved += doc.size
+            return doc
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            doc = await self._load(key, filing_url)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise; don't warn if there are none
+            raise
+        else:
+            future.set_result(doc)
+            return doc
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get_html(self, filing_url: str, max_chars: Optional[int] = None,
+                       accession: Optional[str] = None) -> str:
+        doc = await self.get_document(filing_url, accession)
+        return doc.html if max_chars is None else doc.html[:max_chars]
+
+    async def get_text(self, filing_url: str, max_chars: int = 50000,
+                       accession: Optional[str] = None) -> str:
+        """Tag-stripped, whitespace-collapsed text of the primary document."""
+        doc = await self.get_document(filing_url, accession)
+        return html_to_text(doc.html, max_chars)
+
+    def stats(self) -> dict:
+        requests = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "requests": requests,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / requests, 4) if requests else None,
+            "index_fetches": self.index_fetches,
+            "bytes_fetched": self.bytes_fetched,
+            "bytes_saved": self.bytes_saved,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "memory_limit_bytes": self.memory_bytes,
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_filing_cache: Optional[FilingCache] = None
+
+
+def get_filing_cache() -> FilingCache:
+    """Get or create the process-wide filing cache"""
+    global _filing_cache
+    if _filing_cache is None:
+        _filing_cache = FilingCache()
+    return _filing_cache
@@ -2,20 +2,38 @@
 import asyncio
 import logging
 import os
-from datetime import datetime
-from typing import Optional
+import socket
+from datetime import datetime, timezone
+from typing import List, Optional
 from anthropic import Anthropic
 
 from .poller import EdgarPoller
 from .detector import MADetector
 from .extractor import DealExtractor
 from .alerts import AlertManager
-from .models import EdgarFiling, AlertPayload
+from .models import EdgarFiling, AlertPayload, MADetectionResult
 from .database import EdgarDatabase
 from app.services.ticker_lookup import get_ticker_lookup_service
 
 logger = logging.getLogger(__name__)
 
+# Filing work queue (edgar_filing_queue): workers per process, retry policy,
+# and how long a claim may go without completing before another worker
+# (possibly on another replica) takes it over
+EDGAR_FILING_WORKERS = int(os.environ.get("EDGAR_FILING_WORKERS", "4"))
+EDGAR_FILING_MAX_ATTEMPTS = int(os.environ.get("EDGAR_FILING_MAX_ATTEMPTS", "5"))
+EDGAR_FILING_RETRY_BASE_SEC = float(os.environ.get("EDGAR_FILING_RETRY_BASE_SEC", "30"))
+EDGAR_FILING_RETRY_MAX_SEC = float(os.environ.get("EDGAR_FILING_RETRY_MAX_SEC", "1800"))
+EDGAR_FILING_LOCK_TIMEOUT_SEC = float(os.environ.get("EDGAR_FILING_LOCK_TIMEOUT_SEC", "900"))
+EDGAR_FILING_IDLE_POLL_SEC = 5.0
+
+
+def filing_retry_delay(attempts: int) -> Optional[float]:
+    """Seconds before retrying a filing that failed on its Nth attempt, or None to give up"""
+    if attempts >= EDGAR_FILING_MAX_ATTEMPTS:
+        return None
+    return min(EDGAR_FILING_RETRY_BASE_SEC * 2 ** (attempts - 1), EDGAR_FILING_RETRY_MAX_SEC)
+
 
 class EdgarOrchestrator:
     """Orchestrates the entire EDGAR monitoring pipeline"""
@@ -40,6 +58,8 @@ class EdgarOrchestrator:
             alert_recipients=alert_recipients
         )
         self.is_running = False
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._work_available = asyncio.Event()
 
     async def connect(self):
         """Connect to database"""
@@ -76,48 +96,86 @@ class EdgarOrchestrator:
 
         logger.info("EDGAR orchestrator cleanup complete")
 
-    async def process_filing(self, filing: EdgarFiling):
-        """Process a single filing through the entire pipeline"""
+    async def process_filing(self, filing: EdgarFiling) -> Optional[str]:
+        """Process a single filing through the entire pipeline
+
+        Returns the staged deal id if one was created. Raises on failure so
+        the queue worker can retry. A retry resumes where the failed attempt
+        stopped: stored detection results are reused, and a staged deal
+        already created for the filing gets its research queued and alerts
+        sent instead of being extracted (and de-duplicated) again. A filing
+        is finished once it was found not M&A relevant or its staged deal's
+        alert went out.
+        """
         try:
             logger.info(f"Processing filing: {filing.accession_number} - {filing.company_name}")
 
-            # Step 1: Check if we've already processed this filing
-            if await self.db.filing_exists(filing.accession_number):
-                logger.info(f"Filing {filing.accession_number} already processed")
-                return
+            # Step 1: Check if we've already processed (or partly processed) this filing
+            existing = await self.db.get_filing_by_accession(filing.accession_number)
+            detection_result = None
+            staged = None
+            if existing and existing["status"] != "pending":
+                if not existing["is_ma_relevant"]:
+                    logger.info(f"Filing {filing.accession_number} already processed")
+                    return None
+                staged = await self.db.get_staged_deal_for_filing(existing["filing_id"])
+                if staged and staged["alert_sent"]:
+                    logger.info(f"Filing {filing.accession_number} already processed")
+                    return staged["staged_deal_id"]
+                # An earlier attempt stored the detection, then failed
+                logger.info(f"Resuming filing {filing.accession_number} from stored detection")
+                detection_result = MADetectionResult(
+                    is_ma_relevant=True,
+                    confidence_score=existing["confidence_score"] or 0.0,
+                    detected_keywords=existing["detected_keywords"] or [],
+                    reasoning=existing["reasoning"] or "",
+                )
+
+            if staged:
+                return await self._finish_staged_deal(filing, staged)
+
+            # Step 1.5: Download the filing into the shared cache. Detection
+            # treats an unreadable filing as not M&A relevant, so fetch errors
+            # are raised here instead, where the queue will retry them.
+            await self.detector.filing_cache.get_document(filing.filing_url, filing.accession_number)
 
             # Step 2: Save filing to database (status=pending)
-            filing_id = await self.db.create_filing(
-                accession_number=filing.accession_number,
-                cik=filing.cik,
-                company_name=filing.company_name,
-                ticker=filing.ticker,
-                filing_type=filing.filing_type,
-                filing_date=filing.filing_date,
-                filing_url=filing.filing_url
-            )
+            if existing:
+                filing_id = existing["filing_id"]
+            else:
+                filing_id = await self.db.create_filing(
+                    accession_number=filing.accession_number,
+                    cik=filing.cik,
+                    company_name=filing.company_name,
+                    ticker=filing.ticker,
+                    filing_type=filing.filing_type,
+                    filing_date=filing.filing_date,
+                    filing_url=filing.filing_url
+                )
 
-            # Step 3: Detect M&A relevance (with filing priority for better filtering)
-            filing_priority = self.poller.get_filing_priority(filing.filing_type)
-            detection_result = await self.detector.detect_ma_relevance(filing, filing_priority=filing_priority)
-
-            # Step 4: Update filing with detection results
-            await self.db.update_filing_detection(
-                filing_id=filing_id,
-                is_ma_relevant=detection_result.is_ma_relevant,
-                confidence_score=detection_result.confidence_score,
-                detected_keywords=detection_result.detected_keywords,
-                reasoning=detection_result.reasoning
-            )
+            if detection_result is None:
+                # Step 3: Detect M&A relevance (with filing priority for better filtering)
+                filing_priority = self.poller.get_filing_priority(filing.filing_type)
+                detection_result = await self.detector.detect_ma_relevance(filing, filing_priority=filing_priority)
+
+                # Step 4: Update filing with detection results
+                await self.db.update_filing_detection(
+                    filing_id=filing_id,
+                    is_ma_relevant=detection_result.is_ma_relevant,
+                    confidence_score=detection_result.confidence_score,
+                    detected_keywords=detection_result.detected_keywords,
+                    reasoning=detection_result.reasoning
+                )
 
             # Step 5: If not M&A relevant, stop here
             if not detection_result.is_ma_relevant:
                 logger.info(f"Filing {filing.accession_number} not M&A relevant")
-                return
+                return None
 
             logger.info(f"M&A deal detected! Confidence: {detection_result.confidence_score:.2%}")
 
-            # Step 6: Fetch filing text for extraction
+            # Step 6: Filing text for extraction (served from the filing cache
+            # populated by detection, not downloaded again)
             filing_text = await self.detector.fetch_filing_text(filing.filing_url)
 
             # Step 7: Extract deal information
@@ -125,7 +183,7 @@ class EdgarOrchestrator:
 
             if not deal_info:
                 logger.warning(f"Could not extract deal info from {filing.accession_number}")
-                return
+                return None
 
             # Step 7.5: Enrich with ticker lookups (AI often misses tickers)
             ticker_service = get_ticker_lookup_service()
@@ -146,7 +204,7 @@ class EdgarOrchestrator:
                     f"Rejecting deal for {deal_info.target_name}: No ticker found. "
                     f"Likely a private company acquisition. Skipping staged deal creation."
                 )
-                return
+                return None
 
             # Step 7.8: Check for duplicate deals before creating
             existing_deal = await self.db.check_duplicate_deal(
@@ -160,7 +218,7 @@ class EdgarOrchestrator:
                     f"Existing deal in {existing_deal['source']} with status {existing_deal['status']}. "
                     f"Skipping creation of new staged deal."
                 )
-                return
+                return None
 
             # Step 7.9: Extract matched text excerpt showing why deal was detected
             matched_excerpt = self.detector.extract_matched_text_excerpt(
@@ -183,34 +241,119 @@ class EdgarOrchestrator:
 
             logger.info(f"Created staged deal: {staged_deal_id}")
 
-            # Step 9: Queue research generation
+            return await self._finish_staged_deal(filing, {
+                "staged_deal_id": staged_deal_id,
+                "target_name": deal_info.target_name,
+                "acquirer_name": deal_info.acquirer_name,
+                "deal_value": deal_info.deal_value,
+                "confidence_score": deal_info.confidence_score,
+                "research_queued": False,
+            })
+
+        except Exception as e:
+            logger.error(f"Error processing filing {filing.accession_number}: {e}", exc_info=True)
+            raise
+
+    async def _finish_staged_deal(self, filing: EdgarFiling, staged: dict) -> str:
+        """Queue research for a staged deal and send its alerts (steps 9-11)"""
+        staged_deal_id = staged["staged_deal_id"]
+
+        # Step 9: Queue research generation
+        if not staged["research_queued"]:
             await self.db.create_research_queue(
                 staged_deal_id=staged_deal_id,
                 analyzer_types=["topping_bid", "antitrust", "contract"],
                 priority=10  # High priority for new deals
             )
 
-            # Step 10: Send alerts
-            alert_payload = AlertPayload(
-                staged_deal_id=staged_deal_id,
-                target_name=deal_info.target_name,
-                acquirer_name=deal_info.acquirer_name,
-                deal_value=deal_info.deal_value,
-                filing_type=filing.filing_type,
-                confidence_score=deal_info.confidence_score,
-                filing_url=filing.filing_url,
-                detected_at=datetime.now()
-            )
-
-            alert_results = await self.alert_manager.send_all_alerts(alert_payload)
-
-            # Step 11: Mark alert as sent
-            await self.db.update_staged_deal_alert(staged_deal_id)
-
-            logger.info(f"Alerts sent for deal {staged_deal_id}: {alert_results}")
+        # Step 10: Send alerts
+        alert_payload = AlertPayload(
+            staged_deal_id=staged_deal_id,
+            target_name=staged["target_name"],
+            acquirer_name=staged["acquirer_name"],
+            deal_value=staged["deal_value"],
+            filing_type=filing.filing_type,
+            confidence_score=staged["confidence_score"],
+            filing_url=filing.filing_url,
+            detected_at=datetime.now()
+        )
 
-        except Exception as e:
-            logger.error(f"Error processing filing {filing.accession_number}: {e}", exc_info=True)
+        alert_results = await self.alert_manager.send_all_alerts(alert_payload)
+
+        # Step 11: Mark alert as sent
+        await self.db.update_staged_deal_alert(staged_deal_id)
+
+        logger.info(f"Alerts sent for deal {staged_deal_id}: {alert_results}")
+        return staged_deal_id
+
+
+    async def enqueue_filings(self, filings: List[EdgarFiling]):
+        """Add newly polled filings to the durable work queue and wake the workers"""
+        queued = await self.db.enqueue_filings([
+            {
+                "accession_number": f.accession_number,
+                "filing": f.model_dump_json(),
+                # feedparser reports feed timestamps in UTC
+                "published_at": f.filing_date if f.filing_date.tzinfo else f.filing_date.replace(tzinfo=timezone.utc),
+            }
+            for f in filings
+        ])
+        logger.info(f"Queued {len(queued)} of {len(filings)} new filings (others already queued)")
+        if queued:
+            self._work_available.set()
+
+    async def _filing_worker(self, index: int):
+        """Claim queued filings and run them through process_filing until stopped"""
+        worker_id = f"{self.worker_id}:{index}"
+        while self.is_running:
+            try:
+                self._work_available.clear()
+                claim = await self.db.claim_filing(worker_id, EDGAR_FILING_LOCK_TIMEOUT_SEC)
+            except Exception as e:
+                logger.error(f"Filing worker {worker_id} could not claim work: {e}")
+                claim = None
+            if claim is None:
+                try:
+                    await asyncio.wait_for(self._work_available.wait(), timeout=EDGAR_FILING_IDLE_POLL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            accession = claim["accession_number"]
+            try:
+                filing = EdgarFiling.model_validate_json(claim["filing"])
+                staged_deal_id = await self.process_filing(filing)
+            except asyncio.CancelledError:
+                # Hand the filing back rather than waiting out the lock timeout
+                try:
+                    await asyncio.shield(self.db.retry_filing(accession, worker_id, "worker stopped", 0))
+                except Exception:
+                    pass
+                raise
+            except Exception as e:
+                delay = filing_retry_delay(claim["attempts"])
+                logger.warning(
+                    f"Filing {accession} failed on attempt {claim['attempts']}: {e} - "
+                    + (f"retrying in {delay:.0f}s" if delay is not None else "giving up")
+                )
+                try:
+                    await self.db.retry_filing(accession, worker_id, f"{type(e).__name__}: {e}", delay)
+                except Exception as db_error:
+                    logger.error(f"Could not record failure for filing {accession}: {db_error}")
+                continue
+
+            try:
+                times = await self.db.complete_filing(accession, worker_id, staged_deal_id is not None)
+            except Exception as e:
+                logger.error(f"Could not mark filing {accession} done: {e}")
+                continue
+            if times and times.get("published_at"):
+                latency = (times["completed_at"] - times["published_at"]).total_seconds()
+                queue_wait = (times["started_at"] - times["enqueued_at"]).total_seconds()
+                logger.info(
+                    f"Filing {accession} done in {latency:.1f}s from RSS publish "
+                    f"(queue wait {queue_wait:.1f}s, staged_deal={staged_deal_id is not None})"
+                )
 
     async def run(self):
         """Start the EDGAR monitoring loop"""
@@ -220,8 +363,17 @@ class EdgarOrchestrator:
         try:
             await self.connect()
 
-            # Start polling with our process_filing callback
-            await self.poller.start_polling(callback=self.process_filing)
+            # Workers drain the filing queue while the poller fills it
+            workers = [
+                asyncio.create_task(self._filing_worker(i))
+                for i in range(max(1, EDGAR_FILING_WORKERS))
+            ]
+            try:
+                await self.poller.start_polling(on_new_filings=self.enqueue_filings)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
 
         except Exception as e:
             logger.error(f"Orchestrator error: {e}", exc_info=True)
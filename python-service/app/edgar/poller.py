@@ -195,34 +195,54 @@ class EdgarPoller:
             return 'medium'  # Unknown filing types default to medium
 
     async def poll_once(self) -> List[EdgarFiling]:
-        """Single poll of EDGAR feeds, returns new M&A-relevant filings"""
-        new_filings = []
+        """Single poll of EDGAR feeds, returns new M&A-relevant filings
 
-        for feed_name, feed_url in EDGAR_RSS_FEEDS.items():
-            items = await self.fetch_rss_feed(feed_url)
+        Feeds are fetched (and their entries parsed) concurrently. Filings
+        are returned but not yet marked seen; start_polling does that once
+        they have been handed off.
+        """
+        feed_items = await asyncio.gather(
+            *(self.fetch_rss_feed(feed_url) for feed_url in EDGAR_RSS_FEEDS.values())
+        )
+
+        # Both feeds list most filings; parse each link once, and skip the
+        # ticker lookup in parse_filing for filing types we never process
+        unique_items = {}
+        for feed_name, items in zip(EDGAR_RSS_FEEDS, feed_items):
             logger.info(f"Fetched {len(items)} items from {feed_name} feed")
-
             for item in items:
-                filing = await self.parse_filing(item)
-                if not filing:
-                    continue
+                if self.is_ma_relevant_filing_type(item.title.split(' - ', 1)[0].strip()):
+                    unique_items.setdefault(item.link, item)
 
-                # Skip if we've seen this filing before
-                if filing.accession_number in self.seen_accession_numbers:
-                    continue
+        filings = await asyncio.gather(*(self.parse_filing(item) for item in unique_items.values()))
 
-                # Only process M&A-relevant filing types
-                if not self.is_ma_relevant_filing_type(filing.filing_type):
-                    continue
+        new_filings = []
+        batch_accessions = set()
+        for filing in filings:
+            if not filing:
+                continue
+
+            # Skip if we've seen this filing before
+            if filing.accession_number in self.seen_accession_numbers or filing.accession_number in batch_accessions:
+                continue
+
+            # Only process M&A-relevant filing types
+            if not self.is_ma_relevant_filing_type(filing.filing_type):
+                continue
 
-                self.seen_accession_numbers.add(filing.accession_number)
-                new_filings.append(filing)
-                logger.info(f"New M&A-relevant filing: {filing.filing_type} - {filing.company_name}")
+            batch_accessions.add(filing.accession_number)
+            new_filings.append(filing)
+            logger.info(f"New M&A-relevant filing: {filing.filing_type} - {filing.company_name}")
 
         return new_filings
 
-    async def start_polling(self, callback):
-        """Start continuous polling loop"""
+    async def start_polling(self, on_new_filings):
+        """Start continuous polling loop
+
+        ``on_new_filings`` is awaited with each poll's new filings (the
+        orchestrator enqueues them). Filings are only marked seen once it
+        succeeds, so a failed hand-off is retried on the next poll.
+        """
         logger.info(f"Starting EDGAR poller (interval: {self.poll_interval}s)")
 
         while True:
@@ -239,12 +259,9 @@ class EdgarPoller:
                 duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
                 logger.info(f"Poll complete: {len(new_filings)} new filings in {duration_ms}ms")
 
-                # Process each new filing via callback
-                for filing in new_filings:
-                    try:
-                        await callback(filing)
-                    except Exception as e:
-                        logger.error(f"Callback failed for filing {filing.accession_number}: {e}")
+                if new_filings:
+                    await on_new_filings(new_filings)
+                    self.seen_accession_numbers.update(f.accession_number for f in new_filings)
 
                 await asyncio.sleep(current_interval)
 
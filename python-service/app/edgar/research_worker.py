@@ -7,6 +7,7 @@ from typing import Optional
 from anthropic import Anthropic
 
 from .database import EdgarDatabase
+from .filing_cache import get_filing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -151,12 +152,9 @@ Format as markdown with clear sections."""
                 )
                 return True
 
-            # Fetch filing text (using a simple approach - in production, cache this)
+            # Fetch filing text (usually already cached by detection)
             filing_url = deal.sourceFiling.filingUrl
-            import httpx
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(filing_url)
-                filing_text = response.text[:50000]
+            filing_text = await get_filing_cache().get_text(filing_url, max_chars=50000)
 
             deal_info = {
                 "target_name": deal.targetName,
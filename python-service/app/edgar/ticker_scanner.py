@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 
 from .models import EdgarFiling
 from .poller import MA_FILING_TYPES
+from app.services.sec_ticker_index import get_sec_ticker_index
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +41,11 @@ class TickerScanner:
             CIK string with leading zeros (10 digits) or None if not found
         """
         try:
-            # SEC maintains ticker to CIK mapping at this URL
-            url = "https://www.sec.gov/files/company_tickers.json"
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            tickers_data = response.json()
-
-            # Search for matching ticker (case-insensitive)
-            ticker_upper = ticker.upper()
-            for company_id, company_data in tickers_data.items():
-                if company_data.get("ticker", "").upper() == ticker_upper:
-                    # CIK is stored as integer, convert to 10-digit string with leading zeros
-                    cik = str(company_data["cik_str"]).zfill(10)
-                    logger.info(f"Found CIK {cik} for ticker {ticker}")
-                    return cik
+            index = await get_sec_ticker_index()
+            company = index.by_ticker(ticker)
+            if company:
+                logger.info(f"Found CIK {company.cik} for ticker {ticker}")
+                return company.cik
 
             logger.warning(f"No CIK found for ticker {ticker}")
             return None
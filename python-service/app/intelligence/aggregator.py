@@ -1,7 +1,9 @@
 """Intelligence aggregation and tier management for M&A deals"""
+import asyncio
 import logging
 import json
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from dataclasses import asdict
 import asyncpg
@@ -17,11 +19,52 @@ from app.intelligence.models import (
 from app.intelligence.edgar_cross_reference import EdgarCrossReference
 from app.edgar.ticker_scanner import get_ticker_scanner
 from app.services.ticker_lookup import get_ticker_lookup_service
+from app.utils.company_names import COMPANY_NAME_SIMILARITY_THRESHOLD, company_name_key
 from app.utils.timezone import get_current_utc
 
 logger = logging.getLogger(__name__)
 
 
+def _ticker_sync_key(mention: DealMention) -> Tuple:
+    """Tickers and names _sync_ticker_master writes for a mention"""
+    return (
+        (mention.target_ticker or "").upper(),
+        mention.target_name,
+        (mention.acquirer_ticker or "").upper(),
+        mention.acquirer_name,
+    )
+
+
+def tier_promotion(
+    current_tier: DealTier, confidence: float, official_count: int, news_count: int
+) -> Optional[Tuple[DealTier, str]]:
+    """
+    Apply the TierManager auto-promotion rules to one deal.
+
+    Returns:
+        (new tier, reason) if the deal should be promoted, None otherwise
+    """
+    # Check for promotion to ACTIVE
+    if current_tier != DealTier.ACTIVE:
+        if official_count:
+            # Any official source = ACTIVE
+            return DealTier.ACTIVE, "official source"
+        if news_count >= 3:
+            # 3+ news sources = ACTIVE
+            return DealTier.ACTIVE, "3+ news sources"
+
+    # Check for promotion to RUMORED
+    if current_tier == DealTier.WATCHLIST:
+        if news_count >= 2:
+            # 2+ news sources = RUMORED
+            return DealTier.RUMORED, "2+ news sources"
+        if confidence >= 0.8:
+            # High credibility single source = RUMORED
+            return DealTier.RUMORED, "high credibility"
+
+    return None
+
+
 class IntelligenceAggregator:
     """
     Aggregates deal mentions from multiple sources into unified DealIntelligence objects.
@@ -47,89 +90,184 @@ class IntelligenceAggregator:
         Returns:
             deal_id: UUID of the deal in deal_intelligence table, or None if deal was filtered out
         """
-        logger.info(
-            f"[PROCESS_MENTION] Starting processing for: {mention.target_name} (ticker={mention.target_ticker}) "
-            f"acquirer={mention.acquirer_name} (ticker={mention.acquirer_ticker}) source={mention.source_name}"
-        )
+        result = (await self.process_mentions([mention]))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def process_mentions(
+        self,
+        mentions: List[DealMention],
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Any]:
+        """
+        Process a batch of deal mentions (one monitoring cycle) in order.
+
+        The outcome matches process_mention() called on each mention in turn,
+        but EDGAR filings and existing deals are resolved for the whole batch
+        with one query each, and all of a deal's new sources are inserted and
+        scored together (one transaction per deal).
+
+        Args:
+            mentions: Deal mentions to process
+            timings: Optional dict filled with enrich_ms, resolve_ms and ingest_ms
+
+        Returns:
+            One entry per mention: the deal_id, None if the mention was
+            filtered out, or the exception that failed its deal
+        """
+        timings = timings if timings is not None else {}
+        results: List[Any] = [None] * len(mentions)
+
+        # STEP 1: Enrich mentions with missing tickers (lookups run concurrently)
+        stage_start = time.perf_counter()
+        await asyncio.gather(*(
+            self._enrich_mention_with_tickers(mention) for mention in mentions
+            if (mention.target_name and not mention.target_ticker)
+            or (mention.acquirer_name and not mention.acquirer_ticker)
+        ))
+        timings["enrich_ms"] = (time.perf_counter() - stage_start) * 1000
+
+        # STEP 1.5: Validate that target has a ticker (filter out private companies)
+        pending = []
+        for index, mention in enumerate(mentions):
+            if not mention.target_ticker:
+                logger.warning(
+                    f"[PROCESS_MENTION] FILTERED OUT - no ticker found for target: {mention.target_name} "
+                    f"(source: {mention.source_name}). Likely private company."
+                )
+                continue
+            pending.append(index)
+
+        timings.setdefault("resolve_ms", 0.0)
+        timings.setdefault("ingest_ms", 0.0)
+        if not pending:
+            return results
 
         async with self.pool.acquire() as conn:
-            # Use explicit transaction to ensure atomicity
-            async with conn.transaction():
-                # STEP 1: Enrich mention with missing tickers
-                # If we have company names but no tickers, look them up
-                if (mention.target_name and not mention.target_ticker) or \
-                   (mention.acquirer_name and not mention.acquirer_ticker):
-                    logger.info(
-                        f"[PROCESS_MENTION] Enriching tickers: target={mention.target_name} ({mention.target_ticker}), "
-                        f"acquirer={mention.acquirer_name} ({mention.acquirer_ticker})"
-                    )
-                    await self._enrich_mention_with_tickers(mention)
-                    logger.info(
-                        f"[PROCESS_MENTION] After enrichment: target_ticker={mention.target_ticker}, "
-                        f"acquirer_ticker={mention.acquirer_ticker}"
-                    )
+            stage_start = time.perf_counter()
+
+            # STEP 1.6: Check if deals already exist in EDGAR staged_deals (see
+            # process_mention history: pending/approved -> skip, otherwise upgrade)
+            edgar_filings = await self._find_edgar_filings(
+                conn, [mentions[index].target_ticker for index in pending]
+            )
+            remaining = []
+            for index in pending:
+                mention = mentions[index]
+                edgar_filing = edgar_filings.get(mention.target_ticker.upper())
+                if not edgar_filing:
+                    remaining.append(index)
+                    continue
 
-                # STEP 1.5: Validate that target has a ticker (filter out private companies)
-                # Most rumors about listed companies will include ticker or proper company name
-                # that our lookup can match. If we can't find a ticker, it's likely a private company.
-                if not mention.target_ticker:
+                if edgar_filing['status'] in ('approved', 'pending'):
+                    # Already in the queue - don't duplicate
                     logger.warning(
-                        f"[PROCESS_MENTION] FILTERED OUT - no ticker found for target: {mention.target_name} "
-                        f"(source: {mention.source_name}). Likely private company."
+                        f"[PROCESS_MENTION] FILTERED OUT - deal already {edgar_filing['status']} in EDGAR: "
+                        f"{mention.target_name} ({mention.target_ticker}) (source: {mention.source_name})"
                     )
-                    return None
-
-                # STEP 1.6: Check if deal already exists in EDGAR staged_deals
-                # Three scenarios:
-                # 1. EDGAR filing is approved/pending -> Skip (already in queue)
-                # 2. EDGAR filing exists but rated unlikely -> Upgrade it with intelligence confirmation
-                # 3. No EDGAR filing -> Proceed normally
-                edgar_filing = await self._find_edgar_filing(conn, mention.target_ticker)
-                if edgar_filing:
-                    if edgar_filing['status'] in ('approved', 'pending'):
-                        # Already in the queue - don't duplicate
-                        logger.warning(
-                            f"[PROCESS_MENTION] FILTERED OUT - deal already {edgar_filing['status']} in EDGAR: "
-                            f"{mention.target_name} ({mention.target_ticker}) (source: {mention.source_name})"
-                        )
-                        return None
-                    else:
-                        # EDGAR filing was marked unlikely/rejected, but intelligence confirms it's real
-                        # Upgrade the EDGAR filing and skip creating intelligence deal (per user requirement)
-                        logger.info(
-                            f"[PROCESS_MENTION] Intelligence confirms EDGAR filing! Upgrading {mention.target_ticker} "
-                            f"from '{edgar_filing['status']}' to 'pending'"
-                        )
+                    continue
+
+                # EDGAR filing was marked unlikely/rejected, but intelligence confirms it's real
+                # Upgrade the EDGAR filing and skip creating intelligence deal (per user requirement)
+                logger.info(
+                    f"[PROCESS_MENTION] Intelligence confirms EDGAR filing! Upgrading {mention.target_ticker} "
+                    f"from '{edgar_filing['status']}' to 'pending'"
+                )
+                try:
+                    async with conn.transaction():
                         await self._upgrade_edgar_filing(conn, edgar_filing['staged_deal_id'], mention)
-                        return None  # Don't create intelligence deal - just upgraded EDGAR filing
-
-                # STEP 2: Try to find existing deal by target company name or ticker
-                existing_deal = await self._find_existing_deal(conn, mention)
-
-                if existing_deal:
-                    # Update existing deal with new source
-                    deal_id = existing_deal["deal_id"]
-                    await self._add_source_to_deal(conn, deal_id, mention)
-                    await self._update_deal_intelligence(conn, deal_id)
-                    # Sync ticker_master with updated deal info
-                    await self._sync_ticker_master(conn, deal_id, mention)
-                    logger.info(f"Updated existing deal {deal_id} with new source: {mention.source_name}")
-                else:
-                    # Create new deal
-                    deal_id = await self._create_new_deal(conn, mention)
-                    logger.info(f"Created new deal {deal_id} from source: {mention.source_name}")
+                    edgar_filing['status'] = 'pending'
+                except Exception as e:
+                    logger.error(f"Failed to upgrade EDGAR filing for {mention.target_ticker}: {e}", exc_info=True)
+                    results[index] = e
+
+            # STEP 2: Find existing deals by target ticker or name for the whole batch
+            by_ticker, by_name = await self._find_existing_deals(conn, [mentions[index] for index in remaining])
+
+            # Group mentions by deal, in first-seen order. A target with no deal
+            # yet gets one new deal: later mentions of it join that deal, as a
+            # one-at-a-time lookup would find the deal the first one created.
+            groups: Dict[Any, List[int]] = {}
+            new_by_ticker: Dict[str, Tuple[str, int]] = {}
+            new_by_name: Dict[str, Tuple[str, int]] = {}
+            for index in remaining:
+                mention = mentions[index]
+                ticker = mention.target_ticker.upper()
+                name = company_name_key(mention.target_name)
+                key = (
+                    by_ticker.get(ticker)
+                    or new_by_ticker.get(ticker)
+                    or by_name.get(mention.target_name)
+                    or new_by_name.get(name)
+                )
+                if key is None:
+                    key = ("new", index)
+                    new_by_ticker[ticker] = key
+                    new_by_name.setdefault(name, key)
+                groups.setdefault(key, []).append(index)
+            timings["resolve_ms"] = (time.perf_counter() - stage_start) * 1000
+
+            stage_start = time.perf_counter()
+            for key, indexes in groups.items():
+                existing_deal_id = None if isinstance(key, tuple) else key
+                try:
+                    deal_id = await self._ingest_deal_mentions(
+                        conn, existing_deal_id, [mentions[index] for index in indexes]
+                    )
+                except Exception as e:
+                    logger.error(f"Error ingesting mentions for deal {existing_deal_id or 'new'}: {e}", exc_info=True)
+                    deal_id = e
+                for index in indexes:
+                    results[index] = deal_id
+            timings["ingest_ms"] = (time.perf_counter() - stage_start) * 1000
+
+        return results
+
+    async def _ingest_deal_mentions(
+        self, conn: asyncpg.Connection, deal_id: Optional[str], mentions: List[DealMention]
+    ) -> str:
+        """Add mentions of one deal (creating it if ``deal_id`` is None) in one transaction"""
+        async with conn.transaction():
+            new_sources = mentions
+            synced = set()
+            if deal_id is None:
+                # Create new deal from the first mention
+                deal_id = await self._create_new_deal(conn, mentions[0])
+                logger.info(f"Created new deal {deal_id} from source: {mentions[0].source_name}")
+                new_sources = mentions[1:]
+                synced.add(_ticker_sync_key(mentions[0]))
+
+            if new_sources:
+                # Update existing deal with new sources
+                await self._add_sources_to_deal(conn, deal_id, new_sources)
+                await self._update_deal_intelligence(conn, deal_id)
+                # Sync ticker_master with updated deal info (once per ticker pairing)
+                for mention in new_sources:
+                    if _ticker_sync_key(mention) not in synced:
+                        synced.add(_ticker_sync_key(mention))
+                        await self._sync_ticker_master(conn, deal_id, mention)
+                logger.info(
+                    f"Updated deal {deal_id} with {len(new_sources)} new source(s): "
+                    f"{', '.join(sorted({m.source_name for m in new_sources}))}"
+                )
 
-                # STEP 3: Automatic EDGAR cross-reference for non-official sources
-                # This helps corroborate deals and boost confidence
-                if mention.source_type != SourceType.OFFICIAL:
+            # STEP 3/4: EDGAR cross-reference (non-official sources) and proactive
+            # ticker scan, once per distinct company pairing in this batch
+            cross_referenced = set()
+            scanned = set()
+            for mention in mentions:
+                cross_ref_key = (mention.target_name, (mention.target_ticker or "").upper(), mention.acquirer_name)
+                if mention.source_type != SourceType.OFFICIAL and cross_ref_key not in cross_referenced:
+                    cross_referenced.add(cross_ref_key)
                     await self._perform_edgar_cross_reference(conn, deal_id, mention)
 
-                # STEP 4: Proactive ticker-based EDGAR scanning
-                # Scan SEC.gov for recent filings when a deal has tickers
-                if mention.target_ticker or mention.acquirer_ticker:
+                scan_key = ((mention.target_ticker or "").upper(), (mention.acquirer_ticker or "").upper())
+                if (mention.target_ticker or mention.acquirer_ticker) and scan_key not in scanned:
+                    scanned.add(scan_key)
                     await self._scan_tickers_for_filings(conn, deal_id, mention)
 
-                return deal_id
+            return deal_id
 
     async def _find_edgar_filing(
         self, conn: asyncpg.Connection, target_ticker: str
@@ -157,6 +295,25 @@ class IntelligenceAggregator:
 
         return dict(filing) if filing else None
 
+    async def _find_edgar_filings(
+        self, conn: asyncpg.Connection, target_tickers: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Batch form of _find_edgar_filing: upper-cased ticker -> staged_deals record"""
+        tickers = sorted({t.upper() for t in target_tickers if t})
+        if not tickers:
+            return {}
+
+        rows = await conn.fetch(
+            """SELECT DISTINCT ON (target_ticker)
+                      staged_deal_id, target_name, target_ticker, acquirer_name,
+                      acquirer_ticker, status, detected_at
+               FROM staged_deals
+               WHERE target_ticker = ANY($1::text[])
+               ORDER BY target_ticker""",
+            tickers
+        )
+        return {row["target_ticker"]: dict(row) for row in rows}
+
     async def _upgrade_edgar_filing(
         self,
         conn: asyncpg.Connection,
@@ -220,22 +377,71 @@ class IntelligenceAggregator:
             if deal:
                 return dict(deal)
 
-        # Try fuzzy company name match (less reliable, needs improvement)
-        # For now, use simple case-insensitive match
+        # Fuzzy company name match on normalized keys (trigram index)
+        name_key = company_name_key(mention.target_name)
+        if not name_key:
+            return None
         deal = await conn.fetchrow(
             """SELECT deal_id, target_name, target_ticker, acquirer_name
                FROM deal_intelligence
-               WHERE LOWER(target_name) = LOWER($1)
+               WHERE company_name_key(target_name) % $1
+               AND similarity(company_name_key(target_name), $1) >= $2
                AND deal_status NOT IN ('completed', 'terminated')
-               ORDER BY first_detected_at DESC
+               ORDER BY similarity(company_name_key(target_name), $1) DESC, first_detected_at DESC
                LIMIT 1""",
-            mention.target_name,
+            name_key,
+            COMPANY_NAME_SIMILARITY_THRESHOLD,
         )
         if deal:
             return dict(deal)
 
         return None
 
+    async def _find_existing_deals(
+        self, conn: asyncpg.Connection, mentions: List[DealMention]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Batch form of _find_existing_deal, in one query.
+
+        Returns:
+            (upper-cased target ticker -> deal_id, target name as given -> deal_id)
+        """
+        tickers = sorted({m.target_ticker.upper() for m in mentions if m.target_ticker})
+        names = sorted({m.target_name for m in mentions if company_name_key(m.target_name)})
+        if not tickers and not names:
+            return {}, {}
+
+        rows = await conn.fetch(
+            """SELECT * FROM (
+                   SELECT DISTINCT ON (t.ticker) 'ticker' AS match_on, t.ticker AS match_key, d.deal_id
+                   FROM unnest($1::text[]) AS t(ticker)
+                   JOIN deal_intelligence d ON d.target_ticker = t.ticker
+                   WHERE d.deal_status NOT IN ('completed', 'terminated')
+                   ORDER BY t.ticker, d.first_detected_at DESC
+               ) by_ticker
+               UNION ALL
+               SELECT * FROM (
+                   SELECT DISTINCT ON (n.name) 'name' AS match_on, n.name AS match_key, d.deal_id
+                   FROM unnest($2::text[], $3::text[]) AS n(name, name_key)
+                   JOIN deal_intelligence d ON company_name_key(d.target_name) % n.name_key
+                   WHERE d.deal_status NOT IN ('completed', 'terminated')
+                   AND similarity(company_name_key(d.target_name), n.name_key) >= $4
+                   ORDER BY n.name, similarity(company_name_key(d.target_name), n.name_key) DESC,
+                            d.first_detected_at DESC
+               ) by_name""",
+            tickers,
+            names,
+            [company_name_key(name) for name in names],
+            COMPANY_NAME_SIMILARITY_THRESHOLD,
+        )
+
+        by_ticker: Dict[str, Any] = {}
+        by_name: Dict[str, Any] = {}
+        for row in rows:
+            target = by_ticker if row["match_on"] == "ticker" else by_name
+            target[row["match_key"]] = row["deal_id"]
+        return by_ticker, by_name
+
     async def _create_new_deal(self, conn: asyncpg.Connection, mention: DealMention) -> str:
         """Create new deal_intelligence entry"""
         deal_id = await conn.fetchval(
@@ -276,16 +482,36 @@ class IntelligenceAggregator:
         self, conn: asyncpg.Connection, deal_id: str, mention: DealMention
     ) -> None:
         """Add source mention to deal_sources table (with deduplication)"""
+        await self._add_sources_to_deal(conn, deal_id, [mention])
+
+    async def _add_sources_to_deal(
+        self, conn: asyncpg.Connection, deal_id: str, mentions: List[DealMention]
+    ) -> None:
+        """Add source mentions to deal_sources table in one batch (with deduplication)"""
         # Use ON CONFLICT DO NOTHING to gracefully handle duplicate sources
         # The unique index on (deal_id, source_url) will prevent duplicates
-
-        # Normalize source_published_at to UTC if it has timezone info
-        source_published_at = mention.source_published_at
-        if source_published_at and source_published_at.tzinfo is not None:
-            # Convert to UTC and make naive (PostgreSQL timestamptz expects naive UTC)
-            source_published_at = source_published_at.astimezone(timezone.utc).replace(tzinfo=None)
-
-        await conn.execute(
+        rows = []
+        for mention in mentions:
+            # Normalize source_published_at to UTC if it has timezone info
+            source_published_at = mention.source_published_at
+            if source_published_at and source_published_at.tzinfo is not None:
+                # Convert to UTC and make naive (PostgreSQL timestamptz expects naive UTC)
+                source_published_at = source_published_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+            rows.append((
+                deal_id,
+                mention.source_name,
+                mention.source_type.value,
+                mention.source_url,
+                mention.mention_type.value,
+                mention.headline,
+                mention.content_snippet,
+                mention.credibility_score,
+                json.dumps(mention.extracted_data) if mention.extracted_data else None,
+                source_published_at,
+            ))
+
+        await conn.executemany(
             """INSERT INTO deal_sources (
                 deal_id, source_name, source_type, source_url,
                 mention_type, headline, content_snippet,
@@ -293,16 +519,7 @@ class IntelligenceAggregator:
             ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9::jsonb, $10)
             ON CONFLICT (deal_id, source_url) WHERE source_url IS NOT NULL
             DO NOTHING""",
-            deal_id,
-            mention.source_name,
-            mention.source_type.value,
-            mention.source_url,
-            mention.mention_type.value,
-            mention.headline,
-            mention.content_snippet,
-            mention.credibility_score,
-            json.dumps(mention.extracted_data) if mention.extracted_data else None,
-            source_published_at,
+            rows,
         )
 
     async def _update_deal_intelligence(self, conn: asyncpg.Connection, deal_id: str) -> None:
@@ -762,132 +979,132 @@ class TierManager:
         Returns:
             True if tier was changed, False otherwise
         """
-        async with self.pool.acquire() as conn:
-            # Get current deal info
-            deal = await conn.fetchrow(
-                """SELECT deal_tier, deal_status, confidence_score, source_count
-                   FROM deal_intelligence WHERE deal_id = $1""",
-                deal_id,
-            )
+        changed = await self.evaluate_tier_promotions([deal_id])
+        return changed.get(str(deal_id), False)
 
-            if not deal:
-                return False
+    async def evaluate_tier_promotions(self, deal_ids: List[Any]) -> Dict[str, bool]:
+        """
+        Evaluate tier promotion for many deals in one set-based pass.
 
-            current_tier = DealTier(deal["deal_tier"])
-            confidence = deal["confidence_score"]
-            source_count = deal["source_count"]
+        Source counts for every deal come from one query; each promotion
+        (ACTIVE, RUMORED) is then applied to all its deals with one statement
+        per table, in a single transaction.
 
-            # Get source breakdown
-            sources = await conn.fetch(
-                """SELECT source_name, source_type, mention_type
-                   FROM deal_sources WHERE deal_id = $1""",
-                deal_id,
+        Returns:
+            str(deal_id) -> True if the deal's tier was changed
+        """
+        ids = sorted({str(deal_id) for deal_id in deal_ids if deal_id})
+        if not ids:
+            return {}
+
+        async with self.pool.acquire() as conn:
+            deals = await conn.fetch(
+                """SELECT d.deal_id, d.deal_tier, d.confidence_score,
+                          COUNT(s.source_id) FILTER (WHERE s.source_type = 'official') AS official_count,
+                          COUNT(s.source_id) FILTER (WHERE s.source_type = 'news') AS news_count
+                   FROM deal_intelligence d
+                   LEFT JOIN deal_sources s ON s.deal_id = d.deal_id
+                   WHERE d.deal_id = ANY($1::uuid[])
+                   GROUP BY d.deal_id""",
+                ids,
             )
 
-            official_sources = [s for s in sources if s["source_type"] == "official"]
-            news_sources = [s for s in sources if s["source_type"] == "news"]
-
-            # Check for promotion to ACTIVE
-            if current_tier != DealTier.ACTIVE:
-                if official_sources:
-                    # Any official source = ACTIVE
-                    await self._promote_to_active(conn, deal_id)
-                    logger.info(f"Promoted deal {deal_id} to ACTIVE (official source)")
-                    return True
-                elif len(news_sources) >= 3:
-                    # 3+ news sources = ACTIVE
-                    await self._promote_to_active(conn, deal_id)
-                    logger.info(f"Promoted deal {deal_id} to ACTIVE (3+ news sources)")
-                    return True
-
-            # Check for promotion to RUMORED
-            if current_tier == DealTier.WATCHLIST:
-                if len(news_sources) >= 2:
-                    # 2+ news sources = RUMORED
-                    await self._promote_to_rumored(conn, deal_id)
-                    logger.info(f"Promoted deal {deal_id} to RUMORED (2+ news sources)")
-                    return True
-                elif confidence >= 0.8:
-                    # High credibility single source = RUMORED
-                    await self._promote_to_rumored(conn, deal_id)
-                    logger.info(f"Promoted deal {deal_id} to RUMORED (high credibility)")
-                    return True
-
-            return False
-
-    async def _promote_to_rumored(self, conn: asyncpg.Connection, deal_id: str) -> None:
-        """Promote deal to RUMORED tier"""
+            promote: Dict[DealTier, List[str]] = {DealTier.ACTIVE: [], DealTier.RUMORED: []}
+            for deal in deals:
+                promotion = tier_promotion(
+                    DealTier(deal["deal_tier"]),
+                    deal["confidence_score"],
+                    deal["official_count"],
+                    deal["news_count"],
+                )
+                if promotion:
+                    new_tier, reason = promotion
+                    promote[new_tier].append(str(deal["deal_id"]))
+                    logger.info(f"Promoted deal {deal['deal_id']} to {new_tier.value.upper()} ({reason})")
+
+            if promote[DealTier.ACTIVE] or promote[DealTier.RUMORED]:
+                async with conn.transaction():
+                    if promote[DealTier.ACTIVE]:
+                        await self._promote_to_active(conn, promote[DealTier.ACTIVE])
+                    if promote[DealTier.RUMORED]:
+                        await self._promote_to_rumored(conn, promote[DealTier.RUMORED])
+
+        promoted = set(promote[DealTier.ACTIVE]) | set(promote[DealTier.RUMORED])
+        return {deal_id: deal_id in promoted for deal_id in ids}
+
+    async def _promote_to_rumored(self, conn: asyncpg.Connection, deal_ids: List[str]) -> None:
+        """Promote deals to RUMORED tier"""
+        now = get_current_utc()
         await conn.execute(
             """UPDATE deal_intelligence
                SET deal_tier = 'rumored',
                    promoted_to_rumored_at = $1
-               WHERE deal_id = $2""",
-            get_current_utc(),
-            deal_id,
+               WHERE deal_id = ANY($2::uuid[])""",
+            now,
+            deal_ids,
         )
 
         # Log to history
         await conn.execute(
             """INSERT INTO deal_history (deal_id, change_type, old_value, new_value, triggered_by)
-               VALUES ($1, 'tier_promoted', $2, $3, 'system')""",
-            deal_id,
-            {"tier": "watchlist"},
-            {"tier": "rumored"},
+               SELECT deal_id, 'tier_promoted', $2::jsonb, $3::jsonb, 'system'
+               FROM unnest($1::uuid[]) AS deal_id""",
+            deal_ids,
+            json.dumps({"tier": "watchlist"}),
+            json.dumps({"tier": "rumored"}),
         )
 
         # Update ticker watchlist
-        ticker = await conn.fetchval(
-            "SELECT target_ticker FROM deal_intelligence WHERE deal_id = $1", deal_id
+        await conn.execute(
+            """INSERT INTO ticker_watchlist (ticker, company_name, watch_tier, active_deal_id, promoted_to_rumored_at)
+               SELECT DISTINCT ON (target_ticker) target_ticker, target_name, 'rumored', deal_id, $1
+               FROM deal_intelligence
+               WHERE deal_id = ANY($2::uuid[]) AND COALESCE(target_ticker, '') <> ''
+               ORDER BY target_ticker, first_detected_at DESC
+               ON CONFLICT (ticker) DO UPDATE
+               SET watch_tier = 'rumored',
+                   active_deal_id = EXCLUDED.active_deal_id,
+                   promoted_to_rumored_at = $1,
+                   last_activity_at = $1""",
+            now,
+            deal_ids,
         )
-        if ticker:
-            await conn.execute(
-                """INSERT INTO ticker_watchlist (ticker, company_name, watch_tier, active_deal_id, promoted_to_rumored_at)
-                   SELECT target_ticker, target_name, 'rumored', deal_id, $1
-                   FROM deal_intelligence WHERE deal_id = $2
-                   ON CONFLICT (ticker) DO UPDATE
-                   SET watch_tier = 'rumored',
-                       active_deal_id = $2,
-                       promoted_to_rumored_at = $1,
-                       last_activity_at = $1""",
-                get_current_utc(),
-                deal_id,
-            )
 
-    async def _promote_to_active(self, conn: asyncpg.Connection, deal_id: str) -> None:
-        """Promote deal to ACTIVE tier"""
+    async def _promote_to_active(self, conn: asyncpg.Connection, deal_ids: List[str]) -> None:
+        """Promote deals to ACTIVE tier"""
+        now = get_current_utc()
         await conn.execute(
             """UPDATE deal_intelligence
                SET deal_tier = 'active',
                    deal_status = 'announced',
                    promoted_to_active_at = $1
-               WHERE deal_id = $2""",
-            get_current_utc(),
-            deal_id,
+               WHERE deal_id = ANY($2::uuid[])""",
+            now,
+            deal_ids,
         )
 
         # Log to history
         await conn.execute(
             """INSERT INTO deal_history (deal_id, change_type, old_value, new_value, triggered_by)
-               VALUES ($1, 'tier_promoted', $2, $3, 'system')""",
-            deal_id,
-            {"tier": "rumored"},
-            {"tier": "active"},
+               SELECT deal_id, 'tier_promoted', $2::jsonb, $3::jsonb, 'system'
+               FROM unnest($1::uuid[]) AS deal_id""",
+            deal_ids,
+            json.dumps({"tier": "rumored"}),
+            json.dumps({"tier": "active"}),
         )
 
         # Update ticker watchlist
-        ticker = await conn.fetchval(
-            "SELECT target_ticker FROM deal_intelligence WHERE deal_id = $1", deal_id
+        await conn.execute(
+            """INSERT INTO ticker_watchlist (ticker, company_name, watch_tier, active_deal_id, promoted_to_active_at)
+               SELECT DISTINCT ON (target_ticker) target_ticker, target_name, 'active', deal_id, $1
+               FROM deal_intelligence
+               WHERE deal_id = ANY($2::uuid[]) AND COALESCE(target_ticker, '') <> ''
+               ORDER BY target_ticker, first_detected_at DESC
+               ON CONFLICT (ticker) DO UPDATE
+               SET watch_tier = 'active',
+                   active_deal_id = EXCLUDED.active_deal_id,
+                   promoted_to_active_at = $1,
+                   last_activity_at = $1""",
+            now,
+            deal_ids,
         )
-        if ticker:
-            await conn.execute(
-                """INSERT INTO ticker_watchlist (ticker, company_name, watch_tier, active_deal_id, promoted_to_active_at)
-                   SELECT target_ticker, target_name, 'active', deal_id, $1
-                   FROM deal_intelligence WHERE deal_id = $2
-                   ON CONFLICT (ticker) DO UPDATE
-                   SET watch_tier = 'active',
-                       active_deal_id = $2,
-                       promoted_to_active_at = $1,
-                       last_activity_at = $1""",
-                get_current_utc(),
-                deal_id,
-            )
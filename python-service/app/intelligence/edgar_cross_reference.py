@@ -7,6 +7,7 @@ automatically searches EDGAR for corroborating filings to boost confidence.
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from app.utils.company_names import COMPANY_NAME_SIMILARITY_THRESHOLD, company_name_key
 from app.utils.timezone import get_current_utc
 import asyncpg
 
@@ -144,9 +145,17 @@ class EdgarCrossReference:
         company_name: str,
         cutoff_date: datetime
     ) -> List[Dict[str, Any]]:
-        """Search EDGAR filings by company name (fuzzy match)"""
-        # Use ILIKE for case-insensitive pattern matching
-        search_pattern = f"%{company_name}%"
+        """
+        Search EDGAR filings by company name (fuzzy match).
+
+        The normalized name must closely match some run of words in the filer
+        name (pg_trgm word similarity), so "Acme Inc." finds "ACME
+        INCORPORATED" and "Acme Holdings Group" as the old substring match did,
+        through the trigram index on company_name_key(company_name).
+        """
+        name_key = company_name_key(company_name)
+        if not name_key:
+            return []
 
         rows = await conn.fetch(
             """
@@ -162,13 +171,15 @@ class EdgarCrossReference:
                 confidence_score,
                 detected_keywords
             FROM edgar_filings
-            WHERE company_name ILIKE $1
+            WHERE $1 <% company_name_key(company_name)
+              AND word_similarity($1, company_name_key(company_name)) >= $3
               AND filing_date >= $2
               AND status = 'analyzed'
             ORDER BY filing_date DESC
             """,
-            search_pattern,
-            cutoff_date
+            name_key,
+            cutoff_date,
+            COMPANY_NAME_SIMILARITY_THRESHOLD,
         )
 
         return [dict(row) for row in rows]
@@ -9,6 +9,8 @@ import re
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+from app.utils.keyword_matcher import KeywordHits, KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 # M&A announcement keywords for news articles
@@ -58,6 +60,17 @@ HISTORICAL_KEYWORDS = [
     "since acquiring", "since the merger",
 ]
 
+# Generic deal words that make a rumor keyword M&A relevant
+MA_DEAL_WORDS = ['merger', 'acquisition', 'acquire', 'takeover']
+
+# Keywords that earn the confidence bonus for a firm announcement
+STRONG_ANNOUNCEMENT_KEYWORDS = ['agrees to acquire', 'agreed to acquire', 'merger agreement', 'definitive agreement']
+
+# Every keyword list above, scanned in one pass over the lowercased headline
+HEADLINE_KEYWORD_MATCHER = KeywordMatcher(
+    MA_ANNOUNCEMENT_KEYWORDS + RUMOR_KEYWORDS + HISTORICAL_KEYWORDS + MA_DEAL_WORDS + STRONG_ANNOUNCEMENT_KEYWORDS
+)
+
 # Patterns to extract company names and deal details
 # Format: "Company A to acquire Company B for $X billion"
 ACQUISITION_PATTERNS = [
@@ -128,21 +141,22 @@ class HeadlineParser:
         # Combine headline and summary for analysis
         text = f"{headline} {summary}".strip()
         text_lower = text.lower()
+        hits = HEADLINE_KEYWORD_MATCHER.scan(text_lower)
 
         result = ParsedDeal()
 
         # Step 1: Check if this is M&A relevant
-        if not self._is_ma_relevant(text_lower):
+        if not self._is_ma_relevant(text_lower, hits):
             result.reasoning = "No M&A keywords detected"
             return result
 
         # Step 2: Check for historical references (filter out)
-        if self._is_historical(text_lower):
+        if self._is_historical(text_lower, hits):
             result.reasoning = "Historical reference detected - past deal, not new announcement"
             return result
 
         # Step 3: Determine if this is a rumor or announcement
-        result.is_rumor = self._is_rumor(text_lower)
+        result.is_rumor = self._is_rumor(text_lower, hits)
 
         # Step 4: Extract company names
         target, acquirer = self._extract_companies(text)
@@ -166,7 +180,7 @@ class HeadlineParser:
         result.deal_value = self._extract_deal_value(text)
 
         # Step 7: Calculate confidence
-        result.confidence = self._calculate_confidence(result, text_lower)
+        result.confidence = self._calculate_confidence(result, text_lower, hits)
 
         # Step 8: Set relevance flag
         result.is_ma_relevant = result.confidence >= 0.50
@@ -176,33 +190,32 @@ class HeadlineParser:
 
         return result
 
-    def _is_ma_relevant(self, text_lower: str) -> bool:
+    def _is_ma_relevant(self, text_lower: str, hits: Optional[KeywordHits] = None) -> bool:
         """Check if text contains M&A keywords"""
-        for keyword in MA_ANNOUNCEMENT_KEYWORDS:
-            if keyword in text_lower:
-                return True
+        hits = hits or HEADLINE_KEYWORD_MATCHER.scan(text_lower)
+        if hits.first_present(MA_ANNOUNCEMENT_KEYWORDS) is not None:
+            return True
 
         # Also check rumor keywords (still M&A relevant, just lower confidence)
-        for keyword in RUMOR_KEYWORDS:
-            if keyword in text_lower and any(k in text_lower for k in ['merger', 'acquisition', 'acquire', 'takeover']):
-                return True
-
-        return False
+        return (hits.first_present(RUMOR_KEYWORDS) is not None
+                and hits.first_present(MA_DEAL_WORDS) is not None)
 
-    def _is_historical(self, text_lower: str) -> bool:
+    def _is_historical(self, text_lower: str, hits: Optional[KeywordHits] = None) -> bool:
         """Check if text refers to a past/historical deal"""
-        for keyword in HISTORICAL_KEYWORDS:
-            if keyword in text_lower:
-                self.logger.debug(f"Historical keyword detected: '{keyword}'")
-                return True
+        hits = hits or HEADLINE_KEYWORD_MATCHER.scan(text_lower)
+        keyword = hits.first_present(HISTORICAL_KEYWORDS)
+        if keyword is not None:
+            self.logger.debug(f"Historical keyword detected: '{keyword}'")
+            return True
         return False
 
-    def _is_rumor(self, text_lower: str) -> bool:
+    def _is_rumor(self, text_lower: str, hits: Optional[KeywordHits] = None) -> bool:
         """Check if text indicates a rumor vs confirmed announcement"""
-        for keyword in RUMOR_KEYWORDS:
-            if keyword in text_lower:
-                self.logger.debug(f"Rumor keyword detected: '{keyword}'")
-                return True
+        hits = hits or HEADLINE_KEYWORD_MATCHER.scan(text_lower)
+        keyword = hits.first_present(RUMOR_KEYWORDS)
+        if keyword is not None:
+            self.logger.debug(f"Rumor keyword detected: '{keyword}'")
+            return True
         return False
 
     def _extract_companies(self, text: str) -> tuple[Optional[str], Optional[str]]:
@@ -307,7 +320,7 @@ class HeadlineParser:
                     continue
         return None
 
-    def _calculate_confidence(self, result: ParsedDeal, text_lower: str) -> float:
+    def _calculate_confidence(self, result: ParsedDeal, text_lower: str, hits: Optional[KeywordHits] = None) -> float:
         """Calculate confidence score based on extracted information
 
         Confidence tiers:
@@ -343,8 +356,8 @@ class HeadlineParser:
             score -= 0.15
 
         # Bonus for strong announcement keywords
-        strong_keywords = ['agrees to acquire', 'agreed to acquire', 'merger agreement', 'definitive agreement']
-        if any(kw in text_lower for kw in strong_keywords):
+        hits = hits or HEADLINE_KEYWORD_MATCHER.scan(text_lower)
+        if hits.first_present(STRONG_ANNOUNCEMENT_KEYWORDS) is not None:
             score += 0.10
 
         # Cap at 0.95
@@ -2,12 +2,15 @@
 import asyncio
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from app.utils.timezone import convert_to_et, get_current_utc
 import asyncpg
 
 from app.intelligence.base_monitor import BaseSourceMonitor
+from app.intelligence.models import DealMention
 from app.intelligence.aggregator import IntelligenceAggregator, TierManager
 from app.intelligence.ticker_watch_monitor import TickerWatchMonitor
 from app.intelligence.monitors import (
@@ -21,6 +24,18 @@ from app.intelligence.monitors import (
 
 logger = logging.getLogger(__name__)
 
+# Per-source fetch timeout; a monitor's config may override it with "timeout_seconds"
+INTELLIGENCE_MONITOR_TIMEOUT_SEC = float(os.environ.get("INTELLIGENCE_MONITOR_TIMEOUT_SEC", "120"))
+
+
+def mention_dedupe_key(mention: DealMention) -> Tuple:
+    """Mentions with the same key within a cycle are the same article about the same target"""
+    return (
+        mention.source_url or mention.headline,
+        (mention.target_ticker or "").upper(),
+        (mention.target_name or "").lower(),
+    )
+
 
 class IntelligenceOrchestrator:
     """
@@ -105,6 +120,10 @@ class IntelligenceOrchestrator:
         """
         Run a single monitoring cycle across all sources.
 
+        Monitors are fetched concurrently, each under its own timeout. Their
+        mentions are deduplicated and ingested as one batch, followed by one
+        tier promotion pass over every deal they touched.
+
         Returns:
             Dictionary with cycle statistics
         """
@@ -116,61 +135,91 @@ class IntelligenceOrchestrator:
 
         logger.info("Starting intelligence monitoring cycle")
 
-        for monitor in self.monitors:
-            try:
-                # Update last_poll timestamp
-                await self._update_monitor_status(monitor.source_name, "polling")
-
-                # Run monitor
-                mentions = await monitor.monitor()
-
-                # Process each mention
-                deals_created = 0
-                deals_updated = 0
-
-                for mention in mentions:
-                    try:
-                        # Add mention to intelligence system
-                        deal_id = await self.aggregator.process_mention(mention)
-
-                        # Check if deal was filtered out (e.g., no ticker found for private company)
-                        if deal_id is None:
-                            continue
-
-                        # Evaluate tier promotion
-                        tier_changed = await self.tier_manager.evaluate_tier_promotion(deal_id)
-
-                        if tier_changed:
-                            deals_updated += 1
-                        else:
-                            deals_created += 1
-
-                    except Exception as e:
-                        logger.error(f"Error processing mention from {monitor.source_name}: {e}", exc_info=True)
-                        errors.append({"source": monitor.source_name, "error": str(e)})
+        fetched = await asyncio.gather(*(self._fetch_monitor(monitor) for monitor in self.monitors))
 
-                total_mentions += len(mentions)
-                total_deals_created += deals_created
-                total_deals_updated += deals_updated
-
-                # Update monitor success status
+        # Deduplicate within the cycle, keeping the first monitor's copy
+        unique_mentions: List[DealMention] = []
+        owners: List[BaseSourceMonitor] = []
+        seen = set()
+        for monitor, (mentions, fetch_ms, error) in zip(self.monitors, fetched):
+            if error is not None:
+                errors.append({"source": monitor.source_name, "error": error})
                 await self._update_monitor_status(
-                    monitor.source_name,
-                    "success",
-                    deals_found=len(mentions)
+                    monitor.source_name, "error", error=error, timings={"fetch_ms": round(fetch_ms)}
                 )
+                continue
+            total_mentions += len(mentions)
+            for mention in mentions:
+                key = mention_dedupe_key(mention)
+                if key not in seen:
+                    seen.add(key)
+                    unique_mentions.append(mention)
+                    owners.append(monitor)
+
+        # Ingest every mention in one batch, then one set-based tier pass
+        stage_timings: Dict[str, float] = {}
+        results: List[Any] = []
+        changed: Dict[str, bool] = {}
+        if unique_mentions:
+            try:
+                results = await self.aggregator.process_mentions(unique_mentions, stage_timings)
+            except Exception as e:
+                logger.error(f"Error ingesting mentions: {e}", exc_info=True)
+                results = [e] * len(unique_mentions)
 
-                logger.info(
-                    f"Monitor {monitor.source_name}: {len(mentions)} mentions, "
-                    f"{deals_created} new deals, {deals_updated} updated"
+            tier_start = time.perf_counter()
+            try:
+                changed = await self.tier_manager.evaluate_tier_promotions(
+                    [r for r in results if r is not None and not isinstance(r, Exception)]
                 )
-
             except Exception as e:
-                logger.error(f"Error in monitor {monitor.source_name}: {e}", exc_info=True)
-                errors.append({"source": monitor.source_name, "error": str(e)})
+                logger.error(f"Error evaluating tier promotions: {e}", exc_info=True)
+                errors.append({"source": "tier_promotion", "error": str(e)})
+            stage_timings["tier_ms"] = (time.perf_counter() - tier_start) * 1000
+
+        # Attribute outcomes to the monitor that reported each mention
+        per_monitor = {monitor.source_name: {"created": 0, "updated": 0, "unique": 0} for monitor in self.monitors}
+        counted_promotions = set()
+        for monitor, result in zip(owners, results):
+            counts = per_monitor[monitor.source_name]
+            counts["unique"] += 1
+            if isinstance(result, Exception):
+                errors.append({"source": monitor.source_name, "error": str(result)})
+                continue
+            # Check if deal was filtered out (e.g., no ticker found for private company)
+            if result is None:
+                continue
+            deal_key = str(result)
+            if changed.get(deal_key) and deal_key not in counted_promotions:
+                counted_promotions.add(deal_key)
+                counts["updated"] += 1
+            else:
+                counts["created"] += 1
+
+        for monitor, (mentions, fetch_ms, error) in zip(self.monitors, fetched):
+            if error is not None:
+                continue
+            counts = per_monitor[monitor.source_name]
+            total_deals_created += counts["created"]
+            total_deals_updated += counts["updated"]
+
+            timings = {"fetch_ms": round(fetch_ms)}
+            timings.update({stage: round(ms) for stage, ms in stage_timings.items()})
+            timings["mentions"] = len(mentions)
+            timings["duplicates"] = len(mentions) - counts["unique"]
+
+            # Update monitor success status
+            await self._update_monitor_status(
+                monitor.source_name,
+                "success",
+                deals_found=len(mentions),
+                timings=timings
+            )
 
-                # Update monitor error status
-                await self._update_monitor_status(monitor.source_name, "error", error=str(e))
+            logger.info(
+                f"Monitor {monitor.source_name}: {len(mentions)} mentions, "
+                f"{counts['created']} new deals, {counts['updated']} updated ({fetch_ms:.0f}ms fetch)"
+            )
 
         cycle_duration = (get_current_utc() - cycle_start).total_seconds()
 
@@ -178,27 +227,58 @@ class IntelligenceOrchestrator:
             "cycle_start": cycle_start,
             "duration_seconds": cycle_duration,
             "total_mentions": total_mentions,
+            "unique_mentions": len(unique_mentions),
             "deals_created": total_deals_created,
             "deals_updated": total_deals_updated,
             "errors": errors,
             "monitors_run": len(self.monitors),
+            "stage_timings_ms": {stage: round(ms) for stage, ms in stage_timings.items()},
         }
 
         logger.info(
-            f"Monitoring cycle complete: {total_mentions} mentions, "
+            f"Monitoring cycle complete: {total_mentions} mentions ({len(unique_mentions)} unique), "
             f"{total_deals_created} new deals, {total_deals_updated} updated in {cycle_duration:.1f}s"
         )
 
         return stats
 
+    async def _fetch_monitor(
+        self, monitor: BaseSourceMonitor
+    ) -> Tuple[List[DealMention], float, Optional[str]]:
+        """
+        Run one monitor under its timeout.
+
+        Returns:
+            (mentions, elapsed milliseconds, error message or None)
+        """
+        timeout = float(monitor.config.get("timeout_seconds", INTELLIGENCE_MONITOR_TIMEOUT_SEC))
+        start = time.perf_counter()
+        try:
+            # Update last_poll timestamp
+            await self._update_monitor_status(monitor.source_name, "polling")
+
+            # Run monitor
+            mentions = await asyncio.wait_for(monitor.monitor(), timeout)
+            return mentions, (time.perf_counter() - start) * 1000, None
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout:g}s"
+            logger.error(f"Error in monitor {monitor.source_name}: {error}")
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Error in monitor {monitor.source_name}: {e}", exc_info=True)
+        return [], (time.perf_counter() - start) * 1000, error
+
     async def _update_monitor_status(
         self,
         source_name: str,
         status: str,
         deals_found: int = 0,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Update monitor status in database"""
+        """Update monitor status in database (timings: per-stage ms for the last cycle)"""
+        timings_json = json.dumps(timings) if timings is not None else None
+        fetch_ms = timings.get("fetch_ms") if timings else None
         async with self.pool.acquire() as conn:
             if status == "polling":
                 await conn.execute(
@@ -215,22 +295,30 @@ class IntelligenceOrchestrator:
                        SET last_success_at = $1,
                            total_deals_found = total_deals_found + $2,
                            error_count = 0,
-                           last_error = NULL
+                           last_error = NULL,
+                           last_fetch_ms = COALESCE($4, last_fetch_ms),
+                           last_timings = COALESCE($5::jsonb, last_timings)
                        WHERE source_name = $3""",
                     get_current_utc(),
                     deals_found,
                     source_name,
+                    fetch_ms,
+                    timings_json,
                 )
             elif status == "error":
                 await conn.execute(
                     """UPDATE source_monitors
                        SET last_error_at = $1,
                            error_count = error_count + 1,
-                           last_error = $2
+                           last_error = $2,
+                           last_fetch_ms = COALESCE($4, last_fetch_ms),
+                           last_timings = COALESCE($5::jsonb, last_timings)
                        WHERE source_name = $3""",
                     get_current_utc(),
                     error[:500],  # Truncate error message
                     source_name,
+                    fetch_ms,
+                    timings_json,
                 )
 
     async def start_continuous_monitoring(self, interval_seconds: int = 300) -> None:
@@ -343,7 +431,8 @@ async def get_monitoring_stats() -> Dict[str, Any]:
     async with _orchestrator.pool.acquire() as conn:
         monitors = await conn.fetch(
             """SELECT source_name, last_poll_at, last_success_at, last_error_at,
-                      total_polls, total_deals_found, error_count, last_error
+                      total_polls, total_deals_found, error_count, last_error,
+                      last_fetch_ms, last_timings
                FROM source_monitors
                WHERE is_enabled = true
                ORDER BY source_name"""
@@ -3,7 +3,9 @@ import asyncio
 import aiohttp
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 import asyncpg
@@ -48,6 +50,54 @@ class HaltData:
         }
 
 
+def halt_key(ticker: str, halt_time: datetime, halt_code: str) -> str:
+    """Dedupe key of a halt event; matches the halt_events unique constraint"""
+    return f"{ticker.upper()}_{halt_time.isoformat()}_{halt_code}"
+
+
+class SeenHaltCache:
+    """Halt keys in the order they were last seen, expiring ttl_seconds after that.
+
+    Halts still listed in the exchange feed are touched on every poll, so
+    a key only ages out once the halt has dropped off the feed for
+    ttl_seconds; max_size caps memory on top of that by dropping the
+    least recently seen keys.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int, clock=time.monotonic):
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self._clock = clock
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        self._expire(self._clock())
+        return len(self._seen)
+
+    def __contains__(self, key: str) -> bool:
+        seen_at = self._seen.get(key)
+        return seen_at is not None and self._clock() - seen_at < self.ttl
+
+    def touch(self, key: str) -> bool:
+        """Mark key as seen now; returns whether it was already (unexpired) in the cache"""
+        now = self._clock()
+        self._expire(now)
+        was_seen = key in self._seen
+        self._seen[key] = now
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return was_seen
+
+    def _expire(self, now: float) -> None:
+        # Oldest first: stop at the first key still inside the TTL
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.ttl:
+                break
+            del self._seen[key]
+
+
 class HaltMonitor:
     """Monitor NASDAQ and NYSE for real-time trading halts"""
 
@@ -59,14 +109,23 @@ class HaltMonitor:
     # Poll interval in seconds
     POLL_INTERVAL = 10
 
+    # Seen-halt dedupe: keys expire this long after the halt was last listed
+    SEEN_HALT_TTL_SECONDS = 24 * 3600
+    SEEN_HALT_MAX = 10000
+
     def __init__(self, db_url: str):
         self.db_url = db_url
         self.db_pool = None
         self.is_running = False
         self.session = None
 
-        # Cache of recently seen halts (to avoid duplicate alerts)
-        self.seen_halts = set()
+        # Recently seen halts (to avoid duplicate alerts), warm-started from halt_events
+        self.seen_halts = SeenHaltCache(self.SEEN_HALT_TTL_SECONDS, self.SEEN_HALT_MAX)
+
+        # Per-feed validators, last body and parsed halts for conditional requests
+        self._feed_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._feed_bodies: Dict[str, str] = {}
+        self._feed_halts: Dict[str, List[HaltData]] = {}
 
         # Track M&A deals we're monitoring
         self.tracked_tickers = set()
@@ -85,6 +144,27 @@ class HaltMonitor:
         # Load tracked tickers from deal_intelligence
         await self.refresh_tracked_tickers()
 
+        # Halts stored before a restart are not new
+        await self.load_seen_halts()
+
+    async def load_seen_halts(self):
+        """Warm-start seen_halts from halt_events detected within the dedupe TTL"""
+        try:
+            async with self.db_pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT ticker, halt_time, halt_code
+                    FROM halt_events
+                    WHERE detected_at > NOW() - make_interval(secs => $1)
+                    ORDER BY detected_at
+                """, float(self.SEEN_HALT_TTL_SECONDS))
+
+            for row in rows:
+                self.seen_halts.touch(halt_key(row['ticker'], row['halt_time'], row['halt_code']))
+            logger.info(f"Loaded {len(rows)} recent halts into the seen-halt cache")
+
+        except Exception as e:
+            logger.error(f"Failed to load recent halts: {e}")
+
     async def refresh_tracked_tickers(self):
         """Load current M&A deal target tickers from database"""
         try:
@@ -155,18 +235,43 @@ class HaltMonitor:
             await self.db_pool.close()
         logger.info("Halt monitor cleaned up")
 
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since from the feed's last 200 response"""
+        etag, last_modified = self._feed_validators.get(url, (None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _feed_unchanged(self, url: str, response, body: str) -> bool:
+        """Record the feed's validators and body; True if the body is the one last parsed.
+
+        The body check covers servers that ignore the conditional headers."""
+        self._feed_validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        if url in self._feed_halts and self._feed_bodies.get(url) == body:
+            return True
+        self._feed_bodies[url] = body
+        return False
+
     async def fetch_nyse_csv_halts(self) -> List[HaltData]:
         """
         Fetch current halts from NYSE CSV API.
         This endpoint provides halts from both NYSE and NASDAQ exchanges in a single feed.
         """
         try:
-            async with self.session.get(self.NYSE_CSV_URL) as response:
+            url = self.NYSE_CSV_URL
+            async with self.session.get(url, headers=self._conditional_headers(url)) as response:
+                if response.status == 304:
+                    return self._feed_halts.get(url, [])
                 if response.status != 200:
                     logger.warning(f"NYSE CSV API returned status {response.status}")
                     return []
 
                 csv_text = await response.text()
+                if self._feed_unchanged(url, response, csv_text):
+                    return self._feed_halts[url]
                 reader = csv.DictReader(StringIO(csv_text))
 
                 halts = []
@@ -221,6 +326,7 @@ class HaltMonitor:
                         f"currently {len(halts)} halts active"
                     )
 
+                self._feed_halts[url] = halts
                 return halts
 
         except Exception as e:
@@ -230,12 +336,17 @@ class HaltMonitor:
     async def fetch_nasdaq_halts(self) -> List[HaltData]:
         """Fetch current halts from NASDAQ (DEPRECATED: Use fetch_nyse_csv_halts instead)"""
         try:
-            async with self.session.get(self.NASDAQ_URL) as response:
+            url = self.NASDAQ_URL
+            async with self.session.get(url, headers=self._conditional_headers(url)) as response:
+                if response.status == 304:
+                    return self._feed_halts.get(url, [])
                 if response.status != 200:
                     logger.warning(f"NASDAQ returned status {response.status}")
                     return []
 
                 html = await response.text()
+                if self._feed_unchanged(url, response, html):
+                    return self._feed_halts[url]
                 soup = BeautifulSoup(html, 'html.parser')
 
                 # Find halt table
@@ -279,6 +390,7 @@ class HaltMonitor:
                         continue
 
                 logger.info(f"Fetched {len(halts)} NASDAQ halts")
+                self._feed_halts[url] = halts
                 return halts
 
         except Exception as e:
@@ -371,21 +483,12 @@ class HaltMonitor:
 
     async def process_halts(self, halts: List[HaltData]):
         """Process new halt events"""
+        new_halts = []
         for halt in halts:
-            # Create unique key for this halt
-            halt_key = f"{halt.ticker}_{halt.halt_time.isoformat()}_{halt.halt_code}"
-
-            # Skip if we've already seen this halt
-            if halt_key in self.seen_halts:
+            # Skip (but keep fresh) halts we've already seen
+            if self.seen_halts.touch(halt_key(halt.ticker, halt.halt_time, halt.halt_code)):
                 continue
 
-            # Mark as seen
-            self.seen_halts.add(halt_key)
-
-            # Clean old entries from cache (older than 1 hour)
-            if len(self.seen_halts) > 1000:
-                self.seen_halts = set(list(self.seen_halts)[-500:])
-
             # Check if this ticker is tracked for M&A
             is_tracked = halt.ticker in self.tracked_tickers
 
@@ -395,9 +498,15 @@ class HaltMonitor:
             # Log the halt
             logger.info(f"New halt: {halt.ticker} ({halt.halt_code}) at {halt.halt_time} - Tracked: {is_tracked}, Material News: {is_material_news}")
 
-            # Store halt event in database
-            await self.store_halt_event(halt, is_tracked)
+            new_halts.append((halt, is_tracked, is_material_news))
+
+        if not new_halts:
+            return
 
+        # Store this poll's halt events in one insert
+        await self.store_halt_events([(halt, is_tracked) for halt, is_tracked, _ in new_halts])
+
+        for halt, is_tracked, is_material_news in new_halts:
             # If tracked M&A target AND material news halt, trigger high-priority alert
             if is_tracked and is_material_news:
                 await self.trigger_halt_alert(halt)
@@ -407,6 +516,39 @@ class HaltMonitor:
             elif is_material_news:
                 await self.create_halt_investigation_task(halt)
 
+    async def store_halt_events(self, halts: List[Tuple[HaltData, bool]]):
+        """Store (halt, is_tracked) events in database with a single multi-row insert.
+
+        If the batch fails (one bad row fails all of them), each halt is
+        retried on its own so only the bad rows are lost.
+        """
+        try:
+            async with self.db_pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO halt_events (
+                        ticker, halt_time, halt_code, resumption_time,
+                        exchange, company_name, is_tracked_ticker, detected_at
+                    )
+                    SELECT t, h, c, r, e, n, k, NOW()
+                    FROM unnest(
+                        $1::text[], $2::timestamp[], $3::text[], $4::timestamp[],
+                        $5::text[], $6::text[], $7::boolean[]
+                    ) AS x(t, h, c, r, e, n, k)
+                    ON CONFLICT (ticker, halt_time, halt_code) DO NOTHING
+                """,
+                    [halt.ticker for halt, _ in halts],
+                    [halt.halt_time for halt, _ in halts],
+                    [halt.halt_code for halt, _ in halts],
+                    [halt.resumption_time for halt, _ in halts],
+                    [halt.exchange for halt, _ in halts],
+                    [halt.company_name for halt, _ in halts],
+                    [is_tracked for _, is_tracked in halts]
+                )
+        except Exception as e:
+            logger.error(f"Failed to store {len(halts)} halt events in one insert, storing one by one: {e}")
+            for halt, is_tracked in halts:
+                await self.store_halt_event(halt, is_tracked)
+
     async def store_halt_event(self, halt: HaltData, is_tracked: bool):
         """Store halt event in database"""
         try:
@@ -427,7 +569,7 @@ class HaltMonitor:
                     is_tracked
                 )
         except Exception as e:
-            logger.error(f"Failed to store halt event: {e}")
+            logger.error(f"Failed to store halt event {halt.ticker} at {halt.halt_time}: {e}")
 
     async def trigger_halt_alert(self, halt: HaltData):
         """Trigger alert for M&A target halt"""
@@ -0,0 +1,320 @@
+"""Columnar (NumPy) engine for MergerArbAnalyzer.find_best_opportunities.
+
+The scalar engine builds a TradeOpportunity — notes string, probability
+calls and all — for every candidate call, covered call and spread, then
+sorts and keeps the top few per expiration.  On wide chains (thousands of
+contracts, ~4 spread pairs per leg) almost all of that work is thrown away.
+
+This engine turns the chain into NumPy columns once, evaluates every
+strategy's filters and ranking key (``annualized_return_ft``) in bulk, picks
+the top-N per expiration with ``np.partition`` and only then calls the
+analyzer's own ``analyze_*`` method for the winners.  Because the winners are
+built by the scalar methods, the returned objects are identical to the
+scalar engine's; the selection reproduces its filters, expiration order and
+stable tie-breaking exactly.
+
+Chains that the scalar engine would partly skip through its per-contract
+``except Exception`` (None / NaN / non-numeric fields) are not representable
+as float columns; ``ChainColumns.from_options`` returns None for those and
+the caller falls back to the scalar engine.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtr
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.options.analyzer import MergerArbAnalyzer, OptionData, TradeOpportunity
+
+logger = logging.getLogger(__name__)
+
+# Per-expiration caps used by the scalar engine
+TOP_SINGLE_CALLS = 3
+TOP_COVERED_CALLS = 3
+TOP_SPREADS = 5
+# Spread short legs are taken from the next 4 strikes above the long leg
+SPREAD_STRIKE_OFFSETS = 4
+
+
+class ChainColumns:
+    """Float columns for an option chain, in input order."""
+
+    __slots__ = ("strike", "bid", "ask", "mid", "iv", "open_interest",
+                 "is_call", "is_put", "expiry_code", "expiries")
+
+    def __init__(self, strike, bid, ask, last, iv, open_interest, rights, expiry_code, expiries):
+        self.strike = strike
+        self.bid = bid
+        self.ask = ask
+        # OptionData.mid_price
+        self.mid = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, np.where(last > 0, last, 0.0))
+        self.iv = iv
+        self.open_interest = open_interest
+        self.is_call = rights == "C"
+        self.is_put = rights == "P"
+        self.expiry_code = expiry_code
+        self.expiries = expiries
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    @classmethod
+    def from_options(cls, options: Sequence["OptionData"]) -> Optional["ChainColumns"]:
+        """Build columns, or None if any used field is missing or non-finite."""
+        n = len(options)
+        expiry_index: Dict[str, int] = {}
+        codes = np.empty(n, dtype=np.int64)
+        rows = []
+        try:
+            for i, opt in enumerate(options):
+                expiry = opt.expiry
+                code = expiry_index.get(expiry)
+                if code is None:
+                    code = expiry_index[expiry] = len(expiry_index)
+                codes[i] = code
+                rows.append((opt.strike, opt.bid, opt.ask, opt.last, opt.implied_vol, opt.open_interest))
+            values = np.array(rows, dtype=np.float64).reshape(n, 6)
+            rights = np.array([opt.right for opt in options], dtype=object)
+        except (TypeError, ValueError, AttributeError):
+            return None
+        if not np.isfinite(values).all():
+            return None
+        return cls(
+            strike=values[:, 0], bid=values[:, 1], ask=values[:, 2], last=values[:, 3],
+            iv=values[:, 4], open_interest=values[:, 5], rights=rights,
+            expiry_code=codes, expiries=list(expiry_index),
+        )
+
+
+def top_k_stable(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest scores, descending, ties in input order.
+
+    Matches ``sorted(..., key=score, reverse=True)[:k]`` (Python's sort is
+    stable under reverse=True) without sorting the whole array.
+    """
+    n = len(scores)
+    if n > k:
+        kth = np.partition(scores, n - k)[n - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order[:k]]
+
+
+def _groups_in_first_seen_order(codes: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """Split positions by expiry code; groups ordered by first occurrence.
+
+    Reproduces the key order of the scalar engine's ``defaultdict(list)``
+    accumulators, whose keys are inserted on the first qualifying candidate.
+    """
+    if len(codes) == 0:
+        return []
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    groups = np.split(order, starts[1:])
+    groups.sort(key=lambda g: g[0])
+    return [(int(codes[g[0]]), g) for g in groups]
+
+
+def _spread_pairs(legs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(long, short) positions into a strike-sorted leg array, in scan order."""
+    n = len(legs)
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    longs = np.repeat(np.arange(n), SPREAD_STRIKE_OFFSETS)
+    shorts = longs + np.tile(np.arange(1, SPREAD_STRIKE_OFFSETS + 1), n)
+    keep = shorts < n
+    return longs[keep], shorts[keep]
+
+
+def find_best_opportunities_columnar(
+    analyzer: "MergerArbAnalyzer",
+    options: Sequence["OptionData"],
+    current_price: float,
+    *,
+    call_long_bounds: Tuple[float, float],
+    call_short_bounds: Tuple[float, float],
+    put_long_bounds: Tuple[float, float],
+    put_short_bounds: Tuple[float, float],
+) -> Optional[List["TradeOpportunity"]]:
+    """Columnar equivalent of the scalar find_best_opportunities selection.
+
+    Returns None when the chain cannot be represented as float columns.
+    """
+    cols = ChainColumns.from_options(options)
+    if cols is None:
+        return None
+
+    deal = analyzer.deal
+    deal_value = deal.total_deal_value
+    days_to_close = deal.days_to_close
+    now = datetime.now()
+
+    # Per-expiration scalars: parse once, not once per contract
+    n_exp = len(cols.expiries)
+    expiry_ok = np.zeros(n_exp, dtype=bool)
+    days_to_expiry = np.zeros(n_exp, dtype=np.float64)
+    expected_price = np.zeros(n_exp, dtype=np.float64)
+    for code, expiry in enumerate(cols.expiries):
+        try:
+            expiry_date = datetime.strptime(expiry, "%Y%m%d")
+        except (ValueError, TypeError):
+            continue  # scalar engine raises in every analyze_* -> contract skipped
+        expiry_ok[code] = True
+        days_to_expiry[code] = (expiry_date - now).days
+        expected_price[code] = analyzer._expected_price_at_expiry(current_price, expiry)
+
+    opportunities: List["TradeOpportunity"] = []
+    ok = expiry_ok[cols.expiry_code]
+    exp_price = expected_price[cols.expiry_code]
+    strike, bid, ask, mid = cols.strike, cols.bid, cols.ask, cols.mid
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # ── Single calls ──
+        gain = exp_price - strike
+        intrinsic = np.where(gain > 0, gain, 0.0)
+        max_profit_mid = intrinsic - mid
+        vol = np.where(cols.iv > 0, cols.iv, 0.30)
+        prob = _probability_itm(analyzer, current_price, deal_value, vol, days_to_close / 365)
+        prob_success = prob * deal.confidence
+        expected_mid = (prob_success * max_profit_mid) - ((1 - prob_success) * mid)
+        single_mask = (cols.is_call & ok & (strike < deal_value) & (mid > 0) & (ask > 0)
+                       & (max_profit_mid > 0) & (expected_mid > 0))
+        single_score = (intrinsic - ask) / ask
+        opportunities.extend(_select(
+            single_mask, single_score, cols.expiry_code, TOP_SINGLE_CALLS,
+            lambda i: analyzer.analyze_single_call(options[i], current_price),
+        ))
+
+        # ── Covered calls ──
+        days = days_to_expiry[cols.expiry_code]
+        gap = deal_value - strike
+        net_premium = bid - np.where(gap > 0, gap, 0.0)
+        if current_price > 0:
+            static_return = net_premium / current_price
+            if_called_return = ((strike - current_price) + bid) / current_price
+        else:
+            static_return = np.zeros(len(cols))
+            if_called_return = np.zeros(len(cols))
+        cc_mask = (cols.is_call & ok & (bid > 0.01) & (cols.open_interest >= 10)
+                   & (days >= 14) & (days <= days_to_close + 30)
+                   & (strike >= deal_value * 0.98) & (strike <= deal_value * 1.02)
+                   & (if_called_return > 0))
+        cc_score = static_return / (np.maximum(days, 1) / 365)
+        opportunities.extend(_select(
+            cc_mask, cc_score, cols.expiry_code, TOP_COVERED_CALLS,
+            lambda i: analyzer.analyze_covered_call(options[i], current_price),
+        ))
+
+        # ── Call spreads / put spreads (same expiration only) ──
+        call_pairs, put_pairs = [], []
+        for code in range(n_exp):
+            if not expiry_ok[code]:
+                continue
+            in_expiry = cols.expiry_code == code
+            for legs_mask, out in ((in_expiry & cols.is_call, call_pairs), (in_expiry & cols.is_put, put_pairs)):
+                legs = np.flatnonzero(legs_mask)
+                legs = legs[np.argsort(strike[legs], kind="stable")]
+                longs, shorts = _spread_pairs(legs)
+                out.append((legs[longs], legs[shorts]))
+
+        long_idx, short_idx = _concat_pairs(call_pairs)
+        opportunities.extend(_select_spreads(
+            long_idx, short_idx,
+            *_call_spread_scores(cols, exp_price, long_idx, short_idx, call_long_bounds, call_short_bounds),
+            cols.expiry_code,
+            lambda lo, hi: analyzer.analyze_call_spread(options[lo], options[hi], current_price),
+        ))
+
+        long_idx, short_idx = _concat_pairs(put_pairs)
+        opportunities.extend(_select_spreads(
+            long_idx, short_idx,
+            *_put_spread_scores(cols, exp_price, long_idx, short_idx, put_long_bounds, put_short_bounds),
+            cols.expiry_code,
+            lambda lo, hi: analyzer.analyze_put_spread(options[lo], options[hi], current_price),
+        ))
+
+    return opportunities
+
+
+def _probability_itm(analyzer, current: float, target: float, vol: np.ndarray, time: float) -> np.ndarray:
+    """Vectorized MergerArbAnalyzer.calculate_probability_itm over vol."""
+    if time <= 0 or current <= 0 or target <= 0:
+        return np.full(len(vol), 0.5)
+    d2 = (np.log(current / target) + (analyzer.risk_free_rate - 0.5 * vol**2) * time) / (vol * np.sqrt(time))
+    return ndtr(d2)
+
+
+def _select(mask, scores, expiry_code, k, build) -> List["TradeOpportunity"]:
+    """Top-k per expiration among masked rows, built in scalar-engine order."""
+    rows = np.flatnonzero(mask)
+    selected = []
+    for _, group in _groups_in_first_seen_order(expiry_code[rows]):
+        group_rows = rows[group]
+        for pos in top_k_stable(scores[group_rows], k):
+            opp = build(int(group_rows[pos]))
+            if opp is not None and opp.annualized_return_ft > 0:
+                selected.append(opp)
+    return selected
+
+
+def _concat_pairs(pairs) -> Tuple[np.ndarray, np.ndarray]:
+    if not pairs:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate([p[0] for p in pairs]), np.concatenate([p[1] for p in pairs])
+
+
+def _select_spreads(long_idx, short_idx, mask, scores, expiry_code, build) -> List["TradeOpportunity"]:
+    long_idx, short_idx, scores = long_idx[mask], short_idx[mask], scores[mask]
+    selected = []
+    for _, group in _groups_in_first_seen_order(expiry_code[long_idx]):
+        for pos in top_k_stable(scores[group], TOP_SPREADS):
+            p = group[pos]
+            opp = build(int(long_idx[p]), int(short_idx[p]))
+            if opp is not None and opp.annualized_return_ft > 0:
+                selected.append(opp)
+    return selected
+
+
+def _call_spread_scores(cols, exp_price, long_idx, short_idx, long_bounds, short_bounds):
+    """Filters and annualized_return_ft of analyze_call_spread for each pair."""
+    kl, ks = cols.strike[long_idx], cols.strike[short_idx]
+    mid_l, mid_s = cols.mid[long_idx], cols.mid[short_idx]
+    cost_mid = mid_l - mid_s
+    cost_ft = cols.ask[long_idx] - cols.bid[short_idx]
+    expected = exp_price[long_idx]
+    value = np.where(expected >= ks, ks - kl, np.where(expected > kl, expected - kl, 0.0))
+    mask = ((kl >= long_bounds[0]) & (kl <= long_bounds[1])
+            & (ks >= short_bounds[0]) & (ks <= short_bounds[1])
+            & (mid_l > 0) & (mid_s > 0) & (cols.ask[long_idx] > 0) & (cols.bid[short_idx] > 0)
+            & (cost_mid > 0) & (cost_ft > 0) & (value - cost_mid > 0))
+    return mask, (value - cost_ft) / cost_ft
+
+
+def _put_spread_scores(cols, exp_price, long_idx, short_idx, long_bounds, short_bounds):
+    """Filters and annualized_return_ft of analyze_put_spread for each pair."""
+    kl, ks = cols.strike[long_idx], cols.strike[short_idx]
+    mid_l, mid_s = cols.mid[long_idx], cols.mid[short_idx]
+    width = ks - kl
+    credit_mid = mid_s - mid_l
+    credit_ft = cols.bid[short_idx] - cols.ask[long_idx]
+    max_loss_mid = width - credit_mid
+    max_loss_ft = width - credit_ft
+    expected = exp_price[long_idx]
+    expected_ft = np.where(expected >= ks, credit_ft,
+                           np.where(expected <= kl, -max_loss_ft, credit_ft - (ks - expected)))
+    mask = ((kl >= long_bounds[0]) & (kl <= long_bounds[1])
+            & (ks >= short_bounds[0]) & (ks <= short_bounds[1])
+            & (mid_l > 0) & (mid_s > 0) & (cols.ask[long_idx] > 0) & (cols.bid[short_idx] > 0)
+            & (width > 0) & (credit_mid > 0) & (credit_ft > 0)
+            & (max_loss_mid > 0) & (max_loss_ft > 0))
+    return mask, expected_ft / max_loss_ft
@@ -5,6 +5,17 @@ Falls back to IB via the WebSocket relay when Polygon is unavailable.
 
 Uses httpx async client with retry/backoff for resilience.
 Designed for low-latency REST polling (~100-500ms per call vs 3-180s via IB relay).
+
+All callers share one client (``get_polygon_client()``), so request hygiene
+lives here rather than in the routes:
+
+- One pooled connection set (HTTP/2 when ``h2`` is installed).
+- A token bucket caps the request rate; a 429 pauses the whole bucket for
+  Retry-After instead of each request backing off on its own.
+- Identical in-flight GETs (same path + params) share one upstream call.
+- Option-chain snapshot pages are cached for a few seconds, so /chain,
+  /price-spreads and sell scans hitting the same underlying together cost
+  one fetch.
 """
 
 from __future__ import annotations
@@ -12,18 +23,32 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import httpx
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    _HTTP2 = True
+except ImportError:  # optional: HTTP/1.1 keep-alive pool otherwise
+    _HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://api.polygon.io"
 _MAX_RETRIES = 3
 _BACKOFF_BASE_S = 1.0
 _DEFAULT_TIMEOUT = 15.0
+_DEFAULT_MAX_RPS = 25.0
+_DEFAULT_CHAIN_CACHE_TTL_S = 3.0
+_CHAIN_CACHE_MAX_ENTRIES = 256
+_CHAIN_SNAPSHOT_PATH = "/v3/snapshot/options/"
+_CHAIN_PARTITION_DAYS = 7
+_CHAIN_STRIKE_BANDS = 2
+_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0)
 
 
 def _utc_now_iso() -> str:
@@ -60,16 +85,116 @@ class PolygonError(Exception):
     pass
 
 
+class TokenBucket:
+    """Request-rate limiter shared by every call on one client (or one loader run).
+
+    ``reserve()`` claims the next slot synchronously (no await between the
+    read and the update) and returns how long the caller must sleep, so
+    waiters are served in arrival order. ``pause()`` holds every slot until
+    a deadline — used when Polygon answers 429.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        start = max(now, self._paused_until)
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return start - now
+        return start - now + (-self._tokens) / self.rate
+
+    def pause_remaining(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def pause(self, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            # Slots queued before the pause restart from an empty bucket
+            self._tokens = min(self._tokens, 0.0)
+
+
+def _chain_partitions(
+    params: dict[str, Any], partition_days: int, strike_bands: int
+) -> list[dict[str, Any]]:
+    """Split chain snapshot params into disjoint expiration-window x strike-band queries.
+
+    Expiration windows are inclusive date ranges; strike bands are half-open
+    (``strike_price.lt``) except the last, which keeps the caller's upper
+    bound. A dimension whose bounds are missing is not split.
+    """
+    windows: list[dict[str, Any]] = [{}]
+    exp_gte = params.get("expiration_date.gte")
+    exp_lte = params.get("expiration_date.lte")
+    if exp_gte and exp_lte and "expiration_date" not in params and partition_days > 0:
+        start = datetime.strptime(exp_gte, "%Y-%m-%d")
+        end = datetime.strptime(exp_lte, "%Y-%m-%d")
+        windows = []
+        while start <= end:
+            stop = min(start + timedelta(days=partition_days - 1), end)
+            windows.append({
+                "expiration_date.gte": start.strftime("%Y-%m-%d"),
+                "expiration_date.lte": stop.strftime("%Y-%m-%d"),
+            })
+            start = stop + timedelta(days=1)
+
+    bands: list[dict[str, Any]] = [{}]
+    low = params.get("strike_price.gte")
+    high = params.get("strike_price.lte")
+    if low is not None and high is not None and high > low and strike_bands > 1:
+        width = (high - low) / strike_bands
+        bands = [
+            {"strike_price.gte": low + i * width, "strike_price.lt": low + (i + 1) * width}
+            for i in range(strike_bands - 1)
+        ]
+        bands.append({"strike_price.gte": low + (strike_bands - 1) * width, "strike_price.lte": high})
+
+    partitions = []
+    for window in windows:
+        for band in bands:
+            part = dict(params)
+            if "strike_price.lt" in band:
+                part.pop("strike_price.lte", None)
+            part.update(window)
+            part.update(band)
+            partitions.append(part)
+    return partitions
+
+
 class PolygonOptionsClient:
     """Async Polygon REST client for stock quotes and options chain data.
 
     Call ``get_polygon_client()`` for the module-level shared instance.
     """
 
-    def __init__(self, api_key: str | None = None, timeout: float = _DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        timeout: float = _DEFAULT_TIMEOUT,
+        *,
+        base_url: str = _BASE_URL,
+        max_rps: float = _DEFAULT_MAX_RPS,
+        chain_cache_ttl: float = _DEFAULT_CHAIN_CACHE_TTL_S,
+    ):
         self._api_key = api_key or os.environ.get("POLYGON_API_KEY", "")
         self._timeout = timeout
+        self._base_url = base_url
         self._client: httpx.AsyncClient | None = None
+        self._bucket = TokenBucket(max_rps)
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._chain_cache_ttl = chain_cache_ttl
+        self._chain_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self.stats = {"upstream": 0, "coalesced": 0, "cache_hits": 0, "rate_limited": 0}
 
     @property
     def is_configured(self) -> bool:
@@ -79,6 +204,7 @@ class PolygonOptionsClient:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
             self._client = None
+        self._chain_cache.clear()
 
     # ── Stock quotes ─────────────────────────────────────────
 
@@ -316,11 +442,20 @@ class PolygonOptionsClient:
         strike_lte: float | None = None,
         contract_type: str | None = None,
         limit: int = 250,
+        max_concurrency: int = 1,
+        partition_days: int = _CHAIN_PARTITION_DAYS,
+        strike_bands: int = _CHAIN_STRIKE_BANDS,
     ) -> list[dict]:
         """Fetch options chain snapshot with optional filters.
 
         Returns list of parsed contract dicts matching the OptionContract schema.
         Handles pagination automatically.
+
+        With ``max_concurrency`` > 1 the query is split into expiration
+        windows of ``partition_days`` (needs both expiration bounds) times
+        ``strike_bands`` strike bands (needs both strike bounds). Partitions
+        are paged concurrently, at most ``max_concurrency`` at a time, and
+        merged in partition order with duplicate contracts dropped.
         """
         params: dict[str, Any] = {"limit": limit}
         if expiration_date:
@@ -336,21 +471,61 @@ class PolygonOptionsClient:
         if contract_type:
             params["contract_type"] = contract_type
 
+        if max_concurrency > 1:
+            partitions = _chain_partitions(params, partition_days, strike_bands)
+            if len(partitions) > 1:
+                return await self._fetch_chain_partitions(
+                    underlying.upper(), partitions, max_concurrency
+                )
+        return await self._fetch_chain_pages(underlying.upper(), params)
+
+    async def _fetch_chain_pages(self, underlying: str, params: dict[str, Any]) -> list[dict]:
+        """Walk the next_url cursor for one snapshot query, parsing each page as it arrives."""
         all_contracts: list[dict] = []
-        url: str | None = f"/v3/snapshot/options/{underlying.upper()}"
+        url: str | None = f"/v3/snapshot/options/{underlying}"
         page = 0
 
         while url:
             data = await self._get(url, params if page == 0 else None)
             for snap in data.get("results", []):
                 all_contracts.append(
-                    self._parse_option_snapshot(snap, underlying.upper())
+                    self._parse_option_snapshot(snap, underlying)
                 )
             url = data.get("next_url")
             page += 1
 
         return all_contracts
 
+    async def _fetch_chain_partitions(
+        self, underlying: str, partitions: list[dict[str, Any]], max_concurrency: int
+    ) -> list[dict]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(params: dict[str, Any]) -> list[dict]:
+            async with semaphore:
+                return await self._fetch_chain_pages(underlying, params)
+
+        tasks = [asyncio.ensure_future(fetch(p)) for p in partitions]
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        merged: list[dict] = []
+        seen: set[tuple] = set()
+        for chunk in chunks:
+            for contract in chunk:
+                key = (contract["expiry"], contract["strike"], contract["right"])
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(contract)
+        logger.debug(
+            "Polygon chain %s: %d partitions, %d contracts", underlying, len(partitions), len(merged)
+        )
+        return merged
+
     async def get_option_prices(
         self, contracts: list[dict]
     ) -> list[dict | None]:
@@ -611,16 +786,53 @@ class PolygonOptionsClient:
     async def _ensure_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
-                base_url=_BASE_URL,
+                base_url=self._base_url,
                 timeout=self._timeout,
+                limits=_POOL_LIMITS,
+                http2=_HTTP2,
             )
         return self._client
 
     async def _get(self, url: str, params: dict[str, Any] | None = None) -> dict:
-        """GET with retry, backoff, and rate-limit handling.
+        """GET with coalescing, short-TTL chain caching, rate limiting and retries.
 
         *url* can be a relative path or a full next_url (pagination).
+        Concurrent calls with the same *url* and *params* share one upstream
+        request; option-chain snapshot responses are reused for
+        ``chain_cache_ttl`` seconds. Callers must treat the result as
+        read-only — it may be shared.
         """
+        key = (url, tuple(sorted((params or {}).items())))
+        cacheable = self._chain_cache_ttl > 0 and _CHAIN_SNAPSHOT_PATH in url
+        if cacheable:
+            cached = self._chain_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done, cacheable))
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one caller being cancelled must not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: tuple, task: asyncio.Future, cacheable: bool) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return  # exception() marks it retrieved if every waiter went away
+        if cacheable:
+            self._chain_cache[key] = (time.monotonic() + self._chain_cache_ttl, task.result())
+            self._chain_cache.move_to_end(key)
+            while len(self._chain_cache) > _CHAIN_CACHE_MAX_ENTRIES:
+                self._chain_cache.popitem(last=False)
+
+    async def _fetch(self, url: str, params: dict[str, Any] | None = None) -> dict:
+        """One upstream GET with retry, backoff, and rate-limit handling."""
         client = await self._ensure_client()
         merged_params = dict(params or {})
 
@@ -636,23 +848,33 @@ class PolygonOptionsClient:
         last_err: Exception | None = None
         for attempt in range(_MAX_RETRIES):
             try:
+                wait = self._bucket.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                # A 429 may have paused the bucket while we slept on our slot
+                while (wait := self._bucket.pause_remaining()) > 0:
+                    await asyncio.sleep(wait)
+                self.stats["upstream"] += 1
                 if is_full_url:
                     resp = await client.get(url)
                 else:
                     resp = await client.get(url, params=merged_params)
 
                 if resp.status_code == 429:
+                    self.stats["rate_limited"] += 1
                     wait = float(
                         resp.headers.get(
                             "Retry-After", _BACKOFF_BASE_S * 2**attempt
                         )
                     )
                     logger.warning(
-                        "Polygon 429, retry in %.1fs (attempt %d)",
+                        "Polygon 429, pausing all requests for %.1fs (attempt %d)",
                         wait,
                         attempt + 1,
                     )
-                    await asyncio.sleep(wait)
+                    last_err = PolygonError("rate limited (429)")
+                    # The next reserve() (ours and everyone else's) waits it out
+                    self._bucket.pause(wait)
                     continue
 
                 if resp.status_code >= 500:
@@ -743,5 +965,8 @@ def get_polygon_client() -> PolygonOptionsClient | None:
     if not api_key:
         return None
     if _instance is None:
-        _instance = PolygonOptionsClient(api_key=api_key)
+        _instance = PolygonOptionsClient(
+            api_key=api_key,
+            max_rps=float(os.environ.get("POLYGON_MAX_RPS", _DEFAULT_MAX_RPS)),
+        )
     return _instance
@@ -0,0 +1,129 @@
+"""
+On-disk cache of per-contract daily option bars, one file per underlying.
+
+OptionsDataLoader fetches each contract's daily bars for a deal window once
+and reconstructs every snapshot date's chain from them. The bars are kept
+here so reloading a deal (or re-running a backfill) costs no API calls:
+
+  {OPTIONS_BAR_CACHE_DIR}/{UNDERLYING}.parquet   (pyarrow installed)
+  {OPTIONS_BAR_CACHE_DIR}/{UNDERLYING}.json.gz   (otherwise)
+
+Each file holds one row per bar (contract, t, o, h, l, c, v, vw, n) and, per
+contract, the date range that was fetched — so a contract that did not trade
+is not fetched again. Historical daily bars of an expired contract do not
+change; a request outside the cached range refetches that contract.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:  # optional: gzipped JSON files otherwise
+    _HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+OPTIONS_BAR_CACHE_DIR = os.environ.get(
+    "OPTIONS_BAR_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "ma-tracker-cache", "options_bars"),
+)
+
+# Polygon aggregate fields kept per bar
+BAR_FIELDS = ("t", "o", "h", "l", "c", "v", "vw", "n")
+
+
+def bar_date(bar: dict) -> date:
+    """Trading date of a Polygon daily aggregate (``t`` is epoch milliseconds)."""
+    return datetime.utcfromtimestamp(bar.get("t", 0) / 1000).date()
+
+
+class UnderlyingBars:
+    """Cached bars and fetched ranges for the contracts of one underlying."""
+
+    def __init__(self, underlying: str, coverage: Optional[Dict[str, Tuple[date, date]]] = None,
+                 bars: Optional[Dict[str, List[dict]]] = None):
+        self.underlying = underlying
+        self.coverage = coverage or {}
+        self.bars = bars or {}
+        self.dirty = False
+
+    def covers(self, contract: str, from_date: date, to_date: date) -> bool:
+        fetched = self.coverage.get(contract)
+        return fetched is not None and fetched[0] <= from_date and to_date <= fetched[1]
+
+    def put(self, contract: str, from_date: date, to_date: date, bars: List[dict]) -> None:
+        """Replace a contract's bars with a fresh fetch of [from_date, to_date]."""
+        self.coverage[contract] = (from_date, to_date)
+        self.bars[contract] = [{k: bar[k] for k in BAR_FIELDS if bar.get(k) is not None} for bar in bars]
+        self.dirty = True
+
+    def bars_by_date(self, contract: str) -> Dict[date, dict]:
+        return {bar_date(bar): bar for bar in self.bars.get(contract, [])}
+
+
+class ContractBarCache:
+    """Loads and saves UnderlyingBars files under ``cache_dir``."""
+
+    def __init__(self, cache_dir: str = OPTIONS_BAR_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, underlying: str) -> str:
+        suffix = ".parquet" if _HAS_PYARROW else ".json.gz"
+        return os.path.join(self.cache_dir, underlying.upper().replace("/", "_") + suffix)
+
+    def load(self, underlying: str) -> UnderlyingBars:
+        path = self._path(underlying)
+        if not os.path.exists(path):
+            return UnderlyingBars(underlying)
+        try:
+            if _HAS_PYARROW:
+                table = pq.read_table(path)
+                meta = json.loads(table.schema.metadata[b"coverage"])
+                rows = table.to_pylist()
+            else:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    payload = json.load(f)
+                meta, rows = payload["coverage"], payload["bars"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable option bar cache {path}: {e}")
+            return UnderlyingBars(underlying)
+
+        coverage = {c: (date.fromisoformat(r[0]), date.fromisoformat(r[1])) for c, r in meta.items()}
+        bars: Dict[str, List[dict]] = {c: [] for c in coverage}
+        for row in rows:
+            contract = row.pop("contract")
+            if contract in bars:
+                bars[contract].append({k: v for k, v in row.items() if v is not None})
+        return UnderlyingBars(underlying, coverage, bars)
+
+    def save(self, cached: UnderlyingBars) -> None:
+        path = self._path(cached.underlying)
+        coverage = {c: [r[0].isoformat(), r[1].isoformat()] for c, r in cached.coverage.items()}
+        rows = [dict(bar, contract=c) for c, bars in cached.bars.items() for bar in bars]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            if _HAS_PYARROW:
+                columns = {"contract": pa.array([r["contract"] for r in rows], pa.string())}
+                for field in BAR_FIELDS:
+                    values = [r.get(field) for r in rows]
+                    # Integer fields (t, n, usually v) must come back as ints
+                    integral = all(v is None or isinstance(v, int) for v in values)
+                    columns[field] = pa.array(values, pa.int64() if integral else pa.float64())
+                table = pa.table(columns).replace_schema_metadata({"coverage": json.dumps(coverage)})
+                pq.write_table(table, tmp, compression="zstd")
+            else:
+                with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                    json.dump({"coverage": coverage, "bars": rows}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+            cached.dirty = False
+        except Exception as e:
+            logger.warning(f"Could not persist option bar cache to {path}: {e}")
@@ -8,37 +8,225 @@ Polygon does NOT store historical greeks or IV. We must self-compute from:
   - Time to expiry
   - Risk-free rate (Treasury yield proxy)
 
-Uses Newton-Raphson iteration for IV inversion.
+Uses Newton-Raphson iteration for IV inversion, with a bisection fallback for
+contracts Newton cannot solve (vanishing vega deep in/out of the money).
+
+Every function has an ``*_array`` form taking NumPy arrays (or scalars, which
+broadcast) of S, K, T, r, sigma / price and option type ("C"/"P" strings or
+a bool is-call array), so a whole
+chain is priced in one call. Invalid inputs give 0.0 for prices and vega and
+NaN for greeks and IV. The scalar functions are wrappers over the array forms
+(None where the array form gives NaN).
 """
 
 import math
 from typing import Optional
 
+import numpy as np
+from scipy.special import ndtr
 
-def _norm_cdf(x: float) -> float:
-    """Standard normal CDF approximation (Abramowitz & Stegun)."""
-    if x < -10:
-        return 0.0
-    if x > 10:
-        return 1.0
-    # Constants
-    a1 = 0.254829592
-    a2 = -0.284496736
-    a3 = 1.421413741
-    a4 = -1.453152027
-    a5 = 1.061405429
-    p = 0.3275911
+# Bounds the IV solvers keep sigma within
+_SIGMA_MIN = 0.001
+_SIGMA_MAX = 10.0
+_BISECTION_ITERATIONS = 100
 
-    sign = 1.0 if x >= 0 else -1.0
-    x_abs = abs(x)
-    t = 1.0 / (1.0 + p * x_abs)
-    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(-x_abs * x_abs / 2.0)
-    return 0.5 * (1.0 + sign * y)
 
+def _inputs(S, K, T, r, sigma):
+    """Broadcast inputs to float arrays, plus the mask of elements that can be priced."""
+    S, K, T, r, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma)))
+    valid = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+    return S, K, T, r, sigma, valid
 
-def _norm_pdf(x: float) -> float:
-    """Standard normal PDF."""
-    return math.exp(-x * x / 2.0) / math.sqrt(2.0 * math.pi)
+
+def _d1_d2(S, K, T, r, sigma, valid):
+    # Invalid elements are computed on placeholder values and masked by the caller
+    S_, K_, T_, sigma_ = (np.where(valid, x, 1.0) for x in (S, K, T, sigma))
+    sqrt_t = np.sqrt(T_)
+    d1 = (np.log(S_ / K_) + (r + sigma_ * sigma_ / 2) * T_) / (sigma_ * sqrt_t)
+    return d1, d1 - sigma_ * sqrt_t
+
+
+def _norm_pdf(x):
+    return np.exp(-x * x / 2.0) / math.sqrt(2.0 * math.pi)
+
+
+def _is_call(option_type):
+    """Call mask from "C"/"P" strings (anything but "C" is a put) or a bool array."""
+    option_type = np.asarray(option_type)
+    return option_type if option_type.dtype == bool else option_type == "C"
+
+
+def _price_and_vega(S, K, T, r, sigma, is_call):
+    """Price and vega for inputs already known to be valid (IV solver inner loop)."""
+    sqrt_t = np.sqrt(T)
+    d1 = (np.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    discounted_k = K * np.exp(-r * T)
+    call = S * ndtr(d1) - discounted_k * ndtr(d2)
+    # Put by put-call parity
+    return np.where(is_call, call, call - S + discounted_k), S * _norm_pdf(d1) * sqrt_t
+
+
+def _scalar(value) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+# =============================================================================
+# Array forms
+# =============================================================================
+
+
+def bs_price_array(S, K, T, r, sigma, option_type="C") -> np.ndarray:
+    """Black-Scholes option prices (0.0 where inputs are invalid)."""
+    S, K, T, r, sigma, valid = _inputs(S, K, T, r, sigma)
+    d1, d2 = _d1_d2(S, K, T, r, sigma, valid)
+    discounted_k = K * np.exp(-r * np.where(valid, T, 0.0))
+    call = S * ndtr(d1) - discounted_k * ndtr(d2)
+    put = discounted_k * ndtr(-d2) - S * ndtr(-d1)
+    return np.where(valid, np.where(_is_call(option_type), call, put), 0.0)
+
+
+def bs_vega_array(S, K, T, r, sigma) -> np.ndarray:
+    """Black-Scholes vega (0.0 where inputs are invalid)."""
+    S, K, T, r, sigma, valid = _inputs(S, K, T, r, sigma)
+    d1, _ = _d1_d2(S, K, T, r, sigma, valid)
+    return np.where(valid, S * _norm_pdf(d1) * np.sqrt(np.where(valid, T, 0.0)), 0.0)
+
+
+def bs_delta_array(S, K, T, r, sigma, option_type="C") -> np.ndarray:
+    """Black-Scholes delta (NaN where inputs are invalid)."""
+    S, K, T, r, sigma, valid = _inputs(S, K, T, r, sigma)
+    d1, _ = _d1_d2(S, K, T, r, sigma, valid)
+    delta = ndtr(d1) - np.where(_is_call(option_type), 0.0, 1.0)
+    return np.where(valid, delta, np.nan)
+
+
+def bs_gamma_array(S, K, T, r, sigma) -> np.ndarray:
+    """Black-Scholes gamma (NaN where inputs are invalid)."""
+    S, K, T, r, sigma, valid = _inputs(S, K, T, r, sigma)
+    d1, _ = _d1_d2(S, K, T, r, sigma, valid)
+    S_, T_, sigma_ = (np.where(valid, x, 1.0) for x in (S, T, sigma))
+    return np.where(valid, _norm_pdf(d1) / (S_ * sigma_ * np.sqrt(T_)), np.nan)
+
+
+def bs_theta_array(S, K, T, r, sigma, option_type="C") -> np.ndarray:
+    """Black-Scholes theta per calendar day (NaN where inputs are invalid)."""
+    S, K, T, r, sigma, valid = _inputs(S, K, T, r, sigma)
+    d1, d2 = _d1_d2(S, K, T, r, sigma, valid)
+    T_, sigma_ = np.where(valid, T, 1.0), np.where(valid, sigma, 1.0)
+    common = -S * _norm_pdf(d1) * sigma_ / (2 * np.sqrt(T_))
+    rate_term = r * K * np.exp(-r * T_)
+    theta = np.where(_is_call(option_type), common - rate_term * ndtr(d2), common + rate_term * ndtr(-d2))
+    return np.where(valid, theta / 365.0, np.nan)
+
+
+def implied_volatility_array(
+    market_price,
+    S,
+    K,
+    T,
+    r=0.05,
+    option_type="C",
+    max_iterations: int = 50,
+    tolerance: float = 1e-6,
+) -> np.ndarray:
+    """
+    Implied volatilities for arrays of contracts (NaN where none is found).
+
+    Each element follows the scalar Newton-Raphson iteration and stops at its
+    own first iterate within ``tolerance``. Elements Newton leaves unsolved
+    (vega collapsed, or not converged after ``max_iterations``) are bisected
+    on [0.001, 10] when the price is bracketed there; otherwise an unconverged
+    Newton estimate repricing within 5% is kept, as before.
+    """
+    arrays = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (market_price, S, K, T, r)), _is_call(option_type)
+    )
+    shape = arrays[0].shape
+    price, S, K, T, r, is_call = (np.ravel(x) for x in arrays)
+    valid = (price > 0) & (S > 0) & (K > 0) & (T > 0)
+
+    # Intrinsic value floor: prices well below it are bad data
+    discounted_k = K * np.exp(-r * np.where(valid, T, 0.0))
+    intrinsic = np.maximum(0.0, np.where(is_call, S - discounted_k, discounted_k - S))
+    valid &= ~(price < intrinsic * 0.99)
+
+    result = np.full(price.size, np.nan)
+    idx = np.flatnonzero(valid)
+    if idx.size == 0:
+        return result.reshape(shape)
+
+    p, s, k, t, rr, call = price[idx], S[idx], K[idx], T[idx], r[idx], is_call[idx]
+
+    # Initial guess using Brenner-Subrahmanyam approximation
+    sigma = np.clip(np.sqrt(2.0 * math.pi / t) * p / s, 0.01, 5.0)
+    active = np.ones(idx.size, dtype=bool)
+    vega_failed = np.zeros(idx.size, dtype=bool)
+    solved = np.full(idx.size, np.nan)
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        a = np.flatnonzero(active)
+        model, vega = _price_and_vega(s[a], k[a], t[a], rr[a], sigma[a], call[a])
+        diff = model - p[a]
+
+        collapsed = vega < 1e-12
+        converged = ~collapsed & (np.abs(diff) < tolerance)
+        vega_failed[a[collapsed]] = True
+        solved[a[converged]] = sigma[a[converged]]
+        step = ~collapsed & ~converged
+        sa = a[step]
+        sigma[sa] = np.clip(sigma[sa] - diff[step] / vega[step], _SIGMA_MIN, _SIGMA_MAX)
+        active[a[~step]] = False
+
+    unsolved = np.flatnonzero(np.isnan(solved))
+    if unsolved.size:
+        solved[unsolved] = _bisect_iv(
+            p[unsolved], s[unsolved], k[unsolved], t[unsolved], rr[unsolved], call[unsolved], tolerance
+        )
+        # Unbracketed and Newton ran out of iterations: keep a close-enough estimate
+        fallback = unsolved[np.isnan(solved[unsolved]) & ~vega_failed[unsolved]]
+        if fallback.size:
+            model, _ = _price_and_vega(s[fallback], k[fallback], t[fallback], rr[fallback], sigma[fallback],
+                                       call[fallback])
+            close = np.abs(model - p[fallback]) < p[fallback] * 0.05
+            solved[fallback[close]] = sigma[fallback[close]]
+
+    result[idx] = solved
+    return result.reshape(shape)
+
+
+def _bisect_iv(price, S, K, T, r, is_call, tolerance) -> np.ndarray:
+    """Bisection on [_SIGMA_MIN, _SIGMA_MAX]; NaN where the price is not bracketed."""
+    lo = np.full(price.size, _SIGMA_MIN)
+    hi = np.full(price.size, _SIGMA_MAX)
+    f_lo = _price_and_vega(S, K, T, r, lo, is_call)[0] - price
+    f_hi = _price_and_vega(S, K, T, r, hi, is_call)[0] - price
+    out = np.full(price.size, np.nan)
+    out[np.abs(f_lo) < tolerance] = _SIGMA_MIN
+    out[np.abs(f_hi) < tolerance] = _SIGMA_MAX
+    active = np.isnan(out) & (f_lo < 0) & (f_hi > 0)  # price increases with sigma
+
+    for _ in range(_BISECTION_ITERATIONS):
+        if not active.any():
+            break
+        a = np.flatnonzero(active)
+        mid = (lo[a] + hi[a]) / 2
+        f_mid = _price_and_vega(S[a], K[a], T[a], r[a], mid, is_call[a])[0] - price[a]
+        done = np.abs(f_mid) < tolerance
+        out[a[done]] = mid[done]
+        below = f_mid < 0
+        lo[a[below]] = mid[below]
+        hi[a[~below]] = mid[~below]
+        active[a[done]] = False
+    return out
+
+
+# =============================================================================
+# Scalar forms
+# =============================================================================
 
 
 def bs_price(
@@ -50,16 +238,7 @@ def bs_price(
     option_type: str = "C",  # "C" or "P"
 ) -> float:
     """Black-Scholes option price."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return 0.0
-
-    d1 = (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-
-    if option_type == "C":
-        return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
-    else:
-        return K * math.exp(-r * T) * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+    return float(bs_price_array(S, K, T, r, sigma, option_type))
 
 
 def bs_vega(
@@ -70,11 +249,7 @@ def bs_vega(
     sigma: float,
 ) -> float:
     """Black-Scholes vega (sensitivity of price to volatility)."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return 0.0
-
-    d1 = (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
-    return S * _norm_pdf(d1) * math.sqrt(T)
+    return float(bs_vega_array(S, K, T, r, sigma))
 
 
 def implied_volatility(
@@ -103,42 +278,9 @@ def implied_volatility(
     Returns:
         Implied volatility (annualized) or None if computation fails
     """
-    if market_price <= 0 or S <= 0 or K <= 0 or T <= 0:
-        return None
-
-    # Check for intrinsic value floor
-    if option_type == "C":
-        intrinsic = max(0, S - K * math.exp(-r * T))
-    else:
-        intrinsic = max(0, K * math.exp(-r * T) - S)
-
-    if market_price < intrinsic * 0.99:
-        return None  # Price below intrinsic — bad data
-
-    # Initial guess using Brenner-Subrahmanyam approximation
-    sigma = math.sqrt(2.0 * math.pi / T) * market_price / S
-    sigma = max(0.01, min(sigma, 5.0))  # Clamp to reasonable range
-
-    for _ in range(max_iterations):
-        price = bs_price(S, K, T, r, sigma, option_type)
-        vega = bs_vega(S, K, T, r, sigma)
-
-        if vega < 1e-12:
-            # Vega too small — deep ITM/OTM, can't converge
-            return None
-
-        diff = price - market_price
-        if abs(diff) < tolerance:
-            return sigma
-
-        sigma -= diff / vega
-        sigma = max(0.001, min(sigma, 10.0))  # Keep in bounds
-
-    # Didn't converge — return best estimate if close enough
-    if abs(bs_price(S, K, T, r, sigma, option_type) - market_price) < market_price * 0.05:
-        return sigma
-
-    return None
+    return _scalar(implied_volatility_array(
+        market_price, S, K, T, r, option_type, max_iterations=max_iterations, tolerance=tolerance
+    ))
 
 
 def bs_delta(
@@ -150,41 +292,16 @@ def bs_delta(
     option_type: str = "C",
 ) -> Optional[float]:
     """Compute Black-Scholes delta."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return None
-
-    d1 = (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
-
-    if option_type == "C":
-        return _norm_cdf(d1)
-    else:
-        return _norm_cdf(d1) - 1.0
+    return _scalar(bs_delta_array(S, K, T, r, sigma, option_type))
 
 
 def bs_gamma(S: float, K: float, T: float, r: float, sigma: float) -> Optional[float]:
     """Compute Black-Scholes gamma."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return None
-
-    d1 = (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
-    return _norm_pdf(d1) / (S * sigma * math.sqrt(T))
+    return _scalar(bs_gamma_array(S, K, T, r, sigma))
 
 
 def bs_theta(
     S: float, K: float, T: float, r: float, sigma: float, option_type: str = "C"
 ) -> Optional[float]:
     """Compute Black-Scholes theta (per day, negative = decay)."""
-    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
-        return None
-
-    d1 = (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-
-    common = -S * _norm_pdf(d1) * sigma / (2 * math.sqrt(T))
-
-    if option_type == "C":
-        theta = common - r * K * math.exp(-r * T) * _norm_cdf(d2)
-    else:
-        theta = common + r * K * math.exp(-r * T) * _norm_cdf(-d2)
-
-    return theta / 365.0  # Per calendar day
+    return _scalar(bs_theta_array(S, K, T, r, sigma, option_type))
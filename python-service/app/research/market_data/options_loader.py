@@ -17,6 +17,12 @@ Polygon API limitations:
   - Historical contracts via /v3/reference/options/contracts (paginated, 1000/page)
   - Per-contract daily OHLCV via /v2/aggs/ticker/{OCC_symbol}/range/1/day/{from}/{to}
   - Rate limit: ~100 req/s on paid plans, but be conservative
+
+Bar fetching: by default load_options_for_deal() fetches each contract's daily
+bars for the whole deal window once (concurrently, under a token bucket) and
+pivots every snapshot date's chain from them locally; the bars are kept in a
+per-underlying ContractBarCache on disk. ``bar_range_fetch=False`` restores
+the original one-request-per-contract-per-date path.
 """
 
 import asyncio
@@ -29,14 +35,22 @@ from uuid import UUID
 
 import asyncpg
 import httpx
+import numpy as np
+
+from app.options.polygon_options import TokenBucket
 
-from .black_scholes import bs_delta, bs_gamma, bs_theta, implied_volatility
+from .bar_cache import ContractBarCache
+from .black_scholes import bs_delta_array, bs_gamma_array, bs_theta_array, implied_volatility_array
 
 logger = logging.getLogger(__name__)
 
 POLYGON_BASE_URL = "https://api.polygon.io"
 POLYGON_RATE_DELAY = 0.05  # 20 req/s conservative
 
+# Per-contract bar range fetches: requests in flight, and request rate
+OPTIONS_BAR_CONCURRENCY = int(os.environ.get("OPTIONS_BAR_CONCURRENCY", "8"))
+OPTIONS_BAR_MAX_RPS = float(os.environ.get("OPTIONS_BAR_MAX_RPS", str(1 / POLYGON_RATE_DELAY)))
+
 
 class OptionsDataLoader:
     """
@@ -51,10 +65,12 @@ class OptionsDataLoader:
       - Term structure
     """
 
-    def __init__(self):
+    def __init__(self, bar_cache: Optional[ContractBarCache] = None):
         self.api_key = os.environ.get("POLYGON_API_KEY", "")
         self.client: Optional[httpx.AsyncClient] = None
         self._risk_free_rate = 0.045  # Approximate, can be updated
+        self.bar_cache = bar_cache or ContractBarCache()
+        self.bar_requests = 0  # per-contract aggregates requests sent
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self.client is None:
@@ -157,23 +173,31 @@ class OptionsDataLoader:
         OCC symbol format: O:{TICKER}{YYMMDD}{C/P}{STRIKE*1000}
         e.g., O:ATVI230120C00070000
         """
+        await asyncio.sleep(POLYGON_RATE_DELAY)
+        return await self._request_contract_bars(occ_symbol, from_date, to_date) or []
+
+    async def _request_contract_bars(
+        self,
+        occ_symbol: str,
+        from_date: date,
+        to_date: date,
+    ) -> Optional[List[dict]]:
+        """Aggregates request for one contract; None if it failed (no data is [])."""
         client = await self._get_client()
+        url = (
+            f"{POLYGON_BASE_URL}/v2/aggs/ticker/{occ_symbol}/range/1/day/"
+            f"{from_date.isoformat()}/{to_date.isoformat()}"
+        )
+        params = {"adjusted": "true", "sort": "asc", "limit": 5000}
 
         try:
-            await asyncio.sleep(POLYGON_RATE_DELAY)
-            response = await client.get(
-                f"{POLYGON_BASE_URL}/v2/aggs/ticker/{occ_symbol}/range/1/day/"
-                f"{from_date.isoformat()}/{to_date.isoformat()}",
-                params={"adjusted": "true", "sort": "asc", "limit": 5000},
-            )
+            self.bar_requests += 1
+            response = await client.get(url, params=params)
 
             if response.status_code == 429:
                 await asyncio.sleep(2)
-                response = await client.get(
-                    f"{POLYGON_BASE_URL}/v2/aggs/ticker/{occ_symbol}/range/1/day/"
-                    f"{from_date.isoformat()}/{to_date.isoformat()}",
-                    params={"adjusted": "true", "sort": "asc", "limit": 5000},
-                )
+                self.bar_requests += 1
+                response = await client.get(url, params=params)
 
             if response.status_code == 404:
                 return []  # No data for this contract
@@ -184,7 +208,52 @@ class OptionsDataLoader:
 
         except Exception as e:
             logger.debug(f"Error fetching bars for {occ_symbol}: {e}")
-            return []
+            return None
+
+    async def fetch_contract_bar_ranges(
+        self,
+        underlying_ticker: str,
+        contracts: List[dict],
+        from_date: date,
+        to_date: date,
+    ) -> Dict[str, Dict[date, dict]]:
+        """
+        Daily bars of every contract over [from_date, to_date], keyed by date.
+
+        Contracts already in the bar cache for the range cost no request; the
+        rest are fetched once each, OPTIONS_BAR_CONCURRENCY at a time and at
+        most OPTIONS_BAR_MAX_RPS per second. Failed fetches are not cached (the
+        contract has no bars this run, as with fetch_contract_bars).
+        """
+        tickers = list(dict.fromkeys(c.get("ticker") for c in contracts if c.get("ticker")))
+        cached = self.bar_cache.load(underlying_ticker)
+        missing = [t for t in tickers if not cached.covers(t, from_date, to_date)]
+
+        if missing:
+            bucket = TokenBucket(OPTIONS_BAR_MAX_RPS)
+            semaphore = asyncio.Semaphore(OPTIONS_BAR_CONCURRENCY)
+
+            async def fetch(ticker: str) -> Tuple[str, Optional[List[dict]]]:
+                async with semaphore:
+                    wait = bucket.reserve()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    return ticker, await self._request_contract_bars(ticker, from_date, to_date)
+
+            failed = 0
+            for ticker, bars in await asyncio.gather(*(fetch(t) for t in missing)):
+                if bars is None:
+                    failed += 1
+                else:
+                    cached.put(ticker, from_date, to_date, bars)
+            if cached.dirty:
+                self.bar_cache.save(cached)
+            logger.info(
+                f"Fetched bars for {len(missing) - failed}/{len(missing)} {underlying_ticker} contracts "
+                f"({len(tickers) - len(missing)} cached)"
+            )
+
+        return {t: cached.bars_by_date(t) for t in tickers if t in cached.coverage}
 
     # =========================================================================
     # Chain reconstruction for a single date
@@ -197,6 +266,7 @@ class OptionsDataLoader:
         underlying_close: float,
         deal_price: Optional[float],
         contracts: List[dict],
+        bars_by_contract: Optional[Dict[str, Dict[date, dict]]] = None,
     ) -> List[dict]:
         """
         Reconstruct the options chain for a specific date.
@@ -206,6 +276,13 @@ class OptionsDataLoader:
           - Compute IV via Black-Scholes inversion
           - Compute greeks
 
+        IV and greeks are computed for the whole chain at once (array forms).
+
+        With ``bars_by_contract`` (from fetch_contract_bar_ranges) the bars are
+        looked up locally instead of fetched: the bar for target_date, else the
+        next day's, which is what the [target_date, target_date + 1] request
+        returns first.
+
         Returns list of chain entries with computed IV and greeks.
         """
         # Filter to contracts active on the target date
@@ -226,16 +303,22 @@ class OptionsDataLoader:
             if not ticker:
                 continue
 
-            bars = await self.fetch_contract_bars(
-                ticker,
-                target_date,
-                target_date + timedelta(days=1),
-            )
+            if bars_by_contract is not None:
+                day_bars = bars_by_contract.get(ticker, {})
+                bar = day_bars.get(target_date) or day_bars.get(target_date + timedelta(days=1))
+                if bar is None:
+                    continue
+            else:
+                bars = await self.fetch_contract_bars(
+                    ticker,
+                    target_date,
+                    target_date + timedelta(days=1),
+                )
 
-            if not bars:
-                continue
+                if not bars:
+                    continue
 
-            bar = bars[0]
+                bar = bars[0]
             close_price = bar.get("c", 0)
             if close_price <= 0:
                 continue
@@ -245,29 +328,6 @@ class OptionsDataLoader:
             exp_date = date.fromisoformat(contract.get("expiration_date", "2000-01-01"))
             opt_type = "C" if contract.get("contract_type", "").lower() == "call" else "P"
 
-            # Time to expiry
-            T = max((exp_date - target_date).days, 1) / 365.0
-
-            # Compute IV
-            mid = close_price  # Use close as proxy
-            iv = implied_volatility(
-                market_price=mid,
-                S=underlying_close,
-                K=strike,
-                T=T,
-                r=self._risk_free_rate,
-                option_type=opt_type,
-            )
-
-            # Compute greeks if IV available
-            delta = None
-            gamma = None
-            theta = None
-            if iv and iv > 0:
-                delta = bs_delta(underlying_close, strike, T, self._risk_free_rate, iv, opt_type)
-                gamma = bs_gamma(underlying_close, strike, T, self._risk_free_rate, iv)
-                theta = bs_theta(underlying_close, strike, T, self._risk_free_rate, iv, opt_type)
-
             chain.append({
                 "contract_symbol": ticker,
                 "expiration_date": exp_date,
@@ -276,19 +336,45 @@ class OptionsDataLoader:
                 "close": close_price,
                 "bid": bar.get("l"),  # Low as proxy for bid
                 "ask": bar.get("h"),  # High as proxy for ask
-                "mid": close_price,
+                "mid": close_price,  # Use close as proxy
                 "volume": bar.get("v", 0),
                 "open_interest": contract.get("open_interest"),
-                "implied_vol": iv,
-                "delta": delta,
-                "gamma": gamma,
-                "theta": theta,
+                "implied_vol": None,
+                "delta": None,
+                "gamma": None,
+                "theta": None,
                 "underlying_close": underlying_close,
                 "deal_price": deal_price,
             })
 
+        if chain:
+            self._compute_iv_and_greeks(chain, target_date, underlying_close)
+
         return chain
 
+    def _compute_iv_and_greeks(self, chain: List[dict], target_date: date, underlying_close: float) -> None:
+        """Fill implied_vol, delta, gamma and theta for a whole chain in one pass."""
+        strikes = np.array([e["strike"] for e in chain], dtype=float)
+        is_call = np.array([e["option_type"] == "C" for e in chain])
+        # Time to expiry
+        T = np.array([max((e["expiration_date"] - target_date).days, 1) for e in chain]) / 365.0
+        r = self._risk_free_rate
+
+        iv = implied_volatility_array(
+            np.array([e["mid"] for e in chain], dtype=float), underlying_close, strikes, T, r, is_call
+        )
+        # Greeks where IV is available (NaN otherwise)
+        delta = bs_delta_array(underlying_close, strikes, T, r, iv, is_call)
+        gamma = bs_gamma_array(underlying_close, strikes, T, r, iv)
+        theta = bs_theta_array(underlying_close, strikes, T, r, iv, is_call)
+
+        for i, entry in enumerate(chain):
+            if not np.isnan(iv[i]):
+                entry["implied_vol"] = float(iv[i])
+                entry["delta"] = float(delta[i])
+                entry["gamma"] = float(gamma[i])
+                entry["theta"] = float(theta[i])
+
     # =========================================================================
     # Daily options summary computation
     # =========================================================================
@@ -604,15 +690,18 @@ class OptionsDataLoader:
         deal_price: Optional[float],
         end_date: Optional[date] = None,
         weekly_snapshots: bool = True,
+        bar_range_fetch: bool = True,
     ) -> Dict[str, int]:
         """
         Load all options data for a single deal.
 
         Steps:
           1. List all contracts for the ticker during the deal window
-          2. For each Friday (weekly) or event date, reconstruct the chain
-          3. Compute daily summary and store
-          4. Store full chain snapshots for announcement and other events
+          2. Fetch each contract's daily bars across all processed dates once
+             (``bar_range_fetch=False``: one request per contract per date)
+          3. For each Friday (weekly) or event date, reconstruct the chain
+          4. Compute daily summary and store
+          5. Store full chain snapshots for announcement and other events
 
         Returns count of daily summaries and chain snapshots stored.
         """
@@ -660,6 +749,18 @@ class OptionsDataLoader:
             f"({len(contracts)} contracts)"
         )
 
+        bars_by_contract = None
+        if bar_range_fetch and sorted_dates:
+            # Contracts expiring before the first date are never active
+            first_date = sorted_dates[0]
+            active = [
+                c for c in contracts
+                if date.fromisoformat(c.get("expiration_date", "2000-01-01")) >= first_date
+            ]
+            bars_by_contract = await self.fetch_contract_bar_ranges(
+                ticker, active, first_date, sorted_dates[-1] + timedelta(days=1)
+            )
+
         daily_count = 0
         chain_count = 0
 
@@ -675,6 +776,7 @@ class OptionsDataLoader:
                 underlying_close=underlying_close,
                 deal_price=deal_price,
                 contracts=contracts,
+                bars_by_contract=bars_by_contract,
             )
 
             if not chain:
@@ -19,6 +19,8 @@ from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
 
 import httpx
 
+from app.services.sec_ticker_index import SecTickerIndex, get_sec_ticker_index
+
 logger = logging.getLogger(__name__)
 
 # SEC rate limit: 10 req/sec — SEC enforces this strictly on data.sec.gov
@@ -494,7 +496,7 @@ class CompanyMetadataResolver:
     def __init__(self):
         self.client: Optional[httpx.AsyncClient] = None
         self._ticker_map: Optional[Dict[str, dict]] = None  # CIK → {ticker, name}
-        self._reverse_ticker_map: Optional[Dict[str, str]] = None  # ticker → CIK
+        self._ticker_index: Optional[SecTickerIndex] = None  # index _ticker_map was built from
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self.client is None:
@@ -519,43 +521,29 @@ class CompanyMetadataResolver:
         """
         Load the SEC CIK-to-ticker mapping.
         Returns dict keyed by zero-padded CIK.
-        """
-        if self._ticker_map is not None:
-            return self._ticker_map
-
-        client = await self._get_client()
-        await asyncio.sleep(SEC_RATE_LIMIT_DELAY)
-
-        response = await client.get("https://www.sec.gov/files/company_tickers.json")
-        response.raise_for_status()
-        data = response.json()
 
-        self._ticker_map = {}
-        self._reverse_ticker_map = {}
-
-        for entry in data.values():
-            cik = str(entry.get("cik_str", "")).zfill(10)
-            ticker = entry.get("ticker", "")
-            name = entry.get("title", "")
-
-            self._ticker_map[cik] = {"ticker": ticker, "name": name}
-            if ticker:
-                self._reverse_ticker_map[ticker.upper()] = cik
-
-        logger.info(f"Loaded {len(self._ticker_map)} CIK-ticker mappings")
+        Backed by the process-wide SEC ticker index, so the SEC file is not
+        downloaded again per resolver.
+        """
+        index = await get_sec_ticker_index()
+        if self._ticker_index is not index:
+            self._ticker_index = index
+            self._ticker_map = {
+                c.cik: {"ticker": c.ticker, "name": c.title}
+                for c in reversed(index.companies())
+            }
+            logger.info(f"Loaded {len(self._ticker_map)} CIK-ticker mappings")
         return self._ticker_map
 
     async def cik_to_ticker(self, cik: str) -> Optional[str]:
         """Look up ticker for a CIK."""
-        ticker_map = await self.load_ticker_map()
-        padded = cik.zfill(10)
-        entry = ticker_map.get(padded)
-        return entry["ticker"] if entry else None
+        company = (await get_sec_ticker_index()).by_cik(cik)
+        return company.ticker if company else None
 
     async def ticker_to_cik(self, ticker: str) -> Optional[str]:
         """Look up CIK for a ticker."""
-        await self.load_ticker_map()
-        return self._reverse_ticker_map.get(ticker.upper()) if self._reverse_ticker_map else None
+        company = (await get_sec_ticker_index()).by_ticker(ticker)
+        return company.cik if company else None
 
     async def get_company_metadata(self, cik: str) -> Optional[dict]:
         """
@@ -19,6 +19,7 @@ from anthropic import Anthropic
 
 from .context_hash import ChangeSignificance, build_context_summary, classify_changes, compute_context_hash
 from .model_config import compute_cost, get_model, get_model_for_significance
+from .pipeline import PipelineStage, pipeline_stats
 from .prompts import (
     RISK_ASSESSMENT_SYSTEM_PROMPT,
     RISK_DELTA_SYSTEM_PROMPT,
@@ -133,6 +134,17 @@ CLI_TIMEOUT = int(os.environ.get("CLI_TIMEOUT", "300"))  # 5 min default
 # Default 120s (2 min) → ~35 calls × 2 min = ~70 min of pacing + ~60 min processing ≈ 2.1 hours.
 RISK_CALL_SPACING_SEC = int(os.environ.get("RISK_CALL_SPACING_SEC", "120"))
 
+# Per-stage concurrency for API-bucket deals (prompt -> model -> store).
+# Prompt building never awaits, so that stage is timed but not limited.
+# The model stage defaults to one call at a time in CLI mode so the pacing
+# above still bounds Max-subscription usage; RISK_CALL_SPACING_SEC applies per slot.
+RISK_MODEL_CONCURRENCY = int(os.environ.get(
+    "RISK_MODEL_CONCURRENCY", "1" if USE_CLI_ASSESSMENT else "4",
+))
+RISK_STORE_CONCURRENCY = int(os.environ.get("RISK_STORE_CONCURRENCY", "4"))
+# Minimum seconds between pipeline_stats progress writes to risk_assessment_runs
+RISK_PIPELINE_STATS_INTERVAL_SEC = float(os.environ.get("RISK_PIPELINE_STATS_INTERVAL_SEC", "15"))
+
 # Skip MINOR changes (treat as reuse). MINOR = mostly just price drift >0.1%,
 # not worth re-assessing. Eliminates ~19 formerly-Haiku calls per run.
 RISK_SKIP_MINOR = os.environ.get("RISK_SKIP_MINOR", "true").lower() == "true"
@@ -546,6 +558,84 @@ def detect_discrepancies(ai_result: dict, sheet_data: dict) -> list[dict]:
     return discrepancies
 
 
+def _group_by_ticker(rows, drop=()) -> dict[str, list[dict]]:
+    """Group bulk-query rows per ticker as dicts, preserving query order.
+
+    ``drop`` removes bookkeeping columns (the ticker key, ROW_NUMBER ranks)
+    that the per-deal context never carried.
+    """
+    grouped: dict[str, list[dict]] = {}
+    for r in rows:
+        d = dict(r)
+        ticker = d["ticker"]
+        for col in drop:
+            d.pop(col, None)
+        grouped.setdefault(ticker, []).append(d)
+    return grouped
+
+
+def _derive_context_signals(context: dict) -> None:
+    """Add signals computed from the fetched rows (spread probability, sheet comparison, ...)."""
+    row = context.get("sheet_row")
+    details = context.get("deal_details")
+
+    # Compute spread-implied probability (renamed from options-implied)
+    if ENABLE_ENRICHED_CONTEXT:
+        from .signals import compute_spread_implied_probability
+
+        current_price = context.get("sheet_row", {}).get("current_price")
+        deal_price = context.get("sheet_row", {}).get("deal_price")
+        spread_prob = compute_spread_implied_probability(current_price, deal_price)
+        if spread_prob is not None:
+            context["spread_implied_probability"] = spread_prob
+            # Backward-compat alias for existing assessments
+            context["options_implied_probability"] = spread_prob
+
+    # Build three-signal comparison
+    if ENABLE_ENRICHED_CONTEXT:
+        from .signals import build_signal_comparison
+
+        sheet_prob = None
+        deal_details = context.get("deal_details")
+        if deal_details and deal_details.get("probability_of_success") is not None:
+            try:
+                sheet_prob = float(deal_details["probability_of_success"]) / 100.0
+            except (ValueError, TypeError):
+                pass
+
+        prev_ai_prob = None
+        prev_assessment = context.get("previous_assessment")
+        if prev_assessment and prev_assessment.get("our_prob_success") is not None:
+            try:
+                prev_ai_prob = float(prev_assessment["our_prob_success"]) / 100.0
+            except (ValueError, TypeError):
+                pass
+
+        options_implied = context.get("options_implied_probability")
+        signal_comp = build_signal_comparison(options_implied, sheet_prob, prev_ai_prob)
+        if signal_comp is not None:
+            context["signal_comparison"] = signal_comp
+
+    # Live price: use sheet row's current_price for now
+    if row and row.get("current_price") is not None:
+        context["live_price"] = {
+            "price": float(row["current_price"]),
+            "change": float(row["price_change"]) if row.get("price_change") is not None else None,
+        }
+
+    # Build sheet comparison data for the prompt
+    sheet_comparison = {}
+    if row:
+        sheet_comparison["vote_risk"] = row.get("vote_risk")
+        sheet_comparison["finance_risk"] = row.get("finance_risk")
+        sheet_comparison["legal_risk"] = row.get("legal_risk")
+        sheet_comparison["investable"] = row.get("investable")
+    if details:
+        sheet_comparison["prob_success"] = details.get("probability_of_success")
+    if sheet_comparison:
+        context["sheet_comparison"] = sheet_comparison
+
+
 # ---------------------------------------------------------------------------
 # Engine
 # ---------------------------------------------------------------------------
@@ -565,190 +655,228 @@ class RiskAssessmentEngine:
     # ------------------------------------------------------------------
     async def collect_deal_context(self, ticker: str) -> dict:
         """Gather all available data for a single deal from the database."""
-        context = {"ticker": ticker}
+        contexts = await self.collect_deal_contexts([ticker])
+        return contexts[ticker]
+
+    async def collect_deal_contexts(self, tickers: list[str]) -> dict[str, dict]:
+        """Gather deal context for many tickers with one query per table.
+
+        Each source is fetched once for the whole ticker set (``ticker = ANY($1)``;
+        "latest row" lookups use DISTINCT ON, top-N lookups use ROW_NUMBER) and
+        the rows are grouped per ticker in memory.  The resulting contexts are
+        identical to what the old one-ticker-at-a-time queries produced.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        contexts = {t: {"ticker": t} for t in tickers}
+        if not tickers:
+            return contexts
+
+        def attach_latest(key, rows, drop=()):
+            for ticker, items in _group_by_ticker(rows, drop).items():
+                if ticker in contexts:
+                    contexts[ticker][key] = items[0]
+
+        def attach_lists(key, rows, drop=(), always=False):
+            grouped = _group_by_ticker(rows, drop)
+            for ticker, context in contexts.items():
+                items = grouped.get(ticker)
+                if items or always:
+                    context[key] = items or []
 
         async with self.pool.acquire() as conn:
             # 1. Latest sheet row
-            row = await conn.fetchrow(
-                """SELECT * FROM sheet_rows
-                   WHERE ticker = $1
+            rows = await conn.fetch(
+                """SELECT DISTINCT ON (ticker) * FROM sheet_rows
+                   WHERE ticker = ANY($1::text[])
                      AND snapshot_id = (
                          SELECT id FROM sheet_snapshots
                          ORDER BY snapshot_date DESC, ingested_at DESC LIMIT 1
-                     )""",
-                ticker,
+                     )
+                   ORDER BY ticker""",
+                tickers,
             )
-            if row:
-                context["sheet_row"] = dict(row)
+            attach_latest("sheet_row", rows)
 
             # 2. Deal details
-            details = await conn.fetchrow(
-                "SELECT * FROM sheet_deal_details WHERE ticker = $1 ORDER BY fetched_at DESC LIMIT 1",
-                ticker,
+            rows = await conn.fetch(
+                """SELECT DISTINCT ON (ticker) * FROM sheet_deal_details
+                   WHERE ticker = ANY($1::text[])
+                   ORDER BY ticker, fetched_at DESC""",
+                tickers,
             )
-            if details:
-                context["deal_details"] = dict(details)
+            attach_latest("deal_details", rows)
 
             # 3. Previous assessment
-            prev = await conn.fetchrow(
-                """SELECT * FROM deal_risk_assessments
-                   WHERE ticker = $1 AND assessment_date < CURRENT_DATE
-                   ORDER BY assessment_date DESC LIMIT 1""",
-                ticker,
+            rows = await conn.fetch(
+                """SELECT DISTINCT ON (ticker) * FROM deal_risk_assessments
+                   WHERE ticker = ANY($1::text[]) AND assessment_date < CURRENT_DATE
+                   ORDER BY ticker, assessment_date DESC""",
+                tickers,
             )
-            if prev:
-                context["previous_assessment"] = dict(prev)
+            attach_latest("previous_assessment", rows)
 
             # 4. Recent EDGAR filings (last 30 days)
             try:
-                filings = await conn.fetch(
+                rows = await conn.fetch(
                     """SELECT * FROM portfolio_edgar_filings
-                       WHERE ticker = $1 AND detected_at > NOW() - INTERVAL '30 days'
+                       WHERE ticker = ANY($1::text[]) AND detected_at > NOW() - INTERVAL '30 days'
                        ORDER BY detected_at DESC""",
-                    ticker,
+                    tickers,
                 )
-                context["recent_filings"] = [dict(f) for f in filings]
             except Exception:
-                context["recent_filings"] = []
+                rows = []
+            attach_lists("recent_filings", rows, always=True)
 
             # 5. Recent trading halts (last 7 days)
             try:
-                halts = await conn.fetch(
+                rows = await conn.fetch(
                     """SELECT * FROM halt_events
-                       WHERE ticker = $1 AND halted_at > NOW() - INTERVAL '7 days'
+                       WHERE ticker = ANY($1::text[]) AND halted_at > NOW() - INTERVAL '7 days'
                        ORDER BY halted_at DESC""",
-                    ticker,
+                    tickers,
                 )
-                context["recent_halts"] = [dict(h) for h in halts]
             except Exception:
-                context["recent_halts"] = []
+                rows = []
+            attach_lists("recent_halts", rows, always=True)
 
             # 6. Recent sheet diffs (last 7 days)
             try:
-                diffs = await conn.fetch(
+                rows = await conn.fetch(
                     """SELECT * FROM sheet_diffs
-                       WHERE ticker = $1 AND detected_at > CURRENT_DATE - INTERVAL '7 days'
+                       WHERE ticker = ANY($1::text[]) AND detected_at > CURRENT_DATE - INTERVAL '7 days'
                        ORDER BY detected_at DESC""",
-                    ticker,
+                    tickers,
                 )
-                context["sheet_diffs"] = [dict(d) for d in diffs]
             except Exception:
-                context["sheet_diffs"] = []
+                rows = []
+            attach_lists("sheet_diffs", rows, always=True)
 
             # 7. Existing AI research
             try:
-                research = await conn.fetchrow(
-                    "SELECT * FROM deal_research WHERE ticker = $1 ORDER BY created_at DESC LIMIT 1",
-                    ticker,
+                rows = await conn.fetch(
+                    """SELECT DISTINCT ON (ticker) * FROM deal_research
+                       WHERE ticker = ANY($1::text[])
+                       ORDER BY ticker, created_at DESC""",
+                    tickers,
                 )
-                if research:
-                    context["existing_research"] = dict(research)
+                attach_latest("existing_research", rows)
             except Exception:
                 pass  # Table may not exist in portfolio DB
 
             # 8. Deal attributes
             try:
-                attrs = await conn.fetchrow(
-                    "SELECT * FROM deal_attributes WHERE ticker = $1 ORDER BY created_at DESC LIMIT 1",
-                    ticker,
+                rows = await conn.fetch(
+                    """SELECT DISTINCT ON (ticker) * FROM deal_attributes
+                       WHERE ticker = ANY($1::text[])
+                       ORDER BY ticker, created_at DESC""",
+                    tickers,
                 )
-                if attrs:
-                    context["deal_attributes"] = dict(attrs)
+                attach_latest("deal_attributes", rows)
             except Exception:
                 pass  # Table may not exist in portfolio DB
 
             # 9. Options snapshot (latest row)
             if ENABLE_ENRICHED_CONTEXT:
                 try:
-                    opt_snap = await conn.fetchrow(
-                        """SELECT * FROM deal_options_snapshots
-                           WHERE ticker = $1
-                           ORDER BY snapshot_date DESC LIMIT 1""",
-                        ticker,
+                    rows = await conn.fetch(
+                        """SELECT DISTINCT ON (ticker) * FROM deal_options_snapshots
+                           WHERE ticker = ANY($1::text[])
+                           ORDER BY ticker, snapshot_date DESC""",
+                        tickers,
                     )
-                    if opt_snap:
-                        context["options_snapshot"] = dict(opt_snap)
+                    attach_latest("options_snapshot", rows)
                 except Exception:
                     pass  # Table may not exist yet
 
             # 10. Milestones
             if ENABLE_ENRICHED_CONTEXT:
                 try:
-                    milestones = await conn.fetch(
+                    rows = await conn.fetch(
                         """SELECT * FROM canonical_deal_milestones
-                           WHERE ticker = $1
+                           WHERE ticker = ANY($1::text[])
                            ORDER BY COALESCE(expected_date, milestone_date) ASC NULLS LAST""",
-                        ticker,
+                        tickers,
                     )
-                    context["milestones"] = [dict(m) for m in milestones]
+                    attach_lists("milestones", rows, always=True)
                 except Exception:
                     pass  # Table may not exist yet
 
             # 11. Open predictions (for update/supersede)
             if ENABLE_PREDICTIONS:
                 try:
-                    open_preds = await conn.fetch(
-                        """SELECT prediction_type, claim, by_date, probability,
+                    rows = await conn.fetch(
+                        """SELECT ticker, prediction_type, claim, by_date, probability,
                                   confidence, status, assessment_date
                            FROM deal_predictions
-                           WHERE ticker = $1 AND status = 'open'
+                           WHERE ticker = ANY($1::text[]) AND status = 'open'
                            ORDER BY assessment_date DESC""",
-                        ticker,
+                        tickers,
                     )
-                    if open_preds:
-                        context["open_predictions"] = [dict(p) for p in open_preds]
+                    attach_lists("open_predictions", rows, drop=("ticker",))
                 except Exception:
                     pass  # Table may not exist yet
 
             # 12. Recent human corrections (for feedback into next assessment)
             if ENABLE_REVIEW_QUEUE:
                 try:
-                    corrections = await conn.fetch("""
-                        SELECT ha.correct_signal, ha.corrected_grades,
-                               ha.corrected_probability, ha.probability_reasoning,
-                               ha.missed_reasoning, ha.error_type, ha.annotation_date
-                        FROM human_annotations ha
-                        JOIN human_review_items hri ON hri.id = ha.review_item_id
-                        WHERE hri.ticker = $1
-                          AND ha.annotation_date > CURRENT_DATE - INTERVAL '30 days'
-                        ORDER BY ha.annotation_date DESC LIMIT 3
-                    """, ticker)
-                    if corrections:
-                        context["human_corrections"] = [dict(c) for c in corrections]
+                    rows = await conn.fetch("""
+                        SELECT * FROM (
+                            SELECT hri.ticker, ha.correct_signal, ha.corrected_grades,
+                                   ha.corrected_probability, ha.probability_reasoning,
+                                   ha.missed_reasoning, ha.error_type, ha.annotation_date,
+                                   ROW_NUMBER() OVER (
+                                       PARTITION BY hri.ticker ORDER BY ha.annotation_date DESC
+                                   ) AS rn
+                            FROM human_annotations ha
+                            JOIN human_review_items hri ON hri.id = ha.review_item_id
+                            WHERE hri.ticker = ANY($1::text[])
+                              AND ha.annotation_date > CURRENT_DATE - INTERVAL '30 days'
+                        ) ranked
+                        WHERE rn <= 3
+                        ORDER BY ticker, rn
+                    """, tickers)
+                    attach_lists("human_corrections", rows, drop=("ticker", "rn"))
                 except Exception:
                     pass  # Table may not exist yet
 
         # 13. Latest position snapshot (M&A account)
         try:
             async with self.pool.acquire() as conn:
-                position = await conn.fetchrow(
-                    """SELECT position_qty, avg_cost FROM deal_position_snapshots
-                       WHERE ticker = $1 AND sec_type = 'STK'
-                       ORDER BY snapshot_date DESC LIMIT 1""",
-                    ticker,
+                rows = await conn.fetch(
+                    """SELECT DISTINCT ON (ticker) ticker, position_qty, avg_cost
+                       FROM deal_position_snapshots
+                       WHERE ticker = ANY($1::text[]) AND sec_type = 'STK'
+                       ORDER BY ticker, snapshot_date DESC""",
+                    tickers,
                 )
-            if position:
-                context["position_data"] = {
-                    "position_qty": float(position["position_qty"]),
-                    "avg_cost": float(position["avg_cost"]) if position["avg_cost"] else None,
-                }
+            for position in rows:
+                if position["ticker"] in contexts:
+                    contexts[position["ticker"]]["position_data"] = {
+                        "position_qty": float(position["position_qty"]),
+                        "avg_cost": float(position["avg_cost"]) if position["avg_cost"] else None,
+                    }
         except Exception:
             pass  # Table may not exist yet
 
         # 14. AI filing impact assessments (last 30 days)
         try:
             async with self.pool.acquire() as conn:
-                impacts = await conn.fetch(
-                    """SELECT filing_type, impact_level, summary, key_detail,
-                              risk_factor_affected, grade_change_suggested, assessed_at
-                       FROM portfolio_filing_impacts
-                       WHERE ticker = $1 AND assessed_at > NOW() - INTERVAL '30 days'
-                         AND impact_level != 'none'
-                       ORDER BY assessed_at DESC LIMIT 10""",
-                    ticker,
+                rows = await conn.fetch(
+                    """SELECT * FROM (
+                           SELECT ticker, filing_type, impact_level, summary, key_detail,
+                                  risk_factor_affected, grade_change_suggested, assessed_at,
+                                  ROW_NUMBER() OVER (
+                                      PARTITION BY ticker ORDER BY assessed_at DESC
+                                  ) AS rn
+                           FROM portfolio_filing_impacts
+                           WHERE ticker = ANY($1::text[]) AND assessed_at > NOW() - INTERVAL '30 days'
+                             AND impact_level != 'none'
+                       ) ranked
+                       WHERE rn <= 10
+                       ORDER BY ticker, rn""",
+                    tickers,
                 )
-            if impacts:
-                context["filing_impacts"] = [dict(i) for i in impacts]
+            attach_lists("filing_impacts", rows, drop=("ticker", "rn"))
         except Exception:
             pass  # Table may not exist yet
 
@@ -757,77 +885,29 @@ class RiskAssessmentEngine:
         # This ensures the 10-article limit prioritizes deal-relevant articles.
         try:
             async with self.pool.acquire() as conn:
-                articles = await conn.fetch(
-                    """SELECT title, publisher, published_at, summary,
-                              risk_factor_affected, relevance_score
-                       FROM deal_news_articles
-                       WHERE ticker = $1
-                         AND published_at > NOW() - INTERVAL '7 days'
-                       ORDER BY relevance_score DESC, published_at DESC LIMIT 10""",
-                    ticker,
+                rows = await conn.fetch(
+                    """SELECT * FROM (
+                           SELECT ticker, title, publisher, published_at, summary,
+                                  risk_factor_affected, relevance_score,
+                                  ROW_NUMBER() OVER (
+                                      PARTITION BY ticker
+                                      ORDER BY relevance_score DESC, published_at DESC
+                                  ) AS rn
+                           FROM deal_news_articles
+                           WHERE ticker = ANY($1::text[])
+                             AND published_at > NOW() - INTERVAL '7 days'
+                       ) ranked
+                       WHERE rn <= 10
+                       ORDER BY ticker, rn""",
+                    tickers,
                 )
-            if articles:
-                context["news_articles"] = [dict(a) for a in articles]
+            attach_lists("news_articles", rows, drop=("ticker", "rn"))
         except Exception:
             pass  # Table may not exist yet
 
-        # Compute spread-implied probability (renamed from options-implied)
-        if ENABLE_ENRICHED_CONTEXT:
-            from .signals import compute_spread_implied_probability
-
-            current_price = context.get("sheet_row", {}).get("current_price")
-            deal_price = context.get("sheet_row", {}).get("deal_price")
-            spread_prob = compute_spread_implied_probability(current_price, deal_price)
-            if spread_prob is not None:
-                context["spread_implied_probability"] = spread_prob
-                # Backward-compat alias for existing assessments
-                context["options_implied_probability"] = spread_prob
-
-        # Build three-signal comparison
-        if ENABLE_ENRICHED_CONTEXT:
-            from .signals import build_signal_comparison
-
-            sheet_prob = None
-            deal_details = context.get("deal_details")
-            if deal_details and deal_details.get("probability_of_success") is not None:
-                try:
-                    sheet_prob = float(deal_details["probability_of_success"]) / 100.0
-                except (ValueError, TypeError):
-                    pass
-
-            prev_ai_prob = None
-            prev_assessment = context.get("previous_assessment")
-            if prev_assessment and prev_assessment.get("our_prob_success") is not None:
-                try:
-                    prev_ai_prob = float(prev_assessment["our_prob_success"]) / 100.0
-                except (ValueError, TypeError):
-                    pass
-
-            options_implied = context.get("options_implied_probability")
-            signal_comp = build_signal_comparison(options_implied, sheet_prob, prev_ai_prob)
-            if signal_comp is not None:
-                context["signal_comparison"] = signal_comp
-
-        # Live price: use sheet row's current_price for now
-        if row and row.get("current_price") is not None:
-            context["live_price"] = {
-                "price": float(row["current_price"]),
-                "change": float(row["price_change"]) if row.get("price_change") is not None else None,
-            }
-
-        # Build sheet comparison data for the prompt
-        sheet_comparison = {}
-        if row:
-            sheet_comparison["vote_risk"] = row.get("vote_risk")
-            sheet_comparison["finance_risk"] = row.get("finance_risk")
-            sheet_comparison["legal_risk"] = row.get("legal_risk")
-            sheet_comparison["investable"] = row.get("investable")
-        if details:
-            sheet_comparison["prob_success"] = details.get("probability_of_success")
-        if sheet_comparison:
-            context["sheet_comparison"] = sheet_comparison
-
-        return context
+        for context in contexts.values():
+            _derive_context_signals(context)
+        return contexts
 
     # ------------------------------------------------------------------
     # Single deal assessment
@@ -857,7 +937,8 @@ class RiskAssessmentEngine:
 
         # --- CLI path (Max subscription, $0/call) ---
         if USE_CLI_ASSESSMENT:
-            cli_result = _call_claude_cli(
+            cli_result = await asyncio.to_thread(
+                _call_claude_cli,
                 system_prompt=sys_text,
                 user_prompt=prompt,
                 ticker=ticker,
@@ -922,7 +1003,10 @@ class RiskAssessmentEngine:
 
         t0 = time.monotonic()
         try:
-            response = self.anthropic.messages.create(
+            # Sync client in a worker thread: keeps the event loop free while
+            # other deals are in the model stage
+            response = await asyncio.to_thread(
+                self.anthropic.messages.create,
                 model=model,
                 temperature=0,
                 max_tokens=4096,
@@ -1223,9 +1307,36 @@ class RiskAssessmentEngine:
         reuse_bucket = []   # tickers that can reuse previous assessment
         api_bucket = []     # tickers that need API calls
 
-        for ticker in tickers:
+        # Resume: deals already stored today by a run that never finished are
+        # adopted by this run instead of being assessed again
+        resumed = await self._adopt_unfinished_assessments(run_id, run_date, tickers)
+        for ticker, row in resumed.items():
+            assessed += 1
+            if row.get("needs_attention"):
+                flagged += 1
+            results.append({
+                "ticker": ticker,
+                "status": "success",
+                "strategy": "resumed",
+                "needs_attention": bool(row.get("needs_attention")),
+            })
+        if resumed:
+            logger.info("Resuming run: %d deals already stored today are skipped", len(resumed))
+        pending_tickers = [t for t in tickers if t not in resumed]
+
+        phase1_start = time.monotonic()
+        try:
+            bulk_contexts = await self.collect_deal_contexts(pending_tickers)
+        except Exception as e:
+            # Fall back to per-deal collection so failures are attributed per ticker
+            logger.warning("Bulk context collection failed, collecting per deal: %s", e)
+            bulk_contexts = {}
+
+        for ticker in pending_tickers:
             try:
-                context = await self.collect_deal_context(ticker)
+                context = bulk_contexts.get(ticker)
+                if context is None:
+                    context = await self.collect_deal_context(ticker)
 
                 if calibration_text:
                     context["calibration_text"] = calibration_text
@@ -1286,6 +1397,12 @@ class RiskAssessmentEngine:
                 results.append({"ticker": ticker, "status": "failed", "error": str(e)})
                 logger.error("Failed to collect context for %s: %s", ticker, e, exc_info=True)
 
+        phase1_seconds = round(time.monotonic() - phase1_start, 3)
+        logger.info(
+            "Phase 1: collected %d contexts in %.2fs (%d reuse, %d API)",
+            len(deal_contexts), phase1_seconds, len(reuse_bucket), len(api_bucket),
+        )
+
         # --- Budget pre-check (after we know how many API calls are needed) ---
         # Skip budget check when using CLI — CLI uses Max subscription ($0 marginal cost)
         if api_bucket and not USE_CLI_ASSESSMENT:
@@ -1372,21 +1489,23 @@ class RiskAssessmentEngine:
                 logger.warning("Batch mode failed, falling back to sequential: %s", e)
                 batch_results = {}
 
-        for ticker in api_bucket:
+        # Each deal runs prompt -> model -> store on its own task, bounded per
+        # stage, and is persisted as soon as it finishes (a slow deal no longer
+        # holds up the rest, and a crash keeps everything stored so far).
+        prompt_stage = PipelineStage("prompt", None)
+        model_stage = PipelineStage("model", RISK_MODEL_CONCURRENCY)
+        store_stage = PipelineStage("store", RISK_STORE_CONCURRENCY)
+        stages = [prompt_stage, model_stage, store_stage]
+
+        async def run_api_deal(ticker: str) -> dict:
+            outcome = {"ticker": ticker, "strategy": None, "savings": 0.0}
             try:
                 dc = deal_contexts[ticker]
                 context = dc["context"]
                 prev = dc["prev"]
                 significance = dc["significance"]
                 change_list = dc["change_list"]
-
-                # Smart model routing based on significance
-                routed_model = get_model_for_significance(significance.value)
-                # Guard: if we're in the API bucket, "reuse" isn't valid — use full model
-                if routed_model == "reuse":
-                    routed_model = get_model("full_assessment")
-
-                strategy = "full"
+                is_delta = significance in (ChangeSignificance.MINOR, ChangeSignificance.MODERATE) and bool(prev)
                 assessment = None
 
                 # Check if batch already handled this ticker
@@ -1397,12 +1516,7 @@ class RiskAssessmentEngine:
                         logger.warning("Batch failed for %s, retrying sequentially", ticker)
                         assessment = None
                     else:
-                        if significance in (ChangeSignificance.MINOR, ChangeSignificance.MODERATE) and prev:
-                            strategy = "delta"
-                            delta_deals += 1
-                        else:
-                            strategy = "full"
-                            full_deals += 1
+                        outcome["strategy"] = "delta" if is_delta else "full"
 
                         # Log batch result to unified API call tracker
                         try:
@@ -1424,44 +1538,70 @@ class RiskAssessmentEngine:
                             pass  # Non-fatal
 
                 if assessment is None:
-                    # Sequential fallback (or batch not used)
-                    if significance in (ChangeSignificance.MINOR, ChangeSignificance.MODERATE) and prev:
-                        strategy = "delta"
-                        delta_deals += 1
+                    outcome["strategy"] = "delta" if is_delta else "full"
+                    async with prompt_stage.slot():
+                        # Smart model routing based on significance
+                        routed_model = get_model_for_significance(significance.value)
+                        # Guard: if we're in the API bucket, "reuse" isn't valid — use full model
+                        if routed_model == "reuse":
+                            routed_model = get_model("full_assessment")
+                        if is_delta:
+                            system_prompt = RISK_DELTA_SYSTEM_PROMPT
+                            user_prompt = build_delta_assessment_prompt(
+                                context, prev, change_list, significance.value,
+                            )
+                        else:
+                            system_prompt = None
+                            user_prompt = build_deal_assessment_prompt(context)
 
-                        delta_prompt = build_delta_assessment_prompt(
-                            context, prev, change_list, significance.value,
-                        )
+                    async with model_stage.slot():
                         assessment = await self.assess_single_deal(
                             context,
-                            system_prompt=RISK_DELTA_SYSTEM_PROMPT,
-                            user_prompt=delta_prompt,
+                            system_prompt=system_prompt,
+                            user_prompt=user_prompt,
                             model=routed_model,
                         )
-                        meta = assessment.get("_meta", {})
-                        estimated_savings += max(0, avg_full_cost - meta.get("cost_usd", 0))
-                    else:
-                        strategy = "full"
-                        full_deals += 1
-                        assessment = await self.assess_single_deal(
-                            context, model=routed_model,
-                        )
+                        # Pacing delay: spread CLI calls across the overnight window
+                        # to avoid hitting the Max subscription's rolling 5h usage
+                        # allocation. The slot is held so pacing applies per slot.
+                        if RISK_CALL_SPACING_SEC > 0 and model_stage.waiting:
+                            logger.info(
+                                "Pacing: waiting %ds before next assessment...",
+                                RISK_CALL_SPACING_SEC,
+                            )
+                            await asyncio.sleep(RISK_CALL_SPACING_SEC)
 
-                    # Pacing delay: spread CLI calls across the overnight window
-                    # to avoid hitting the Max subscription's rolling 5h usage allocation.
-                    if RISK_CALL_SPACING_SEC > 0 and ticker != api_bucket[-1]:
-                        logger.info(
-                            "Pacing: waiting %ds before next assessment...",
-                            RISK_CALL_SPACING_SEC,
-                        )
-                        await asyncio.sleep(RISK_CALL_SPACING_SEC)
+                    if is_delta:
+                        meta = assessment.get("_meta", {})
+                        outcome["savings"] = max(0, avg_full_cost - meta.get("cost_usd", 0))
 
-                proc_stats = await self._process_assessment_result(
-                    run_id, run_date, ticker, assessment, context,
-                    significance, change_list, dc["ctx_hash"],
-                    strategy, results,
-                )
+                async with store_stage.slot():
+                    outcome["proc_stats"] = await self._process_assessment_result(
+                        run_id, run_date, ticker, assessment, context,
+                        significance, change_list, dc["ctx_hash"],
+                        outcome["strategy"], results,
+                    )
+                outcome["assessment"] = assessment
+            except Exception as e:
+                outcome["error"] = str(e)
+                logger.error("Failed to assess %s: %s", ticker, e, exc_info=True)
+            return outcome
+
+        last_stats_write = time.monotonic()
+        for next_done in asyncio.as_completed([run_api_deal(t) for t in api_bucket]):
+            outcome = await next_done
+            if outcome["strategy"] == "delta":
+                delta_deals += 1
+            elif outcome["strategy"] == "full":
+                full_deals += 1
+            if "error" in outcome:
+                failed += 1
+                results.append({"ticker": outcome["ticker"], "status": "failed", "error": outcome["error"]})
+            else:
+                assessment = outcome["assessment"]
+                proc_stats = outcome["proc_stats"]
                 assessed += 1
+                estimated_savings += outcome["savings"]
                 meta = assessment.get("_meta", {})
                 total_tokens += meta.get("tokens_used", 0)
                 total_cost += meta.get("cost_usd", 0)
@@ -1471,10 +1611,15 @@ class RiskAssessmentEngine:
                 if proc_stats["score_changes"] > 0:
                     changed += 1
 
-            except Exception as e:
-                failed += 1
-                results.append({"ticker": ticker, "status": "failed", "error": str(e)})
-                logger.error("Failed to assess %s: %s", ticker, e, exc_info=True)
+            if time.monotonic() - last_stats_write >= RISK_PIPELINE_STATS_INTERVAL_SEC:
+                await self._record_pipeline_stats(
+                    run_id, pipeline_stats(stages, phase1_seconds=phase1_seconds, resumed_deals=len(resumed)),
+                )
+                last_stats_write = time.monotonic()
+
+        run_pipeline_stats = pipeline_stats(
+            stages, phase1_seconds=phase1_seconds, resumed_deals=len(resumed),
+        )
 
         # Generate run summary
         summary = None
@@ -1512,6 +1657,7 @@ class RiskAssessmentEngine:
                 total_tokens, total_cost, summary,
                 reused_deals, delta_deals, full_deals, round(estimated_savings, 4),
             )
+        await self._record_pipeline_stats(run_id, run_pipeline_stats)
 
         logger.info(
             "Risk run %s completed: %d/%d assessed (%d reused, %d delta, %d full), "
@@ -1589,6 +1735,9 @@ class RiskAssessmentEngine:
             "delta_deals": delta_deals,
             "full_deals": full_deals,
             "estimated_savings_usd": round(estimated_savings, 4),
+            "phase1_seconds": phase1_seconds,
+            "resumed_deals": len(resumed),
+            "pipeline": run_pipeline_stats,
             "batch_mode": batch_used if ENABLE_BATCH_MODE else False,
             "summary": summary,
             "results": results,
@@ -2367,6 +2516,42 @@ Keep it actionable and direct."""
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
+    async def _adopt_unfinished_assessments(self, run_id, run_date, tickers) -> dict[str, dict]:
+        """Move today's assessments stored by an unfinished run onto ``run_id``.
+
+        A run that crashed or was interrupted part-way has already persisted
+        some deals; this run takes those rows over and skips the tickers.
+        Returns {ticker: {"ticker", "needs_attention"}} for the adopted rows.
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """UPDATE deal_risk_assessments dra
+                       SET run_id = $1
+                       FROM risk_assessment_runs r
+                       WHERE r.id = dra.run_id AND r.id <> $1
+                         AND r.status IN ('running', 'interrupted', 'failed')
+                         AND dra.assessment_date = $2
+                         AND dra.ticker = ANY($3::text[])
+                       RETURNING dra.ticker, dra.needs_attention""",
+                    run_id, run_date, tickers,
+                )
+        except Exception as e:
+            logger.warning("Could not check for unfinished runs to resume: %s", e)
+            return {}
+        return {r["ticker"]: dict(r) for r in rows}
+
+    async def _record_pipeline_stats(self, run_id, stats: dict):
+        """Write per-stage latency / queue depth to the run record (non-fatal)."""
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE risk_assessment_runs SET pipeline_stats = $2 WHERE id = $1",
+                    run_id, json.dumps(stats),
+                )
+        except Exception as e:
+            logger.warning("Failed to record pipeline stats for run %s: %s", run_id, e)
+
     async def _finish_run(self, run_id, status, error=None):
         """Mark a run as finished (used for early exits)."""
         async with self.pool.acquire() as conn:
@@ -0,0 +1,78 @@
+"""Concurrency-limited stages for the morning risk assessment pipeline.
+
+Each API-bucket deal flows through prompt -> model -> store on its own task;
+a PipelineStage bounds how many deals may be inside a stage at once and
+records per-stage latency and queue depth for the risk_assessment_runs row.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class PipelineStage:
+    """A named concurrency limit with latency and queue-depth accounting.
+
+    limit=None only times the stage: for work that never awaits (such as
+    building prompts) a semaphore would never be contended.
+    """
+
+    def __init__(self, name: str, limit: int | None):
+        self.name = name
+        self.limit = max(1, limit) if limit is not None else None
+        self._sem = asyncio.Semaphore(self.limit) if self.limit is not None else None
+        self.waiting = 0
+        self.active = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self._latencies_ms: list[float] = []
+        self._waits_ms: list[float] = []
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the stage's slots for the duration of the block."""
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.waiting)
+        try:
+            if self._sem is not None:
+                await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.monotonic()
+        self._waits_ms.append((started - queued_at) * 1000)
+        self.active += 1
+        try:
+            yield
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+        finally:
+            self.active -= 1
+            if self._sem is not None:
+                self._sem.release()
+            self._latencies_ms.append((time.monotonic() - started) * 1000)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies_ms)
+        n = len(latencies)
+        return {
+            "limit": self.limit,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queued": self.waiting,
+            "in_flight": self.active,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_ms": round(sum(latencies) / n, 1) if n else None,
+            "p95_ms": round(latencies[min(n - 1, int(n * 0.95))], 1) if n else None,
+            "max_ms": round(latencies[-1], 1) if n else None,
+            "avg_wait_ms": round(sum(self._waits_ms) / len(self._waits_ms), 1) if self._waits_ms else None,
+        }
+
+
+def pipeline_stats(stages: list[PipelineStage], **extra) -> dict:
+    """Snapshot of all stages, keyed by stage name, plus run-level extras."""
+    return {**extra, "stages": {stage.name: stage.stats() for stage in stages}}
@@ -16,6 +16,7 @@ if sys.platform == 'win32':
 
 import pandas as pd
 import numpy as np
+from scipy.special import ndtr  # == scipy.stats.norm.cdf, without the per-call overhead
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
@@ -46,6 +47,8 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from app.options.columnar import find_best_opportunities_columnar
+
 logger = logging.getLogger(__name__)
 
 
@@ -925,6 +928,8 @@ class MergerArbAnalyzer:
     Analyze option opportunities for merger arbitrage
     """
 
+    ENGINES = ("columnar", "scalar")
+
     def __init__(self, deal: DealInput):
         self.deal = deal
         self.risk_free_rate = 0.05  # 5% risk-free rate
@@ -1306,24 +1311,22 @@ class MergerArbAnalyzer:
     def calculate_probability_itm(self, current: float, target: float,
                                   vol: float, time: float) -> float:
         """Calculate probability of being in the money using Black-Scholes d2."""
-        from scipy import stats
 
         if vol <= 0 or time <= 0 or current <= 0 or target <= 0:
             return 0.5
 
         d2 = (np.log(current / target) + (self.risk_free_rate - 0.5 * vol**2) * time) / (vol * np.sqrt(time))
-        return float(stats.norm.cdf(d2))
+        return float(ndtr(d2))
 
     def calculate_probability_above(self, current: float, target: float,
                                    vol: float, time: float) -> float:
         """Calculate probability of price being above target using Black-Scholes d2."""
-        from scipy import stats
 
         if vol <= 0 or time <= 0 or current <= 0 or target <= 0:
             return 0.5
 
         d2 = (np.log(current / target) + (self.risk_free_rate - 0.5 * vol**2) * time) / (vol * np.sqrt(time))
-        return float(stats.norm.cdf(d2))
+        return float(ndtr(d2))
 
     def get_market_implied_probability(self, current: float, deal_price: float,
                                       option_cost: float, strike: float) -> float:
@@ -1351,7 +1354,8 @@ class MergerArbAnalyzer:
                                put_long_strike_lower_pct: float = 0.25,
                                put_long_strike_upper_pct: float = 0.0,    # hardcoded at deal
                                put_short_strike_lower_pct: float = 0.05,
-                               put_short_strike_upper_pct: float = 0.03) -> List[TradeOpportunity]:
+                               put_short_strike_upper_pct: float = 0.03,
+                               engine: str = "columnar") -> List[TradeOpportunity]:
         """
         Find the best opportunities from option chain
         
@@ -1364,7 +1368,14 @@ class MergerArbAnalyzer:
             put_long_strike_upper_pct: % BELOW deal for long put (shallowest, 0 = at deal)
             put_short_strike_lower_pct: % BELOW deal for short put
             put_short_strike_upper_pct: % ABOVE deal for short put
+            engine: "columnar" (default) scores the whole chain with NumPy and
+                only builds TradeOpportunity objects for the per-expiration
+                winners; "scalar" analyzes every candidate individually.
+                Both return identical results; columnar falls back to scalar
+                for chains with missing/non-numeric fields.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {self.ENGINES}")
         from collections import defaultdict
 
         opportunities = []
@@ -1385,6 +1396,22 @@ class MergerArbAnalyzer:
         put_short_lower_mult = 1.0 - put_short_strike_lower_pct   # e.g., 0.05 -> 0.95
         put_short_upper_mult = 1.0 + put_short_strike_upper_pct   # e.g., 0.03 -> 1.03
 
+        if engine == "columnar":
+            selected = find_best_opportunities_columnar(
+                self, options, current_price,
+                call_long_bounds=(call_long_lower_bound, call_long_upper_bound),
+                call_short_bounds=(self.deal.total_deal_value * call_short_lower_mult,
+                                   self.deal.total_deal_value * call_short_upper_mult),
+                put_long_bounds=(put_long_lower_bound, put_long_upper_bound),
+                put_short_bounds=(self.deal.total_deal_value * put_short_lower_mult,
+                                  self.deal.total_deal_value * put_short_upper_mult),
+            )
+            if selected is not None:
+                self._log_scan_summary(selected, engine)
+                return selected
+            logger.debug("Options scan for %s: chain not columnar-safe, using scalar engine", self.deal.ticker)
+            engine = "scalar"
+
         # Analyze single calls - group by expiration and select top 3 per expiration
         calls_only = [opt for opt in options if opt.right == 'C']
         eligible_calls = [opt for opt in calls_only if opt.strike < self.deal.total_deal_value]
@@ -1494,14 +1521,17 @@ class MergerArbAnalyzer:
             expiry_put_spreads.sort(key=lambda x: x.annualized_return_ft, reverse=True)
             opportunities.extend([o for o in expiry_put_spreads[:5] if o.annualized_return_ft > 0])
 
+        self._log_scan_summary(opportunities, engine)
+        return opportunities
+
+    def _log_scan_summary(self, opportunities: List[TradeOpportunity], engine: str) -> None:
         logger.info(
-            "Options scan for %s: %d opportunities (calls=%d, cc=%d, spreads=%d, put_spreads=%d)",
+            "Options scan for %s: %d opportunities (calls=%d, cc=%d, spreads=%d, put_spreads=%d, engine=%s)",
             self.deal.ticker,
             len(opportunities),
             sum(1 for o in opportunities if o.strategy == "call"),
             sum(1 for o in opportunities if o.strategy == "covered_call"),
             sum(1 for o in opportunities if o.strategy == "spread"),
             sum(1 for o in opportunities if o.strategy == "put_spread"),
+            engine,
         )
-
-        return opportunities
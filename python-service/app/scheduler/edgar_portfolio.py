@@ -11,12 +11,13 @@ via MessagingService.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 import httpx
 
 from app.risk.filing_impact import assess_filing_impact
 from app.services.messaging import MessagingService
+from app.services.sec_ticker_index import SecTickerIndex, get_sec_ticker_index
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +49,8 @@ MATERIAL_FILING_TYPES = {
     "DEFM14A", "PREM14A", "S-4", "S-4/A", "425",
 }
 
-# Module-level CIK cache: ticker -> (cik_int, company_title)
-_cik_cache: Dict[str, Tuple[int, str]] = {}
+# Shared SEC ticker index, (re)bound at the start of each check
+_cik_index: Optional[SecTickerIndex] = None
 
 
 async def check_portfolio_edgar_filings(
@@ -202,37 +203,24 @@ async def _get_active_tickers_with_context(pool) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 async def _ensure_cik_cache() -> None:
-    """Load the SEC ticker→CIK mapping into module-level cache (once)."""
-    global _cik_cache
-    if _cik_cache:
-        return
-
-    url = "https://www.sec.gov/files/company_tickers.json"
+    """Bind the process-wide SEC ticker index (loaded once, refreshed daily)."""
+    global _cik_index
     try:
-        async with httpx.AsyncClient(timeout=15.0, headers=SEC_HEADERS) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-        _cik_cache = {
-            v["ticker"]: (v["cik_str"], v.get("title", ""))
-            for v in data.values()
-            if v.get("ticker")
-        }
-        logger.info("[edgar_portfolio] Loaded CIK cache: %d tickers", len(_cik_cache))
+        _cik_index = await get_sec_ticker_index()
     except Exception:
         logger.error("[edgar_portfolio] Failed to load CIK cache", exc_info=True)
 
 
 def _get_cik(ticker: str) -> Optional[int]:
     """Return CIK for a ticker, or None if not found."""
-    entry = _cik_cache.get(ticker)
-    return entry[0] if entry else None
+    company = _cik_index.by_ticker(ticker) if _cik_index else None
+    return company.cik_int if company else None
 
 
 def _get_company_title(ticker: str) -> str:
     """Return SEC company title for a ticker."""
-    entry = _cik_cache.get(ticker)
-    return entry[1] if entry else ""
+    company = _cik_index.by_ticker(ticker) if _cik_index else None
+    return company.title if company else ""
 
 
 # ---------------------------------------------------------------------------
@@ -391,12 +379,12 @@ def _extract_ticker_from_name(name: str) -> Optional[str]:
         return None
     # If the name is itself a valid ticker (all caps, short)
     cleaned = name.strip().upper()
-    if len(cleaned) <= 5 and cleaned.isalpha() and cleaned in _cik_cache:
+    if len(cleaned) <= 5 and cleaned.isalpha() and _get_cik(cleaned) is not None:
         return cleaned
     # Check for ticker in parentheses
     import re
     m = re.search(r'\(([A-Z]{1,5})\)', name)
-    if m and m.group(1) in _cik_cache:
+    if m and _get_cik(m.group(1)) is not None:
         return m.group(1)
     return None
 
@@ -0,0 +1,249 @@
+"""Process-wide SEC ticker <-> CIK <-> company-name index.
+
+Built from SEC's company_tickers.json, which used to be downloaded separately
+(and scanned linearly) by TickerScanner, CompanyMetadataResolver,
+TickerLookupService and the portfolio EDGAR job. The index is:
+
+- loaded once per process and shared by every caller of get_sec_ticker_index()
+- persisted to a local file, so a cold start does not wait on sec.gov
+- refreshed in the background with a conditional GET (ETag / Last-Modified)
+  once it is older than SEC_TICKER_MAP_MAX_AGE_SEC
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SEC_COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+
+SEC_USER_AGENT = os.environ.get("SEC_USER_AGENT", "M&A Tracker don@limitlessventures.us")
+
+# Local copy used for fast cold starts (container HOME may not be writable)
+SEC_TICKER_MAP_PATH = os.environ.get(
+    "SEC_TICKER_MAP_PATH",
+    os.path.join(tempfile.gettempdir(), "ma-tracker-cache", "sec_company_tickers.json"),
+)
+
+# SEC regenerates the file daily
+SEC_TICKER_MAP_MAX_AGE_SEC = float(os.environ.get("SEC_TICKER_MAP_MAX_AGE_SEC", str(24 * 3600)))
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+
+def normalize_company_name(name: str) -> str:
+    """Uppercase, punctuation-free, single-spaced form used by the name index."""
+    return _NON_ALNUM.sub(" ", (name or "").upper()).strip()
+
+
+def pad_cik(cik: Union[int, str]) -> str:
+    """10-digit zero-padded CIK string."""
+    return str(cik).strip().zfill(10)
+
+
+@dataclass(frozen=True)
+class SecCompany:
+    cik: str  # 10-digit, zero-padded
+    ticker: str  # uppercase
+    title: str  # as published by SEC
+
+    @property
+    def cik_int(self) -> int:
+        return int(self.cik)
+
+
+class SecTickerIndex:
+    """Immutable lookup tables over one company_tickers.json payload.
+
+    Ticker and CIK lookups are dict hits; name prefix search bisects a sorted
+    list of normalized names. A CIK with several listed share classes maps to
+    its first entry in the SEC file (SEC orders the file by primary listing).
+    """
+
+    def __init__(self, raw: Dict[str, dict], etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, fetched_at: Optional[float] = None):
+        self.raw = raw
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        self._by_ticker: Dict[str, SecCompany] = {}
+        self._by_cik: Dict[str, List[SecCompany]] = {}
+        self._by_title: Dict[str, SecCompany] = {}
+        names = []
+        for entry in raw.values():
+            ticker = (entry.get("ticker") or "").upper()
+            if not ticker or entry.get("cik_str") is None:
+                continue
+            company = SecCompany(pad_cik(entry["cik_str"]), ticker, entry.get("title") or "")
+            self._by_ticker.setdefault(ticker, company)
+            self._by_cik.setdefault(company.cik, []).append(company)
+            self._by_title.setdefault(company.title.upper(), company)
+            names.append((normalize_company_name(company.title), ticker))
+        names.sort()
+        self._names = names
+        self._name_keys = [n for n, _ in names]
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def companies(self) -> List[SecCompany]:
+        return list(self._by_ticker.values())
+
+    def by_ticker(self, ticker: str) -> Optional[SecCompany]:
+        return self._by_ticker.get((ticker or "").upper())
+
+    def by_cik(self, cik: Union[int, str]) -> Optional[SecCompany]:
+        listed = self._by_cik.get(pad_cik(cik))
+        return listed[0] if listed else None
+
+    def tickers_for_cik(self, cik: Union[int, str]) -> List[str]:
+        return [c.ticker for c in self._by_cik.get(pad_cik(cik), [])]
+
+    def by_title(self, title: str) -> Optional[SecCompany]:
+        """Exact (case-insensitive) SEC title match."""
+        return self._by_title.get((title or "").upper())
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[SecCompany]:
+        """Companies whose normalized name starts with the normalized prefix."""
+        key = normalize_company_name(prefix)
+        if not key:
+            return []
+        matches = []
+        names = self._names
+        for i in range(bisect.bisect_left(self._name_keys, key), len(names)):
+            name, ticker = names[i]
+            if not name.startswith(key) or len(matches) >= limit:
+                break
+            matches.append(self._by_ticker[ticker])
+        return matches
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+_index: Optional[SecTickerIndex] = None
+_load_lock: Optional[asyncio.Lock] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def _read_cache_file(path: str) -> Optional[SecTickerIndex]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        return SecTickerIndex(
+            cached["companies"], cached.get("etag"), cached.get("last_modified"), cached.get("fetched_at"),
+        )
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable SEC ticker cache %s: %s", path, e)
+        return None
+
+
+def _write_cache_file(path: str, index: SecTickerIndex) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "etag": index.etag,
+                "last_modified": index.last_modified,
+                "fetched_at": index.fetched_at,
+                "companies": index.raw,
+            }, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning("Could not persist SEC ticker cache to %s: %s", path, e)
+
+
+async def _fetch(current: Optional[SecTickerIndex], client: Optional[httpx.AsyncClient]) -> SecTickerIndex:
+    """GET company_tickers.json, conditional on the current copy's validators."""
+    headers = {"User-Agent": SEC_USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    if current is not None:
+        if current.etag:
+            headers["If-None-Match"] = current.etag
+        if current.last_modified:
+            headers["If-Modified-Since"] = current.last_modified
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+    try:
+        response = await client.get(SEC_COMPANY_TICKERS_URL, headers=headers)
+    finally:
+        if own_client:
+            await client.aclose()
+
+    if response.status_code == 304 and current is not None:
+        logger.info("SEC ticker map unchanged (304), %d tickers", len(current))
+        current.fetched_at = time.time()
+        return current
+    response.raise_for_status()
+    index = SecTickerIndex(
+        response.json(), response.headers.get("ETag"), response.headers.get("Last-Modified"),
+    )
+    logger.info("Loaded SEC ticker map: %d tickers", len(index))
+    return index
+
+
+async def refresh_sec_ticker_index(client: Optional[httpx.AsyncClient] = None) -> SecTickerIndex:
+    """Conditionally re-download the map now, persist it, and swap it in."""
+    global _index
+    index = await _fetch(_index, client)
+    _index = index
+    await asyncio.to_thread(_write_cache_file, SEC_TICKER_MAP_PATH, index)
+    return index
+
+
+async def _background_refresh(client: Optional[httpx.AsyncClient]) -> None:
+    try:
+        await refresh_sec_ticker_index(client)
+    except Exception as e:
+        logger.warning("SEC ticker map refresh failed, keeping cached copy: %s", e)
+
+
+async def get_sec_ticker_index(client: Optional[httpx.AsyncClient] = None) -> SecTickerIndex:
+    """Return the shared index, loading it from disk or sec.gov on first use.
+
+    A stale index is returned as-is while a single background task refreshes
+    it; only a process with neither a loaded index nor a local copy waits on
+    the network. ``client`` (optional) is the caller's SEC httpx client.
+    """
+    global _index, _load_lock, _refresh_task
+    index = _index
+    if index is None:
+        if _load_lock is None:
+            _load_lock = asyncio.Lock()
+        async with _load_lock:
+            if _index is None:
+                _index = await asyncio.to_thread(_read_cache_file, SEC_TICKER_MAP_PATH)
+                if _index is not None:
+                    logger.info("Loaded SEC ticker map from %s: %d tickers", SEC_TICKER_MAP_PATH, len(_index))
+                else:
+                    await refresh_sec_ticker_index(client)
+            index = _index
+
+    if time.time() - index.fetched_at > SEC_TICKER_MAP_MAX_AGE_SEC and (
+        _refresh_task is None or _refresh_task.done()
+    ):
+        _refresh_task = asyncio.create_task(_background_refresh(client))
+    return index
+
+
+def reset_sec_ticker_index() -> None:
+    """Drop the in-process index (tests)."""
+    global _index, _load_lock, _refresh_task
+    _index = None
+    _load_lock = None
+    _refresh_task = None
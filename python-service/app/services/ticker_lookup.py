@@ -6,10 +6,11 @@ import asyncio
 import logging
 import httpx
 from typing import Optional, Dict, List
-from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 import re
 
+from app.services.sec_ticker_index import SecTickerIndex, get_sec_ticker_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,17 +19,15 @@ class TickerLookupService:
     Lookup ticker symbols from company names using SEC data with caching.
 
     Features:
-    - Downloads SEC's ticker mapping on first use
-    - Caches in memory for fast lookups
+    - Uses the process-wide SEC ticker index (loaded once, refreshed daily)
+    - O(1) ticker and exact-name lookups
     - Fuzzy matching for company name variations
-    - 24-hour cache TTL
     """
 
     def __init__(self):
-        # SEC ticker data cache
+        # Ticker-keyed view of the shared SEC ticker index
         self._ticker_cache: Optional[Dict[str, Dict]] = None
-        self._cache_loaded_at: Optional[datetime] = None
-        self._cache_ttl = timedelta(hours=24)  # Refresh daily
+        self._sec_index: Optional[SecTickerIndex] = None
 
         # HTTP client with proper SEC headers
         self.client = httpx.AsyncClient(
@@ -39,9 +38,9 @@ class TickerLookupService:
             }
         )
 
-    async def _load_sec_ticker_data(self) -> Dict[str, Dict]:
+    def _build_ticker_cache(self, index: SecTickerIndex) -> Dict[str, Dict]:
         """
-        Load ticker mapping from SEC.
+        Build the ticker-keyed view of the shared SEC ticker index.
 
         Returns:
             Dict mapping ticker (uppercase) to company data:
@@ -54,44 +53,27 @@ class TickerLookupService:
                 ...
             }
         """
-        try:
-            logger.info("Loading SEC ticker mapping data...")
-
-            url = "https://www.sec.gov/files/company_tickers.json"
-            response = await self.client.get(url)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Convert to ticker-keyed dict for faster lookups
-            ticker_map = {}
-            for item_id, company_data in data.items():
-                ticker = company_data.get("ticker", "").upper()
-                if ticker:
-                    ticker_map[ticker] = {
-                        "cik_str": company_data.get("cik_str"),
-                        "ticker": ticker,
-                        "title": company_data.get("title", "").upper()
-                    }
-
-            logger.info(f"Loaded {len(ticker_map)} ticker mappings from SEC")
-            return ticker_map
+        ticker_map = {
+            c.ticker: {"cik_str": c.cik_int, "ticker": c.ticker, "title": c.title.upper()}
+            for c in index.companies()
+        }
+        logger.info(f"Loaded {len(ticker_map)} ticker mappings from SEC")
+        return ticker_map
 
+    async def _ensure_cache_loaded(self) -> None:
+        """Ensure ticker cache is built from the current shared SEC index"""
+        try:
+            index = await get_sec_ticker_index()
         except Exception as e:
             logger.error(f"Failed to load SEC ticker data: {e}")
-            return {}
-
-    async def _ensure_cache_loaded(self) -> None:
-        """Ensure ticker cache is loaded and fresh"""
-        now = datetime.now()
-
-        # Load if not loaded or expired
-        if (self._ticker_cache is None or
-            self._cache_loaded_at is None or
-            now - self._cache_loaded_at > self._cache_ttl):
+            if self._ticker_cache is None:
+                self._ticker_cache = {}
+            return
 
-            self._ticker_cache = await self._load_sec_ticker_data()
-            self._cache_loaded_at = now
+        # The shared index refreshes itself daily; rebuild when it was swapped
+        if self._ticker_cache is None or index is not self._sec_index:
+            self._ticker_cache = self._build_ticker_cache(index)
+            self._sec_index = index
 
     def _similarity_score(self, str1: str, str2: str) -> float:
         """
@@ -201,14 +183,14 @@ class TickerLookupService:
         company_name_clean = self._clean_company_name(company_name).upper()
 
         # First try exact match
-        for ticker, data in self._ticker_cache.items():
-            if data["title"] == company_name_upper:
-                return {
-                    "ticker": ticker,
-                    "company_name": data["title"],
-                    "cik": str(data["cik_str"]).zfill(10),
-                    "similarity_score": 1.0
-                }
+        exact = self._sec_index.by_title(company_name_upper) if self._sec_index else None
+        if exact and exact.ticker in self._ticker_cache:
+            return {
+                "ticker": exact.ticker,
+                "company_name": self._ticker_cache[exact.ticker]["title"],
+                "cik": exact.cik,
+                "similarity_score": 1.0
+            }
 
         # Token-based matching: Check if input is a complete word/token in company name
         # This handles cases like "Cidara" matching "CIDARA THERAPEUTICS INC"
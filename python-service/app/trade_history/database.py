@@ -13,14 +13,185 @@ import json
 import logging
 import math
 import os
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 # Module-level singleton
 _instance: Optional["TradeDatabase"] = None
 
+# Statement = (sql, args) executed via conn.execute / conn.executemany
+Statement = Tuple[str, tuple]
+
+_UPSERT_POSITION_SQL = """
+    INSERT INTO algo_positions (
+        position_id, user_id, status, strategy_type, parent_strategy,
+        symbol, sec_type, strike, expiry, right_type,
+        entry_price, entry_quantity, entry_time,
+        exit_reason, closed_at,
+        total_gross_pnl, total_commission, total_net_pnl, multiplier,
+        model_version, lineage, risk_config, runtime_state,
+        agent_created_at, created_at, updated_at
+    ) VALUES (
+        $1, $2, $3, $4, $5,
+        $6, $7, $8, $9, $10,
+        $11, $12, $13,
+        $14, $15,
+        $16, $17, $18, $19,
+        $20, $21, $22, $23,
+        $24, COALESCE($25, NOW()), NOW()
+    )
+    ON CONFLICT (user_id, position_id) DO UPDATE SET
+        status = EXCLUDED.status,
+        entry_price = EXCLUDED.entry_price,
+        entry_quantity = EXCLUDED.entry_quantity,
+        entry_time = EXCLUDED.entry_time,
+        exit_reason = EXCLUDED.exit_reason,
+        closed_at = EXCLUDED.closed_at,
+        total_gross_pnl = EXCLUDED.total_gross_pnl,
+        total_commission = EXCLUDED.total_commission,
+        total_net_pnl = EXCLUDED.total_net_pnl,
+        model_version = EXCLUDED.model_version,
+        lineage = EXCLUDED.lineage,
+        risk_config = EXCLUDED.risk_config,
+        runtime_state = EXCLUDED.runtime_state,
+        updated_at = NOW()
+    """
+
+_APPLY_ANNOTATION_HINT_SQL = """
+    UPDATE algo_positions
+    SET manual_intervention = $3,
+        intervention_type = $4,
+        annotation = COALESCE(annotation, $5)
+    WHERE user_id = $1 AND position_id = $2
+      AND annotation IS NULL
+    """
+
+_UPSERT_FILL_SQL = """
+    INSERT INTO algo_fills (
+        position_id, user_id, fill_index,
+        fill_time, order_id, exec_id, level,
+        qty_filled, avg_price, remaining_qty, pnl_pct,
+        commission, realized_pnl_ib, fill_exchange, slippage, last_liquidity
+    ) VALUES (
+        $1, $2, $3,
+        $4, $5, $6, $7,
+        $8, $9, $10, $11,
+        $12, $13, $14, $15, $16
+    )
+    ON CONFLICT (user_id, position_id, fill_index) DO UPDATE SET
+        fill_time = EXCLUDED.fill_time,
+        order_id = EXCLUDED.order_id,
+        exec_id = EXCLUDED.exec_id,
+        level = EXCLUDED.level,
+        qty_filled = EXCLUDED.qty_filled,
+        avg_price = EXCLUDED.avg_price,
+        remaining_qty = EXCLUDED.remaining_qty,
+        pnl_pct = EXCLUDED.pnl_pct,
+        commission = EXCLUDED.commission,
+        realized_pnl_ib = EXCLUDED.realized_pnl_ib,
+        fill_exchange = EXCLUDED.fill_exchange,
+        slippage = EXCLUDED.slippage,
+        last_liquidity = EXCLUDED.last_liquidity
+    """
+
+_TRIM_FILLS_SQL = "DELETE FROM algo_fills WHERE user_id = $1 AND position_id = $2 AND fill_index >= $3"
+
+_UPSERT_EXECUTION_SQL = """
+    INSERT INTO algo_executions (
+        user_id, broker_execution_key, position_id, strategy_id,
+        account, exec_id, order_id, perm_id, contract_key,
+        symbol, sec_type, strike, expiry, right_type,
+        side, level, qty_filled, avg_price, fill_time,
+        remaining_qty, pnl_pct, routing_exchange, fill_exchange,
+        last_liquidity, slippage, effective_spread, pre_trade_snapshot, post_fill,
+        commission, realized_pnl_ib, source, unresolved_position,
+        analytics_status, degraded_reasons, finalization_state,
+        captured_at, broker_enriched_at, analytics_finalized_at, updated_at
+    ) VALUES (
+        $1, $2, $3, $4,
+        $5, $6, $7, $8, $9,
+        $10, $11, $12, $13, $14,
+        $15, $16, $17, $18, $19,
+        $20, $21, $22, $23,
+        $24, $25, $26, $27, $28,
+        $29, $30, $31, $32,
+        $33, $34, $35,
+        $36, $37, $38, NOW()
+    )
+    ON CONFLICT (user_id, broker_execution_key) DO UPDATE SET
+        position_id = EXCLUDED.position_id,
+        strategy_id = EXCLUDED.strategy_id,
+        account = EXCLUDED.account,
+        exec_id = EXCLUDED.exec_id,
+        order_id = EXCLUDED.order_id,
+        perm_id = EXCLUDED.perm_id,
+        contract_key = EXCLUDED.contract_key,
+        symbol = EXCLUDED.symbol,
+        sec_type = EXCLUDED.sec_type,
+        strike = EXCLUDED.strike,
+        expiry = EXCLUDED.expiry,
+        right_type = EXCLUDED.right_type,
+        side = EXCLUDED.side,
+        level = EXCLUDED.level,
+        qty_filled = EXCLUDED.qty_filled,
+        avg_price = EXCLUDED.avg_price,
+        fill_time = EXCLUDED.fill_time,
+        remaining_qty = EXCLUDED.remaining_qty,
+        pnl_pct = EXCLUDED.pnl_pct,
+        routing_exchange = EXCLUDED.routing_exchange,
+        fill_exchange = EXCLUDED.fill_exchange,
+        last_liquidity = EXCLUDED.last_liquidity,
+        slippage = EXCLUDED.slippage,
+        effective_spread = EXCLUDED.effective_spread,
+        pre_trade_snapshot = EXCLUDED.pre_trade_snapshot,
+        post_fill = EXCLUDED.post_fill,
+        commission = EXCLUDED.commission,
+        realized_pnl_ib = EXCLUDED.realized_pnl_ib,
+        source = EXCLUDED.source,
+        unresolved_position = EXCLUDED.unresolved_position,
+        analytics_status = EXCLUDED.analytics_status,
+        degraded_reasons = EXCLUDED.degraded_reasons,
+        finalization_state = EXCLUDED.finalization_state,
+        captured_at = EXCLUDED.captured_at,
+        broker_enriched_at = EXCLUDED.broker_enriched_at,
+        analytics_finalized_at = EXCLUDED.analytics_finalized_at,
+        updated_at = NOW()
+    """
+
+_UPSERT_EXIT_RESERVATION_SQL = """
+    INSERT INTO algo_exit_reservations (
+        user_id, reservation_id, strategy_id, contract_key,
+        symbol, strike, expiry, right_type, reserved_qty,
+        order_id, perm_id, source, status, active,
+        release_reason, created_at, updated_at, released_at
+    ) VALUES (
+        $1, $2, $3, $4,
+        $5, $6, $7, $8, $9,
+        $10, $11, $12, $13, $14,
+        $15, $16, $17, $18
+    )
+    ON CONFLICT (user_id, reservation_id) DO UPDATE SET
+        strategy_id = EXCLUDED.strategy_id,
+        contract_key = EXCLUDED.contract_key,
+        symbol = EXCLUDED.symbol,
+        strike = EXCLUDED.strike,
+        expiry = EXCLUDED.expiry,
+        right_type = EXCLUDED.right_type,
+        reserved_qty = EXCLUDED.reserved_qty,
+        order_id = EXCLUDED.order_id,
+        perm_id = EXCLUDED.perm_id,
+        source = EXCLUDED.source,
+        status = EXCLUDED.status,
+        active = EXCLUDED.active,
+        release_reason = EXCLUDED.release_reason,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at,
+        released_at = EXCLUDED.released_at
+    """
+
 
 def get_trade_db() -> Optional["TradeDatabase"]:
     """Return the global TradeDatabase instance, or None if not initialized."""
@@ -64,79 +235,118 @@ class TradeDatabase:
                 self.pool = None
 
     # ── Upsert (called from ws_relay on position_sync) ──
+    #
+    # Every record is turned into an ordered list of (sql, args) statements.
+    # A batch is first written with one executemany() per distinct statement
+    # (asyncpg pipelines the rows, so a reconnect's mark_all_dirty() re-push
+    # costs a handful of round trips instead of one per row and fill).  The
+    # bulk attempt runs in a savepoint: if Postgres rejects any row, it rolls
+    # back and the batch is replayed record by record, each in its own
+    # savepoint, so one bad record still never aborts the rest.
 
     async def upsert_positions(self, user_id: str, positions: List[dict]) -> int:
-        """Upsert a batch of positions + their fills. Returns count upserted.
-
-        Each position is wrapped in a savepoint so one failure doesn't abort the batch.
-        """
+        """Upsert a batch of positions + their fills. Returns count upserted."""
         if not self.pool or not positions:
             return 0
-
-        count = 0
-        async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                for pos in positions:
-                    try:
-                        # Savepoint per position: if this one fails, only the
-                        # savepoint rolls back — the outer transaction stays valid.
-                        async with conn.transaction():
-                            await self._upsert_one_position(conn, user_id, pos)
-                            count += 1
-                    except Exception as e:
-                        logger.error(
-                            "Failed to upsert position %s: %s",
-                            pos.get("id", "?"), e,
-                        )
-        if count:
-            logger.info("TradeDatabase: upserted %d/%d positions for user %s",
-                        count, len(positions), user_id)
-        return count
+        # Fill trimming depends on the latest fill_log length, so a batch that
+        # repeats a position id must be applied strictly in order.
+        position_ids = [pos.get("id", "") for pos in positions]
+        return await self._upsert_batch(
+            "positions", user_id, positions, "id", self._position_statements,
+            bulk=len(set(position_ids)) == len(position_ids),
+        )
 
     async def upsert_executions(self, user_id: str, executions: List[dict]) -> int:
         """Upsert canonical execution ledger rows."""
         if not self.pool or not executions:
             return 0
-        count = 0
-        async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                for execution in executions:
-                    try:
-                        async with conn.transaction():
-                            await self._upsert_one_execution(conn, user_id, execution)
-                            count += 1
-                    except Exception as exc:
-                        logger.error(
-                            "Failed to upsert execution %s: %s",
-                            execution.get("broker_execution_key", "?"),
-                            exc,
-                        )
-        return count
+        return await self._upsert_batch(
+            "executions", user_id, executions, "broker_execution_key", self._execution_statements,
+        )
 
     async def upsert_exit_reservations(self, user_id: str, reservations: List[dict]) -> int:
         """Upsert exit reservation ledger rows."""
         if not self.pool or not reservations:
             return 0
+        return await self._upsert_batch(
+            "reservations", user_id, reservations, "reservation_id", self._exit_reservation_statements,
+        )
+
+    async def _upsert_batch(
+        self,
+        label: str,
+        user_id: str,
+        records: List[dict],
+        id_field: str,
+        build: Callable[[str, dict], List[Statement]],
+        bulk: bool = True,
+    ) -> int:
+        """Write a batch of records, in bulk when possible. Returns count upserted."""
+        started = time.perf_counter()
+        built: List[Tuple[Any, List[Statement]]] = []
+        for record in records:
+            try:
+                built.append((record.get(id_field, "?"), build(user_id, record)))
+            except Exception as e:
+                logger.error("Failed to upsert %s %s: %s", label[:-1], record.get(id_field, "?"), e)
+
         count = 0
+        mode = "bulk" if bulk else "per-row"
         async with self.pool.acquire() as conn:
             async with conn.transaction():
-                for reservation in reservations:
+                if bulk and built:
                     try:
                         async with conn.transaction():
-                            await self._upsert_one_exit_reservation(conn, user_id, reservation)
-                            count += 1
-                    except Exception as exc:
-                        logger.error(
-                            "Failed to upsert reservation %s: %s",
-                            reservation.get("reservation_id", "?"),
-                            exc,
+                            await self._execute_grouped(conn, [stmts for _, stmts in built])
+                        count = len(built)
+                    except Exception as e:
+                        logger.warning(
+                            "TradeDatabase: bulk upsert of %d %s failed (%s); retrying row by row",
+                            len(built), label, e,
                         )
+                        mode = "per-row"
+                if mode == "per-row":
+                    for record_id, statements in built:
+                        try:
+                            # Savepoint per record: if this one fails, only the
+                            # savepoint rolls back — the outer transaction stays valid.
+                            async with conn.transaction():
+                                for sql, args in statements:
+                                    await conn.execute(sql, *args)
+                                count += 1
+                        except Exception as e:
+                            logger.error("Failed to upsert %s %s: %s", label[:-1], record_id, e)
+        if count:
+            logger.info(
+                "TradeDatabase: upserted %d/%d %s for user %s in %.1f ms (%s)",
+                count, len(records), label, user_id,
+                (time.perf_counter() - started) * 1000, mode,
+            )
         return count
 
+    @staticmethod
+    async def _execute_grouped(conn: asyncpg.Connection, batches: List[List[Statement]]):
+        """executemany() each distinct statement, in first-seen order.
+
+        Rows of the same statement keep their batch order, so repeated keys
+        resolve exactly as they would row by row.
+        """
+        grouped: Dict[str, List[tuple]] = {}
+        for statements in batches:
+            for sql, args in statements:
+                grouped.setdefault(sql, []).append(args)
+        for sql, rows in grouped.items():
+            await conn.executemany(sql, rows)
+
     async def _upsert_one_position(
         self, conn: asyncpg.Connection, user_id: str, pos: dict
     ):
         """Upsert a single position and its fills."""
+        for sql, args in self._position_statements(user_id, pos):
+            await conn.execute(sql, *args)
+
+    def _position_statements(self, user_id: str, pos: dict) -> List[Statement]:
+        """Statements that upsert a position, its annotation hint and its fills."""
         position_id = pos.get("id", "")
         entry = pos.get("entry", {})
         instrument = pos.get("instrument", {})
@@ -185,41 +395,7 @@ class TradeDatabase:
         if closed_at_raw:
             closed_at = self._parse_timestamp(closed_at_raw)
 
-        await conn.execute(
-            """
-            INSERT INTO algo_positions (
-                position_id, user_id, status, strategy_type, parent_strategy,
-                symbol, sec_type, strike, expiry, right_type,
-                entry_price, entry_quantity, entry_time,
-                exit_reason, closed_at,
-                total_gross_pnl, total_commission, total_net_pnl, multiplier,
-                model_version, lineage, risk_config, runtime_state,
-                agent_created_at, created_at, updated_at
-            ) VALUES (
-                $1, $2, $3, $4, $5,
-                $6, $7, $8, $9, $10,
-                $11, $12, $13,
-                $14, $15,
-                $16, $17, $18, $19,
-                $20, $21, $22, $23,
-                $24, COALESCE($25, NOW()), NOW()
-            )
-            ON CONFLICT (user_id, position_id) DO UPDATE SET
-                status = EXCLUDED.status,
-                entry_price = EXCLUDED.entry_price,
-                entry_quantity = EXCLUDED.entry_quantity,
-                entry_time = EXCLUDED.entry_time,
-                exit_reason = EXCLUDED.exit_reason,
-                closed_at = EXCLUDED.closed_at,
-                total_gross_pnl = EXCLUDED.total_gross_pnl,
-                total_commission = EXCLUDED.total_commission,
-                total_net_pnl = EXCLUDED.total_net_pnl,
-                model_version = EXCLUDED.model_version,
-                lineage = EXCLUDED.lineage,
-                risk_config = EXCLUDED.risk_config,
-                runtime_state = EXCLUDED.runtime_state,
-                updated_at = NOW()
-            """,
+        statements: List[Statement] = [(_UPSERT_POSITION_SQL, (
             position_id,
             user_id,
             pos.get("status", "active"),
@@ -245,42 +421,30 @@ class TradeDatabase:
             self._json_dumps(runtime_state) if runtime_state else "{}",
             agent_created_at_raw,
             created_at_dt,
-        )
+        ))]
 
         # Apply annotation hint from reconciliation (only if no human note exists)
         annotation_hint = pos.get("annotation_hint")
         if annotation_hint and isinstance(annotation_hint, dict):
-            await conn.execute(
-                """
-                UPDATE algo_positions
-                SET manual_intervention = $3,
-                    intervention_type = $4,
-                    annotation = COALESCE(annotation, $5)
-                WHERE user_id = $1 AND position_id = $2
-                  AND annotation IS NULL
-                """,
+            statements.append((_APPLY_ANNOTATION_HINT_SQL, (
                 user_id,
                 position_id,
                 annotation_hint.get("manual_intervention", False),
                 annotation_hint.get("intervention_type", ""),
                 annotation_hint.get("auto_note", ""),
-            )
+            )))
 
         # Upsert fills
         for idx, fill in enumerate(fill_log):
-            await self._upsert_one_fill(conn, user_id, position_id, idx, fill)
+            statements.append((_UPSERT_FILL_SQL, self._fill_args(user_id, position_id, idx, fill)))
 
         # Delete any fill rows with index >= current fill_log length.
         # This handles the case where fills were removed from the agent's
         # fill_log (e.g. phantom entry fills purged by purge_phantom_entry_fills).
         # Without this, orphaned rows at old indices linger in the DB forever
         # because INSERT ON CONFLICT never removes rows.
-        await conn.execute(
-            "DELETE FROM algo_fills WHERE user_id = $1 AND position_id = $2 AND fill_index >= $3",
-            user_id,
-            position_id,
-            len(fill_log),
-        )
+        statements.append((_TRIM_FILLS_SQL, (user_id, position_id, len(fill_log))))
+        return statements
 
     async def _upsert_one_fill(
         self,
@@ -291,39 +455,14 @@ class TradeDatabase:
         fill: dict,
     ):
         """Upsert a single fill entry."""
+        await conn.execute(_UPSERT_FILL_SQL, *self._fill_args(user_id, position_id, fill_index, fill))
+
+    def _fill_args(self, user_id: str, position_id: str, fill_index: int, fill: dict) -> tuple:
         analytics = fill.get("execution_analytics", {})
         fill_time = self._parse_timestamp(
             fill.get("fill_time", fill.get("time"))
         )
-
-        await conn.execute(
-            """
-            INSERT INTO algo_fills (
-                position_id, user_id, fill_index,
-                fill_time, order_id, exec_id, level,
-                qty_filled, avg_price, remaining_qty, pnl_pct,
-                commission, realized_pnl_ib, fill_exchange, slippage, last_liquidity
-            ) VALUES (
-                $1, $2, $3,
-                $4, $5, $6, $7,
-                $8, $9, $10, $11,
-                $12, $13, $14, $15, $16
-            )
-            ON CONFLICT (user_id, position_id, fill_index) DO UPDATE SET
-                fill_time = EXCLUDED.fill_time,
-                order_id = EXCLUDED.order_id,
-                exec_id = EXCLUDED.exec_id,
-                level = EXCLUDED.level,
-                qty_filled = EXCLUDED.qty_filled,
-                avg_price = EXCLUDED.avg_price,
-                remaining_qty = EXCLUDED.remaining_qty,
-                pnl_pct = EXCLUDED.pnl_pct,
-                commission = EXCLUDED.commission,
-                realized_pnl_ib = EXCLUDED.realized_pnl_ib,
-                fill_exchange = EXCLUDED.fill_exchange,
-                slippage = EXCLUDED.slippage,
-                last_liquidity = EXCLUDED.last_liquidity
-            """,
+        return (
             position_id,
             user_id,
             fill_index,
@@ -348,72 +487,15 @@ class TradeDatabase:
         user_id: str,
         execution: dict,
     ):
+        for sql, args in self._execution_statements(user_id, execution):
+            await conn.execute(sql, *args)
+
+    def _execution_statements(self, user_id: str, execution: dict) -> List[Statement]:
         instrument = execution.get("instrument", {}) or {}
         contract_key = execution.get("contract_key", "")
         degraded_reasons = execution.get("degraded_reasons") or []
         finalization_state = execution.get("finalization_state") or {}
-        await conn.execute(
-            """
-            INSERT INTO algo_executions (
-                user_id, broker_execution_key, position_id, strategy_id,
-                account, exec_id, order_id, perm_id, contract_key,
-                symbol, sec_type, strike, expiry, right_type,
-                side, level, qty_filled, avg_price, fill_time,
-                remaining_qty, pnl_pct, routing_exchange, fill_exchange,
-                last_liquidity, slippage, effective_spread, pre_trade_snapshot, post_fill,
-                commission, realized_pnl_ib, source, unresolved_position,
-                analytics_status, degraded_reasons, finalization_state,
-                captured_at, broker_enriched_at, analytics_finalized_at, updated_at
-            ) VALUES (
-                $1, $2, $3, $4,
-                $5, $6, $7, $8, $9,
-                $10, $11, $12, $13, $14,
-                $15, $16, $17, $18, $19,
-                $20, $21, $22, $23,
-                $24, $25, $26, $27, $28,
-                $29, $30, $31, $32,
-                $33, $34, $35,
-                $36, $37, $38, NOW()
-            )
-            ON CONFLICT (user_id, broker_execution_key) DO UPDATE SET
-                position_id = EXCLUDED.position_id,
-                strategy_id = EXCLUDED.strategy_id,
-                account = EXCLUDED.account,
-                exec_id = EXCLUDED.exec_id,
-                order_id = EXCLUDED.order_id,
-                perm_id = EXCLUDED.perm_id,
-                contract_key = EXCLUDED.contract_key,
-                symbol = EXCLUDED.symbol,
-                sec_type = EXCLUDED.sec_type,
-                strike = EXCLUDED.strike,
-                expiry = EXCLUDED.expiry,
-                right_type = EXCLUDED.right_type,
-                side = EXCLUDED.side,
-                level = EXCLUDED.level,
-                qty_filled = EXCLUDED.qty_filled,
-                avg_price = EXCLUDED.avg_price,
-                fill_time = EXCLUDED.fill_time,
-                remaining_qty = EXCLUDED.remaining_qty,
-                pnl_pct = EXCLUDED.pnl_pct,
-                routing_exchange = EXCLUDED.routing_exchange,
-                fill_exchange = EXCLUDED.fill_exchange,
-                last_liquidity = EXCLUDED.last_liquidity,
-                slippage = EXCLUDED.slippage,
-                effective_spread = EXCLUDED.effective_spread,
-                pre_trade_snapshot = EXCLUDED.pre_trade_snapshot,
-                post_fill = EXCLUDED.post_fill,
-                commission = EXCLUDED.commission,
-                realized_pnl_ib = EXCLUDED.realized_pnl_ib,
-                source = EXCLUDED.source,
-                unresolved_position = EXCLUDED.unresolved_position,
-                analytics_status = EXCLUDED.analytics_status,
-                degraded_reasons = EXCLUDED.degraded_reasons,
-                finalization_state = EXCLUDED.finalization_state,
-                captured_at = EXCLUDED.captured_at,
-                broker_enriched_at = EXCLUDED.broker_enriched_at,
-                analytics_finalized_at = EXCLUDED.analytics_finalized_at,
-                updated_at = NOW()
-            """,
+        return [(_UPSERT_EXECUTION_SQL, (
             user_id,
             execution.get("broker_execution_key", ""),
             execution.get("position_id", ""),
@@ -452,7 +534,7 @@ class TradeDatabase:
             self._parse_timestamp(execution.get("captured_at")),
             self._parse_timestamp(execution.get("broker_enriched_at")),
             self._parse_timestamp(execution.get("analytics_finalized_at")),
-        )
+        ))]
 
     async def _upsert_one_exit_reservation(
         self,
@@ -460,6 +542,10 @@ class TradeDatabase:
         user_id: str,
         reservation: dict,
     ):
+        for sql, args in self._exit_reservation_statements(user_id, reservation):
+            await conn.execute(sql, *args)
+
+    def _exit_reservation_statements(self, user_id: str, reservation: dict) -> List[Statement]:
         contract_key = str(reservation.get("contract_key", ""))
         symbol = ""
         strike = None
@@ -472,37 +558,7 @@ class TradeDatabase:
                 strike = float(strike_text or 0.0)
             except (TypeError, ValueError):
                 strike = None
-        await conn.execute(
-            """
-            INSERT INTO algo_exit_reservations (
-                user_id, reservation_id, strategy_id, contract_key,
-                symbol, strike, expiry, right_type, reserved_qty,
-                order_id, perm_id, source, status, active,
-                release_reason, created_at, updated_at, released_at
-            ) VALUES (
-                $1, $2, $3, $4,
-                $5, $6, $7, $8, $9,
-                $10, $11, $12, $13, $14,
-                $15, $16, $17, $18
-            )
-            ON CONFLICT (user_id, reservation_id) DO UPDATE SET
-                strategy_id = EXCLUDED.strategy_id,
-                contract_key = EXCLUDED.contract_key,
-                symbol = EXCLUDED.symbol,
-                strike = EXCLUDED.strike,
-                expiry = EXCLUDED.expiry,
-                right_type = EXCLUDED.right_type,
-                reserved_qty = EXCLUDED.reserved_qty,
-                order_id = EXCLUDED.order_id,
-                perm_id = EXCLUDED.perm_id,
-                source = EXCLUDED.source,
-                status = EXCLUDED.status,
-                active = EXCLUDED.active,
-                release_reason = EXCLUDED.release_reason,
-                created_at = EXCLUDED.created_at,
-                updated_at = EXCLUDED.updated_at,
-                released_at = EXCLUDED.released_at
-            """,
+        return [(_UPSERT_EXIT_RESERVATION_SQL, (
             user_id,
             reservation.get("reservation_id", ""),
             reservation.get("strategy_id", ""),
@@ -521,7 +577,7 @@ class TradeDatabase:
             self._parse_timestamp(reservation.get("created_at")),
             self._parse_timestamp(reservation.get("updated_at")),
             self._parse_timestamp(reservation.get("released_at")),
-        )
+        ))]
 
     # ── Query Methods ──
 
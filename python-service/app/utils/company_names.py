@@ -0,0 +1,54 @@
+"""
+Company-name keys and trigram similarity settings for fuzzy name lookups.
+
+Usage:
+    from app.utils.company_names import COMPANY_NAME_SIMILARITY_THRESHOLD, company_name_key
+
+    company_name_key("Acme, Inc.")          # "acme"
+    company_name_key("ACME Incorporated")   # "acme"
+
+    await conn.fetch(
+        "... WHERE company_name_key(company_name) % $1"
+        "    AND similarity(company_name_key(company_name), $1) >= $2",
+        company_name_key(name), COMPANY_NAME_SIMILARITY_THRESHOLD,
+    )
+
+The key is lowercase, punctuation-free and single-spaced, with trailing legal
+suffixes ("Inc.", "Incorporated", "Corp", "Ltd", ...) and a leading "The"
+dropped, so spelling variants of one company compare equal. Migration 068
+defines the same normalization as the SQL function company_name_key() and
+builds pg_trgm GIN indexes on it for edgar_filings.company_name and
+deal_intelligence.target_name; keep the two definitions in step.
+
+The pg_trgm operators (``%`` and ``<%``) select candidates through the index
+at their own session thresholds (0.3 and 0.6 by default); callers add an
+explicit similarity() >= threshold filter on top, so thresholds below those
+defaults have no effect.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+# Minimum pg_trgm similarity for two company names to be treated as the same company
+COMPANY_NAME_SIMILARITY_THRESHOLD = float(os.environ.get("COMPANY_NAME_SIMILARITY_THRESHOLD", "0.6"))
+
+# Trailing tokens dropped from the key (also in migrations/068_company_name_trigram.sql)
+LEGAL_SUFFIXES = (
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited",
+    "llc", "llp", "lp", "plc", "sa", "nv", "ag", "se",
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_TRAILING_SUFFIXES = re.compile(r"( (" + "|".join(LEGAL_SUFFIXES) + r"))+$")
+_LEADING_THE = re.compile(r"^the ")
+
+
+@lru_cache(maxsize=65536)
+def company_name_key(name: str) -> str:
+    """Normalized comparison key for a company name (same as SQL company_name_key())."""
+    key = _NON_ALNUM.sub(" ", (name or "").lower()).strip()
+    stripped = _LEADING_THE.sub("", _TRAILING_SUFFIXES.sub("", key))
+    # A name that is nothing but suffixes ("The Company") keeps its full key
+    return stripped or key
+
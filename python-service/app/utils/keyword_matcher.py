@@ -0,0 +1,140 @@
+"""
+Precompiled multi-keyword matcher shared by the EDGAR detector and the
+headline parser.
+
+Usage:
+    matcher = KeywordMatcher(["merger", "merger agreement", "tender offer"])
+    hits = matcher.scan(text.lower())
+    hits.starts("merger")                   # every start offset, overlaps included
+    hits.first_present(KEYWORDS, end=2000)  # first keyword (list order) ending by 2000
+
+The keyword set is compiled into one trie-shaped regex. Each search finds the
+next offset where any keyword starts (the engine skips ahead on the set of
+possible first characters) and reports the longest keyword there; keywords
+that are prefixes of it are filled in from a table built up front. That yields
+the same hit set as an Aho-Corasick automaton (all keywords, all offsets,
+overlaps included) with one C-level call per hit rather than per character.
+
+Keywords are matched verbatim (case-sensitive), exactly like ``keyword in
+text``: callers that lowercase the text get no hits for keywords containing
+capitals, same as before.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        # Greedy optional group: the longest keyword at an offset wins
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+class KeywordHits:
+    """All keyword occurrences in one scanned string."""
+
+    def __init__(self, text: str, positions: Dict[str, List[int]], known: frozenset):
+        self.text = text
+        self.positions = positions
+        self._known = known
+        self._ordered: Optional[List[Tuple[int, str]]] = None
+
+    def __contains__(self, keyword: str) -> bool:
+        return bool(self.starts(keyword))
+
+    def compiled(self, keyword: str) -> bool:
+        """Whether ``keyword`` was part of the scanned keyword set"""
+        return keyword in self._known
+
+    def starts(self, keyword: str) -> List[int]:
+        """Sorted start offsets of ``keyword`` (overlapping occurrences included)."""
+        if keyword in self._known:
+            return self.positions.get(keyword, [])
+        # Not part of the compiled set: fall back to a direct search
+        found, pos = [], self.text.find(keyword)
+        while pos != -1 and keyword:
+            found.append(pos)
+            pos = self.text.find(keyword, pos + 1)
+        return found
+
+    def present(self, keyword: str, end: Optional[int] = None) -> bool:
+        """Whether ``keyword`` occurs entirely within ``text[:end]``."""
+        starts = self.starts(keyword)
+        return bool(starts) and (end is None or starts[0] + len(keyword) <= end)
+
+    def first_present(self, keywords: Iterable[str], end: Optional[int] = None) -> Optional[str]:
+        """First keyword, in the given order, occurring entirely within ``text[:end]``."""
+        positions, known = self.positions, self._known
+        for keyword in keywords:
+            if keyword in known:
+                starts = positions.get(keyword)
+                if starts and (end is None or starts[0] + len(keyword) <= end):
+                    return keyword
+            elif self.present(keyword, end):
+                return keyword
+        return None
+
+    def occurs_between(self, keyword: str, start: int, end: int) -> bool:
+        """Whether ``keyword`` occurs entirely within ``text[start:end]``."""
+        starts = self.starts(keyword)
+        i = bisect.bisect_left(starts, start)
+        return i < len(starts) and starts[i] + len(keyword) <= end
+
+    def hits_between(self, start: int, end: int) -> List[Tuple[int, str]]:
+        """(offset, keyword) for every compiled keyword entirely within ``text[start:end]``."""
+        if self._ordered is None:
+            self._ordered = sorted((pos, kw) for kw, starts in self.positions.items() for pos in starts)
+        ordered = self._ordered
+        i = bisect.bisect_left(ordered, (start, ""))
+        out = []
+        while i < len(ordered) and ordered[i][0] < end:
+            pos, keyword = ordered[i]
+            if pos + len(keyword) <= end:
+                out.append(ordered[i])
+            i += 1
+        return out
+
+
+class KeywordMatcher:
+    """One-pass matcher for a fixed keyword set; see module docstring."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._known = frozenset(self.keywords)
+        self._regex = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        by_length = sorted(self.keywords, key=len)
+        # keyword -> every keyword that is a prefix of it (itself included)
+        self._prefixes = {k: [p for p in by_length if k.startswith(p)] for k in self.keywords}
+
+    def scan(self, text: str) -> KeywordHits:
+        positions: Dict[str, List[int]] = {}
+        if self._regex is not None and text:
+            prefixes = self._prefixes
+            search = self._regex.search
+            match = search(text)
+            while match is not None:
+                start = match.start()
+                for keyword in prefixes[match.group()]:
+                    starts = positions.get(keyword)
+                    if starts is None:
+                        positions[keyword] = [start]
+                    else:
+                        starts.append(start)
+                match = search(text, start + 1)
+        return KeywordHits(text, positions, self._known)
@@ -0,0 +1,5 @@
+-- Migration 065: Per-stage pipeline stats on risk assessment runs
+-- JSON snapshot of the prompt/model/store stages (limit, latency, queue depth)
+-- written periodically during a run and once more when it completes.
+
+ALTER TABLE risk_assessment_runs ADD COLUMN IF NOT EXISTS pipeline_stats JSONB;
@@ -0,0 +1,33 @@
+-- Migration 066: Durable work queue for EDGAR RSS filings
+-- The poller inserts new M&A-relevant filings here (deduplicated by accession
+-- number across restarts and replicas); orchestrator workers claim rows with
+-- FOR UPDATE SKIP LOCKED, retry failures with backoff, and record timestamps
+-- for RSS publish -> staged deal latency.
+
+CREATE TABLE IF NOT EXISTS edgar_filing_queue (
+    accession_number  VARCHAR(100) PRIMARY KEY,
+    filing            JSONB        NOT NULL,  -- serialized EdgarFiling
+    published_at      TIMESTAMPTZ,            -- RSS entry timestamp
+    enqueued_at       TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    status            VARCHAR(20)  NOT NULL DEFAULT 'pending',  -- pending | processing | done | failed
+    attempts          INTEGER      NOT NULL DEFAULT 0,
+    next_attempt_at   TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    locked_by         VARCHAR(200),
+    locked_at         TIMESTAMPTZ,
+    last_error        TEXT,
+    started_at        TIMESTAMPTZ,            -- first claim
+    completed_at      TIMESTAMPTZ,
+    staged_deal_at    TIMESTAMPTZ             -- set when processing created a staged deal
+);
+
+CREATE INDEX IF NOT EXISTS idx_edgar_filing_queue_ready
+    ON edgar_filing_queue (next_attempt_at)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_edgar_filing_queue_processing
+    ON edgar_filing_queue (locked_at)
+    WHERE status = 'processing';
+
+CREATE INDEX IF NOT EXISTS idx_edgar_filing_queue_completed
+    ON edgar_filing_queue (completed_at DESC)
+    WHERE completed_at IS NOT NULL;
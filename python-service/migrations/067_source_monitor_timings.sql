@@ -0,0 +1,11 @@
+-- Migration 067: Per-monitor and per-stage timings for intelligence cycles
+-- Monitors are fetched concurrently and their mentions ingested as one batch;
+-- each monitor row records its own fetch time and the cycle's stage timings
+-- (enrich, resolve, ingest, tier promotion) in milliseconds.
+
+ALTER TABLE source_monitors
+    ADD COLUMN IF NOT EXISTS last_fetch_ms INTEGER,
+    ADD COLUMN IF NOT EXISTS last_timings JSONB;
+
+COMMENT ON COLUMN source_monitors.last_fetch_ms IS 'Duration of the last fetch/parse of this source (ms), including timeouts';
+COMMENT ON COLUMN source_monitors.last_timings IS 'Last cycle: fetch_ms, mention/duplicate counts and batch stage timings (enrich_ms, resolve_ms, ingest_ms, tier_ms)';
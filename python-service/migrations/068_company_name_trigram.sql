@@ -0,0 +1,36 @@
+-- Migration 068: Trigram-indexed fuzzy company-name matching
+-- Deal and EDGAR filing lookups by company name used LOWER(x) = LOWER($1) and
+-- ILIKE '%name%', which scan the whole table and miss spelling variants
+-- ("Acme Inc." vs "Acme Incorporated"). Both now compare normalized keys with
+-- pg_trgm similarity through GIN indexes.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Keep in step with company_name_key() in app/utils/company_names.py:
+-- lowercase, non-alphanumerics collapsed to single spaces, trailing legal
+-- suffixes and a leading "the" dropped (unless nothing would be left).
+CREATE OR REPLACE FUNCTION company_name_key(name TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT COALESCE(
+        NULLIF(
+            regexp_replace(
+                regexp_replace(k, '( (inc|incorporated|corp|corporation|co|company|ltd|limited|llc|llp|lp|plc|sa|nv|ag|se))+$', ''),
+                '^the ', ''
+            ),
+            ''
+        ),
+        k
+    )
+    FROM (SELECT btrim(regexp_replace(lower(COALESCE(name, '')), '[^a-z0-9]+', ' ', 'g')) AS k) normalized
+$$;
+
+COMMENT ON FUNCTION company_name_key(TEXT) IS 'Normalized company-name key for trigram matching (mirrors app.utils.company_names.company_name_key)';
+
+CREATE INDEX IF NOT EXISTS idx_edgar_filings_company_name_trgm
+ON edgar_filings USING gin (company_name_key(company_name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_deal_intelligence_target_name_trgm
+ON deal_intelligence USING gin (company_name_key(target_name) gin_trgm_ops);
+
+ANALYZE edgar_filings;
+ANALYZE deal_intelligence;
@@ -274,6 +274,68 @@ class ExecutionStrategy(ABC):
         return {}
 
 
+# ── Latency instrumentation ──
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds), safe to read from any thread.
+
+    Bucket upper bounds are inclusive; the final bucket catches everything
+    above the last bound. Percentiles are bucket-resolution estimates
+    (the upper bound of the bucket containing the requested rank).
+    """
+
+    BUCKETS_MS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+            self._count = 0
+            self._sum_ms = 0.0
+            self._max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        idx = len(self.BUCKETS_MS)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if latency_ms <= bound:
+                idx = i
+                break
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum_ms += latency_ms
+            if latency_ms > self._max_ms:
+                self._max_ms = latency_ms
+
+    def _percentile_locked(self, pct: float) -> float:
+        if self._count == 0:
+            return 0.0
+        rank = pct / 100.0 * self._count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank and n > 0:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else self._max_ms
+        return self._max_ms
+
+    def to_dict(self) -> dict:
+        """Serialize for JSON telemetry."""
+        with self._lock:
+            labels = [f"le_{b:g}" for b in self.BUCKETS_MS] + ["inf"]
+            return {
+                "count": self._count,
+                "mean_ms": round(self._sum_ms / self._count, 3) if self._count else 0.0,
+                "p50_ms": self._percentile_locked(50),
+                "p90_ms": self._percentile_locked(90),
+                "p99_ms": self._percentile_locked(99),
+                "max_ms": round(self._max_ms, 3),
+                "buckets": dict(zip(labels, self._counts)),
+            }
+
+
 # ── Constants ──
 
 IB_IGNORE_TICKERS = frozenset({"VGZ", "UNCO", "HOLO"})
@@ -309,9 +371,25 @@ class ExecutionEngine:
     2. Flip-flop guard -- per-strategy order rate limiter
     3. Inflight cap -- global cap on orders awaiting TWS ack
     4. Connection gate -- rejects orders when IB is disconnected
+
+    Evaluation modes:
+    - **poll** (default): every eval_interval, evaluate every strategy.
+    - **event**: the quote cache wakes the loop on each tick; only strategies
+      subscribed to the keys that ticked are evaluated (coalesced per wake).
+      A full sweep of all strategies still runs every EVENT_SWEEP_INTERVAL_SEC
+      so time-based logic (EOD exits, cooldowns, decision intervals) fires
+      without ticks, and the lifecycle sweep runs on the same wall-clock
+      cadence as in poll mode.
+    Both modes record a tick-to-decision latency histogram (first tick on a
+    key -> evaluate() returned for a strategy subscribed to it).
     """
 
+    EVAL_MODE_POLL = "poll"
+    EVAL_MODE_EVENT = "event"
+    EVAL_MODES = (EVAL_MODE_POLL, EVAL_MODE_EVENT)
+
     DEFAULT_EVAL_INTERVAL = 0.1  # 100ms between evaluation ticks
+    EVENT_SWEEP_INTERVAL_SEC = 1.0  # event mode: full re-evaluation of all strategies
     MAX_INFLIGHT_ORDERS = 10     # global cap -- drop actions if this many are pending
     ORDER_TIMEOUT_SEC = 10.0     # per-order TWS acknowledgment timeout
     LIFECYCLE_SWEEP_TICKS = 20   # run lifecycle sweep every N ticks (2s at 100ms)
@@ -329,7 +407,10 @@ class ExecutionEngine:
         quote_cache: "StreamingQuoteCache",
         resource_manager: "ResourceManager",
         position_store=None,
+        eval_mode: str = EVAL_MODE_POLL,
     ):
+        if eval_mode not in self.EVAL_MODES:
+            raise ValueError(f"eval_mode must be one of {self.EVAL_MODES}, got {eval_mode!r}")
         self._scanner = scanner
         self._cache = quote_cache
         self._resource_manager = resource_manager
@@ -337,6 +418,10 @@ class ExecutionEngine:
         self._strategies: Dict[str, StrategyState] = {}
         self._running = False
         self._eval_interval = self.DEFAULT_EVAL_INTERVAL
+        self._eval_mode = eval_mode
+        # Set by quote ticks (event mode) and order events; waited on by the eval loop
+        self._wake_event = threading.Event()
+        self._tick_to_decision = LatencyHistogram()
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
 
@@ -1352,6 +1437,7 @@ class ExecutionEngine:
         """
         if order_id in self._order_strategy_map:
             self._order_event_queue.put(("status", order_id, status_data))
+            self._wake_event.set()
 
     def on_scanner_exec_details(self, order_id: int, exec_data: dict):
         """Listener for execDetails and commissionReport callbacks.
@@ -1363,8 +1449,10 @@ class ExecutionEngine:
         if exec_data.get("_commission_report"):
             # Commission report: always enqueue (order_id=0)
             self._order_event_queue.put(("commission", order_id, exec_data))
+            self._wake_event.set()
         elif order_id in self._order_strategy_map:
             self._order_event_queue.put(("exec", order_id, exec_data))
+            self._wake_event.set()
 
     # ── Lifecycle ──
 
@@ -1383,10 +1471,13 @@ class ExecutionEngine:
 
         self._running = True
         self._tick_count = 0
+        self._cache.drain_dirty()  # discard ticks that arrived while stopped
+        if self._eval_mode == self.EVAL_MODE_EVENT:
+            self._cache.set_wake_event(self._wake_event)
         self._thread = threading.Thread(target=self._evaluation_loop, daemon=True, name="exec-engine")
         self._thread.start()
-        logger.info("ExecutionEngine started (eval_interval=%.3fs, strategies=%d, global_entry_cap=%s)",
-                     self._eval_interval, len(self._strategies),
+        logger.info("ExecutionEngine started (eval_mode=%s, eval_interval=%.3fs, strategies=%d, global_entry_cap=%s)",
+                     self._eval_mode, self._eval_interval, len(self._strategies),
                      "UNLIMITED" if self._global_entry_cap == -1 else self._global_entry_cap)
 
     def stop(self):
@@ -1404,6 +1495,8 @@ class ExecutionEngine:
         if not self._running:
             return
         self._running = False
+        self._cache.set_wake_event(None)
+        self._wake_event.set()  # unblock an event-mode wait immediately
 
         # 1. Wait for eval loop to finish its current iteration
         if self._thread is not None:
@@ -1484,6 +1577,24 @@ class ExecutionEngine:
     def is_running(self) -> bool:
         return self._running
 
+    @property
+    def eval_mode(self) -> str:
+        return self._eval_mode
+
+    def set_eval_mode(self, mode: str) -> dict:
+        """Switch between polling and event-driven evaluation (takes effect on the next wake)."""
+        if mode not in self.EVAL_MODES:
+            return {"error": f"eval_mode must be one of {list(self.EVAL_MODES)}"}
+        if mode != self._eval_mode:
+            self._eval_mode = mode
+            self._cache.set_wake_event(
+                self._wake_event if (mode == self.EVAL_MODE_EVENT and self._running) else None
+            )
+            self._tick_to_decision.reset()
+            self._wake_event.set()
+            logger.info("Execution eval mode set to %s", mode)
+        return {"eval_mode": self._eval_mode}
+
     # ── Strategy management ──
 
     def load_strategy(self, strategy_id: str, strategy: ExecutionStrategy, config: dict) -> dict:
@@ -1608,25 +1719,51 @@ class ExecutionEngine:
     # ── Evaluation loop ──
 
     def _evaluation_loop(self):
-        """Main loop: drain order events, evaluate all strategies, place orders, repeat."""
-        logger.info("Evaluation loop started")
+        """Main loop: drain order events, evaluate strategies, place orders, repeat.
+
+        Poll mode evaluates every strategy every eval_interval. Event mode
+        blocks until a tick or order event wakes it (or eval_interval passes),
+        evaluates only the strategies whose subscriptions ticked, and runs a
+        full sweep every EVENT_SWEEP_INTERVAL_SEC.
+        """
+        logger.info("Evaluation loop started (mode=%s)", self._eval_mode)
+        lifecycle_interval = self.LIFECYCLE_SWEEP_TICKS * self.DEFAULT_EVAL_INTERVAL
+        last_lifecycle = time.monotonic()
+        last_full_sweep = 0.0
         while self._running:
             loop_start = time.monotonic()
+            event_mode = self._eval_mode == self.EVAL_MODE_EVENT
             try:
                 # 1. Drain order event queue (fills, status changes from IB)
                 self._drain_order_events()
 
-                # 2. Lifecycle sweep (every N ticks)
+                # 2. Lifecycle sweep (every N ticks in poll mode, same wall-clock cadence in event mode)
                 self._tick_count += 1
-                if self._tick_count % self.LIFECYCLE_SWEEP_TICKS == 0:
+                if event_mode:
+                    if loop_start - last_lifecycle >= lifecycle_interval:
+                        last_lifecycle = loop_start
+                        self._lifecycle_sweep()
+                elif self._tick_count % self.LIFECYCLE_SWEEP_TICKS == 0:
                     self._lifecycle_sweep()
 
-                # 3. Evaluate all strategies
-                self._evaluate_all()
+                # 3. Evaluate strategies
+                dirty = self._cache.drain_dirty()
+                if event_mode and loop_start - last_full_sweep < self.EVENT_SWEEP_INTERVAL_SEC:
+                    self._evaluate_all(dirty, only_dirty=True)
+                else:
+                    last_full_sweep = loop_start
+                    self._evaluate_all(dirty)
 
             except Exception as e:
                 logger.error("Evaluation loop error: %s", e, exc_info=True)
 
+            if event_mode:
+                # Sleep until the next tick/order event; the timeout bounds the
+                # wait so sweeps keep running on a quiet market.
+                self._wake_event.wait(self._eval_interval)
+                self._wake_event.clear()
+                continue
+
             # Sleep for the remainder of the interval
             elapsed = time.monotonic() - loop_start
             sleep_time = max(0, self._eval_interval - elapsed)
@@ -1958,8 +2095,17 @@ class ExecutionEngine:
                 logger.error("Failed to cancel stale order %d: %s", order_id, e)
             # Strategy will be notified via orderStatus -> on_order_dead path
 
-    def _evaluate_all(self):
-        """Run evaluate() on each active strategy and process resulting order actions."""
+    def _evaluate_all(self, dirty: Optional[Dict[str, float]] = None, only_dirty: bool = False):
+        """Run evaluate() on each active strategy and process resulting order actions.
+
+        Args:
+            dirty: cache_key -> monotonic time of the first tick since the last
+                evaluation pass (from StreamingQuoteCache.drain_dirty). Used to
+                record tick-to-decision latency.
+            only_dirty: If True, skip strategies with no subscription in `dirty`
+                (event-mode coalesced evaluation).
+        """
+        dirty = dirty or {}
         # Check IB connection health
         if self._scanner.connection_lost:
             return  # skip evaluation when IB is disconnected
@@ -1976,6 +2122,13 @@ class ExecutionEngine:
                     logger.info("Strategy %s resumed after flip-flop cooldown", state.strategy_id)
                 else:
                     continue
+            first_tick = None
+            for cache_key in state.subscriptions:
+                t = dirty.get(cache_key)
+                if t is not None and (first_tick is None or t < first_tick):
+                    first_tick = t
+            if only_dirty and first_tick is None:
+                continue
             try:
                 # Gather quotes for this strategy's subscriptions
                 quotes = {}
@@ -1986,6 +2139,8 @@ class ExecutionEngine:
 
                 # Evaluate
                 actions = state.strategy.evaluate(quotes, state.config)
+                if first_tick is not None:
+                    self._tick_to_decision.record((time.monotonic() - first_tick) * 1000.0)
                 state.last_eval_time = time.time()
                 state.eval_count += 1
 
@@ -3229,6 +3384,8 @@ class ExecutionEngine:
         return {
             "running": self._running,
             "eval_interval": self._eval_interval,
+            "eval_mode": self._eval_mode,
+            "tick_to_decision_latency": self._tick_to_decision.to_dict(),
             "strategy_count": len(self._strategies),
             "strategies": strategies,
             "inflight_orders_total": self._inflight_order_count,
@@ -3289,6 +3446,8 @@ class ExecutionEngine:
             ]
         return {
             "running": self._running,
+            "eval_mode": self._eval_mode,
+            "tick_to_decision_latency": self._tick_to_decision.to_dict(),
             "strategy_count": len(self._strategies),
             "strategies": [
                 {
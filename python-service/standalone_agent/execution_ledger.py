@@ -5,6 +5,14 @@ Canonical execution and reservation ledger sidecar.
 This file is the durable local archive for broker-facing execution records and
 exit reservations. It intentionally lives beside the position store instead of
 inside Postgres so restart/recovery logic can replay it before any network sync.
+
+Persistence backends:
+- ``journal`` (default): each mutation appends put/del ops for the records it
+  touched to ``<path>.journal`` (see mutation_journal.py); the JSON snapshot
+  is rewritten only on compaction.
+- ``snapshot``: legacy behaviour -- rewrite the whole JSON file (with .bak)
+  on every mutation.
+Both backends read the same snapshot format.
 """
 
 from __future__ import annotations
@@ -17,9 +25,14 @@ import threading
 import time
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from zoneinfo import ZoneInfo
 
+try:
+    from .mutation_journal import MutationJournal
+except ImportError:  # pragma: no cover - supports direct script imports in tests
+    from mutation_journal import MutationJournal
+
 logger = logging.getLogger(__name__)
 IB_EXECUTION_TIMEZONE = ZoneInfo("America/New_York")
 
@@ -31,15 +44,47 @@ class ExecutionLedgerStore:
     EXEC_ID_TIMEOUT_SEC = 5.0
     POST_FILL_TIMEOUT_SEC = 65.0
 
-    def __init__(self, path: str):
+    BACKEND_JOURNAL = "journal"
+    BACKEND_SNAPSHOT = "snapshot"
+    BACKENDS = (BACKEND_JOURNAL, BACKEND_SNAPSHOT)
+
+    # Journal collection name -> attribute holding that collection
+    _COLLECTIONS = {
+        "executions": "_executions",
+        "reservations": "_reservations",
+        "pending_commissions": "_pending_commissions",
+    }
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        backend: str = BACKEND_JOURNAL,
+        compact_every: int = MutationJournal.DEFAULT_COMPACT_EVERY,
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend!r}")
         self._path = path
         self._bak_path = path + ".bak"
+        self._backend = backend
+        self._journal = (
+            MutationJournal(path + ".journal", compact_every=compact_every)
+            if backend == self.BACKEND_JOURNAL else None
+        )
         self._lock = threading.Lock()
         self._executions: Dict[str, dict] = {}
         self._reservations: Dict[str, dict] = {}
         self._pending_commissions: Dict[str, dict] = {}
         self._dirty_execution_keys: set[str] = set()
         self._dirty_reservation_ids: set[str] = set()
+        # Secondary indexes (insertion-ordered dicts used as ordered sets).
+        # Maintained by _put_execution_locked / _put_reservation_locked and
+        # rebuilt on load; verify with check_index_consistency().
+        self._exec_id_index: Dict[str, Dict[str, None]] = {}
+        self._order_id_index: Dict[int, Dict[str, None]] = {}
+        self._reservation_order_index: Dict[int, Dict[str, None]] = {}
+        self._reservation_perm_index: Dict[int, Dict[str, None]] = {}
+        self._reservation_seq: Dict[str, int] = {}
         self._load()
 
     # ------------------------------------------------------------------
@@ -286,14 +331,13 @@ class ExecutionLedgerStore:
                 "captured_at": record.get("captured_at", now),
                 "updated_at": now,
             })
-            self._apply_pending_commission(record)
+            consumed_commission = self._apply_pending_commission(record)
             self._refresh_record_states(record, now=now)
-            if existing_key and existing_key != resolved_execution_key:
-                self._executions.pop(existing_key, None)
-                self._dirty_execution_keys.add(existing_key)
-            self._executions[resolved_execution_key] = record
-            self._dirty_execution_keys.add(resolved_execution_key)
-            self._save_locked()
+            self._put_execution_locked(resolved_execution_key, record, replaced_key=existing_key)
+            self._persist_locked(
+                executions=(existing_key, resolved_execution_key),
+                pending_commissions=(consumed_commission,),
+            )
             return resolved_execution_key
 
     def update_execution_details(
@@ -377,14 +421,13 @@ class ExecutionLedgerStore:
                 ),
                 "updated_at": now,
             })
-            self._apply_pending_commission(record)
+            consumed_commission = self._apply_pending_commission(record)
             self._refresh_record_states(record, now=now)
-            if existing_key and existing_key != target_key:
-                self._executions.pop(existing_key, None)
-                self._dirty_execution_keys.add(existing_key)
-            self._executions[target_key] = record
-            self._dirty_execution_keys.add(target_key)
-            self._save_locked()
+            self._put_execution_locked(target_key, record, replaced_key=existing_key)
+            self._persist_locked(
+                executions=(existing_key, target_key),
+                pending_commissions=(consumed_commission,),
+            )
             return True
 
     def update_commission(
@@ -403,7 +446,7 @@ class ExecutionLedgerStore:
                     "account": account,
                     **dict(commission_report or {}),
                 }
-                self._save_locked()
+                self._persist_locked(pending_commissions=(exec_id,))
                 return False
             record = self._executions[key]
             record["account"] = account or record.get("account", "")
@@ -412,7 +455,7 @@ class ExecutionLedgerStore:
             record["updated_at"] = time.time()
             self._refresh_record_states(record)
             self._dirty_execution_keys.add(key)
-            self._save_locked()
+            self._persist_locked(executions=(key,))
             return True
 
     def update_post_fill(
@@ -441,7 +484,7 @@ class ExecutionLedgerStore:
             record["updated_at"] = time.time()
             self._refresh_record_states(record)
             self._dirty_execution_keys.add(key)
-            self._save_locked()
+            self._persist_locked(executions=(key,))
             return True
 
     def ingest_ib_execution_batch(
@@ -604,9 +647,9 @@ class ExecutionLedgerStore:
                 ),
             })
             existing.setdefault("created_at", existing.get("updated_at", time.time()))
-            self._reservations[reservation_id] = existing
+            self._put_reservation_locked(reservation_id, existing)
             self._dirty_reservation_ids.add(reservation_id)
-            self._save_locked()
+            self._persist_locked(reservations=(reservation_id,))
             return reservation_id
 
     def bind_reservation(self, reservation_id: str, *, order_id: int, perm_id: int = 0) -> bool:
@@ -614,13 +657,15 @@ class ExecutionLedgerStore:
             record = self._reservations.get(reservation_id)
             if not record:
                 return False
+            self._unindex_reservation_locked(reservation_id, record)
             record["order_id"] = self._coerce_int(order_id)
             if perm_id:
                 record["perm_id"] = self._coerce_int(perm_id)
             record["status"] = "working"
             record["updated_at"] = time.time()
+            self._index_reservation_locked(reservation_id, record)
             self._dirty_reservation_ids.add(reservation_id)
-            self._save_locked()
+            self._persist_locked(reservations=(reservation_id,))
             return True
 
     def sync_reservation(
@@ -645,12 +690,15 @@ class ExecutionLedgerStore:
                 record["reserved_qty"] = max(0, self._coerce_int(remaining))
                 record["status"] = "working"
             if perm_id:
+                rid = str(record.get("reservation_id") or "")
+                self._unindex_reservation_locked(rid, record)
                 record["perm_id"] = self._coerce_int(perm_id)
+                self._index_reservation_locked(rid, record)
             record["updated_at"] = time.time()
             reservation_id = record.get("reservation_id")
             if reservation_id:
                 self._dirty_reservation_ids.add(reservation_id)
-            self._save_locked()
+            self._persist_locked(reservations=(reservation_id,))
             return True
 
     def release_reservation(
@@ -662,8 +710,12 @@ class ExecutionLedgerStore:
         release_reason: str = "released",
     ) -> int:
         released = 0
+        released_ids: List[str] = []
         with self._lock:
-            for record in self._reservations.values():
+            for record in self._reservation_candidates_locked(
+                reservation_id=reservation_id,
+                order_id=order_id,
+            ):
                 if reservation_id and record.get("reservation_id") != reservation_id:
                     continue
                 if order_id and self._coerce_int(record.get("order_id")) != self._coerce_int(order_id):
@@ -682,9 +734,10 @@ class ExecutionLedgerStore:
                 record["updated_at"] = time.time()
                 if record.get("reservation_id"):
                     self._dirty_reservation_ids.add(record["reservation_id"])
+                    released_ids.append(record["reservation_id"])
                 released += 1
             if released:
-                self._save_locked()
+                self._persist_locked(reservations=released_ids)
         return released
 
     def get_active_reservations(self) -> List[dict]:
@@ -726,18 +779,15 @@ class ExecutionLedgerStore:
     ) -> Optional[str]:
         hinted_exec_id = str((match_hint or {}).get("exec_id") or "")
         if hinted_exec_id and hinted_exec_id != exec_id:
-            for key, record in self._executions.items():
-                if record.get("exec_id") == hinted_exec_id:
-                    return key
+            for key in self._exec_id_index.get(hinted_exec_id, ()):
+                return key
         if exec_id:
-            for key, record in self._executions.items():
-                if record.get("exec_id") == exec_id:
-                    return key
+            for key in self._exec_id_index.get(exec_id, ()):
+                return key
         if order_id:
             candidates = []
-            for key, record in self._executions.items():
-                if self._coerce_int(record.get("order_id")) != self._coerce_int(order_id):
-                    continue
+            for key in self._order_id_index.get(self._coerce_int(order_id), ()):
+                record = self._executions[key]
                 if position_id and record.get("position_id") != position_id:
                     continue
                 score = self._execution_match_score(
@@ -827,24 +877,159 @@ class ExecutionLedgerStore:
         )
 
     def _find_reservation_locked(self, *, order_id: int = 0, perm_id: int = 0) -> Optional[dict]:
-        for record in self._reservations.values():
-            if order_id and self._coerce_int(record.get("order_id")) == self._coerce_int(order_id):
-                return record
-            if perm_id and self._coerce_int(record.get("perm_id")) == self._coerce_int(perm_id):
-                return record
-        return None
+        """First reservation (in insertion order) matching order_id or perm_id."""
+        rids = []
+        if order_id:
+            rids.extend(self._reservation_order_index.get(self._coerce_int(order_id), ()))
+        if perm_id:
+            rids.extend(self._reservation_perm_index.get(self._coerce_int(perm_id), ()))
+        if not rids:
+            return None
+        return self._reservations[min(rids, key=self._reservation_seq.__getitem__)]
+
+    def _reservation_candidates_locked(self, *, reservation_id: str = "", order_id: int = 0) -> List[dict]:
+        """Reservations that could match a release filter, in insertion order."""
+        if reservation_id:
+            record = self._reservations.get(reservation_id)
+            return [record] if record is not None else []
+        if order_id:
+            rids = self._reservation_order_index.get(self._coerce_int(order_id), ())
+            return [self._reservations[rid] for rid in sorted(rids, key=self._reservation_seq.__getitem__)]
+        return list(self._reservations.values())
+
+    # ------------------------------------------------------------------
+    # Secondary indexes
+    # ------------------------------------------------------------------
 
-    def _apply_pending_commission(self, record: dict) -> None:
+    def _index_execution_locked(self, key: str, record: dict) -> None:
         exec_id = str(record.get("exec_id") or "")
-        if not exec_id:
+        if exec_id:
+            self._exec_id_index.setdefault(exec_id, {})[key] = None
+        order_id = self._coerce_int(record.get("order_id"))
+        if order_id:
+            self._order_id_index.setdefault(order_id, {})[key] = None
+
+    def _unindex_execution_locked(self, key: str, record: dict) -> None:
+        for index, value in (
+            (self._exec_id_index, str(record.get("exec_id") or "")),
+            (self._order_id_index, self._coerce_int(record.get("order_id"))),
+        ):
+            if not value:
+                continue
+            keys = index.get(value)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    index.pop(value, None)
+
+    def _put_execution_locked(self, key: str, record: dict, *, replaced_key: Optional[str] = None) -> None:
+        """Store `record` under `key` (removing `replaced_key` if re-keyed), keeping indexes in sync."""
+        if replaced_key and replaced_key != key:
+            old = self._executions.pop(replaced_key, None)
+            if old is not None:
+                self._unindex_execution_locked(replaced_key, old)
+            self._dirty_execution_keys.add(replaced_key)
+        old = self._executions.get(key)
+        if old is not None:
+            self._unindex_execution_locked(key, old)
+        self._executions[key] = record
+        self._index_execution_locked(key, record)
+        self._dirty_execution_keys.add(key)
+
+    def _index_reservation_locked(self, reservation_id: str, record: dict) -> None:
+        if not reservation_id:
             return
+        order_id = self._coerce_int(record.get("order_id"))
+        if order_id:
+            self._reservation_order_index.setdefault(order_id, {})[reservation_id] = None
+        perm_id = self._coerce_int(record.get("perm_id"))
+        if perm_id:
+            self._reservation_perm_index.setdefault(perm_id, {})[reservation_id] = None
+
+    def _unindex_reservation_locked(self, reservation_id: str, record: dict) -> None:
+        for index, value in (
+            (self._reservation_order_index, self._coerce_int(record.get("order_id"))),
+            (self._reservation_perm_index, self._coerce_int(record.get("perm_id"))),
+        ):
+            if not value:
+                continue
+            rids = index.get(value)
+            if rids is not None:
+                rids.pop(reservation_id, None)
+                if not rids:
+                    index.pop(value, None)
+
+    def _put_reservation_locked(self, reservation_id: str, record: dict) -> None:
+        old = self._reservations.get(reservation_id)
+        if old is not None:
+            self._unindex_reservation_locked(reservation_id, old)
+        else:
+            self._reservation_seq[reservation_id] = len(self._reservation_seq)
+        self._reservations[reservation_id] = record
+        self._index_reservation_locked(reservation_id, record)
+
+    def _rebuild_indexes_locked(self) -> None:
+        self._exec_id_index = {}
+        self._order_id_index = {}
+        self._reservation_order_index = {}
+        self._reservation_perm_index = {}
+        self._reservation_seq = {}
+        for key, record in self._executions.items():
+            self._index_execution_locked(key, record)
+        for seq, (rid, record) in enumerate(self._reservations.items()):
+            self._reservation_seq[rid] = seq
+            self._index_reservation_locked(rid, record)
+
+    def check_index_consistency(self) -> List[str]:
+        """Compare the maintained secondary indexes with ones rebuilt from scratch.
+
+        Returns a list of human-readable problems (empty when consistent).
+        """
+        def _as_sets(index: dict) -> dict:
+            return {k: set(v) for k, v in index.items()}
+
+        with self._lock:
+            maintained = {
+                "exec_id": _as_sets(self._exec_id_index),
+                "order_id": _as_sets(self._order_id_index),
+                "reservation_order_id": _as_sets(self._reservation_order_index),
+                "reservation_perm_id": _as_sets(self._reservation_perm_index),
+            }
+            seq_keys = set(self._reservation_seq)
+            reservation_keys = set(self._reservations)
+            self._rebuild_indexes_locked()
+            rebuilt = {
+                "exec_id": _as_sets(self._exec_id_index),
+                "order_id": _as_sets(self._order_id_index),
+                "reservation_order_id": _as_sets(self._reservation_order_index),
+                "reservation_perm_id": _as_sets(self._reservation_perm_index),
+            }
+        problems = []
+        for name, expected in rebuilt.items():
+            actual = maintained[name]
+            for value in sorted(set(expected) | set(actual), key=str):
+                if expected.get(value, set()) != actual.get(value, set()):
+                    problems.append(
+                        f"{name}[{value}]: indexed={sorted(actual.get(value, set()))} "
+                        f"actual={sorted(expected.get(value, set()))}"
+                    )
+        if seq_keys != reservation_keys:
+            problems.append("reservation_seq keys differ from reservations")
+        return problems
+
+    def _apply_pending_commission(self, record: dict) -> Optional[str]:
+        """Fold a buffered commission report into `record`; returns the consumed exec_id."""
+        exec_id = str(record.get("exec_id") or "")
+        if not exec_id:
+            return None
         pending = self._pending_commissions.pop(exec_id, None)
         if not pending:
-            return
+            return None
         record["commission"] = pending.get("commission")
         record["realized_pnl_ib"] = pending.get("realized_pnl")
         if pending.get("account") and not record.get("account"):
             record["account"] = pending.get("account")
+        return exec_id
 
     def _refresh_record_states(self, record: dict, *, now: Optional[float] = None) -> None:
         now = now or time.time()
@@ -904,7 +1089,79 @@ class ExecutionLedgerStore:
         else:
             record["analytics_finalized_at"] = None
 
+    def _persist_locked(
+        self,
+        *,
+        executions: Iterable[Optional[str]] = (),
+        reservations: Iterable[Optional[str]] = (),
+        pending_commissions: Iterable[Optional[str]] = (),
+    ) -> None:
+        """Persist a mutation touching the given record keys.
+
+        Journal backend: append one put (key present) or del (key absent) op
+        per touched key. Snapshot backend: rewrite the whole file.
+        Must be called while holding self._lock.
+        """
+        if self._journal is None:
+            self._save_locked()
+            return
+        ops = []
+        for collection, keys in (
+            ("executions", executions),
+            ("reservations", reservations),
+            ("pending_commissions", pending_commissions),
+        ):
+            records = getattr(self, self._COLLECTIONS[collection])
+            for key in dict.fromkeys(k for k in keys if k):
+                if key in records:
+                    ops.append({"op": "put", "c": collection, "k": key, "v": records[key]})
+                else:
+                    ops.append({"op": "del", "c": collection, "k": key})
+        if not ops:
+            return
+        try:
+            self._journal.append_many(ops)
+        except Exception as exc:
+            logger.error("ExecutionLedgerStore journal append failed (%s) — writing snapshot", exc)
+            self._compact_locked()
+            return
+        if self._journal.needs_compaction:
+            self._compact_locked()
+
+    def _apply_journal_op(self, op: dict) -> None:
+        attr = self._COLLECTIONS.get(op.get("c", ""))
+        if attr is None or not op.get("k"):
+            return
+        records = getattr(self, attr)
+        if op.get("op") == "put":
+            records[op["k"]] = op.get("v")
+        elif op.get("op") == "del":
+            records.pop(op["k"], None)
+
+    def _compact_locked(self) -> None:
+        """Write a durable snapshot of current state, then truncate the journal."""
+        if self._save_locked(durable=True) and self._journal is not None:
+            self._journal.reset()
+
     def _load(self) -> None:
+        self._load_snapshot()
+        self._load_journal()
+        self._rebuild_indexes_locked()
+
+    def _load_journal(self) -> None:
+        if self._journal is None:
+            return
+        ops = self._journal.replay()
+        for op in ops:
+            self._apply_journal_op(op)
+        if ops:
+            logger.info(
+                "ExecutionLedgerStore: replayed %d journal ops from %s",
+                len(ops), self._journal.path,
+            )
+            self._compact_locked()
+
+    def _load_snapshot(self) -> None:
         if not os.path.exists(self._path):
             self._executions = {}
             self._reservations = {}
@@ -933,7 +1190,12 @@ class ExecutionLedgerStore:
             self._reservations = {}
             self._pending_commissions = {}
 
-    def _save_locked(self) -> None:
+    def _save_locked(self, *, durable: bool = False) -> bool:
+        """Atomic snapshot write (tmp + .bak + rename). Returns True on success.
+
+        ``durable`` fsyncs the temp file before the rename; compaction needs
+        that before it may truncate the journal.
+        """
         tmp_path = self._path + ".tmp"
         payload = {
             "schema_version": 1,
@@ -944,9 +1206,13 @@ class ExecutionLedgerStore:
         try:
             with open(tmp_path, "w") as fh:
                 json.dump(payload, fh, indent=2)
+                if durable:
+                    fh.flush()
+                    os.fsync(fh.fileno())
             if os.path.exists(self._path):
                 shutil.copy2(self._path, self._bak_path)
             os.replace(tmp_path, self._path)
+            return True
         except Exception as exc:
             logger.error("ExecutionLedgerStore save failed: %s", exc)
             try:
@@ -954,3 +1220,4 @@ class ExecutionLedgerStore:
                     os.remove(tmp_path)
             except OSError:
                 pass
+            return False
@@ -45,6 +45,8 @@ from websockets.exceptions import ConnectionClosed
 from ib_scanner import IBMergerArbScanner, DealInput
 from resource_manager import ResourceManager
 from quote_cache import StreamingQuoteCache
+from option_quote_store import OptionQuoteStore
+from quote_push import QUOTE_PROTOCOL_VERSION, QuoteDeltaEncoder, pack_frame, supported_encodings
 from execution_engine import ExecutionEngine, ExecutionStrategy
 from position_store import PositionStore
 from engine_config_store import EngineConfigStore
@@ -82,9 +84,15 @@ _raw_exclude = _env("IB_EXCLUDE_ACCOUNTS")
 IB_EXCLUDE_ACCOUNTS: set = set(a.strip() for a in _raw_exclude.split(",") if a.strip()) if _raw_exclude else set()
 if IB_EXCLUDE_ACCOUNTS:
     logger.info("IB_EXCLUDE_ACCOUNTS: %s", IB_EXCLUDE_ACCOUNTS)
+# Execution engine evaluation mode: "poll" (fixed 10 Hz) or "event" (tick-driven)
+EXEC_EVAL_MODE = (_env("EXEC_EVAL_MODE") or ExecutionEngine.EVAL_MODE_POLL).lower()
+if EXEC_EVAL_MODE not in ExecutionEngine.EVAL_MODES:
+    logger.warning("Unknown EXEC_EVAL_MODE=%r, falling back to poll", EXEC_EVAL_MODE)
+    EXEC_EVAL_MODE = ExecutionEngine.EVAL_MODE_POLL
 HEARTBEAT_INTERVAL = 10  # seconds
 RECONNECT_DELAY = 5  # seconds
-CACHE_TTL_SECONDS = 60  # How long to cache option chain data
+CACHE_TTL_SECONDS = 60  # How long a cached option quote / greeks stay fresh
+OPTION_QUOTE_CACHE_MAX_CONTRACTS = 20000  # LRU cap on contracts in the option quote store
 
 # ── Risk config hot-modify: BMC flat fields → nested risk manager format ──
 _BMC_RISK_FIELDS = frozenset({
@@ -175,39 +183,6 @@ def _translate_bmc_to_risk_config(bmc_config: dict) -> dict:
     return risk
 
 
-class OptionChainCache:
-    """In-memory cache for option chain data with TTL expiration"""
-    
-    def __init__(self, ttl_seconds: int = CACHE_TTL_SECONDS):
-        self.cache = {}
-        self.ttl = ttl_seconds
-    
-    def _make_key(self, ticker: str, deal_price: float, close_date: str, days_before_close: int) -> str:
-        return f"{ticker}_{deal_price}_{close_date}_{days_before_close}"
-    
-    def get(self, ticker: str, deal_price: float, close_date: str, days_before_close: int):
-        key = self._make_key(ticker, deal_price, close_date, days_before_close)
-        if key in self.cache:
-            data, timestamp = self.cache[key]
-            age = time.time() - timestamp
-            if age < self.ttl:
-                logger.debug(f"Cache HIT for {ticker} (age: {age:.1f}s)")
-                return data
-            else:
-                logger.debug(f"Cache EXPIRED for {ticker} (age: {age:.1f}s)")
-                del self.cache[key]
-        return None
-    
-    def set(self, ticker: str, deal_price: float, close_date: str, days_before_close: int, data: dict):
-        key = self._make_key(ticker, deal_price, close_date, days_before_close)
-        self.cache[key] = (data, time.time())
-        logger.debug(f"Cache SET for {ticker} ({len(data.get('contracts', []))} contracts)")
-    
-    def clear(self):
-        self.cache.clear()
-        logger.info("Cache cleared")
-
-
 def resolve_rm_ticker(instrument: dict, parent_strategy_id: str = "") -> str:
     """Resolve the underlying ticker for a risk manager.
 
@@ -235,7 +210,9 @@ class IBDataAgent:
         self.websocket = None
         self.running = False
         self.provider_id = None
-        self.option_chain_cache = OptionChainCache(ttl_seconds=CACHE_TTL_SECONDS)
+        self.option_quote_store = OptionQuoteStore(
+            ttl_seconds=CACHE_TTL_SECONDS, max_contracts=OPTION_QUOTE_CACHE_MAX_CONTRACTS
+        )
         self.resource_manager = ResourceManager()
         self.quote_cache: Optional[StreamingQuoteCache] = None  # created after scanner is ready
         self.execution_engine: Optional[ExecutionEngine] = None  # created after scanner is ready
@@ -256,6 +233,10 @@ class IBDataAgent:
         self._farms_down_since: Optional[float] = None
         # Shared Polygon WS infrastructure for BMC strategies
         self._shared_polygon_infra = None
+        # execution_quotes protocol/framing negotiated with the relay on auth
+        self._quote_protocol = 1
+        self._quote_encoding = "json"
+        self._quote_encoder: Optional[QuoteDeltaEncoder] = None
         
     def connect_to_ib(self) -> bool:
         """Connect to IB TWS. Tries configured port first; on failure tries the other (7496/7497)
@@ -288,7 +269,7 @@ class IBDataAgent:
                 if self.execution_engine is None:
                     self.execution_engine = ExecutionEngine(
                         self.scanner, self.quote_cache, self.resource_manager,
-                        self.position_store,
+                        self.position_store, eval_mode=EXEC_EVAL_MODE,
                     )
                 else:
                     self.execution_engine._scanner = self.scanner
@@ -1438,6 +1419,25 @@ class IBDataAgent:
             logger.error(f"Error fetching futures: {e}")
             return {"error": str(e)}
 
+    def _get_option_quotes(self, ticker: str, contracts: list) -> list:
+        """get_option_data_batch through the option quote store.
+
+        Contracts with a fresh quote and greeks in the store are served from
+        it; only missing or stale ones are requested from IB. Same contract
+        order and None-for-no-data convention as get_option_data_batch."""
+        results, missing = self.option_quote_store.lookup(ticker, contracts)
+        if missing:
+            to_fetch = [contracts[i] for i in missing]
+            fetched = self.scanner.get_option_data_batch(ticker, to_fetch)
+            for i, opt in zip(missing, self.option_quote_store.update(ticker, to_fetch, fetched)):
+                results[i] = opt
+        if len(missing) < len(contracts):
+            logger.info(
+                f"Option quote store: {ticker} {len(contracts) - len(missing)}/{len(contracts)} contracts cached, "
+                f"{len(missing)} requested"
+            )
+        return results
+
     def _handle_fetch_chain_sync(self, payload: dict) -> dict:
         """Fetch option chain from IB (synchronous)"""
         ticker = payload.get("ticker", "").upper()
@@ -1449,15 +1449,7 @@ class IBDataAgent:
             return {"error": self._ib_not_connected_error()}
         
         days_before_close = scan_params.get("daysBeforeClose", 60)
-        
-        # Check cache
-        cached_data = self.option_chain_cache.get(
-            ticker, deal_price, expected_close_date, days_before_close
-        )
-        if cached_data:
-            logger.info(f"Returning cached chain for {ticker}")
-            return cached_data
-        
+
         try:
             # Resolve stock contract first (conId + primaryExchange) to avoid IB error 200
             # on accounts where symbol+SMART is ambiguous or sec-def is slow.
@@ -1484,7 +1476,8 @@ class IBDataAgent:
                 current_price=spot_price,
                 deal_close_date=close_date,
                 days_before_close=days_before_close,
-                deal_price=deal_price
+                deal_price=deal_price,
+                option_batch=self._get_option_quotes,
             )
 
             # Convert to serializable format
@@ -1515,17 +1508,12 @@ class IBDataAgent:
                     "error": f"No options returned for {ticker}. Check agent console for [{ticker}] Step 1-5 to see where it failed (e.g. no expirations from IB, or no quotes)."
                 }
 
-            result = {
+            return {
                 "ticker": ticker,
                 "spotPrice": spot_price,
                 "expirations": sorted(list(expirations)),
                 "contracts": contracts
             }
-
-            # Cache result
-            self.option_chain_cache.set(ticker, deal_price, expected_close_date, days_before_close, result)
-
-            return result
         except Exception as e:
             logger.exception(f"Chain fetch failed for {ticker}")
             return {"error": f"Chain fetch failed for {ticker}: {e}. Check agent console for [{ticker}] step messages."}
@@ -1551,7 +1539,7 @@ class IBDataAgent:
         results = [None] * len(contracts)
         for ticker, items in by_ticker.items():
             batch = [(expiry, strike, right) for (_, expiry, strike, right) in items]
-            batch_results = self.scanner.get_option_data_batch(ticker, batch)
+            batch_results = self._get_option_quotes(ticker, batch)
             for (idx, expiry_norm, strike, right), opt in zip(items, batch_results):
                 if opt and (opt.bid > 0 or opt.ask > 0):
                     results[idx] = {
@@ -1630,7 +1618,7 @@ class IBDataAgent:
                     batch.append((expiry, strike, right))
                 if ntm_strikes:
                     expirations_used.append(expiry)
-            results = self.scanner.get_option_data_batch(ticker, batch)
+            results = self._get_option_quotes(ticker, batch)
             contracts = []
             for opt in results:
                 if opt:
@@ -3955,6 +3943,8 @@ class IBDataAgent:
                 if self.scanner:
                     state["ib_farms"] = self.scanner.get_farm_status()
                     state["ib_data_available"] = self.scanner.is_data_available()
+                # Option quote store hit/miss and market data lines saved
+                state["option_quote_cache"] = self.option_quote_store.stats()
                 await self._send_ws_json({
                     "type": "agent_state",
                     **state
@@ -4058,30 +4048,47 @@ class IBDataAgent:
                 break
 
     async def _quote_push_loop(self):
-        """Push live quote snapshots every ~2s for real-time Book tab updates.
+        """Push live quotes every ~2s for real-time Book tab updates.
 
         Separate from the full telemetry push (~20s) to keep quote data fresh
         without sending the entire position_ledger/attribution payload.
+        Relays that negotiated quote protocol v2 get key/delta frames (see
+        quote_push.py); older relays get the full v1 snapshot.
         """
         QUOTE_PUSH_INTERVAL = 2  # seconds
+        encoder = QuoteDeltaEncoder() if self._quote_protocol >= 2 else None
+        self._quote_encoder = encoder
         while self.running and self.websocket:
             try:
                 if (
                     self.execution_engine is not None
                     and self.execution_engine.is_running
                 ):
-                    snapshot = self.execution_engine._cache.get_all_serialized()
-                    if snapshot:
-                        await self._send_ws_json({
-                            "type": "execution_quotes",
-                            "quote_snapshot": snapshot,
-                            "timestamp": time.time(),
-                        })
+                    if encoder is not None:
+                        frame = encoder.encode(self.execution_engine._cache.get_all(), time.time())
+                        await self._send_quote_frame(frame)
+                    else:
+                        snapshot = self.execution_engine._cache.get_all_serialized()
+                        if snapshot:
+                            await self._send_ws_json({
+                                "type": "execution_quotes",
+                                "quote_snapshot": snapshot,
+                                "timestamp": time.time(),
+                            })
                 await asyncio.sleep(QUOTE_PUSH_INTERVAL)
             except Exception as e:
                 logger.debug("Quote push error: %s", e)
                 break
 
+    async def _send_quote_frame(self, frame: dict) -> None:
+        """Send a v2 quote frame using the framing negotiated with the relay."""
+        if not self.websocket:
+            return
+        if self._quote_encoding == "msgpack":
+            await self.websocket.send(pack_frame(_sanitize_for_json(frame)))
+        else:
+            await self._send_ws_json(frame)
+
     async def _account_event_push_loop(self):
         """Fallback: drain any events that the instant callback may have missed.
 
@@ -4190,6 +4197,9 @@ class IBDataAgent:
                     task = asyncio.create_task(self._process_request(request_id, data))
                     pending_tasks.add(task)
                     task.add_done_callback(pending_tasks.discard)
+                elif msg_type == "quote_keyframe_request":
+                    if self._quote_encoder is not None:
+                        self._quote_encoder.request_keyframe()
                 else:
                     logger.warning(f"Unknown message type: {msg_type}")
             except ConnectionClosed:
@@ -4242,7 +4252,9 @@ class IBDataAgent:
             await self.websocket.send(json.dumps({
                 "type": "auth",
                 "api_key": IB_PROVIDER_KEY,
-                "version": _agent_version
+                "version": _agent_version,
+                "quote_protocol": QUOTE_PROTOCOL_VERSION,
+                "encodings": supported_encodings(),
             }))
             
             response = await asyncio.wait_for(
@@ -4254,7 +4266,13 @@ class IBDataAgent:
             
             if auth_result.get("success"):
                 self.provider_id = auth_result.get("provider_id")
-                logger.info(f"Authenticated with relay as provider {self.provider_id}")
+                # Relays that predate quote protocol v2 omit both fields
+                self._quote_protocol = int(auth_result.get("quote_protocol", 1) or 1)
+                self._quote_encoding = auth_result.get("encoding", "json")
+                logger.info(
+                    f"Authenticated with relay as provider {self.provider_id} "
+                    f"(quote protocol v{self._quote_protocol}, {self._quote_encoding} framing)"
+                )
                 return True
             else:
                 logger.error(f"Authentication failed: {auth_result.get('error')}")
@@ -17,7 +17,7 @@ if sys.platform == 'win32':
 
 from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import time
 import logging
@@ -91,6 +91,49 @@ class OptionData:
         return self.last if self.last > 0 else 0
 
 
+class _BatchSnapshot:
+    """One in-flight reqMktData of get_option_data_batch.
+
+    The tick handlers call mark() as bid/ask prices and sizes (and greeks)
+    arrive; the first time everything needed is in, the reqId goes on the
+    batch's done queue so the scheduler can retire it and reuse the line.
+    """
+
+    BID, ASK, BID_SIZE, ASK_SIZE, GREEKS = 1, 2, 4, 8, 16
+    QUOTE = BID | ASK | BID_SIZE | ASK_SIZE
+
+    __slots__ = ("req_id", "index", "started", "deadline", "needed", "seen", "done", "failed")
+
+    def __init__(self, req_id: int, index: int, started: float, deadline: float,
+                 require_greeks: bool, done: "queue.Queue"):
+        self.req_id = req_id
+        self.index = index
+        self.started = started
+        self.deadline = deadline
+        self.needed = self.QUOTE | (self.GREEKS if require_greeks else 0)
+        self.seen = 0
+        self.done = done
+        self.failed = False
+
+    @property
+    def complete(self) -> bool:
+        return self.seen & self.needed == self.needed
+
+    def mark(self, bit: int):
+        if self.complete:
+            return
+        self.seen |= bit
+        if self.complete:
+            self.done.put(self.req_id)
+
+    def fail(self):
+        """IB rejected the request (e.g. error 200): nothing more will arrive."""
+        if not self.failed:
+            self.failed = True
+            self.done.put(self.req_id)
+
+
+
 class IBMergerArbScanner(EWrapper, EClient):
     """
     IB API-based scanner for merger arbitrage options.
@@ -151,6 +194,9 @@ class IBMergerArbScanner(EWrapper, EClient):
         # Serializes reqHistoricalData (monkey-patch pattern is not thread-safe)
         self._historical_lock = Lock()
         self._opt_snapshot_req_id: Optional[int] = None
+        # get_option_data_batch: in-flight requests (reqId -> _BatchSnapshot) and last call's stats
+        self._batch_snapshots: Dict[int, _BatchSnapshot] = {}
+        self.last_batch_stats: Optional[dict] = None
 
         # Data farm health: tracks which data farms are up/down
         # Keys are farm names extracted from IB error strings (e.g. "usfarm.nj", "usfuture", "cashfarm")
@@ -943,6 +989,10 @@ class IBMergerArbScanner(EWrapper, EClient):
             if errorCode in _mkt_err_codes or "not subscribed" in (errorString or "").lower():
                 self.last_mkt_data_error = (reqId, errorCode, errorString)
             # 200 = no security definition; for option snapshots, unblock the wait
+            if errorCode == 200:
+                snapshot = self._batch_snapshots.get(reqId)
+                if snapshot is not None:
+                    snapshot.fail()
             if errorCode == 200 and self._opt_snapshot_req_id == reqId:
                 done = self._opt_snapshot_done
                 if done:
@@ -1681,12 +1731,19 @@ class IBMergerArbScanner(EWrapper, EClient):
                     elif tickType == 9:
                         self.underlying_close = price
             elif reqId in self.option_chain:
+                # .get(): get_option_data_batch may retire the request meanwhile
+                entry = self.option_chain.get(reqId)
+                if entry is None:
+                    return
                 if tickType == 1:
-                    self.option_chain[reqId]['bid'] = price
+                    entry['bid'] = price
                 elif tickType == 2:
-                    self.option_chain[reqId]['ask'] = price
+                    entry['ask'] = price
                 elif tickType == 4:
-                    self.option_chain[reqId]['last'] = price
+                    entry['last'] = price
+                snapshot = self._batch_snapshots.get(reqId)
+                if snapshot is not None and tickType in (1, 2):
+                    snapshot.mark(_BatchSnapshot.BID if tickType == 1 else _BatchSnapshot.ASK)
 
     def tickSize(self, reqId: TickerId, tickType: int, size: int):
         """Handle size updates -- routes to streaming cache or scan data as appropriate."""
@@ -1704,15 +1761,19 @@ class IBMergerArbScanner(EWrapper, EClient):
                     self.underlying_volume = size
             return
         # Existing scan path (unchanged)
-        if reqId in self.option_chain:
+        entry = self.option_chain.get(reqId)
+        if entry is not None:
             if tickType == 0:  # Bid size
-                self.option_chain[reqId]['bid_size'] = size
+                entry['bid_size'] = size
             elif tickType == 3:  # Ask size
-                self.option_chain[reqId]['ask_size'] = size
+                entry['ask_size'] = size
             elif tickType == 8:  # Volume
-                self.option_chain[reqId]['volume'] = size
+                entry['volume'] = size
             elif tickType == 27:  # Open Interest
-                self.option_chain[reqId]['open_interest'] = size
+                entry['open_interest'] = size
+            snapshot = self._batch_snapshots.get(reqId)
+            if snapshot is not None and tickType in (0, 3):
+                snapshot.mark(_BatchSnapshot.BID_SIZE if tickType == 0 else _BatchSnapshot.ASK_SIZE)
 
     def tickOptionComputation(self, reqId: TickerId, tickType: int, tickAttrib: int,
                               impliedVol: float, delta: float, optPrice: float,
@@ -1726,17 +1787,23 @@ class IBMergerArbScanner(EWrapper, EClient):
         # Scan path: store all greeks into option_chain
         # IB sends 1.7976931348623157e+308 (Double.MAX_VALUE) for "not computed"
         _IB_SENTINEL = 1e+300  # anything above this is an IB "no value" sentinel
-        if reqId in self.option_chain:
+        entry = self.option_chain.get(reqId)
+        if entry is not None:
             if impliedVol is not None and 0 < impliedVol < _IB_SENTINEL:
-                self.option_chain[reqId]['implied_vol'] = impliedVol
+                entry['implied_vol'] = impliedVol
             if delta is not None and abs(delta) < _IB_SENTINEL:
-                self.option_chain[reqId]['delta'] = delta
+                entry['delta'] = delta
+                # Bid/ask/last computations (10, 11, 12) also carry a delta, but only
+                # the model's (13, or 83 delayed) are the contract's greeks
+                snapshot = self._batch_snapshots.get(reqId)
+                if snapshot is not None and tickType in (13, 83):
+                    snapshot.mark(_BatchSnapshot.GREEKS)
             if gamma is not None and abs(gamma) < _IB_SENTINEL:
-                self.option_chain[reqId]['gamma'] = gamma
+                entry['gamma'] = gamma
             if theta is not None and abs(theta) < _IB_SENTINEL:
-                self.option_chain[reqId]['theta'] = theta
+                entry['theta'] = theta
             if vega is not None and abs(vega) < _IB_SENTINEL:
-                self.option_chain[reqId]['vega'] = vega
+                entry['vega'] = vega
 
     def get_available_expirations(self, ticker: str, contract_id: int = 0) -> List[str]:
         """Get available option expirations and strikes from IB. Waits for End callback (all exchanges).
@@ -1844,8 +1911,13 @@ class IBMergerArbScanner(EWrapper, EClient):
 
     def fetch_option_chain(self, ticker: str, expiry_months: int = 6, current_price: float = None, 
                            deal_close_date: datetime = None, days_before_close: int = 0, 
-                           deal_price: float = None) -> List[OptionData]:
-        """Fetch option chain from IB"""
+                           deal_price: float = None,
+                           option_batch: Optional[Callable[[str, List[Tuple[str, float, str]]],
+                                                           List[Optional[OptionData]]]] = None) -> List[OptionData]:
+        """Fetch option chain from IB.
+
+        option_batch replaces get_option_data_batch for the quote step (the
+        agent passes one that serves fresh contracts from its quote store)."""
         print(f"[{ticker}] Fetching option chain (price={current_price or self.underlying_price}, deal_close={deal_close_date})", flush=True)
 
         _chain_start = time.time()
@@ -1919,7 +1991,7 @@ class IBMergerArbScanner(EWrapper, EClient):
                     for right in ['C', 'P']:
                         batch.append((expiry, strike, right))
             _batch_start = time.time()
-            results = self.get_option_data_batch(ticker, batch)
+            results = (option_batch or self.get_option_data_batch)(ticker, batch)
             _step_times["batch_option_data"] = round(time.time() - _batch_start, 3)
             options = [opt for opt in results if opt is not None]
 
@@ -1985,7 +2057,7 @@ class IBMergerArbScanner(EWrapper, EClient):
         return None
 
     BATCH_CHUNK_SIZE = 50  # default; overridden by resource_manager.scan_batch_size when available
-    BATCH_WAIT_SEC = 2.5
+    BATCH_WAIT_SEC = 2.5  # per-contract deadline in get_option_data_batch
 
     @property
     def _effective_batch_size(self) -> int:
@@ -1995,19 +2067,32 @@ class IBMergerArbScanner(EWrapper, EClient):
         return self.BATCH_CHUNK_SIZE
 
     def get_option_data_batch(
-        self, ticker: str, contracts: List[Tuple[str, float, str]]
+        self, ticker: str, contracts: List[Tuple[str, float, str]], require_greeks: bool = True
     ) -> List[Optional[OptionData]]:
-        """Get data for many option contracts at once (batch reqMktData, single wait, then cancel).
-        Processes in chunks sized by _effective_batch_size to stay under IB concurrent limits.
-        Returns list in same order as contracts; missing/empty data is None."""
+        """Get data for many option contracts at once over a sliding window of market data lines.
+
+        Keeps up to _effective_batch_size reqMktData requests in flight. Each is
+        cancelled as soon as its bid/ask prices and sizes (and greeks, when
+        require_greeks) have arrived, IB rejects it, or BATCH_WAIT_SEC after it
+        started, and the freed line goes to the next contract right away.
+        Returns list in same order as contracts; missing/empty data is None.
+        Per-call stats (lines used, latency) are in last_batch_stats."""
         if not contracts:
             return []
-        chunk_size = self._effective_batch_size
-        results: List[Optional[OptionData]] = []
-        for start in range(0, len(contracts), chunk_size):
-            chunk = contracts[start : start + chunk_size]
-            req_ids: List[int] = []
-            for expiry, strike, right in chunk:
+        results: List[Optional[OptionData]] = [None] * len(contracts)
+        done: "queue.Queue[int]" = queue.Queue()
+        active: Dict[int, _BatchSnapshot] = {}
+        waiting = deque(enumerate(contracts))
+        latencies: List[float] = []
+        stats = {"ticker": ticker, "contracts": len(contracts), "lines": 0, "peak_in_flight": 0,
+                 "complete": 0, "rejected": 0, "timed_out": 0}
+        batch_start = time.monotonic()
+
+        while waiting or active:
+            window = self._effective_batch_size
+            stats["lines"] = max(stats["lines"], window)
+            while waiting and len(active) < window:
+                index, (expiry, strike, right) = waiting.popleft()
                 contract = Contract()
                 contract.symbol = ticker
                 contract.secType = "OPT"
@@ -2018,7 +2103,6 @@ class IBMergerArbScanner(EWrapper, EClient):
                 contract.right = right
                 contract.multiplier = "100"
                 req_id = self.get_next_req_id()
-                req_ids.append(req_id)
                 self.req_id_map[req_id] = f"option_{ticker}_{expiry}_{strike}_{right}"
                 self.option_chain[req_id] = {
                     "symbol": ticker,
@@ -2038,18 +2122,54 @@ class IBMergerArbScanner(EWrapper, EClient):
                     "bid_size": 0,
                     "ask_size": 0,
                 }
+                now = time.monotonic()
+                snapshot = _BatchSnapshot(req_id, index, now, now + self.BATCH_WAIT_SEC, require_greeks, done)
+                active[req_id] = snapshot
+                self._batch_snapshots[req_id] = snapshot
                 self.reqMktData(req_id, contract, "100,101,104,106", False, False, [])
-            time.sleep(self.BATCH_WAIT_SEC)
-            for req_id in req_ids:
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], len(active))
+
+            # Wait for the next completion, or until the earliest deadline
+            retire: List[int] = []
+            timeout = min(s.deadline for s in active.values()) - time.monotonic()
+            try:
+                retire.append(done.get(timeout=max(timeout, 0)))
+                while True:
+                    retire.append(done.get_nowait())
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            retire.extend(req_id for req_id, s in active.items() if s.deadline <= now)
+
+            for req_id in retire:
+                snapshot = active.pop(req_id, None)
+                if snapshot is None:
+                    continue  # completed and timed out in the same pass
                 self.cancelMktData(req_id)
-            for req_id, (expiry, strike, right) in zip(req_ids, chunk):
-                data = self.option_chain.get(req_id)
+                self._batch_snapshots.pop(req_id, None)
+                # Pop so late-arriving ticks do not leave orphan entries.
+                data = self.option_chain.pop(req_id, None)
+                self.req_id_map.pop(req_id, None)
                 if data:
-                    results.append(OptionData(**data))
+                    results[snapshot.index] = OptionData(**data)
+                if snapshot.complete:
+                    stats["complete"] += 1
+                    latencies.append(now - snapshot.started)
+                elif snapshot.failed:
+                    stats["rejected"] += 1
                 else:
-                    results.append(None)
-            # Clean up all req_ids so late-arriving ticks do not leave orphan entries.
-            for req_id in req_ids:
-                self.option_chain.pop(req_id, None)
-                self.req_id_map.pop(req_id, None)
+                    stats["timed_out"] += 1
+
+        stats["elapsed_sec"] = round(time.monotonic() - batch_start, 3)
+        if latencies:
+            latencies.sort()
+            stats["contract_p50_sec"] = round(latencies[len(latencies) // 2], 3)
+            stats["contract_max_sec"] = round(latencies[-1], 3)
+        self.last_batch_stats = stats
+        print(
+            f"[perf][{ticker}] option batch contracts={stats['contracts']} lines={stats['lines']} "
+            f"peak_in_flight={stats['peak_in_flight']} complete={stats['complete']} "
+            f"rejected={stats['rejected']} timed_out={stats['timed_out']} elapsed={stats['elapsed_sec']}s",
+            flush=True,
+        )
         return results
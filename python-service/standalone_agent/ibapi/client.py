@@ -42,7 +42,7 @@ class EClient(object):
     #TODO: support redirect !!
 
     def __init__(self, wrapper):
-        self.msg_queue = queue.Queue()
+        self.msg_queue = reader.MessageQueue()
         self.wrapper = wrapper
         self.decoder = None
         self.reset()
@@ -218,8 +218,8 @@ class EClient(object):
         """Call this function to check if there is a connection with TWS"""
 
         connConnected = self.conn and self.conn.isConnected()
-        logger.debug("%s isConn: %s, connConnected: %s" % (id(self),
-            self.connState, str(connConnected)))
+        logger.debug("%s isConn: %s, connConnected: %s", id(self),
+            self.connState, connConnected)
         return EClient.CONNECTED == self.connState and connConnected
 
     def keyboardInterrupt(self):
@@ -269,9 +269,10 @@ class EClient(object):
                 except BadMessage:
                     logger.info("BadMessage")
 
-                logger.debug("conn:%d queue.sz:%d",
-                             self.isConnected(),
-                             self.msg_queue.qsize())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("conn:%d queue.sz:%d",
+                                 self.isConnected(),
+                                 self.msg_queue.qsize())
         finally:
             self.disconnect()
 
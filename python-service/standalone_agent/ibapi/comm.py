@@ -55,20 +55,79 @@ def make_field_handle_empty(val) -> str:
     return make_field(val)
 
 
+_SIZE_PREFIX = struct.Struct("!I")
+
+
 def read_msg(buf:bytes) -> tuple:
     """ first the size prefix and then the corresponding msg payload """
 
     if len(buf) < 4:
         return (0, "", buf)
-    size = struct.unpack("!I", buf[0:4])[0]
+    size = _SIZE_PREFIX.unpack_from(buf)[0]
     logger.debug("read_msg: size: %d", size)
     if len(buf) - 4 >= size:
-        text = struct.unpack("!%ds" % size, buf[4:4+size])[0]
-        return (size, text, buf[4+size:])
+        return (size, bytes(buf[4:4+size]), buf[4+size:])
     else:
         return (size, "", buf)
 
 
+class FrameBuffer:
+    """ Reassembles size-prefixed messages from a byte stream.
+
+    Incoming data is appended to a preallocated bytearray and complete
+    messages are cut out at a read offset through a memoryview, so each
+    payload is copied once no matter how many messages a read carries.
+    Unread bytes are moved to the front only when the buffer runs out of
+    room, which doubles it if the pending message does not fit.
+    """
+
+    def __init__(self, capacity:int=65536):
+        self.buf = bytearray(capacity)
+        self.start = 0   # first unread byte
+        self.end = 0     # one past the last received byte
+
+    def __len__(self):
+        return self.end - self.start
+
+    def feed(self, data:bytes):
+        n = len(data)
+        if self.end + n > len(self.buf):
+            self._make_room(n)
+        self.buf[self.end:self.end+n] = data
+        self.end += n
+
+    def _make_room(self, n:int):
+        pending = self.end - self.start
+        capacity = len(self.buf)
+        while pending + n > capacity:
+            capacity *= 2
+        if capacity > len(self.buf):
+            buf = bytearray(capacity)
+            buf[:pending] = memoryview(self.buf)[self.start:self.end]
+            self.buf = buf
+        else:
+            self.buf[:pending] = self.buf[self.start:self.end]
+        self.start, self.end = 0, pending
+
+    def read_msgs(self) -> list:
+        """ complete message payloads received so far, in order """
+
+        msgs = []
+        buf, start, end = self.buf, self.start, self.end
+        with memoryview(buf) as view:
+            while end - start >= 4:
+                size = _SIZE_PREFIX.unpack_from(buf, start)[0]
+                if end - start - 4 < size:
+                    break
+                if size:   # empty frames were never queued by read_msg callers
+                    msgs.append(bytes(view[start+4:start+4+size]))
+                start += 4 + size
+        if start == end:
+            start = end = 0
+        self.start, self.end = start, end
+        return msgs
+
+
 def read_fields(buf:bytes) -> tuple:
     if isinstance(buf, str):
         buf = buf.encode()
@@ -108,15 +108,17 @@ class Connection:
 
     def _recvAllMsg(self):
         cont = True
-        allbuf = b""
+        chunks = []
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         while cont and self.isConnected():
             buf = self.socket.recv(4096)
-            allbuf += buf
-            logger.debug("len %d raw:%s|", len(buf), buf)
+            chunks.append(buf)
+            if debug:
+                logger.debug("len %d raw:%s|", len(buf), buf)
 
             if len(buf) < 4096:
                 cont = False
 
-        return allbuf
+        return b"".join(chunks)
 
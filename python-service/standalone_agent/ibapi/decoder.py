@@ -26,6 +26,18 @@ from ibapi.orderdecoder import OrderDecoder
 logger = logging.getLogger(__name__)
 
 
+# Field converters for the fast-path decoders: decode() without the logging
+# and the per-call type dispatch
+def _int(s):
+    return int(s or 0)
+
+def _float(s):
+    return float(s or 0)
+
+def _str(s):
+    return s.decode(errors='backslashreplace') if type(s) is bytes else s
+
+
 class HandleInfo(Object):
     def __init__(self, wrap=None, proc=None):
         self.wrapperMeth = wrap
@@ -43,8 +55,19 @@ class HandleInfo(Object):
 class Decoder(Object):
     def __init__(self, wrapper, serverVersion):
         self.wrapper = wrapper
-        self.serverVersion = serverVersion
         self.discoverParams()
+        self.serverVersion = serverVersion
+
+    @property
+    def serverVersion(self):
+        return self._serverVersion
+
+    @serverVersion.setter
+    def serverVersion(self, serverVersion):
+        # Field layouts depend on the server version, so the fast-path
+        # decoders are rebuilt whenever it is set (EClient sets it after the handshake)
+        self._serverVersion = serverVersion
+        self.fastDecoders = self.makeFastDecoders() if serverVersion is not None else {}
 
 
     def processTickPriceMsg(self, fields):
@@ -1274,6 +1297,186 @@ class Decoder(Object):
         logger.debug("calling %s with %s %s", method, self.wrapper, args)
         method(*args)
 
+    ######################################################################
+
+    def makeFastDecoders(self):
+        """ Specialized decoders for the high-frequency messages at this server version.
+
+        Each one converts fields by position with converters chosen here, once,
+        instead of per message and per field, calls the wrapper method and
+        returns True. It returns False when the message does not have the
+        expected number of fields, and interpret() then takes the generic path,
+        which handles or reports it as before. Messages whose layout depends on
+        a version field in the message (old servers) get no fast decoder.
+
+        Wrapper methods are looked up on every call rather than bound here:
+        callers swap them at runtime (IBDataAgent replaces scanner.tickPrice
+        while it takes a futures snapshot).
+        """
+        decoders = {
+            IN.TICK_PRICE: self.makeTickPriceDecoder(),
+            IN.ORDER_STATUS: self.makeOrderStatusDecoder(),
+        }
+        for msgId in (IN.TICK_SIZE, IN.TICK_GENERIC, IN.TICK_STRING):
+            decoders[msgId] = self.makeSignatureDecoder(self.msgId2handleInfo[msgId])
+        if self.serverVersion >= MIN_SERVER_VER_PRICE_BASED_VOLATILITY:
+            decoders[IN.TICK_OPTION_COMPUTATION] = self.makeTickOptionComputationDecoder()
+        if self.serverVersion >= MIN_SERVER_VER_LAST_LIQUIDITY:
+            decoders[IN.EXECUTION_DATA] = self.makeExecutionDataDecoder()
+        return {msgId: decoder for (msgId, decoder) in decoders.items() if decoder is not None}
+
+    def makeSignatureDecoder(self, handleInfo):
+        """ interpretWithSignature() with the parameter walk done up front """
+        if handleInfo.wrapperParams is None:
+            return None
+
+        encoding = 'unicode-escape' if self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7 else 'UTF-8'
+
+        def text(s):
+            try:
+                return s.decode(encoding)
+            except UnicodeDecodeError:
+                return s.decode('latin-1')
+
+        converters = tuple(int if param.annotation is int else float if param.annotation is float else text
+                           for (pname, param) in handleInfo.wrapperParams.items() if pname != "self")
+        nFields = len(converters) + 2 # msgId and versionId
+        wrapper = self.wrapper
+        methName = handleInfo.wrapperMeth.__name__
+
+        def decodeWithSignature(fields):
+            if len(fields) != nFields:
+                return False
+            getattr(wrapper, methName)(*[conv(field) for (conv, field) in zip(converters, fields[2:])])
+            return True
+        return decodeWithSignature
+
+    def makeTickPriceDecoder(self):
+        """ processTickPriceMsg() """
+        wrapper = self.wrapper
+        pastLimit = self.serverVersion >= MIN_SERVER_VER_PAST_LIMIT
+        preOpen = self.serverVersion >= MIN_SERVER_VER_PRE_OPEN_BID_ASK
+        sizeTickTypes = {
+            TickTypeEnum.BID: TickTypeEnum.BID_SIZE,
+            TickTypeEnum.ASK: TickTypeEnum.ASK_SIZE,
+            TickTypeEnum.LAST: TickTypeEnum.LAST_SIZE,
+            TickTypeEnum.DELAYED_BID: TickTypeEnum.DELAYED_BID_SIZE,
+            TickTypeEnum.DELAYED_ASK: TickTypeEnum.DELAYED_ASK_SIZE,
+            TickTypeEnum.DELAYED_LAST: TickTypeEnum.DELAYED_LAST_SIZE,
+        }
+
+        def decodeTickPrice(fields):
+            if len(fields) < 7:
+                return False
+            reqId = _int(fields[2])
+            tickType = _int(fields[3])
+            price = _float(fields[4])
+            size = _int(fields[5])
+            attrMask = _int(fields[6])
+
+            attrib = TickAttrib()
+            if pastLimit:
+                attrib.canAutoExecute = attrMask & 1 != 0
+                attrib.pastLimit = attrMask & 2 != 0
+                if preOpen:
+                    attrib.preOpen = attrMask & 4 != 0
+            else:
+                attrib.canAutoExecute = attrMask == 1
+
+            wrapper.tickPrice(reqId, tickType, price, attrib)
+            sizeTickType = sizeTickTypes.get(tickType)
+            if sizeTickType is not None:
+                wrapper.tickSize(reqId, sizeTickType, size)
+            return True
+        return decodeTickPrice
+
+    def makeOrderStatusDecoder(self):
+        """ processOrderStatusMsg() """
+        wrapper = self.wrapper
+        qty = _float if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS else _int
+        hasMktCapPrice = self.serverVersion >= MIN_SERVER_VER_MARKET_CAP_PRICE
+        # orderId, status, filled, remaining, avgFillPrice, permId, parentId,
+        # lastFillPrice, clientId, whyHeld[, mktCapPrice]
+        converters = (_int, _str, qty, qty, _float, _int, _int, _float, _int, _str)
+        if hasMktCapPrice:
+            converters += (_float,)
+        first = 1 if hasMktCapPrice else 2 # no version field from MIN_SERVER_VER_MARKET_CAP_PRICE on
+        nFields = first + len(converters)
+
+        def decodeOrderStatus(fields):
+            if len(fields) < nFields:
+                return False
+            args = [conv(field) for (conv, field) in zip(converters, fields[first:])]
+            if not hasMktCapPrice:
+                args.append(None)
+            wrapper.orderStatus(*args)
+            return True
+        return decodeOrderStatus
+
+    def makeTickOptionComputationDecoder(self):
+        """ processTickOptionComputationMsg(), MIN_SERVER_VER_PRICE_BASED_VOLATILITY and later """
+        wrapper = self.wrapper
+
+        def decodeTickOptionComputation(fields):
+            if len(fields) < 12:
+                return False
+            reqId = _int(fields[1])
+            tickTypeInt = _int(fields[2])
+            tickAttrib = _int(fields[3])
+            impliedVol = _float(fields[4])
+            delta = _float(fields[5])
+            optPrice = _float(fields[6])
+            pvDividend = _float(fields[7])
+            gamma = _float(fields[8])
+            vega = _float(fields[9])
+            theta = _float(fields[10])
+            undPrice = _float(fields[11])
+
+            # same "not computed" indicators as processTickOptionComputationMsg()
+            wrapper.tickOptionComputation(reqId, tickTypeInt, tickAttrib,
+                None if impliedVol < 0 else impliedVol,
+                None if delta == -2 else delta,
+                None if optPrice == -1 else optPrice,
+                None if pvDividend == -1 else pvDividend,
+                None if gamma == -2 else gamma,
+                None if vega == -2 else vega,
+                None if theta == -2 else theta,
+                None if undPrice == -1 else undPrice)
+            return True
+        return decodeTickOptionComputation
+
+    def makeExecutionDataDecoder(self):
+        """ processExecutionDataMsg(), MIN_SERVER_VER_LAST_LIQUIDITY and later """
+        wrapper = self.wrapper
+        contractFields = (("conId", _int), ("symbol", _str), ("secType", _str),
+            ("lastTradeDateOrContractMonth", _str), ("strike", _float), ("right", _str),
+            ("multiplier", _str), ("exchange", _str), ("currency", _str),
+            ("localSymbol", _str), ("tradingClass", _str))
+        executionFields = (("execId", _str), ("time", _str), ("acctNumber", _str),
+            ("exchange", _str), ("side", _str),
+            ("shares", _float if self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_POSITIONS else _int),
+            ("price", _float), ("permId", _int), ("clientId", _int), ("liquidation", _int),
+            ("cumQty", _float), ("avgPrice", _float), ("orderRef", _str), ("evRule", _str),
+            ("evMultiplier", _float), ("modelCode", _str), ("lastLiquidity", _int))
+        firstExecutionField = 3 + len(contractFields)
+        nFields = firstExecutionField + len(executionFields)
+
+        def decodeExecutionData(fields):
+            if len(fields) < nFields:
+                return False
+            reqId = _int(fields[1])
+            orderId = _int(fields[2])
+            contract = Contract()
+            for ((name, conv), field) in zip(contractFields, fields[3:firstExecutionField]):
+                setattr(contract, name, conv(field))
+            execution = Execution()
+            execution.orderId = orderId
+            for ((name, conv), field) in zip(executionFields, fields[firstExecutionField:]):
+                setattr(execution, name, conv(field))
+            wrapper.execDetails(reqId, contract, execution)
+            return True
+        return decodeExecutionData
+
     def interpret(self, fields):
         if len(fields) == 0:
             logger.debug("no fields")
@@ -1282,6 +1485,10 @@ class Decoder(Object):
         sMsgId = fields[0]
         nMsgId = int(sMsgId)
 
+        fastDecoder = self.fastDecoders.get(nMsgId)
+        if fastDecoder is not None and fastDecoder(fields):
+            return
+
         handleInfo = self.msgId2handleInfo.get(nMsgId, None)
 
         if handleInfo is None:
@@ -12,6 +12,7 @@ remove the size prefix and put the rest in a Queue.
 """
 
 import logging
+import queue
 from threading import Thread
 
 from ibapi import comm
@@ -20,6 +21,16 @@ from ibapi import comm
 logger = logging.getLogger(__name__)
 
 
+class MessageQueue(queue.Queue):
+    """ Unbounded Queue that also takes a whole batch of messages under one lock """
+
+    def put_many(self, items):
+        with self.not_full:
+            self.queue.extend(items)
+            self.unfinished_tasks += len(items)
+            self.not_empty.notify(len(items))
+
+
 class EReader(Thread):
     def __init__(self, conn, msg_queue):
         super().__init__()
@@ -29,26 +40,31 @@ class EReader(Thread):
     def run(self):
         try:
             logger.debug("EReader thread started")
-            buf = b""
+            frames = comm.FrameBuffer()
+            put_many = getattr(self.msg_queue, "put_many", None)
             while self.conn.isConnected():
 
                 data = self.conn.recvMsg()
-                logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
+                if not data:
+                    continue
+                frames.feed(data)
+                msgs = frames.read_msgs()
 
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    #logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug("size:%d msg.size:%d msg:|%s| buf:%s|", size,
-                        len(msg), buf, "|")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("reader loop, recvd size %d", len(data))
+                    for msg in msgs:
+                        logger.debug("size:%d msg:|%s|", len(msg), msg)
+                    if len(frames):
+                        logger.debug("more incoming packet(s) are needed, %d bytes pending", len(frames))
 
-                    if msg:
+                if not msgs:
+                    continue
+                if put_many is not None:
+                    put_many(msgs)
+                else:
+                    for msg in msgs:
                         self.msg_queue.put(msg)
-                    else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
 
             logger.debug("EReader thread finished")
         except:
             logger.exception('unhandled exception in EReader thread')
-
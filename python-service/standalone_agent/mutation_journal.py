@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Mutation Journal
+================
+Append-only, fsync'd JSON-lines journal used by PositionStore and
+ExecutionLedgerStore to persist individual mutations in constant time.
+
+Each store keeps its existing JSON snapshot file as the compacted base and
+appends one line per mutation to ``<snapshot>.journal``. On load the store
+reads the snapshot, replays the journal on top of it, and compacts (writes a
+fresh snapshot, truncates the journal). The store also compacts whenever the
+journal reaches ``compact_every`` ops.
+
+Ops are absolute writes (set field / put record / delete record), never
+deltas, so replaying a journal over a snapshot that already contains its
+effects is idempotent. That keeps recovery exact even if the process dies
+between writing a compacted snapshot and truncating the journal.
+
+The journal itself is store-agnostic: it only appends and replays dicts.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+class MutationJournal:
+    """Append-only JSON-lines journal with fsync-per-append durability."""
+
+    DEFAULT_COMPACT_EVERY = 1000
+
+    def __init__(self, path: str, *, compact_every: int = DEFAULT_COMPACT_EVERY, fsync: bool = True):
+        self._path = path
+        self._compact_every = max(1, int(compact_every))
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._fh = None
+        self._op_count = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def op_count(self) -> int:
+        """Ops appended since the last reset (i.e. not yet in the snapshot)."""
+        return self._op_count
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._op_count >= self._compact_every
+
+    def append(self, op: dict) -> None:
+        self.append_many((op,))
+
+    def append_many(self, ops: Iterable[dict]) -> None:
+        """Write ops as one contiguous chunk, flush and fsync."""
+        lines = [json.dumps(op, separators=(",", ":"), default=str) for op in ops]
+        if not lines:
+            return
+        chunk = "\n".join(lines) + "\n"
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self._path, "a", encoding="utf-8")
+            self._fh.write(chunk)
+            self._fh.flush()
+            if self._fsync:
+                os.fsync(self._fh.fileno())
+            self._op_count += len(lines)
+
+    def replay(self) -> List[dict]:
+        """Read every complete op from disk.
+
+        A malformed final line is treated as a torn write from a crash and
+        dropped. A malformed line in the middle stops replay there -- later
+        ops may depend on the lost one, so applying them could corrupt state.
+        """
+        if not os.path.exists(self._path):
+            self._op_count = 0
+            return []
+        ops: List[dict] = []
+        with open(self._path, "r", encoding="utf-8") as fh:
+            lines = fh.read().split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        for lineno, line in enumerate(lines, start=1):
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError:
+                if lineno == len(lines):
+                    logger.warning("MutationJournal %s: dropping torn final line", self._path)
+                else:
+                    logger.error(
+                        "MutationJournal %s: corrupt line %d of %d, replay stopped",
+                        self._path, lineno, len(lines),
+                    )
+                break
+            if isinstance(op, dict):
+                ops.append(op)
+        self._op_count = len(ops)
+        return ops
+
+    def reset(self) -> None:
+        """Truncate the journal. Call only after a snapshot containing every op is on disk."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            with open(self._path, "w", encoding="utf-8") as fh:
+                fh.flush()
+                if self._fsync:
+                    os.fsync(fh.fileno())
+            self._op_count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
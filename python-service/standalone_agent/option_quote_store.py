@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Option Quote Store
+==================
+Per-contract cache of option snapshot quotes for the agent's request handlers.
+
+fetch_chain, fetch_prices and sell_scan all end in
+IBMergerArbScanner.get_option_data_batch, and their contract sets overlap
+heavily (the same near-the-money strikes for a ticker, or a chain the
+dashboard asked for a moment ago under different deal parameters). Entries
+are keyed by (symbol, expiry, strike, right), so any handler can reuse a
+quote another one fetched, and only contracts that are missing or stale cost
+a market data line.
+
+Freshness is tracked per field group: the quote (bid/ask/last and sizes) and
+the model greeks (implied vol, delta, gamma, theta, vega) each carry the time
+they were last received, with their own TTL. A snapshot that timed out before
+its greeks arrived still refreshes the quote, and keeps greeks fetched earlier
+while those are within their TTL.
+
+Memory is capped by an LRU bound on the number of contracts; entries whose
+field groups have all outlived their TTL are purged as the store is updated.
+
+Usage:
+    store = OptionQuoteStore(ttl_seconds=60, max_contracts=20000)
+    results, missing = store.lookup("AAPL", contracts)
+    fetched = scanner.get_option_data_batch("AAPL", [contracts[i] for i in missing])
+    for i, opt in zip(missing, store.update("AAPL", [contracts[i] for i in missing], fetched)):
+        results[i] = opt
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from ib_scanner import OptionData
+
+logger = logging.getLogger(__name__)
+
+QUOTE_FIELDS = ("bid", "ask", "last", "volume", "open_interest", "bid_size", "ask_size")
+GREEK_FIELDS = ("implied_vol", "delta", "gamma", "theta", "vega")
+
+
+def contract_key(symbol: str, expiry: str, strike: float, right: str) -> Tuple[str, str, float, str]:
+    """Normalized store key: upper-case symbol, YYYYMMDD expiry, float strike, C/P."""
+    return (symbol.upper(), expiry.replace("-", ""), float(strike), right.upper())
+
+
+class _Entry:
+    """Stored fields of one contract plus when each field group last arrived."""
+
+    __slots__ = ("fields", "quote_at", "greeks_at")
+
+    def __init__(self, fields: dict, quote_at: Optional[float], greeks_at: Optional[float]):
+        self.fields = fields
+        self.quote_at = quote_at
+        self.greeks_at = greeks_at
+
+
+class OptionQuoteStore:
+    """Contract-level option quote cache with per-field-group TTL and an LRU cap."""
+
+    def __init__(self, ttl_seconds: float = 60, greeks_ttl_seconds: Optional[float] = None,
+                 max_contracts: int = 20000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl_seconds
+        self.greeks_ttl = ttl_seconds if greeks_ttl_seconds is None else greeks_ttl_seconds
+        self.max_contracts = max_contracts
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = clock() + min(self.ttl, self.greeks_ttl)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # misses where a contract was stored but too old
+        self.evicted = 0  # dropped by the LRU cap
+        self.expired = 0  # dropped by TTL purge
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, entry: _Entry, now: float, require_greeks: bool) -> bool:
+        if entry.quote_at is None or now - entry.quote_at >= self.ttl:
+            return False
+        if require_greeks and (entry.greeks_at is None or now - entry.greeks_at >= self.greeks_ttl):
+            return False
+        return True
+
+    def lookup(self, symbol: str, contracts: List[Tuple[str, float, str]],
+               require_greeks: bool = True) -> Tuple[List[Optional[OptionData]], List[int]]:
+        """Cached data for (expiry, strike, right) contracts of symbol.
+
+        Returns (results, missing): results in the order of contracts, with
+        None where the contract has no fresh entry, and the indexes of those
+        contracts, to be fetched and passed to update()."""
+        results: List[Optional[OptionData]] = [None] * len(contracts)
+        missing: List[int] = []
+        now = self._clock()
+        with self._lock:
+            for i, (expiry, strike, right) in enumerate(contracts):
+                key = contract_key(symbol, expiry, strike, right)
+                entry = self._entries.get(key)
+                if entry is not None and self._fresh(entry, now, require_greeks):
+                    self._entries.move_to_end(key)
+                    results[i] = OptionData(**entry.fields)
+                    self.hits += 1
+                else:
+                    if entry is not None:
+                        self.stale += 1
+                    missing.append(i)
+                    self.misses += 1
+        return results, missing
+
+    def update(self, symbol: str, contracts: List[Tuple[str, float, str]],
+               fetched: List[Optional[OptionData]]) -> List[Optional[OptionData]]:
+        """Store fetched snapshots (as returned by get_option_data_batch) for contracts.
+
+        Only field groups that arrived replace stored ones; greeks or a quote
+        still within TTL are kept when the new snapshot lacks them. Returns
+        the merged data per contract: a snapshot with neither a quote nor
+        greeks is returned as fetched but not stored, and None means nothing
+        was fetched or stored."""
+        merged: List[Optional[OptionData]] = []
+        now = self._clock()
+        with self._lock:
+            for (expiry, strike, right), opt in zip(contracts, fetched):
+                key = contract_key(symbol, expiry, strike, right)
+                entry = self._entries.get(key)
+                if opt is None:
+                    merged.append(OptionData(**entry.fields) if entry is not None
+                                  and self._fresh(entry, now, False) else None)
+                    continue
+                fields = dict(vars(opt))
+                # Only a live bid or ask is a quote. last can be a trade hours old
+                # (after the close IB sends -1 bid/ask with last, volume and OI),
+                # so a last-only snapshot is not served to later requests.
+                has_quote = opt.bid > 0 or opt.ask > 0
+                has_greeks = opt.delta != 0 or opt.implied_vol != 0
+                quote_at = now if has_quote else None
+                greeks_at = now if has_greeks else None
+                if entry is not None:
+                    if not has_quote and entry.quote_at is not None and now - entry.quote_at < self.ttl:
+                        fields.update({f: entry.fields[f] for f in QUOTE_FIELDS})
+                        quote_at = entry.quote_at
+                    if not has_greeks and entry.greeks_at is not None and now - entry.greeks_at < self.greeks_ttl:
+                        fields.update({f: entry.fields[f] for f in GREEK_FIELDS})
+                        greeks_at = entry.greeks_at
+                if quote_at is None and greeks_at is None:
+                    self._entries.pop(key, None)
+                    merged.append(opt)
+                    continue
+                self._entries[key] = _Entry(fields, quote_at, greeks_at)
+                self._entries.move_to_end(key)
+                merged.append(OptionData(**fields))
+            while len(self._entries) > self.max_contracts:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+            if now >= self._next_purge:
+                self._purge_expired(now)
+        return merged
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [
+            key for key, entry in self._entries.items()
+            if (entry.quote_at is None or now - entry.quote_at >= self.ttl)
+            and (entry.greeks_at is None or now - entry.greeks_at >= self.greeks_ttl)
+        ]
+        for key in expired:
+            del self._entries[key]
+        self.expired += len(expired)
+        self._next_purge = now + min(self.ttl, self.greeks_ttl)
+        if expired:
+            logger.debug("Option quote store purged %d expired contracts", len(expired))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        logger.info("Option quote store cleared")
+
+    def stats(self) -> dict:
+        """Counters for agent_state: every hit is a reqMktData line not used."""
+        lookups = self.hits + self.misses
+        return {
+            "contracts": len(self._entries),
+            "max_contracts": self.max_contracts,
+            "ttl_sec": self.ttl,
+            "greeks_ttl_sec": self.greeks_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "lines_saved": self.hits,
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
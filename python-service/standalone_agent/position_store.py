@@ -6,11 +6,18 @@ JSON-based persistence for risk manager positions. Survives engine restarts
 so risk managers can be reconstructed with full state (HWM, trailing stops,
 level states, fill logs).
 
-Single flat JSON file — human-readable, write-on-mutate with atomic writes
-and .bak backup. Thread-safe via threading.Lock.
+Single flat JSON file — human-readable snapshot with atomic writes and
+.bak backup. Thread-safe via threading.Lock.
+
+Mutations are persisted by appending small field/fill ops to an fsync'd
+journal (position_store.json.journal) which is replayed on load and folded
+into the snapshot on compaction, so a fill costs one journal line instead of
+a full-file rewrite. backend="snapshot" restores the legacy
+rewrite-on-every-mutation behaviour.
 
 File: standalone_agent/position_store.json (next to this module)
 Backup: standalone_agent/position_store.json.bak
+Journal: standalone_agent/position_store.json.journal
 """
 
 import json
@@ -25,8 +32,10 @@ from typing import Dict, List, Optional
 
 try:
     from .execution_ledger import ExecutionLedgerStore
+    from .mutation_journal import MutationJournal
 except ImportError:  # pragma: no cover - supports direct script imports in tests
     from execution_ledger import ExecutionLedgerStore
+    from mutation_journal import MutationJournal
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +43,18 @@ logger = logging.getLogger(__name__)
 class PositionStore:
     """Thread-safe JSON position store with atomic writes."""
 
-    def __init__(self, path: Optional[str] = None):
+    BACKEND_JOURNAL = ExecutionLedgerStore.BACKEND_JOURNAL
+    BACKEND_SNAPSHOT = ExecutionLedgerStore.BACKEND_SNAPSHOT
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        backend: str = BACKEND_JOURNAL,
+        compact_every: int = MutationJournal.DEFAULT_COMPACT_EVERY,
+    ):
+        if backend not in ExecutionLedgerStore.BACKENDS:
+            raise ValueError(f"backend must be one of {ExecutionLedgerStore.BACKENDS}, got {backend!r}")
         if path is None:
             # Default: position_store.json next to this file
             path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "position_store.json")
@@ -48,7 +68,19 @@ class PositionStore:
         self._lock = threading.Lock()
         self._positions: Dict[str, dict] = {}  # id -> position record
         self._dirty_ids: set = set()  # position IDs needing sync to server
-        self._execution_ledger = ExecutionLedgerStore(ledger_path)
+        self._journal = (
+            MutationJournal(path + ".journal", compact_every=compact_every)
+            if backend == self.BACKEND_JOURNAL else None
+        )
+        # position id -> fill_log length already journaled (detects fills
+        # appended to a shared fill_log list outside the store API)
+        self._journaled_fill_counts: Dict[str, int] = {}
+        # position id -> per-position fill_log lookup (exec_id -> index,
+        # order_id -> indexes); see _fill_lookup_locked
+        self._fill_lookups: Dict[str, dict] = {}
+        self._execution_ledger = ExecutionLedgerStore(
+            ledger_path, backend=backend, compact_every=compact_every,
+        )
         self._load()
 
     # ── Public API ──
@@ -82,7 +114,7 @@ class PositionStore:
             }
             self._positions[position_id] = record
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fields=tuple(record))
         logger.info("PositionStore: added position %s (%s)", position_id, parent_strategy)
 
     def update_runtime_state(self, position_id: str, state_dict: dict) -> None:
@@ -93,7 +125,7 @@ class PositionStore:
                 logger.warning("PositionStore: update_runtime_state for unknown position %s", position_id)
                 return
             pos["runtime_state"] = state_dict
-            self._save()
+            self._persist_locked(position_id, fields=("runtime_state",))
 
     def add_fill(self, position_id: str, fill_dict: dict) -> None:
         """Append a fill entry to the position's fill_log."""
@@ -118,10 +150,13 @@ class PositionStore:
                     fill_dict.get("qty_filled"),
                     float(fill_dict.get("avg_price", 0.0) or 0.0),
                 )
+                # The duplicate may already sit in a fill_log shared with a
+                # risk manager; make sure it reaches the journal.
+                self._persist_locked(position_id)
                 return
             fill_log.append(fill_dict)
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id)
             inserted = True
         if inserted:
             self._execution_ledger.record_fill(
@@ -143,7 +178,7 @@ class PositionStore:
             if exit_reason:
                 pos["exit_reason"] = exit_reason
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fields=("status", "closed_at", "exit_reason"))
         logger.info("PositionStore: marked position %s as closed (reason=%s)", position_id, exit_reason or "unspecified")
 
     def get_active_positions(self) -> List[dict]:
@@ -170,7 +205,7 @@ class PositionStore:
                 return
             pos["lineage"] = lineage
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fields=("lineage",))
 
     def update_entry(self, position_id: str, entry_updates: dict) -> None:
         """Merge updates into a position's entry dict (e.g. aggregated qty/price).
@@ -185,7 +220,7 @@ class PositionStore:
                 return
             pos.setdefault("entry", {}).update(entry_updates)
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fields=("entry",))
 
     @staticmethod
     def _deep_merge(base: dict, override: dict) -> dict:
@@ -386,6 +421,57 @@ class PositionStore:
             1 if unresolved else 0,
         )
 
+    @classmethod
+    def _index_fill(cls, lookup: dict, idx: int, fill: dict) -> None:
+        exec_id = fill.get("exec_id")
+        if exec_id:
+            current = lookup["exec"].get(exec_id)
+            if current is None or idx < current:
+                lookup["exec"][exec_id] = idx
+        lookup["order"].setdefault(cls._coerce_int(fill.get("order_id")), []).append(idx)
+
+    @classmethod
+    def _build_fill_lookup(cls, fill_log: List[dict]) -> dict:
+        lookup = {"log": fill_log, "n": 0, "last": None, "exec": {}, "order": {}}
+        for idx, fill in enumerate(fill_log):
+            cls._index_fill(lookup, idx, fill)
+        lookup["n"] = len(fill_log)
+        lookup["last"] = fill_log[-1] if fill_log else None
+        return lookup
+
+    def _fill_lookup_locked(self, position_id: str, fill_log: List[dict]) -> dict:
+        """Return the exec_id/order_id lookup for a position's fill_log.
+
+        Extended incrementally when fills are appended; rebuilt when the list
+        is replaced, shrinks, or its tail no longer matches (the list may be
+        shared with, and cleared by, a recovered risk manager).
+        """
+        lookup = self._fill_lookups.get(position_id)
+        n = len(fill_log)
+        if (
+            lookup is None
+            or lookup["log"] is not fill_log
+            or lookup["n"] > n
+            or (lookup["n"] and fill_log[lookup["n"] - 1] is not lookup["last"])
+        ):
+            lookup = self._build_fill_lookup(fill_log)
+            self._fill_lookups[position_id] = lookup
+            return lookup
+        for idx in range(lookup["n"], n):
+            self._index_fill(lookup, idx, fill_log[idx])
+        lookup["n"] = n
+        lookup["last"] = fill_log[-1] if fill_log else None
+        return lookup
+
+    def _note_fill_exec_id_locked(self, position_id: str, idx: int, exec_id: str) -> None:
+        """Record an exec_id newly assigned to an already-indexed fill."""
+        lookup = self._fill_lookups.get(position_id)
+        if lookup is None or not exec_id or idx >= lookup["n"]:
+            return
+        current = lookup["exec"].get(exec_id)
+        if current is None or idx < current:
+            lookup["exec"][exec_id] = idx
+
     @classmethod
     def _find_fill_index_locked(
         cls,
@@ -395,16 +481,35 @@ class PositionStore:
         exec_id: str = "",
         match_hint: Optional[dict] = None,
         prefer_unresolved_exec: bool = False,
+        lookup: Optional[dict] = None,
     ) -> Optional[int]:
+        """Best-matching fill index: exact exec_id first, then scored order_id candidates.
+
+        `lookup` (from _fill_lookup_locked) replaces the linear scans with
+        hash lookups; without it every fill is scanned.
+        """
         hinted_exec_id = str((match_hint or {}).get("exec_id") or "")
         target_exec_id = exec_id or hinted_exec_id
         if target_exec_id:
-            for idx, fill in enumerate(fills):
-                if fill.get("exec_id") == target_exec_id:
+            if lookup is not None:
+                idx = lookup["exec"].get(target_exec_id)
+                if idx is not None and idx < len(fills) and fills[idx].get("exec_id") == target_exec_id:
                     return idx
-
+                if idx is not None:
+                    # Stale entry -- fall back to a scan rather than miss a match
+                    lookup = None
+            if lookup is None:
+                for idx, fill in enumerate(fills):
+                    if fill.get("exec_id") == target_exec_id:
+                        return idx
+
+        if lookup is not None:
+            order_indexes = lookup["order"].get(cls._coerce_int(order_id), ())
+        else:
+            order_indexes = range(len(fills))
         candidates = []
-        for idx, fill in enumerate(fills):
+        for idx in order_indexes:
+            fill = fills[idx]
             if cls._coerce_int(fill.get("order_id")) != cls._coerce_int(order_id):
                 continue
             score = cls._fill_match_score(
@@ -436,7 +541,7 @@ class PositionStore:
             rc = pos.get("risk_config", {})
             pos["risk_config"] = self._deep_merge(rc, risk_updates)
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fields=("risk_config",))
         logger.info("PositionStore: updated risk_config for %s (keys=%s)", position_id, list(risk_updates.keys()))
 
     def update_fill_exec_id(self, position_id: str, order_id: int, exec_id: str) -> bool:
@@ -456,13 +561,15 @@ class PositionStore:
                 order_id=order_id,
                 exec_id=exec_id,
                 prefer_unresolved_exec=True,
+                lookup=self._fill_lookup_locked(position_id, fill_log),
             )
             if fill_index is not None:
                 fill = fill_log[fill_index]
                 if not fill.get("exec_id"):
                     fill["exec_id"] = exec_id
+                    self._note_fill_exec_id_locked(position_id, fill_index, exec_id)
                     self._dirty_ids.add(position_id)
-                    self._save()
+                    self._persist_locked(position_id, fill_indexes=(fill_index,))
                     return True
             return False
 
@@ -492,12 +599,14 @@ class PositionStore:
                 exec_id=exec_id,
                 match_hint=match_hint,
                 prefer_unresolved_exec=True,
+                lookup=self._fill_lookup_locked(position_id, fill_log),
             )
             if fill_index is None:
                 return False
             fill = fill_log[fill_index]
             if exec_id and not fill.get("exec_id"):
                 fill["exec_id"] = exec_id
+                self._note_fill_exec_id_locked(position_id, fill_index, exec_id)
             if execution_analytics:
                 normalized_analytics = dict(execution_analytics)
                 if normalized_analytics.get("exchange") and not normalized_analytics.get("fill_exchange"):
@@ -522,7 +631,7 @@ class PositionStore:
                 ),
             }
             self._dirty_ids.add(position_id)
-            self._save()
+            self._persist_locked(position_id, fill_indexes=(fill_index,))
             self._execution_ledger.update_execution_details(
                 position_id=position_id,
                 order_id=order_id,
@@ -570,9 +679,8 @@ class PositionStore:
                 ]
                 if len(pos["fill_log"]) < before:
                     self._dirty_ids.add(pos["id"])
+                    self._persist_locked(pos["id"], replace_fills=True)
                     cleaned += 1
-            if cleaned:
-                self._save()
         if cleaned:
             logger.info(
                 "PositionStore: purged phantom entry fills from %d position(s)", cleaned
@@ -585,15 +693,21 @@ class PositionStore:
             pos = self._positions.get(position_id)
             if not pos:
                 return
-            for fill in pos.get("fill_log", []):
-                if fill.get("exec_id") == exec_id:
-                    if "execution_analytics" not in fill:
-                        fill["execution_analytics"] = {}
-                    fill["execution_analytics"]["commission"] = commission_report.get("commission")
-                    fill["execution_analytics"]["realized_pnl_ib"] = commission_report.get("realized_pnl")
-                    self._dirty_ids.add(position_id)
-                    break
-            self._save()
+            fill_log = pos.get("fill_log", [])
+            fill_index = self._find_fill_index_locked(
+                fill_log,
+                order_id=0,
+                exec_id=exec_id,
+                lookup=self._fill_lookup_locked(position_id, fill_log),
+            )
+            if fill_index is not None and fill_log[fill_index].get("exec_id") == exec_id:
+                fill = fill_log[fill_index]
+                if "execution_analytics" not in fill:
+                    fill["execution_analytics"] = {}
+                fill["execution_analytics"]["commission"] = commission_report.get("commission")
+                fill["execution_analytics"]["realized_pnl_ib"] = commission_report.get("realized_pnl")
+                self._dirty_ids.add(position_id)
+                self._persist_locked(position_id, fill_indexes=(fill_index,))
         self._execution_ledger.update_commission(exec_id, commission_report)
 
     def update_fill_post_trade(
@@ -618,6 +732,7 @@ class PositionStore:
                 fill_log,
                 order_id=order_id,
                 match_hint=match_hint,
+                lookup=self._fill_lookup_locked(position_id, fill_log),
             )
             if fill_index is not None:
                 fill = fill_log[fill_index]
@@ -651,7 +766,7 @@ class PositionStore:
                     ),
                 }
                 self._dirty_ids.add(position_id)
-            self._save()
+                self._persist_locked(position_id, fill_indexes=(fill_index,))
         self._execution_ledger.update_post_fill(
             position_id=position_id,
             order_id=order_id,
@@ -660,6 +775,26 @@ class PositionStore:
             match_hint=match_hint,
         )
 
+    def check_index_consistency(self) -> List[str]:
+        """Verify fill_log lookups and the ledger's secondary indexes against a full rebuild.
+
+        Returns a list of problems (empty when every maintained index matches).
+        """
+        problems = []
+        with self._lock:
+            for position_id, lookup in self._fill_lookups.items():
+                pos = self._positions.get(position_id)
+                fill_log = (pos or {}).get("fill_log", [])
+                if pos is None or lookup["log"] is not fill_log or lookup["n"] != len(fill_log):
+                    continue  # stale entries are rebuilt on next access
+                fresh = self._build_fill_lookup(fill_log)
+                if fresh["exec"] != lookup["exec"]:
+                    problems.append(f"fill exec_id index mismatch for {position_id}")
+                if fresh["order"] != lookup["order"]:
+                    problems.append(f"fill order_id index mismatch for {position_id}")
+        problems.extend(self._execution_ledger.check_index_consistency())
+        return problems
+
     # ── Sync / Dirty Tracking ──
 
     def drain_dirty(self) -> List[dict]:
@@ -847,7 +982,101 @@ class PositionStore:
 
     # ── Internal ──
 
+    def _persist_locked(
+        self,
+        position_id: str,
+        *,
+        fields: tuple = (),
+        fill_indexes: tuple = (),
+        replace_fills: bool = False,
+    ) -> None:
+        """Persist a mutation of one position.
+
+        Journal backend: append a ``set`` op for the listed top-level fields
+        and a ``fill`` op per touched fill_log index (plus any fills appended
+        since the last journaled length), or one ``fills`` op replacing the
+        whole log. Snapshot backend: rewrite the whole file.
+        Must be called while holding self._lock.
+        """
+        if self._journal is None:
+            self._save()
+            return
+        pos = self._positions.get(position_id)
+        if pos is None:
+            return
+        ops = []
+        if fields:
+            ops.append({
+                "op": "set",
+                "id": position_id,
+                "fields": {f: pos[f] for f in fields if f in pos and f != "fill_log"},
+            })
+        fill_log = pos.get("fill_log") or []
+        if replace_fills:
+            ops.append({"op": "fills", "id": position_id, "fills": fill_log})
+        else:
+            known = self._journaled_fill_counts.get(position_id, 0)
+            indexes = set(i for i in fill_indexes if 0 <= i < len(fill_log))
+            indexes.update(range(min(known, len(fill_log)), len(fill_log)))
+            for idx in sorted(indexes):
+                ops.append({"op": "fill", "id": position_id, "index": idx, "fill": fill_log[idx]})
+        self._journaled_fill_counts[position_id] = len(fill_log)
+        if not ops:
+            return
+        try:
+            self._journal.append_many(ops)
+        except Exception as e:
+            logger.error("PositionStore: journal append failed (%s) — writing snapshot", e)
+            self._compact_locked()
+            return
+        if self._journal.needs_compaction:
+            self._compact_locked()
+
+    def _apply_journal_op(self, op: dict) -> None:
+        """Apply one replayed journal op. Ops are absolute writes, so re-applying is harmless."""
+        position_id = op.get("id")
+        kind = op.get("op")
+        if not position_id:
+            return
+        if kind == "set":
+            pos = self._positions.setdefault(position_id, {"id": position_id, "fill_log": []})
+            pos.update(op.get("fields") or {})
+            pos.setdefault("fill_log", [])
+            return
+        pos = self._positions.get(position_id)
+        if pos is None:
+            logger.warning("PositionStore: journal op %s for unknown position %s", kind, position_id)
+            return
+        fill_log = pos.setdefault("fill_log", [])
+        if kind == "fills":
+            pos["fill_log"] = list(op.get("fills") or [])
+        elif kind == "fill":
+            idx = int(op.get("index", len(fill_log)))
+            if 0 <= idx < len(fill_log):
+                fill_log[idx] = op.get("fill")
+            else:
+                fill_log.append(op.get("fill"))
+
+    def _compact_locked(self) -> None:
+        """Write a durable snapshot of current state, then truncate the journal."""
+        if self._save(durable=True) and self._journal is not None:
+            self._journal.reset()
+
     def _load(self) -> None:
+        """Read the snapshot, then replay and compact any journaled mutations."""
+        self._load_snapshot()
+        if self._journal is not None:
+            ops = self._journal.replay()
+            for op in ops:
+                self._apply_journal_op(op)
+            if ops:
+                logger.info("PositionStore: replayed %d journal ops from %s", len(ops), self._journal.path)
+                self._compact_locked()
+        self._journaled_fill_counts = {
+            pid: len(pos.get("fill_log") or []) for pid, pos in self._positions.items()
+        }
+
+    def _load_snapshot(self) -> None:
         """Read positions from disk. Corrupt/missing file → start empty."""
         if not os.path.exists(self._path):
             logger.info("PositionStore: no file at %s, starting empty", self._path)
@@ -889,9 +1118,11 @@ class PositionStore:
                     logger.error("PositionStore: .bak recovery also failed: %s", bak_err)
             self._positions = {}
 
-    def _save(self) -> None:
+    def _save(self, *, durable: bool = False) -> bool:
         """Atomic write: write to .tmp, backup existing to .bak, rename .tmp → .json.
 
+        ``durable`` fsyncs the temp file before the rename (required before
+        compaction truncates the journal). Returns True on success.
         Must be called while holding self._lock.
         """
         tmp_path = self._path + ".tmp"
@@ -900,6 +1131,9 @@ class PositionStore:
             data = list(self._positions.values())
             with open(tmp_path, "w") as f:
                 json.dump(data, f, indent=2)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
 
             # Backup existing file
             if os.path.exists(self._path):
@@ -907,6 +1141,7 @@ class PositionStore:
 
             # Atomic rename
             os.replace(tmp_path, self._path)
+            return True
         except Exception as e:
             logger.error("PositionStore: save failed: %s", e)
             # Clean up temp file if it exists
@@ -915,6 +1150,7 @@ class PositionStore:
                     os.remove(tmp_path)
             except OSError:
                 pass
+            return False
 
     # ── Canonical ledger resolution helpers ──
 
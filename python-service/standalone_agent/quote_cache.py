@@ -12,6 +12,9 @@ tick data for every subscribed instrument.
 Design goals:
 - Sub-microsecond reads on the hot path (the execution evaluation loop).
 - Thread-safe writes from the IB message processing thread.
+- Consistent reads: every quote a reader gets is a snapshot of one point
+  between ticks (seqlock-style version counter per row), never a bid
+  from one tick and an ask from the next.
 - Clean integration with ResourceManager for line accounting.
 - No external dependencies beyond the standard library.
 
@@ -27,8 +30,8 @@ Usage:
 import threading
 import time
 import logging
-from dataclasses import dataclass, field
-from typing import Dict, Optional, TYPE_CHECKING
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ib_scanner import IBMergerArbScanner
@@ -38,27 +41,66 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Raw quote fields, in storage / export order
+QUOTE_FIELDS = (
+    "bid", "ask", "last", "bid_size", "ask_size", "volume", "open_interest",
+    "implied_vol", "delta", "gamma", "theta", "vega", "timestamp",
+)
+_read_fields = attrgetter(*QUOTE_FIELDS)
+
+# Live storage is one list per subscription: the QUOTE_FIELDS values in
+# order, then a seqlock version (odd while the IB thread is mid-tick, 2 x
+# completed updates otherwise). Only the IB message thread writes rows.
+(_BID, _ASK, _LAST, _BID_SIZE, _ASK_SIZE, _VOLUME, _OPEN_INTEREST,
+ _IMPLIED_VOL, _DELTA, _GAMMA, _THETA, _VEGA, _TIMESTAMP, _VERSION) = range(len(QUOTE_FIELDS) + 1)
+_EMPTY_ROW = (0.0, 0.0, 0.0, 0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+# IB tick type -> row slot
+_PRICE_TICK_SLOTS = {1: _BID, 2: _ASK, 4: _LAST}
+_SIZE_TICK_SLOTS = {0: _BID_SIZE, 3: _ASK_SIZE, 8: _VOLUME, 27: _OPEN_INTEREST}
+
+
 class Quote:
     """Latest market data for a single instrument.
-    
-    Fields are updated individually by tickPrice/tickSize callbacks.
-    The `timestamp` field records the wall-clock time of the most recent
-    update to any field, allowing consumers to check freshness.
+
+    Objects handed out by StreamingQuoteCache are consistent snapshots: all
+    fields come from the same point between ticks. The `timestamp` field
+    records the wall-clock time of the most recent update to any field,
+    allowing consumers to check freshness; `seq` counts the updates applied
+    to the subscription so far (it only ever increases for a cache key).
     """
-    bid: float = 0.0
-    ask: float = 0.0
-    last: float = 0.0
-    bid_size: int = 0
-    ask_size: int = 0
-    volume: int = 0
-    open_interest: int = 0
-    implied_vol: float = 0.0
-    delta: float = 0.0
-    gamma: float = 0.0
-    theta: float = 0.0
-    vega: float = 0.0
-    timestamp: float = 0.0  # time.time() of last update
+
+    __slots__ = QUOTE_FIELDS + ("seq",)
+
+    def __init__(self, bid: float = 0.0, ask: float = 0.0, last: float = 0.0,
+                 bid_size: int = 0, ask_size: int = 0, volume: int = 0,
+                 open_interest: int = 0, implied_vol: float = 0.0,
+                 delta: float = 0.0, gamma: float = 0.0, theta: float = 0.0,
+                 vega: float = 0.0, timestamp: float = 0.0, seq: int = 0):
+        self.bid = bid
+        self.ask = ask
+        self.last = last
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+        self.volume = volume
+        self.open_interest = open_interest
+        self.implied_vol = implied_vol
+        self.delta = delta
+        self.gamma = gamma
+        self.theta = theta
+        self.vega = vega
+        self.timestamp = timestamp  # time.time() of last update
+        self.seq = seq
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Quote({fields})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Quote):
+            return NotImplemented
+        return _read_fields(self) == _read_fields(other) and self.seq == other.seq
+
+    __hash__ = None
 
     @property
     def mid(self) -> float:
@@ -102,6 +144,32 @@ class Quote:
         }
 
 
+def _read_row(values: list) -> tuple:
+    """Consistent copy of a live row (fields + version).
+
+    tuple(list) is a single C-level copy, so it cannot interleave with a
+    writer's bytecodes; the version check rejects copies taken between the
+    first and last field write of one tick.
+    """
+    row = tuple(values)
+    while row[_VERSION] & 1:
+        time.sleep(0)  # writer is mid-tick: yield the GIL to it
+        row = tuple(values)
+    return row
+
+
+_new_quote = object.__new__
+
+
+def _quote_from_row(row: tuple) -> Quote:
+    quote = _new_quote(Quote)
+    (quote.bid, quote.ask, quote.last, quote.bid_size, quote.ask_size, quote.volume,
+     quote.open_interest, quote.implied_vol, quote.delta, quote.gamma, quote.theta,
+     quote.vega, quote.timestamp, quote.seq) = row
+    quote.seq >>= 1
+    return quote
+
+
 class StreamingQuoteCache:
     """Manages persistent IB streaming subscriptions and caches latest tick data.
     
@@ -109,17 +177,30 @@ class StreamingQuoteCache:
     - `subscribe`/`unsubscribe` acquire the lock (infrequent, called when
       strategies start/stop).
     - `update_price`/`update_size`/`update_greeks` are called from the IB
-      message thread on every tick. They use the lock for dict-key lookups
-      only; the Quote attribute writes are atomic in CPython.
-    - `get` is called from the execution evaluation loop at 10 Hz. It does
-      a single dict lookup (GIL-protected); no lock needed for reads.
+      message thread (the single writer) on every tick. Each does one
+      reqId -> row lookup and updates the row list in place, bracketed by
+      two increments of its seqlock version — no lock and no allocation
+      per tick.
+    - `get`/`get_all`/`export_rows` are lock-free: they copy a row and
+      retry while its version is odd, so a reader always gets a
+      consistent per-key snapshot.
+
+    Dirty tracking:
+    - Every tick marks its cache key dirty, remembering the monotonic time of
+      the first tick since the key was last drained. The execution engine
+      drains the dirty set once per wake (`drain_dirty`) to decide which
+      strategies need re-evaluation and to measure tick-to-decision latency.
+    - If a wake event is attached (`set_wake_event`), it is set on every
+      tick so an event-driven engine can react without polling.
     """
 
     def __init__(self, resource_manager: "ResourceManager"):
         self._resource_manager = resource_manager
-        # cache_key -> Quote
-        self._quotes: Dict[str, Quote] = {}
-        # IB reqId -> cache_key  (for routing tickPrice/tickSize callbacks)
+        # cache_key -> live row (see _VERSION)
+        self._quotes: Dict[str, list] = {}
+        # IB reqId -> (cache_key, live row)  (tick routing: one lookup per callback)
+        self._req_id_to_row: Dict[int, Tuple[str, list]] = {}
+        # IB reqId -> cache_key
         self._req_id_to_key: Dict[int, str] = {}
         # cache_key -> IB reqId  (for cancellation)
         self._key_to_req_id: Dict[str, int] = {}
@@ -128,6 +209,10 @@ class StreamingQuoteCache:
         # Reference counting: how many strategies share each subscription
         self._ref_counts: Dict[str, int] = {}
         self._lock = threading.Lock()
+        # cache_key -> time.monotonic() of the first tick since last drain
+        self._dirty: Dict[str, float] = {}
+        self._dirty_lock = threading.Lock()
+        self._wake_event: Optional[threading.Event] = None
 
     # ── Subscription management ──
 
@@ -156,7 +241,8 @@ class StreamingQuoteCache:
                 return None
 
             req_id = scanner.get_next_req_id()
-            self._quotes[cache_key] = Quote()
+            row = self._quotes[cache_key] = list(_EMPTY_ROW)
+            self._req_id_to_row[req_id] = (cache_key, row)
             self._req_id_to_key[req_id] = cache_key
             self._key_to_req_id[cache_key] = req_id
             # Store contract for resubscription after reconnect
@@ -188,8 +274,11 @@ class StreamingQuoteCache:
                 logger.warning("unsubscribe: %s not found in cache", cache_key)
                 return
             self._req_id_to_key.pop(req_id, None)
+            self._req_id_to_row.pop(req_id, None)
             self._quotes.pop(cache_key, None)
             self._key_to_contract.pop(cache_key, None)
+        with self._dirty_lock:
+            self._dirty.pop(cache_key, None)
 
         scanner.cancelMktData(req_id)
         self._resource_manager.release_execution_lines(1, allocation_key=cache_key)
@@ -210,7 +299,7 @@ class StreamingQuoteCache:
         The old reqIds are stale (IB does not resume streaming after reconnect),
         so we allocate new reqIds and re-issue reqMktData for each subscription.
         
-        Quote data is preserved — the Quote objects are NOT cleared, so
+        Quote data is preserved — the rows are NOT cleared, so
         consumers see the last known tick values until fresh ticks arrive.
         """
         resub_list = []  # (cache_key, contract, generic_ticks, new_req_id)
@@ -223,6 +312,7 @@ class StreamingQuoteCache:
                 except Exception:
                     pass
                 self._req_id_to_key.pop(old_req_id, None)
+                self._req_id_to_row.pop(old_req_id, None)
 
                 contract_info = self._key_to_contract.get(cache_key)
                 if not contract_info:
@@ -232,6 +322,7 @@ class StreamingQuoteCache:
 
                 new_req_id = scanner.get_next_req_id()
                 self._req_id_to_key[new_req_id] = cache_key
+                self._req_id_to_row[new_req_id] = (cache_key, self._quotes[cache_key])
                 self._key_to_req_id[cache_key] = new_req_id
                 resub_list.append((cache_key, contract, generic_ticks, new_req_id))
 
@@ -258,19 +349,17 @@ class StreamingQuoteCache:
         tick_type mapping (IB standard):
             1 = bid, 2 = ask, 4 = last, 6 = high, 7 = low, 9 = close
         """
-        key = self._req_id_to_key.get(req_id)
-        if key is None:
+        entry = self._req_id_to_row.get(req_id)
+        if entry is None:
             return
-        quote = self._quotes.get(key)
-        if quote is None:
-            return
-        if tick_type == 1:
-            quote.bid = price
-        elif tick_type == 2:
-            quote.ask = price
-        elif tick_type == 4:
-            quote.last = price
-        quote.timestamp = time.time()
+        key, row = entry
+        slot = _PRICE_TICK_SLOTS.get(tick_type)
+        row[_VERSION] += 1
+        if slot is not None:
+            row[slot] = price
+        row[_TIMESTAMP] = time.time()
+        row[_VERSION] += 1
+        self._mark_dirty(key)
 
     def update_size(self, req_id: int, tick_type: int, size: int):
         """Update size fields from tickSize callback.
@@ -278,56 +367,126 @@ class StreamingQuoteCache:
         tick_type mapping (IB standard):
             0 = bid_size, 3 = ask_size, 5 = last_size, 8 = volume, 27 = open_interest
         """
-        key = self._req_id_to_key.get(req_id)
-        if key is None:
-            return
-        quote = self._quotes.get(key)
-        if quote is None:
+        entry = self._req_id_to_row.get(req_id)
+        if entry is None:
             return
-        if tick_type == 0:
-            quote.bid_size = size
-        elif tick_type == 3:
-            quote.ask_size = size
-        elif tick_type == 8:
-            quote.volume = size
-        elif tick_type == 27:
-            quote.open_interest = size
-        quote.timestamp = time.time()
+        key, row = entry
+        slot = _SIZE_TICK_SLOTS.get(tick_type)
+        row[_VERSION] += 1
+        if slot is not None:
+            row[slot] = size
+        row[_TIMESTAMP] = time.time()
+        row[_VERSION] += 1
+        self._mark_dirty(key)
 
     def update_greeks(self, req_id: int, implied_vol: float, delta: float,
                       gamma: float, vega: float, theta: float):
         """Update option greeks from tickOptionComputation callback."""
-        key = self._req_id_to_key.get(req_id)
-        if key is None:
-            return
-        quote = self._quotes.get(key)
-        if quote is None:
+        entry = self._req_id_to_row.get(req_id)
+        if entry is None:
             return
+        key, row = entry
+        row[_VERSION] += 1
         if implied_vol is not None and implied_vol > 0:
-            quote.implied_vol = implied_vol
+            row[_IMPLIED_VOL] = implied_vol
         if delta is not None:
-            quote.delta = delta
+            row[_DELTA] = delta
         if gamma is not None:
-            quote.gamma = gamma
+            row[_GAMMA] = gamma
         if vega is not None:
-            quote.vega = vega
+            row[_VEGA] = vega
         if theta is not None:
-            quote.theta = theta
-        quote.timestamp = time.time()
+            row[_THETA] = theta
+        row[_TIMESTAMP] = time.time()
+        row[_VERSION] += 1
+        self._mark_dirty(key)
+
+    def _mark_dirty(self, key: str):
+        """Record that `key` ticked and wake the event-driven engine (if attached)."""
+        if key in self._dirty:
+            # Already pending: the wake was set when it was added, and the
+            # drainer reads the row after taking the dict, so it sees this tick.
+            return
+        with self._dirty_lock:
+            if key not in self._dirty:
+                self._dirty[key] = time.monotonic()
+        wake = self._wake_event
+        if wake is not None:
+            wake.set()
+
+    # ── Dirty tracking (called from execution engine) ──
+
+    def set_wake_event(self, event: Optional[threading.Event]):
+        """Attach (or detach with None) an Event that is set on every tick."""
+        self._wake_event = event
+
+    def drain_dirty(self) -> Dict[str, float]:
+        """Return and clear the dirty keys accumulated since the last drain.
+
+        Returns:
+            Dict of cache_key -> time.monotonic() of the first tick since the
+            previous drain. Multiple ticks on the same key coalesce into one entry.
+        """
+        with self._dirty_lock:
+            if not self._dirty:
+                return {}
+            dirty = self._dirty
+            self._dirty = {}
+        return dirty
 
     # ── Read methods (called from execution engine) ──
 
     def get(self, cache_key: str) -> Optional[Quote]:
-        """Get the latest quote for a cache key. Returns None if not subscribed."""
-        return self._quotes.get(cache_key)
+        """Get a consistent snapshot of the latest quote. None if not subscribed."""
+        row = self._quotes.get(cache_key)
+        if row is None:
+            return None
+        return _quote_from_row(_read_row(row))
 
     def get_all(self) -> Dict[str, Quote]:
-        """Return a snapshot dict of all cached quotes (for telemetry/dashboard)."""
-        return dict(self._quotes)
+        """Return consistent snapshots of all cached quotes (for telemetry/dashboard)."""
+        return {key: _quote_from_row(_read_row(row)) for key, row in list(self._quotes.items())}
+
+    def export_rows(self) -> List[Tuple[str, int, tuple]]:
+        """Bulk export: (cache_key, seq, values in QUOTE_FIELDS order) per quote.
+
+        Each row is a consistent snapshot of its key; no Quote objects are built.
+        """
+        rows = []
+        for key, live in list(self._quotes.items()):
+            row = _read_row(live)
+            rows.append((key, row[_VERSION] >> 1, row[:_VERSION]))
+        return rows
 
     def get_all_serialized(self) -> Dict[str, dict]:
-        """Return all quotes as serializable dicts."""
-        return {key: quote.to_dict() for key, quote in self._quotes.items()}
+        """Return all quotes as serializable dicts (Quote.to_dict shape)."""
+        now = time.time()
+        serialized = {}
+        for key, live in list(self._quotes.items()):
+            (bid, ask, last, bid_size, ask_size, volume, open_interest,
+             implied_vol, delta, gamma, theta, vega, timestamp, _) = _read_row(live)
+            if bid > 0 and ask > 0:
+                mid = (bid + ask) / 2.0
+            else:
+                mid = last if last > 0 else 0.0
+            serialized[key] = {
+                "bid": bid,
+                "ask": ask,
+                "last": last,
+                "mid": mid,
+                "bid_size": bid_size,
+                "ask_size": ask_size,
+                "volume": volume,
+                "open_interest": open_interest,
+                "implied_vol": implied_vol,
+                "delta": delta,
+                "gamma": gamma,
+                "theta": theta,
+                "vega": vega,
+                "timestamp": timestamp,
+                "age_seconds": round(now - timestamp, 2) if timestamp > 0 else float("inf"),
+            }
+        return serialized
 
     # ── Status ──
 
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Quote Push Encoder
+==================
+Delta encoding for the ``execution_quotes`` pushes sent to the relay.
+
+Protocol v1 (legacy) sends ``StreamingQuoteCache.get_all_serialized()``
+every push: every field of every subscribed contract, plus the derived
+``mid`` and ``age_seconds``, whether or not anything ticked.
+
+Protocol v2 sends frames of raw quote fields only:
+
+    {"type": "execution_quotes", "v": 2, "frame": "key" | "delta",
+     "frame_seq": N, "timestamp": <push time>,
+     "quotes": {cache_key: {"seq": S, <changed raw fields>}},
+     "removed": [cache_key, ...]}
+
+- ``frame_seq`` increases by one per frame on a connection; a relay that
+  sees a gap asks for a keyframe (``quote_keyframe_request``).
+- ``seq`` is a per-key sequence number, bumped whenever any field of that
+  key changes. The relay ignores updates that do not advance it.
+- A keyframe carries every key with all raw fields and replaces the relay's
+  snapshot. The first frame on a connection, every ``keyframe_every``-th
+  frame and any requested frame are keyframes.
+- ``mid`` and ``age_seconds`` are derived by the relay, not transmitted.
+
+Delta frames are sent even when nothing changed (empty ``quotes``) so the
+relay's freshness timestamp keeps advancing.
+
+Frames are JSON text by default. When both sides have ``msgpack`` and the
+relay accepts it in the auth handshake, frames are sent as binary msgpack.
+"""
+
+import math
+from typing import Dict, List
+
+from quote_cache import QUOTE_FIELDS  # raw fields carried by v2 frames
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON framing is always available
+    msgpack = None
+
+QUOTE_PROTOCOL_VERSION = 2
+DEFAULT_KEYFRAME_EVERY = 15  # 15 x 2s pushes = one keyframe every ~30s
+
+
+def supported_encodings() -> List[str]:
+    """Frame encodings this agent can send, in preference order."""
+    return ["msgpack", "json"] if msgpack is not None else ["json"]
+
+
+def pack_frame(frame: dict) -> bytes:
+    """Serialize a (JSON-sanitized) frame for binary transport."""
+    return msgpack.packb(frame, use_bin_type=True)
+
+
+def _clean(value):
+    # Same coercion as _sanitize_for_json: NaN/inf would never compare equal
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+class QuoteDeltaEncoder:
+    """Turns successive quote-cache snapshots into v2 key/delta frames.
+
+    One encoder per relay connection; a fresh encoder always starts with a
+    keyframe. Not thread-safe — call from the push loop only.
+
+    Quotes from StreamingQuoteCache carry a cache-side ``seq``; a key whose
+    (seq, timestamp) is unchanged since the last frame is skipped without
+    re-reading its fields. The wire ``seq`` is the encoder's own counter.
+    """
+
+    def __init__(self, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        self.keyframe_every = max(1, keyframe_every)
+        self._sent: Dict[str, tuple] = {}
+        self._seq: Dict[str, int] = {}
+        self._source_seq: Dict[str, tuple] = {}
+        self._frame_seq = 0
+        self._frames_since_keyframe = 0
+        self._force_keyframe = True
+
+    def request_keyframe(self):
+        """Make the next frame a keyframe (relay detected a gap)."""
+        self._force_keyframe = True
+
+    def encode(self, quotes: Dict[str, object], timestamp: float) -> dict:
+        """Build the next frame from ``{cache_key: Quote}``."""
+        keyframe = self._force_keyframe or self._frames_since_keyframe >= self.keyframe_every - 1
+        frame_quotes: Dict[str, dict] = {}
+        current: Dict[str, tuple] = {}
+        for key, quote in quotes.items():
+            previous = self._sent.get(key)
+            source_seq = getattr(quote, "seq", 0)
+            if source_seq and previous is not None and self._source_seq.get(key) == (source_seq, quote.timestamp):
+                current[key] = previous
+                if keyframe:
+                    frame_quotes[key] = dict(zip(QUOTE_FIELDS, previous), seq=self._seq[key])
+                continue
+            if source_seq:
+                self._source_seq[key] = (source_seq, quote.timestamp)
+            values = tuple(_clean(getattr(quote, name)) for name in QUOTE_FIELDS)
+            current[key] = values
+            if previous != values:
+                self._seq[key] = self._seq.get(key, 0) + 1
+            if keyframe or previous is None:
+                fields = dict(zip(QUOTE_FIELDS, values))
+            elif previous != values:
+                fields = {name: new for name, old, new in zip(QUOTE_FIELDS, previous, values) if old != new}
+            else:
+                continue
+            fields["seq"] = self._seq[key]
+            frame_quotes[key] = fields
+
+        removed = [key for key in self._sent if key not in current]
+        for key in removed:
+            self._seq.pop(key, None)
+            self._source_seq.pop(key, None)
+        self._sent = current
+        self._frame_seq += 1
+        if keyframe:
+            self._force_keyframe = False
+            self._frames_since_keyframe = 0
+        else:
+            self._frames_since_keyframe += 1
+
+        frame = {
+            "type": "execution_quotes",
+            "v": QUOTE_PROTOCOL_VERSION,
+            "frame": "key" if keyframe else "delta",
+            "frame_seq": self._frame_seq,
+            "timestamp": timestamp,
+            "quotes": frame_quotes,
+        }
+        if removed and not keyframe:
+            frame["removed"] = removed
+        return frame
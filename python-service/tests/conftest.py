@@ -1,6 +1,12 @@
 """Shared fixtures for M&A options scanner tests."""
 
+import heapq
+import importlib
+import itertools
+import random
 import sys
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -120,3 +126,122 @@ def near_close_analyzer(near_close_deal) -> MergerArbAnalyzer:
 @freeze_time(FROZEN_NOW)
 def extras_analyzer(deal_with_extras) -> MergerArbAnalyzer:
     return MergerArbAnalyzer(deal_with_extras)
+
+
+# ---------------------------------------------------------------------------
+# Vendored ibapi (standalone_agent/ibapi)
+# ---------------------------------------------------------------------------
+STANDALONE_AGENT = str(Path(__file__).resolve().parent.parent / "standalone_agent")
+
+
+def import_vendored_ibapi(*names):
+    """standalone_agent/ibapi modules, even though app code already imported the installed ibapi."""
+    def is_ibapi(name):
+        return name == "ibapi" or name.startswith("ibapi.")
+
+    installed = {name: sys.modules.pop(name) for name in list(sys.modules) if is_ibapi(name)}
+    sys.path.insert(0, STANDALONE_AGENT)
+    try:
+        return [importlib.import_module(f"ibapi.{name}") for name in names]
+    finally:
+        sys.path.remove(STANDALONE_AGENT)
+        for name in [n for n in sys.modules if is_ibapi(n)]:
+            del sys.modules[name]
+        sys.modules.update(installed)
+
+
+# ---------------------------------------------------------------------------
+# Simulated TWS market data (standalone_agent IBMergerArbScanner)
+# ---------------------------------------------------------------------------
+class SimulatedTWS:
+    """reqMktData / cancelMktData stand-in that plays ticks back on a dispatcher thread."""
+
+    def __init__(self, scanner, quote_latency=(0.02, 0.08), greeks_delay=(0.01, 0.04),
+                 never=(), reject=(), side_greeks=False, seed=11):
+        self.scanner = scanner
+        self.quote_latency = quote_latency
+        self.greeks_delay = greeks_delay
+        self.never = set(never)
+        self.reject = set(reject)
+        self.side_greeks = side_greeks
+        self.rng = random.Random(seed)
+        self.events = []
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.live = set()
+        self.requested = []
+        self.cancelled = []
+        self.peak = 0
+        self.stopped = False
+        scanner.reqMktData = self.reqMktData
+        scanner.cancelMktData = self.cancelMktData
+        self.thread = threading.Thread(target=self._dispatch, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def quote(contract):
+        """Deterministic bid/ask/delta for a contract."""
+        base = round(contract.strike / 10 + (0.5 if contract.right == "C" else 0.25), 2)
+        return base, round(base + 0.1, 2), 0.5 if contract.right == "C" else -0.5
+
+    def reqMktData(self, req_id, contract, generic_ticks, snapshot, regulatory, options):
+        key = (contract.lastTradeDateOrContractMonth, contract.strike, contract.right)
+        now = time.monotonic()
+        with self.cond:
+            self.live.add(req_id)
+            self.peak = max(self.peak, len(self.live))
+            self.requested.append(key)
+            if key in self.reject:
+                self._at(now + 0.005, self.scanner.error, req_id, 200, "No security definition has been found")
+            elif key not in self.never:
+                bid, ask, delta = self.quote(contract)
+                t = now + self.rng.uniform(*self.quote_latency)
+                # Decoder order: tickPrice then its tickSize, per side
+                self._at(t, self.scanner.tickPrice, req_id, 1, bid, None)
+                self._at(t, self.scanner.tickSize, req_id, 0, 10)
+                self._at(t, self.scanner.tickPrice, req_id, 2, ask, None)
+                self._at(t, self.scanner.tickSize, req_id, 3, 12)
+                self._at(t, self.scanner.tickSize, req_id, 8, 100)
+                if self.side_greeks:
+                    # Bid and ask computations (tick types 10/11) come before the model's
+                    for tick_type, price in ((10, bid), (11, ask)):
+                        self._at(t, self.scanner.tickOptionComputation, req_id, tick_type, 0, 0.9,
+                                 delta / 2, price, 0.0, 0.05, 0.2, -0.06, 100.0)
+                self._at(t + self.rng.uniform(*self.greeks_delay), self.scanner.tickOptionComputation,
+                         req_id, 13, 0, 0.3, delta, (bid + ask) / 2, 0.0, 0.02, 0.1, -0.03, 100.0)
+            self.cond.notify()
+
+    def cancelMktData(self, req_id):
+        with self.cond:
+            self.live.discard(req_id)
+            self.cancelled.append(req_id)
+
+    def _at(self, when, fn, *args):
+        heapq.heappush(self.events, (when, next(self.seq), fn, args))
+
+    def _dispatch(self):
+        while True:
+            with self.cond:
+                while not self.stopped and (not self.events or self.events[0][0] > time.monotonic()):
+                    self.cond.wait(None if not self.events else self.events[0][0] - time.monotonic())
+                if self.stopped:
+                    return
+                when, _, fn, args = heapq.heappop(self.events)
+                if args[0] not in self.live:
+                    continue  # cancelled: TWS stops sending
+            fn(*args)
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        self.thread.join()
+
+
+def chain(n_strikes=30, expiries=("20260320", "20260417")):
+    return [(e, 80.0 + 2.5 * k, r) for e in expiries for k in range(n_strikes) for r in "CP"]
+
+
+class StubResourceManager:
+    def __init__(self, lines):
+        self.scan_batch_size = lines
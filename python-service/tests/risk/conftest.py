@@ -0,0 +1,12 @@
+"""Shared helpers for risk engine tests."""
+
+import asyncio
+
+
+def run_sync(coro):
+    """Run an async coroutine synchronously on the current event loop.
+
+    The risk tests share one get_event_loop() loop; pytest-asyncio would
+    close it and break the tests that run after.
+    """
+    return asyncio.get_event_loop().run_until_complete(coro)
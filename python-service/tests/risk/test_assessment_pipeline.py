@@ -0,0 +1,195 @@
+"""Tests for the staged API-bucket pipeline of the morning risk run."""
+
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+
+from app.risk import engine as engine_mod
+from app.risk.engine import RiskAssessmentEngine
+from app.risk.pipeline import PipelineStage, pipeline_stats
+from tests.risk.conftest import run_sync
+
+
+# ---------------------------------------------------------------------------
+# PipelineStage
+# ---------------------------------------------------------------------------
+
+
+def test_stage_bounds_concurrency_and_tracks_queue_depth():
+    stage = PipelineStage("model", 2)
+    active = []
+
+    async def work(delay):
+        async with stage.slot():
+            active.append(stage.active)
+            await asyncio.sleep(delay)
+
+    async def run_all():
+        await asyncio.gather(*(work(0.01) for _ in range(5)))
+
+    run_sync(run_all())
+    stats = stage.stats()
+    assert max(active) == 2
+    assert stats["completed"] == 5 and stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["max_queue_depth"] >= 3
+    assert stats["avg_ms"] >= 10 and stats["p95_ms"] <= stats["max_ms"]
+
+
+def test_stage_counts_failures_and_releases_slot():
+    stage = PipelineStage("store", 1)
+
+    async def store(fail):
+        async with stage.slot():
+            if fail:
+                raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        run_sync(store(True))
+    run_sync(store(False))
+    summary = pipeline_stats([stage], phase1_seconds=1.5)
+    assert summary["phase1_seconds"] == 1.5
+    assert summary["stages"]["store"]["failed"] == 1 and summary["stages"]["store"]["completed"] == 1
+
+
+def test_unlimited_stage_only_times_the_work():
+    stage = PipelineStage("prompt", None)
+    active = []
+
+    async def build():
+        async with stage.slot():
+            await asyncio.sleep(0.01)
+            active.append(stage.active)
+
+    async def build_all():
+        await asyncio.gather(*(build() for _ in range(3)))
+
+    run_sync(build_all())
+    stats = stage.stats()
+    assert stats["limit"] is None and max(active) == 3
+    assert stats["completed"] == 3 and stats["avg_ms"] >= 10
+
+
+# ---------------------------------------------------------------------------
+# Morning run with the DB and model stubbed out
+# ---------------------------------------------------------------------------
+
+
+class _FakeConn:
+    def __init__(self, tickers, executed):
+        self.tickers = tickers
+        self.executed = executed
+
+    async def fetchrow(self, sql, *args):
+        return {"id": 1} if "sheet_snapshots" in sql else None
+
+    async def fetch(self, sql, *args):
+        if "SELECT DISTINCT ticker FROM sheet_rows" in sql:
+            return [{"ticker": t} for t in self.tickers]
+        return []
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+
+class _FakePool:
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.executed = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _FakeConn(self.tickers, self.executed)
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch):
+    monkeypatch.setattr(engine_mod, "USE_CLI_ASSESSMENT", True)  # no budget check
+    monkeypatch.setattr(engine_mod, "ENABLE_BATCH_MODE", False)
+    monkeypatch.setattr(engine_mod, "RISK_CALL_SPACING_SEC", 0)
+    monkeypatch.setattr(engine_mod, "RISK_MODEL_CONCURRENCY", 3)
+    monkeypatch.setattr(engine_mod, "RISK_PIPELINE_STATS_INTERVAL_SEC", 0)
+
+
+def _engine(pool, delays, resumed=None):
+    engine = RiskAssessmentEngine.__new__(RiskAssessmentEngine)
+    engine.pool = pool
+    engine.model = "test-model"
+    engine.stored = []
+    engine.collected = []
+    engine.in_model = 0
+    engine.max_in_model = 0
+
+    async def collect_deal_contexts(tickers):
+        engine.collected.extend(tickers)
+        return {t: {"ticker": t} for t in tickers}
+
+    async def assess_single_deal(context, system_prompt=None, user_prompt=None, model=None):
+        engine.in_model += 1
+        engine.max_in_model = max(engine.max_in_model, engine.in_model)
+        try:
+            await asyncio.sleep(delays[context["ticker"]])
+        finally:
+            engine.in_model -= 1
+        if context["ticker"] == "BAD":
+            raise ValueError("Claude returned invalid JSON for BAD")
+        return {"needs_attention": context["ticker"] == "SLOW", "_meta": {"tokens_used": 10, "cost_usd": 0.01}}
+
+    async def process(run_id, run_date, ticker, assessment, context, significance,
+                      change_list, ctx_hash, strategy, results):
+        engine.stored.append(ticker)
+        results.append({"ticker": ticker, "status": "success", "strategy": strategy})
+        return {"score_changes": 0, "discrepancies": 0}
+
+    async def adopt(run_id, run_date, tickers):
+        return resumed or {}
+
+    async def summary(*args, **kwargs):
+        return "summary"
+
+    engine.collect_deal_contexts = collect_deal_contexts
+    engine.assess_single_deal = assess_single_deal
+    engine._process_assessment_result = process
+    engine._adopt_unfinished_assessments = adopt
+    engine._generate_run_summary = summary
+    return engine
+
+
+def _pipeline_writes(pool):
+    return [json.loads(args[1]) for sql, args in pool.executed if "pipeline_stats" in sql]
+
+
+def test_deals_are_stored_as_they_finish_under_model_limit(pipeline_env):
+    delays = {"SLOW": 0.2, "A": 0.01, "B": 0.02, "C": 0.01, "D": 0.03, "BAD": 0.01}
+    pool = _FakePool(sorted(delays))
+    engine = _engine(pool, delays)
+
+    result = run_sync(engine._run_morning_assessment_inner(date(2026, 3, 2), "test", uuid.uuid4(), None))
+
+    assert engine.max_in_model == 3
+    # The slow deal does not hold up the ones behind it
+    assert engine.stored[-1] == "SLOW" and set(engine.stored) == set(delays) - {"BAD"}
+    assert result["assessed_deals"] == 5 and result["failed_deals"] == 1
+    assert result["full_deals"] == 6 and result["flagged_deals"] == 1
+    stages = result["pipeline"]["stages"]
+    assert stages["model"]["completed"] == 5 and stages["model"]["failed"] == 1
+    assert stages["model"]["max_queue_depth"] >= 3 and stages["store"]["completed"] == 5
+    # Progress snapshots are written while the run is going, plus the final one
+    writes = _pipeline_writes(pool)
+    assert len(writes) >= 2 and writes[-1] == result["pipeline"]
+
+
+def test_resumed_run_skips_already_stored_deals(pipeline_env):
+    delays = {"A": 0.01, "B": 0.01, "C": 0.01}
+    pool = _FakePool(sorted(delays))
+    engine = _engine(pool, delays, resumed={"A": {"ticker": "A", "needs_attention": True}})
+
+    result = run_sync(engine._run_morning_assessment_inner(date(2026, 3, 2), "test", uuid.uuid4(), None))
+
+    assert engine.collected == ["B", "C"] and sorted(engine.stored) == ["B", "C"]
+    assert result["assessed_deals"] == 3 and result["resumed_deals"] == 1
+    assert result["flagged_deals"] == 1
+    assert {"ticker": "A", "status": "success", "strategy": "resumed", "needs_attention": True} in result["results"]
@@ -1,6 +1,5 @@
 """Tests for batch_assessor: batch request building, result processing."""
 
-import asyncio
 import json
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -13,11 +12,7 @@ from app.risk.batch_assessor import (
     run_batch_assessment,
 )
 from app.risk.model_config import CACHE_MIN_TOKENS
-
-
-def _run(coro):
-    """Run an async coroutine synchronously."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+from tests.risk.conftest import run_sync
 
 
 # ---------------------------------------------------------------------------
@@ -168,7 +163,7 @@ def _make_batch(batch_id="batch_123", status="ended", succeeded=1, errored=0, ex
 
 def test_run_batch_empty_input():
     """Empty deal list returns empty dict."""
-    result = _run(run_batch_assessment(None, []))
+    result = run_sync(run_batch_assessment(None, []))
     assert result == {}
 
 
@@ -198,7 +193,7 @@ def test_run_batch_success():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert "ATVI" in results
     assert results["ATVI"]["grades"]["regulatory"]["grade"] == "Medium"
@@ -235,7 +230,7 @@ def test_run_batch_strips_markdown_fences():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert "SAVE" in results
     assert results["SAVE"]["risk"] == "low"
@@ -258,7 +253,7 @@ def test_run_batch_errored_result():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert "FAIL" in results
     assert results["FAIL"]["_meta"]["error"] == "batch_errored"
@@ -281,7 +276,7 @@ def test_run_batch_expired_result():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert "LATE" in results
     assert results["LATE"]["_meta"]["error"] == "batch_expired"
@@ -313,7 +308,7 @@ def test_run_batch_cost_is_half():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     batch_cost = results["COST"]["_meta"]["cost_usd"]
     assert abs(batch_cost - standard_cost * 0.5) < 1e-10
@@ -338,7 +333,7 @@ def test_run_batch_multiple_deals():
     ]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert len(results) == 3
     assert results["AAA"]["risk"] == "low"
@@ -367,7 +362,7 @@ def test_run_batch_malformed_json():
     }]
 
     with patch("app.risk.batch_assessor.asyncio.sleep", new_callable=AsyncMock):
-        results = _run(run_batch_assessment(mock_client, deal_requests))
+        results = run_sync(run_batch_assessment(mock_client, deal_requests))
 
     assert "BAD" in results
     assert results["BAD"]["_meta"]["error"] == "invalid_json"
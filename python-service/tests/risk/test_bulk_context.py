@@ -0,0 +1,125 @@
+"""Tests for set-based deal context collection (RiskAssessmentEngine.collect_deal_contexts)."""
+
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.risk.context_hash import compute_context_hash
+from app.risk.engine import RiskAssessmentEngine
+from tests.risk.conftest import run_sync
+
+
+# ---------------------------------------------------------------------------
+# Fake pool: one canned row list per table, filtered by the ANY($1) ticker set
+# ---------------------------------------------------------------------------
+
+
+class _FakeConn:
+    def __init__(self, tables, failing, calls):
+        self.tables = tables
+        self.failing = failing
+        self.calls = calls
+
+    async def fetch(self, sql, tickers):
+        table = re.search(r"FROM (\w+)", sql.split("FROM sheet_snapshots")[0]).group(1)
+        self.calls.append(table)
+        if table in self.failing:
+            raise RuntimeError(f'relation "{table}" does not exist')
+        return [r for r in self.tables.get(table, []) if r["ticker"] in tickers]
+
+
+class _FakePool:
+    def __init__(self, tables, failing=()):
+        self.tables = tables
+        self.failing = set(failing)
+        self.calls = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _FakeConn(self.tables, self.failing, self.calls)
+
+
+TABLES = {
+    "sheet_rows": [
+        {"ticker": "ACME", "deal_price": 50.0, "current_price": 48.0, "price_change": 0.2,
+         "vote_risk": "Low", "finance_risk": "Medium", "legal_risk": "Low", "investable": "Yes"},
+        {"ticker": "BOLT", "deal_price": 20.0, "current_price": 19.5, "price_change": None,
+         "vote_risk": "High", "finance_risk": "Low", "legal_risk": "Low", "investable": "No"},
+    ],
+    "sheet_deal_details": [{"ticker": "ACME", "probability_of_success": 90, "mac_clauses": "std"}],
+    "deal_risk_assessments": [{"ticker": "ACME", "our_prob_success": 85}],
+    "portfolio_edgar_filings": [
+        {"ticker": "ACME", "filing_type": "8-K"},
+        {"ticker": "BOLT", "filing_type": "DEFM14A"},
+        {"ticker": "ACME", "filing_type": "SC 13D"},
+    ],
+    "halt_events": [{"ticker": "BOLT", "halt_code": "T1"}],
+    "deal_attributes": [{"ticker": "BOLT", "id": 4, "is_hostile": False}],
+    "canonical_deal_milestones": [{"ticker": "ACME", "status": "pending"}],
+    "deal_position_snapshots": [{"ticker": "ACME", "position_qty": 1000, "avg_cost": None}],
+    "portfolio_filing_impacts": [
+        {"ticker": "ACME", "filing_type": "8-K", "impact_level": "high", "rn": 1},
+    ],
+    "deal_news_articles": [
+        {"ticker": "BOLT", "title": "Vote scheduled", "relevance_score": 0.9, "rn": 1},
+        {"ticker": "BOLT", "title": "Spread widens", "relevance_score": 0.4, "rn": 2},
+    ],
+}
+
+
+def _engine(pool):
+    engine = RiskAssessmentEngine.__new__(RiskAssessmentEngine)
+    engine.pool = pool
+    return engine
+
+
+def test_one_query_per_table_regardless_of_deal_count():
+    single = _FakePool(TABLES)
+    run_sync(_engine(single).collect_deal_contexts(["ACME"]))
+    many = _FakePool(TABLES)
+    run_sync(_engine(many).collect_deal_contexts(["ACME", "BOLT"] + [f"T{i}" for i in range(100)]))
+    assert many.calls == single.calls
+    assert len(many.calls) == len(set(many.calls))
+
+
+def test_rows_are_grouped_per_ticker_like_single_deal_queries():
+    contexts = run_sync(_engine(_FakePool(TABLES)).collect_deal_contexts(["ACME", "BOLT", "NONE"]))
+
+    acme, bolt, none = contexts["ACME"], contexts["BOLT"], contexts["NONE"]
+    assert [f["filing_type"] for f in acme["recent_filings"]] == ["8-K", "SC 13D"]
+    assert acme["recent_halts"] == [] and bolt["recent_halts"] == [{"ticker": "BOLT", "halt_code": "T1"}]
+    assert acme["previous_assessment"] == {"ticker": "ACME", "our_prob_success": 85}
+    assert "previous_assessment" not in bolt
+    assert acme["position_data"] == {"position_qty": 1000.0, "avg_cost": None}
+    # Bookkeeping columns of the bulk queries do not leak into the context
+    assert acme["filing_impacts"] == [{"filing_type": "8-K", "impact_level": "high"}]
+    assert [a["title"] for a in bolt["news_articles"]] == ["Vote scheduled", "Spread widens"]
+    assert "ticker" not in bolt["news_articles"][0]
+    assert "news_articles" not in acme and "filing_impacts" not in bolt
+    # Derived signals are computed per deal
+    assert acme["sheet_comparison"]["prob_success"] == 90
+    assert bolt["live_price"] == {"price": 19.5, "change": None}
+    assert none == {"ticker": "NONE", "recent_filings": [], "recent_halts": [], "sheet_diffs": [],
+                    "milestones": []}
+
+
+def test_single_deal_collection_matches_bulk_and_hash():
+    pool = _FakePool(TABLES)
+    bulk = run_sync(_engine(pool).collect_deal_contexts(["ACME", "BOLT"]))
+    for ticker in ("ACME", "BOLT"):
+        single = run_sync(_engine(pool).collect_deal_context(ticker))
+        assert single == bulk[ticker]
+        assert compute_context_hash(single) == compute_context_hash(bulk[ticker])
+
+
+def test_missing_optional_tables_keep_per_deal_defaults():
+    pool = _FakePool(TABLES, failing={"portfolio_edgar_filings", "canonical_deal_milestones", "deal_news_articles"})
+    contexts = run_sync(_engine(pool).collect_deal_contexts(["ACME", "BOLT"]))
+    assert contexts["ACME"]["recent_filings"] == [] and contexts["BOLT"]["recent_filings"] == []
+    assert "milestones" not in contexts["ACME"]
+    assert "news_articles" not in contexts["BOLT"]
+    assert contexts["ACME"]["position_data"]["position_qty"] == 1000.0
+
+    with pytest.raises(RuntimeError):
+        run_sync(_engine(_FakePool(TABLES, failing={"sheet_rows"})).collect_deal_contexts(["ACME"]))
@@ -0,0 +1,220 @@
+"""Accuracy tests for the array Black-Scholes functions against the original scalar implementation.
+
+The legacy_* functions are the per-contract implementations (Abramowitz &
+Stegun normal CDF, Newton-Raphson IV) the array forms replaced, with one fix:
+the old _norm_cdf applied the A&S erf approximation to x instead of x/sqrt(2),
+so N(1) came out as 0.870 rather than 0.841.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.research.market_data.black_scholes import (
+    bs_delta,
+    bs_delta_array,
+    bs_gamma,
+    bs_gamma_array,
+    bs_price,
+    bs_price_array,
+    bs_theta,
+    bs_theta_array,
+    bs_vega,
+    bs_vega_array,
+    implied_volatility,
+    implied_volatility_array,
+)
+
+
+def legacy_norm_cdf(x):
+    x = x / math.sqrt(2.0)  # the fix; the rest is the old code
+    if x < -10:
+        return 0.0
+    if x > 10:
+        return 1.0
+    a1, a2, a3, a4, a5, p = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429, 0.3275911
+    sign = 1.0 if x >= 0 else -1.0
+    x_abs = abs(x)
+    t = 1.0 / (1.0 + p * x_abs)
+    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(-x_abs * x_abs)
+    return 0.5 * (1.0 + sign * y)
+
+
+def test_legacy_reference_cdf_is_the_normal_cdf():
+    for x in np.linspace(-8, 8, 161):
+        assert legacy_norm_cdf(x) == pytest.approx(0.5 * math.erfc(-x / math.sqrt(2.0)), abs=1e-7)
+
+
+def legacy_norm_pdf(x):
+    return math.exp(-x * x / 2.0) / math.sqrt(2.0 * math.pi)
+
+
+def _d1(S, K, T, r, sigma):
+    return (math.log(S / K) + (r + sigma * sigma / 2) * T) / (sigma * math.sqrt(T))
+
+
+def legacy_price(S, K, T, r, sigma, option_type="C"):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return 0.0
+    d1 = _d1(S, K, T, r, sigma)
+    d2 = d1 - sigma * math.sqrt(T)
+    if option_type == "C":
+        return S * legacy_norm_cdf(d1) - K * math.exp(-r * T) * legacy_norm_cdf(d2)
+    return K * math.exp(-r * T) * legacy_norm_cdf(-d2) - S * legacy_norm_cdf(-d1)
+
+
+def legacy_vega(S, K, T, r, sigma):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return 0.0
+    return S * legacy_norm_pdf(_d1(S, K, T, r, sigma)) * math.sqrt(T)
+
+
+def legacy_iv(market_price, S, K, T, r=0.05, option_type="C", max_iterations=50, tolerance=1e-6):
+    if market_price <= 0 or S <= 0 or K <= 0 or T <= 0:
+        return None
+    if option_type == "C":
+        intrinsic = max(0, S - K * math.exp(-r * T))
+    else:
+        intrinsic = max(0, K * math.exp(-r * T) - S)
+    if market_price < intrinsic * 0.99:
+        return None
+    sigma = max(0.01, min(math.sqrt(2.0 * math.pi / T) * market_price / S, 5.0))
+    for _ in range(max_iterations):
+        price = legacy_price(S, K, T, r, sigma, option_type)
+        vega = legacy_vega(S, K, T, r, sigma)
+        if vega < 1e-12:
+            return None
+        diff = price - market_price
+        if abs(diff) < tolerance:
+            return sigma
+        sigma = max(0.001, min(sigma - diff / vega, 10.0))
+    if abs(legacy_price(S, K, T, r, sigma, option_type) - market_price) < market_price * 0.05:
+        return sigma
+    return None
+
+
+def legacy_delta(S, K, T, r, sigma, option_type="C"):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return None
+    d1 = _d1(S, K, T, r, sigma)
+    return legacy_norm_cdf(d1) if option_type == "C" else legacy_norm_cdf(d1) - 1.0
+
+
+def legacy_gamma(S, K, T, r, sigma):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return None
+    return legacy_norm_pdf(_d1(S, K, T, r, sigma)) / (S * sigma * math.sqrt(T))
+
+
+def legacy_theta(S, K, T, r, sigma, option_type="C"):
+    if T <= 0 or sigma <= 0 or S <= 0 or K <= 0:
+        return None
+    d1 = _d1(S, K, T, r, sigma)
+    d2 = d1 - sigma * math.sqrt(T)
+    common = -S * legacy_norm_pdf(d1) * sigma / (2 * math.sqrt(T))
+    if option_type == "C":
+        theta = common - r * K * math.exp(-r * T) * legacy_norm_cdf(d2)
+    else:
+        theta = common + r * K * math.exp(-r * T) * legacy_norm_cdf(-d2)
+    return theta / 365.0
+
+
+def random_contracts(n, seed=4):
+    """Chains around spot, with some invalid and deep ITM/OTM rows."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        S = rng.uniform(5, 500)
+        K = S * math.exp(rng.gauss(0, 0.35))
+        T = rng.choice([0.0, -0.1, rng.uniform(1 / 365, 2.5)]) if rng.random() < 0.05 else rng.uniform(1 / 365, 2.5)
+        sigma = rng.choice([0.0, rng.uniform(0.05, 2.0)]) if rng.random() < 0.05 else rng.uniform(0.05, 2.0)
+        rows.append((S, K, T, rng.choice([0.0, 0.045, 0.08]), sigma, rng.choice("CP")))
+    return rows
+
+
+def _nan_if_none(value):
+    return np.nan if value is None else value
+
+
+def _columns(rows):
+    S, K, T, r, sigma, kind = zip(*rows)
+    return np.array(S), np.array(K), np.array(T), np.array(r), np.array(sigma), np.array(kind)
+
+
+def test_price_vega_and_greeks_match_scalar_implementation():
+    rows = random_contracts(3000)
+    S, K, T, r, sigma, kind = _columns(rows)
+    price = bs_price_array(S, K, T, r, sigma, kind)
+    vega = bs_vega_array(S, K, T, r, sigma)
+    delta = bs_delta_array(S, K, T, r, sigma, kind)
+    gamma = bs_gamma_array(S, K, T, r, sigma)
+    theta = bs_theta_array(S, K, T, r, sigma, kind)
+
+    for i, row in enumerate(rows):
+        s, k, t, rr, sg, c = row
+        # A&S CDF error is < 7.5e-8; everything else is the same formula
+        assert price[i] == pytest.approx(legacy_price(*row), abs=3e-7 * max(s, k))
+        assert vega[i] == pytest.approx(legacy_vega(s, k, t, rr, sg), rel=1e-12, abs=1e-12)
+        assert gamma[i] == pytest.approx(_nan_if_none(legacy_gamma(s, k, t, rr, sg)), rel=1e-12, nan_ok=True)
+        assert delta[i] == pytest.approx(_nan_if_none(legacy_delta(*row)), abs=2e-7, nan_ok=True)
+        expected_theta = legacy_theta(*row)
+        if expected_theta is None:
+            assert np.isnan(theta[i])
+        else:
+            assert theta[i] == pytest.approx(expected_theta, abs=3e-7 * max(s, k) / 365 * (1 + rr))
+        # Scalar wrappers give the array values (None for NaN)
+        assert bs_price(*row) == price[i] and bs_vega(s, k, t, rr, sg) == vega[i]
+        assert bs_delta(*row) == (None if np.isnan(delta[i]) else delta[i])
+        assert bs_gamma(s, k, t, rr, sg) == (None if np.isnan(gamma[i]) else gamma[i])
+        assert bs_theta(*row) == (None if np.isnan(theta[i]) else theta[i])
+
+
+def test_implied_volatility_matches_scalar_newton_where_it_converges():
+    rows = random_contracts(2000, seed=9)
+    rng = random.Random(2)
+    quotes = []
+    for S, K, T, r, sigma, kind in rows:
+        fair = legacy_price(S, K, max(T, 0.01), r, max(sigma, 0.05), kind)
+        # Mostly fair prices; some noise, some below intrinsic, some zero
+        quotes.append((round(fair * rng.choice([1, 1, 1, 0.97, 1.03, 0.5, 0]), 2), S, K, T, r, kind))
+    price, S, K, T, r, kind = (np.array(c) for c in zip(*quotes))
+    iv = implied_volatility_array(price, S, K, T, r, kind)
+
+    newton = recovered = 0
+    for i, quote in enumerate(quotes):
+        expected = legacy_iv(*quote)
+        p, s, k, t, rr, c = quote
+        if expected is not None and abs(legacy_price(s, k, t, rr, expected, c) - p) < 1e-6:
+            newton += 1
+            assert iv[i] == pytest.approx(expected, abs=1e-4)
+        elif not np.isnan(iv[i]):
+            # Bisection fallback (or the 5% rule): must reprice the quote
+            recovered += expected is None
+            assert bs_price(s, k, t, rr, iv[i], c) == pytest.approx(p, abs=max(1e-5, p * 0.05))
+        if p <= 0 or t <= 0:
+            assert np.isnan(iv[i])
+        assert implied_volatility(*quote) == (None if np.isnan(iv[i]) else iv[i])
+    assert newton > 1000 and recovered > 0
+
+
+def test_bisection_solves_what_newton_cannot():
+    # Deep OTM short-dated call: vega collapses at the Newton starting point
+    S, K, T, r = 100.0, 160.0, 10 / 365, 0.045
+    price = bs_price(S, K, T, r, 1.8, "C")
+    assert legacy_iv(price, S, K, T, r, "C") is None
+    assert implied_volatility(price, S, K, T, r, "C") == pytest.approx(1.8, abs=1e-3)
+
+    # Above the sigma=10 price: not bracketed, no estimate
+    assert implied_volatility(99.9, S, K, T, r, "C") is None
+
+
+def test_array_forms_broadcast_scalars_and_keep_shape():
+    strikes = np.array([[90.0, 100.0], [110.0, 120.0]])
+    prices = bs_price_array(100.0, strikes, 0.5, 0.045, 0.3, "C")
+    assert prices.shape == (2, 2)
+    iv = implied_volatility_array(prices, 100.0, strikes, 0.5, 0.045, np.array([[True, True], [True, True]]))
+    assert iv.shape == (2, 2) and np.allclose(iv, 0.3, atol=1e-4)
+    assert implied_volatility_array(np.array([]), 100.0, np.array([]), 0.5).shape == (0,)
+    assert np.isnan(implied_volatility_array(-1.0, 100.0, 100.0, 0.5)) and implied_volatility(-1.0, 100, 100, 0.5) is None
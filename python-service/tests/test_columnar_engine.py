@@ -0,0 +1,113 @@
+"""Columnar find_best_opportunities engine must match the scalar engine exactly."""
+
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+from freezegun import freeze_time
+
+from app.options.analyzer import MergerArbAnalyzer as PortfolioAnalyzer
+from app.options.analyzer import DealInput as PortfolioDealInput
+from app.options.analyzer import OptionData as PortfolioOptionData
+from app.options.columnar import ChainColumns, top_k_stable
+from app.scanner import MergerArbAnalyzer, DealInput
+from tests.conftest import FROZEN_NOW, make_option
+
+EXPIRIES = ["20260220", "20260320", "20260417", "20260515", "20260619", "20260714", "20260918"]
+
+
+def _random_chain(rng: random.Random, n: int, deal_price: float = 100.0):
+    chain = []
+    for _ in range(n):
+        strike = round(deal_price * rng.uniform(0.6, 1.2) * 2) / 2  # $0.50 grid -> many ties
+        bid = round(max(0.0, rng.uniform(-0.5, 12.0)), 2)
+        ask = round(bid + rng.choice([0.0, 0.05, 0.10, 0.5, 1.0]), 2) if rng.random() > 0.05 else 0.0
+        chain.append(make_option(
+            strike=strike,
+            expiry=rng.choice(EXPIRIES),
+            right=rng.choice("CP"),
+            bid=bid,
+            ask=ask,
+            last=round(rng.uniform(0, 10), 2) if rng.random() > 0.3 else 0.0,
+            open_interest=rng.choice([0, 5, 10, 500]),
+            implied_vol=rng.choice([0.0, 0.2, 0.35, 1.1]),
+        ))
+    return chain
+
+
+def _both(analyzer, chain, price, **kwargs):
+    return (analyzer.find_best_opportunities(chain, price, engine="scalar", **kwargs),
+            analyzer.find_best_opportunities(chain, price, engine="columnar", **kwargs))
+
+
+@freeze_time(FROZEN_NOW)
+@pytest.mark.parametrize("seed", range(12))
+def test_randomized_chains_match_scalar(seed):
+    rng = random.Random(seed)
+    deal = DealInput("ACME", 100.0, datetime(2026, 7, 14, 12, 0),
+                     dividend_before_close=rng.choice([0.0, 0.5]), confidence=rng.choice([0.6, 0.9]))
+    analyzer = MergerArbAnalyzer(deal)
+    chain = _random_chain(rng, rng.choice([0, 1, 40, 400]))
+    price = rng.choice([85.0, 95.0, 99.5, 103.0])
+    scalar, columnar = _both(analyzer, chain, price)
+    assert columnar == scalar
+
+
+@freeze_time(FROZEN_NOW)
+def test_custom_bounds_and_dense_chain_match_scalar():
+    rng = random.Random(99)
+    deal = DealInput("ACME", 100.0, datetime(2026, 7, 14, 12, 0), confidence=0.8)
+    analyzer = MergerArbAnalyzer(deal)
+    chain = _random_chain(rng, 3000)
+    scalar, columnar = _both(
+        analyzer, chain, 96.0,
+        call_long_strike_lower_pct=0.4, call_short_strike_upper_pct=0.2,
+        put_long_strike_lower_pct=0.4, put_short_strike_lower_pct=0.1, put_short_strike_upper_pct=0.1,
+    )
+    assert len(scalar) > 0
+    assert columnar == scalar
+
+
+@freeze_time(FROZEN_NOW)
+def test_portfolio_analyzer_matches_scalar():
+    rng = random.Random(7)
+    deal = PortfolioDealInput("ACME", 100.0, datetime(2026, 7, 14, 12, 0), confidence=0.75)
+    analyzer = PortfolioAnalyzer(deal)
+    chain = [PortfolioOptionData(**vars(o)) for o in _random_chain(rng, 800)]
+    scalar, columnar = _both(analyzer, chain, 97.0)
+    assert len(scalar) > 0
+    assert columnar == scalar
+
+
+@freeze_time(FROZEN_NOW)
+def test_bad_expiry_and_missing_fields():
+    deal = DealInput("ACME", 100.0, datetime(2026, 7, 14, 12, 0), confidence=0.75)
+    analyzer = MergerArbAnalyzer(deal)
+    chain = [
+        make_option(strike=95, expiry="2026-07-14", right="C", bid=0.2, ask=0.4),
+        make_option(strike=95, expiry="20260714", right="C", bid=0.2, ask=0.4),
+        make_option(strike=100, expiry="20260714", right="C", bid=2.0, ask=3.0),
+    ]
+    scalar, columnar = _both(analyzer, chain, 97.0)
+    assert columnar == scalar
+    assert all(o.contracts[0].expiry == "20260714" for o in columnar)
+
+    # A None field cannot be columnized: engine falls back to scalar
+    chain.append(make_option(strike=90, expiry="20260714", right="P", bid=None, ask=2.0))
+    assert ChainColumns.from_options(chain) is None
+    scalar, columnar = _both(analyzer, chain, 97.0)
+    assert columnar == scalar
+
+
+def test_unknown_engine_rejected():
+    analyzer = MergerArbAnalyzer(DealInput("ACME", 100.0, datetime(2030, 1, 1)))
+    with pytest.raises(ValueError):
+        analyzer.find_best_opportunities([], 99.0, engine="gpu")
+
+
+def test_top_k_stable_keeps_input_order_for_ties():
+    scores = np.array([1.0, 3.0, 2.0, 3.0, 2.0, 3.0, 0.5])
+    assert top_k_stable(scores, 2).tolist() == [1, 3]
+    assert top_k_stable(scores, 5).tolist() == [1, 3, 5, 2, 4]
+    assert top_k_stable(scores, 10).tolist() == sorted(range(7), key=lambda i: scores[i], reverse=True)
@@ -0,0 +1,98 @@
+"""Tests for normalized company-name keys and the trigram name lookups that use them."""
+
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from app.intelligence.aggregator import IntelligenceAggregator
+from app.intelligence.edgar_cross_reference import EdgarCrossReference
+from app.intelligence.models import DealMention, MentionType, SourceType
+from app.utils.company_names import (
+    COMPANY_NAME_SIMILARITY_THRESHOLD,
+    LEGAL_SUFFIXES,
+    company_name_key,
+)
+
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "068_company_name_trigram.sql"
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Acme, Inc.", "acme"),
+    ("ACME INCORPORATED", "acme"),
+    ("Acme Corp.", "acme"),
+    ("The Acme Co., Ltd.", "acme"),
+    ("Johnson & Johnson", "johnson johnson"),
+    ("  Widget   Holdings  PLC ", "widget holdings"),
+    ("Cinco Inc Holdings", "cinco inc holdings"),  # only trailing suffixes are dropped
+    ("The Company", "the"),
+    ("Inc.", "inc"),
+    ("", ""),
+    (None, ""),
+])
+def test_company_name_key(name, key):
+    assert company_name_key(name) == key
+
+
+def test_sql_key_function_uses_the_same_suffixes():
+    sql = MIGRATION.read_text()
+    suffixes = re.search(r"'\( \(([a-z|]+)\)\)\+\$'", sql).group(1).split("|")
+    assert tuple(suffixes) == LEGAL_SUFFIXES
+    assert "'[^a-z0-9]+'" in sql and "'^the '" in sql
+
+
+class _Conn:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.calls = []
+
+    async def fetch(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.rows
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.rows[0] if self.rows else None
+
+
+@pytest.mark.asyncio
+async def test_filing_name_search_uses_trigram_key():
+    xref = EdgarCrossReference.__new__(EdgarCrossReference)
+    conn = _Conn([{"filing_id": "f1", "company_name": "ACME INCORPORATED"}])
+    cutoff = datetime(2026, 1, 1)
+
+    filings = await xref._search_by_company_name(conn, "Acme, Inc.", cutoff)
+
+    assert filings == [{"filing_id": "f1", "company_name": "ACME INCORPORATED"}]
+    sql, args = conn.calls[0]
+    assert "$1 <% company_name_key(company_name)" in sql and "ILIKE" not in sql
+    assert args == ("acme", cutoff, COMPANY_NAME_SIMILARITY_THRESHOLD)
+
+    # A name with no usable key no longer matches every filing
+    assert await xref._search_by_company_name(conn, " , ", cutoff) == []
+    assert len(conn.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_deal_name_lookup_compares_keys():
+    aggregator = IntelligenceAggregator.__new__(IntelligenceAggregator)
+    mention = DealMention(
+        source_name="reuters_ma", source_type=SourceType.NEWS, mention_type=MentionType.RUMOR,
+        target_name="Acme Incorporated", target_ticker=None, source_url="https://r/1", headline="",
+    )
+    conn = _Conn([{"deal_id": "d1", "target_name": "Acme, Inc.", "target_ticker": None, "acquirer_name": None}])
+
+    deal = await aggregator._find_existing_deal(conn, mention)
+
+    assert deal["deal_id"] == "d1"
+    sql, args = conn.calls[0]
+    assert "company_name_key(target_name) % $1" in sql
+    assert args == ("acme", COMPANY_NAME_SIMILARITY_THRESHOLD)
+
+    conn.rows = [{"match_on": "name", "match_key": "Acme Incorporated", "deal_id": "d1"}]
+    by_ticker, by_name = await aggregator._find_existing_deals(conn, [mention])
+    assert (by_ticker, by_name) == ({}, {"Acme Incorporated": "d1"})
+    sql, args = conn.calls[1]
+    assert "unnest($2::text[], $3::text[])" in sql
+    assert args == ([], ["Acme Incorporated"], ["acme"], COMPANY_NAME_SIMILARITY_THRESHOLD)
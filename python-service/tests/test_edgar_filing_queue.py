@@ -0,0 +1,332 @@
+"""Tests for concurrent EDGAR polling and the durable filing work queue."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.edgar import orchestrator as orch_mod
+from app.edgar.models import DealExtraction, EdgarFiling, EdgarRSSItem, MADetectionResult
+from app.edgar.extractor import DealExtractor
+from app.edgar.orchestrator import EdgarOrchestrator, filing_retry_delay
+from app.edgar.poller import EdgarPoller
+
+
+def _item(form, n):
+    return EdgarRSSItem(
+        title=f"{form} - COMPANY {n} INC (000000{n:04d})",
+        link=f"https://www.sec.gov/Archives/edgar/data/{n}/00000000012600{n:04d}/0000000001-26-00{n:04d}-index.htm",
+        description="",
+        pub_date=datetime(2026, 3, 2, 14, 30),
+        guid=str(n),
+    )
+
+
+def _filing(n, form="8-K"):
+    return EdgarFiling(
+        accession_number=f"0000000001-26-{n:06d}", cik=str(n), company_name=f"COMPANY {n} INC",
+        filing_type=form, filing_date=datetime(2026, 3, 2, 14, 30), filing_url=f"https://www.sec.gov/{n}-index.htm",
+    )
+
+
+@pytest.mark.asyncio
+async def test_poll_fetches_feeds_concurrently_and_parses_each_relevant_filing_once():
+    poller = EdgarPoller()
+    in_flight, max_in_flight, parsed = 0, 0, []
+
+    async def fetch_rss_feed(url):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        shared = [_item("8-K", 1), _item("4", 2), _item("SC TO", 3)]
+        return shared + ([_item("425", 4)] if "owner=include" in url else [])
+
+    async def parse_filing(item):
+        parsed.append(item.link)
+        return EdgarFiling(
+            accession_number=item.link.split('/')[-1].replace('-index.htm', ''), cik="1",
+            filing_type=item.title.split(' - ')[0], filing_date=item.pub_date, filing_url=item.link,
+        )
+
+    poller.fetch_rss_feed = fetch_rss_feed
+    poller.parse_filing = parse_filing
+    poller.seen_accession_numbers.add("0000000001-26-000003")
+    try:
+        filings = await poller.poll_once()
+    finally:
+        await poller.close()
+
+    assert max_in_flight == 2
+    # Form 4 is never parsed; filings listed by both feeds are parsed once
+    assert len(parsed) == 3 and len(set(parsed)) == 3
+    assert [f.filing_type for f in filings] == ["8-K", "425"]
+    # Marking seen is left to start_polling, after the hand-off succeeds
+    assert poller.seen_accession_numbers == {"0000000001-26-000003"}
+
+
+def test_retry_delay_backs_off_then_gives_up(monkeypatch):
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_MAX_ATTEMPTS", 5)
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_RETRY_BASE_SEC", 30)
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_RETRY_MAX_SEC", 100)
+    assert [filing_retry_delay(n) for n in range(1, 6)] == [30, 60, 100, 100, None]
+
+
+class _QueueDB:
+    """In-memory stand-in for the edgar_filing_queue methods of EdgarDatabase."""
+
+    def __init__(self):
+        self.rows = {}
+        self.retries = []
+
+    async def enqueue_filings(self, filings):
+        new = []
+        for f in filings:
+            if f["accession_number"] not in self.rows:
+                self.rows[f["accession_number"]] = {
+                    **f, "status": "pending", "attempts": 0, "locked_by": None,
+                    "enqueued_at": datetime.now(timezone.utc), "started_at": None, "ready_at": 0.0,
+                }
+                new.append(f["accession_number"])
+        return new
+
+    async def claim_filing(self, worker_id, lock_timeout_seconds):
+        now = asyncio.get_running_loop().time()
+        for acc, row in self.rows.items():
+            if row["status"] == "pending" and row["ready_at"] <= now:
+                row.update(status="processing", locked_by=worker_id, attempts=row["attempts"] + 1)
+                row["started_at"] = row["started_at"] or datetime.now(timezone.utc)
+                return {"accession_number": acc, "filing": row["filing"], "attempts": row["attempts"],
+                        "published_at": row["published_at"], "enqueued_at": row["enqueued_at"]}
+        return None
+
+    async def complete_filing(self, accession_number, worker_id, staged_deal):
+        row = self.rows[accession_number]
+        assert row["locked_by"] == worker_id
+        row.update(status="done", locked_by=None, staged_deal=staged_deal, completed_at=datetime.now(timezone.utc))
+        return row
+
+    async def retry_filing(self, accession_number, worker_id, error, delay_seconds):
+        row = self.rows[accession_number]
+        assert row["locked_by"] == worker_id
+        self.retries.append((accession_number, row["attempts"], delay_seconds))
+        row.update(status="failed" if delay_seconds is None else "pending", locked_by=None, last_error=error)
+        if delay_seconds is not None:
+            row["ready_at"] = asyncio.get_running_loop().time() + delay_seconds
+
+
+def _orchestrator(db, process):
+    orchestrator = EdgarOrchestrator.__new__(EdgarOrchestrator)
+    orchestrator.db = db
+    orchestrator.is_running = True
+    orchestrator.worker_id = "test"
+    orchestrator._work_available = asyncio.Event()
+    orchestrator.process_filing = process
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_workers_process_filings_concurrently_and_retry_failures(monkeypatch):
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_RETRY_BASE_SEC", 0.01)
+    monkeypatch.setattr(orch_mod, "EDGAR_FILING_IDLE_POLL_SEC", 0.01)
+    db = _QueueDB()
+    finished = []
+
+    async def process(filing):
+        if filing.cik == "1":
+            await asyncio.sleep(0.3)  # one slow Claude detection
+        if filing.cik == "9":
+            raise RuntimeError("SEC returned 503")
+        finished.append(filing.cik)
+        return "deal-id" if filing.cik == "2" else None
+
+    orchestrator = _orchestrator(db, process)
+    workers = [asyncio.create_task(orchestrator._filing_worker(i)) for i in range(3)]
+    try:
+        filings = [_filing(n) for n in (1, 2, 3, 4, 9)]
+        await orchestrator.enqueue_filings(filings)
+        await orchestrator.enqueue_filings(filings[:2])  # re-polled: already queued
+        for _ in range(100):
+            if len(finished) == 4 and db.rows["0000000001-26-000009"]["status"] == "failed":
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        orchestrator.is_running = False
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    # The slow filing does not hold up the ones queued behind it
+    assert finished[-1] == "1" and sorted(finished) == ["1", "2", "3", "4"]
+    assert db.rows["0000000001-26-000002"]["staged_deal"] is True
+    assert db.rows["0000000001-26-000003"]["staged_deal"] is False
+    assert [r[1:] for r in db.retries] == [(1, 0.01), (2, 0.02), (3, None)]
+    assert db.rows["0000000001-26-000009"]["last_error"] == "RuntimeError: SEC returned 503"
+    published = db.rows["0000000001-26-000001"]["published_at"]
+    assert published.tzinfo is timezone.utc and published == datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_stopped_worker_hands_its_filing_back():
+    db = _QueueDB()
+    started = asyncio.Event()
+
+    async def process(filing):
+        started.set()
+        await asyncio.sleep(10)
+
+    orchestrator = _orchestrator(db, process)
+    await orchestrator.enqueue_filings([_filing(5)])
+    worker = asyncio.create_task(orchestrator._filing_worker(0))
+    await started.wait()
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+    row = db.rows["0000000001-26-000005"]
+    assert row["status"] == "pending" and row["locked_by"] is None
+    assert db.retries == [("0000000001-26-000005", 1, 0)]
+
+
+class _PipelineDB:
+    """In-memory stand-in for the edgar_filings / staged_deals methods process_filing uses.
+
+    Methods named in fail_once raise the first time they are called."""
+
+    def __init__(self, fail_once=()):
+        self.fail_once = set(fail_once)
+        self.filings, self.staged, self.research, self.alerted = {}, [], [], []
+
+    def _maybe_fail(self, name):
+        if name in self.fail_once:
+            self.fail_once.discard(name)
+            raise ConnectionError(f"{name}: connection reset")
+
+    async def get_filing_by_accession(self, accession_number):
+        row = self.filings.get(accession_number)
+        return dict(row) if row else None
+
+    async def create_filing(self, accession_number, **kwargs):
+        self.filings[accession_number] = {"filing_id": f"f-{accession_number}", "status": "pending",
+                                          "is_ma_relevant": False, "confidence_score": None,
+                                          "detected_keywords": None, "reasoning": None}
+        return self.filings[accession_number]["filing_id"]
+
+    async def update_filing_detection(self, filing_id, **detection):
+        row = next(r for r in self.filings.values() if r["filing_id"] == filing_id)
+        row.update(status="analyzed", **detection)
+
+    async def check_duplicate_deal(self, target_name, acquirer_name=None):
+        self._maybe_fail("check_duplicate_deal")
+        # Like the real query, a pending staged deal counts as a duplicate
+        dup = next((d for d in self.staged if d["target_name"].lower() == target_name.lower()), None)
+        return {"source": "staged_deals", "status": "pending"} if dup else None
+
+    async def create_staged_deal(self, source_filing_id, **deal):
+        self.staged.append({"staged_deal_id": f"deal-{len(self.staged) + 1}", "source_filing_id": source_filing_id,
+                            "alert_sent": False, **deal})
+        return self.staged[-1]["staged_deal_id"]
+
+    async def get_staged_deal_for_filing(self, filing_id):
+        deal = next((d for d in self.staged if d["source_filing_id"] == filing_id), None)
+        if deal is None:
+            return None
+        return {"staged_deal_id": deal["staged_deal_id"], "target_name": deal["target_name"],
+                "acquirer_name": deal["acquirer_name"], "deal_value": deal["deal_value"],
+                "confidence_score": deal["confidence_score"], "alert_sent": deal["alert_sent"],
+                "research_queued": deal["staged_deal_id"] in self.research}
+
+    async def create_research_queue(self, staged_deal_id, analyzer_types, priority=5):
+        self._maybe_fail("create_research_queue")
+        self.research.append(staged_deal_id)
+
+    async def update_staged_deal_alert(self, deal_id):
+        next(d for d in self.staged if d["staged_deal_id"] == deal_id)["alert_sent"] = True
+
+
+class _Stub:
+    def __init__(self, **methods):
+        self.__dict__.update(methods)
+
+
+def _pipeline(db, monkeypatch, fail_alerts=False):
+    calls = {"detect": 0, "extract": 0, "alerts": []}
+
+    async def get_document(url, accession):
+        return None
+
+    async def detect_ma_relevance(filing, filing_priority=None):
+        calls["detect"] += 1
+        return MADetectionResult(is_ma_relevant=True, confidence_score=0.9,
+                                 detected_keywords=["merger agreement"], reasoning="definitive agreement")
+
+    async def fetch_filing_text(url):
+        return "Agreement and Plan of Merger"
+
+    async def extract_deal_info(filing, text):
+        calls["extract"] += 1
+        return DealExtraction(target_name="Target Co", target_ticker="TGT", acquirer_name="Buyer Inc",
+                              deal_value=1.5, deal_type="merger", confidence_score=0.8, key_terms=[],
+                              announcement_summary="")
+
+    async def enrich_deal_with_tickers(**names):
+        return {"target_ticker": "TGT", "acquirer_ticker": None}
+
+    async def send_all_alerts(payload):
+        if fail_alerts and not calls["alerts"]:
+            calls["alerts"].append(None)
+            raise TimeoutError("SendGrid timed out")
+        calls["alerts"].append(payload.staged_deal_id)
+        return {"email": True}
+
+    monkeypatch.setattr(orch_mod, "get_ticker_lookup_service",
+                        lambda: _Stub(enrich_deal_with_tickers=enrich_deal_with_tickers))
+    orchestrator = EdgarOrchestrator.__new__(EdgarOrchestrator)
+    orchestrator.db = db
+    orchestrator.poller = _Stub(get_filing_priority=lambda filing_type: "high")
+    orchestrator.detector = _Stub(filing_cache=_Stub(get_document=get_document),
+                                  detect_ma_relevance=detect_ma_relevance, fetch_filing_text=fetch_filing_text,
+                                  extract_matched_text_excerpt=lambda text, detected_keywords: "excerpt")
+    orchestrator.extractor = _Stub(extract_deal_info=extract_deal_info)
+    orchestrator.alert_manager = _Stub(send_all_alerts=send_all_alerts)
+    return orchestrator, calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail", ["check_duplicate_deal", "create_research_queue", "send_all_alerts"])
+async def test_retry_after_detection_resumes_and_creates_the_staged_deal(monkeypatch, fail):
+    db = _PipelineDB(fail_once={fail} - {"send_all_alerts"})
+    orchestrator, calls = _pipeline(db, monkeypatch, fail_alerts=fail == "send_all_alerts")
+    filing = _filing(7)
+
+    with pytest.raises(Exception):
+        await orchestrator.process_filing(filing)
+    assert db.filings[filing.accession_number]["status"] == "analyzed"
+
+    staged_deal_id = await orchestrator.process_filing(filing)
+    assert staged_deal_id == "deal-1" and len(db.staged) == 1 and db.staged[0]["alert_sent"]
+    assert db.research == ["deal-1"] and calls["alerts"][-1] == "deal-1"
+    # Detection is not paid for twice; extraction only reruns if no deal was staged
+    assert calls["detect"] == 1 and calls["extract"] == (2 if fail == "check_duplicate_deal" else 1)
+
+    # Once the alert went out the filing is finished
+    assert await orchestrator.process_filing(filing) == "deal-1"
+    assert len(db.staged) == 1 and db.research == ["deal-1"] and calls["alerts"].count("deal-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_extractions_do_not_block_the_event_loop():
+    def create(**kwargs):
+        time.sleep(0.2)  # the sync Anthropic client waiting on the model
+        text = '{"target_name": "Target Co", "deal_type": "merger", "key_terms": [], ' \
+               '"announcement_summary": "", "confidence_score": 0.8}'
+        return _Stub(content=[_Stub(text=text)])
+
+    extractor = DealExtractor.__new__(DealExtractor)
+    extractor.anthropic = _Stub(messages=_Stub(create=create))
+    start = time.monotonic()
+    deals = await asyncio.gather(*(extractor.extract_deal_info(_filing(n), "text") for n in range(4)))
+    assert [d.target_name for d in deals] == ["Target Co"] * 4
+    assert time.monotonic() - start < 0.6
@@ -0,0 +1,191 @@
+"""Tests for event-driven evaluation mode and quote-cache dirty tracking."""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+from execution_engine import ExecutionEngine, ExecutionStrategy, LatencyHistogram
+from quote_cache import StreamingQuoteCache
+
+
+class StubResourceManager:
+    execution_lines_held = 0
+    available_for_scan = 100
+
+    def acquire_execution_lines(self, n, allocation_key=None):
+        self.execution_lines_held += n
+        return True
+
+    def release_execution_lines(self, n, allocation_key=None):
+        self.execution_lines_held -= n
+
+
+class StubScanner:
+    connection_lost = False
+
+    def __init__(self):
+        self._next_req_id = 1000
+
+    def get_next_req_id(self):
+        self._next_req_id += 1
+        return self._next_req_id
+
+    def reqMktData(self, *args, **kwargs):
+        return None
+
+    def cancelMktData(self, *args, **kwargs):
+        return None
+
+    def cancelOrder(self, *args, **kwargs):
+        return None
+
+    def add_order_status_listener(self, listener):
+        return None
+
+    def add_exec_details_listener(self, listener):
+        return None
+
+    def remove_order_status_listener(self, listener):
+        return None
+
+    def remove_exec_details_listener(self, listener):
+        return None
+
+
+class RecordingStrategy(ExecutionStrategy):
+    def __init__(self, keys):
+        self.keys = keys
+        self.evaluations = []
+        self.evaluated = threading.Event()
+
+    def get_subscriptions(self, config):
+        return [{"cache_key": k, "contract": {"symbol": k}} for k in self.keys]
+
+    def evaluate(self, quotes, config):
+        self.evaluations.append({k: q.bid for k, q in quotes.items()})
+        self.evaluated.set()
+        return []
+
+    def on_fill(self, order_id, fill_data, config):
+        return None
+
+
+def _make_engine(eval_mode="poll"):
+    cache = StreamingQuoteCache(StubResourceManager())
+    scanner = StubScanner()
+    engine = ExecutionEngine(scanner, cache, StubResourceManager(), eval_mode=eval_mode)
+    return engine, cache
+
+
+def _req_id(cache, key):
+    return cache._key_to_req_id[key]
+
+
+def test_ticks_coalesce_into_one_dirty_entry_per_key():
+    engine, cache = _make_engine()
+    engine.load_strategy("s1", RecordingStrategy(["AAPL", "MSFT"]), {})
+
+    cache.update_price(_req_id(cache, "AAPL"), 1, 100.0)
+    first = cache._dirty["AAPL"]
+    cache.update_price(_req_id(cache, "AAPL"), 2, 100.1)
+    cache.update_size(_req_id(cache, "AAPL"), 0, 5)
+
+    dirty = cache.drain_dirty()
+    assert list(dirty) == ["AAPL"]
+    assert dirty["AAPL"] == first
+    assert cache.drain_dirty() == {}
+
+
+def test_unknown_req_id_does_not_mark_dirty():
+    _, cache = _make_engine()
+    cache.update_price(424242, 1, 1.0)
+    assert cache.drain_dirty() == {}
+
+
+def test_tick_sets_attached_wake_event():
+    engine, cache = _make_engine()
+    engine.load_strategy("s1", RecordingStrategy(["AAPL"]), {})
+    wake = threading.Event()
+    cache.set_wake_event(wake)
+    cache.update_greeks(_req_id(cache, "AAPL"), 0.3, 0.5, 0.01, 0.1, -0.02)
+    assert wake.is_set()
+
+
+def test_only_dirty_evaluates_subscribed_strategies_only():
+    engine, cache = _make_engine(eval_mode="event")
+    aapl = RecordingStrategy(["AAPL"])
+    msft = RecordingStrategy(["MSFT"])
+    engine.load_strategy("aapl", aapl, {})
+    engine.load_strategy("msft", msft, {})
+
+    cache.update_price(_req_id(cache, "AAPL"), 1, 101.0)
+    engine._evaluate_all(cache.drain_dirty(), only_dirty=True)
+
+    assert aapl.evaluations == [{"AAPL": 101.0}]
+    assert msft.evaluations == []
+    assert engine._tick_to_decision.to_dict()["count"] == 1
+
+
+def test_full_sweep_evaluates_idle_strategies():
+    engine, cache = _make_engine(eval_mode="event")
+    aapl = RecordingStrategy(["AAPL"])
+    msft = RecordingStrategy(["MSFT"])
+    engine.load_strategy("aapl", aapl, {})
+    engine.load_strategy("msft", msft, {})
+
+    engine._evaluate_all(cache.drain_dirty())
+
+    assert len(aapl.evaluations) == 1
+    assert len(msft.evaluations) == 1
+    # No ticks -> nothing to attribute latency to
+    assert engine._tick_to_decision.to_dict()["count"] == 0
+
+
+def test_event_mode_reacts_to_tick_before_poll_interval():
+    engine, cache = _make_engine(eval_mode="event")
+    engine._eval_interval = 5.0  # a poll-mode engine would not wake for 5s
+    strategy = RecordingStrategy(["AAPL"])
+    engine.load_strategy("aapl", strategy, {})
+    engine.start()
+    try:
+        # Wait out the initial full sweep
+        assert strategy.evaluated.wait(1.0)
+        strategy.evaluated.clear()
+        time.sleep(0.05)
+
+        cache.update_price(_req_id(cache, "AAPL"), 1, 102.5)
+        assert strategy.evaluated.wait(1.0)
+        assert strategy.evaluations[-1] == {"AAPL": 102.5}
+    finally:
+        engine.stop()
+    status = engine.get_status()
+    assert status["eval_mode"] == "event"
+
+
+def test_set_eval_mode_validates():
+    engine, _ = _make_engine()
+    assert engine.set_eval_mode("event") == {"eval_mode": "event"}
+    assert "error" in engine.set_eval_mode("busy-wait")
+    assert engine.eval_mode == "event"
+    with pytest.raises(ValueError):
+        ExecutionEngine(StubScanner(), None, StubResourceManager(), eval_mode="bogus")
+
+
+def test_latency_histogram_buckets_and_percentiles():
+    hist = LatencyHistogram()
+    for ms in (0.05, 0.3, 0.3, 4.0, 2000.0):
+        hist.record(ms)
+    snap = hist.to_dict()
+    assert snap["count"] == 5
+    assert snap["buckets"]["le_0.1"] == 1
+    assert snap["buckets"]["le_0.5"] == 2
+    assert snap["buckets"]["le_5"] == 1
+    assert snap["buckets"]["inf"] == 1
+    assert snap["p50_ms"] == 0.5
+    assert snap["max_ms"] == 2000.0
+    hist.reset()
+    assert hist.to_dict()["count"] == 0
@@ -0,0 +1,165 @@
+"""Tests for the accession-keyed EDGAR filing document cache."""
+
+import asyncio
+import random
+import re
+
+import httpx
+import pytest
+
+from app.edgar import filing_cache as fc
+from app.edgar.detector import MADetector
+from app.edgar.filing_cache import FilingCache, accession_from_url, html_to_text
+
+INDEX_URL = "https://www.sec.gov/Archives/edgar/data/1234567/000123456726000042/0001234567-26-000042-index.htm"
+DOC_URL = "https://www.sec.gov/Archives/edgar/data/1234567/000123456726000042/d8k.htm"
+EX_URL = "https://www.sec.gov/Archives/edgar/data/1234567/000123456726000042/dex991.htm"
+
+INDEX_HTML = """<table>
+<tr><td><a href="/Archives/edgar/data/1234567/000123456726000042/0001234567-26-000042-index.htm">index</a></td></tr>
+<tr><td><a href="/ix?doc=/Archives/edgar/data/1234567/000123456726000042/d8k.htm">d8k.htm</a></td></tr>
+<tr><td><a href="/Archives/edgar/data/1234567/000123456726000042/d8k.htm">d8k.htm</a></td></tr>
+<tr><td><a href="/Archives/edgar/data/1234567/000123456726000042/dex991.htm">dex991.htm</a></td></tr>
+</table>"""
+
+DOC_HTML = (
+    "<html><body><p>Acme Corp   entered into a\n definitive <b>merger agreement</b></p>"
+    + "<div style='x'>  with Widget Inc. for $42.00 per share in cash. </div>" * 50
+    + "</body></html>"
+)
+
+EX_HTML = "<html><body><p>Press release: Acme to be acquired by Widget — €42.00 per share</p></body></html>"
+
+
+def _old_text(html, max_chars):
+    """The two-pass conversion MADetector used before the cache."""
+    text = re.sub(r'<[^>]+>', ' ', html)
+    text = re.sub(r'\s+', ' ', text)
+    return text[:max_chars]
+
+
+class _FakeSec:
+    def __init__(self, delay=0.0):
+        self.requests = []
+        self.delay = delay
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if str(request.url) == INDEX_URL:
+            return httpx.Response(200, text=INDEX_HTML)
+        if str(request.url) == DOC_URL:
+            return httpx.Response(200, text=DOC_HTML)
+        if str(request.url) == EX_URL:
+            return httpx.Response(200, text=EX_HTML)
+        return httpx.Response(404)
+
+    def cache(self, path, **kwargs):
+        return FilingCache(str(path), client=httpx.AsyncClient(transport=httpx.MockTransport(self)), **kwargs)
+
+
+def test_html_to_text_matches_two_pass_regex(monkeypatch):
+    monkeypatch.setattr(fc, "_TEXT_WINDOW", 37)  # force many window boundaries
+    rng = random.Random(3)
+    pieces = ["<p>", "</p>", "<a href='x'>", "<>", "a < b", " ", "\n\t ", "word", "x>y", "<br/>", "  text  "]
+    for _ in range(200):
+        html = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 80)))
+        for max_chars in (None, 0, 5, 50, 10_000):
+            assert html_to_text(html, max_chars) == _old_text(html, max_chars)
+    assert html_to_text(DOC_HTML, 50000) == _old_text(DOC_HTML, 50000)
+
+
+def test_accession_is_derived_from_index_and_document_urls():
+    assert accession_from_url(INDEX_URL) == "0001234567-26-000042"
+    assert accession_from_url(DOC_URL) == "0001234567-26-000042"
+    assert accession_from_url("https://example.com/press.htm") is None
+
+
+@pytest.mark.asyncio
+async def test_detection_extraction_and_research_share_one_download(tmp_path):
+    sec = _FakeSec()
+    cache = sec.cache(tmp_path)
+    detector = MADetector(anthropic_api_key="test", filing_cache=cache)
+
+    text = await detector.fetch_filing_text(INDEX_URL)  # detection
+    assert text == _old_text(DOC_HTML, 50000)
+    assert await detector.fetch_filing_text(INDEX_URL) == text  # extraction
+    assert await detector.fetch_primary_document_url(INDEX_URL) == DOC_URL
+    assert await cache.get_html(DOC_URL, max_chars=100) == DOC_HTML[:100]  # research, by document URL
+    assert await cache.get_text(INDEX_URL, max_chars=20) == text[:20]
+
+    assert sec.requests == [INDEX_URL, DOC_URL]
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["memory_hits"] == 4 and stats["hit_rate"] == 0.8
+    assert stats["index_fetches"] == 1
+    assert stats["bytes_fetched"] == len(INDEX_HTML) + len(DOC_HTML)
+    assert stats["bytes_saved"] == 4 * len(DOC_HTML)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart_and_memory_is_bounded(tmp_path):
+    sec = _FakeSec()
+    cache = sec.cache(tmp_path, memory_bytes=len(DOC_HTML) + 10)
+    await cache.get_text(INDEX_URL)
+    assert list(tmp_path.glob("*.json.gz")) == [tmp_path / "0001234567-26-000042.json.gz"]
+    assert (tmp_path / "0001234567-26-000042.json.gz").stat().st_size < len(DOC_HTML) / 5
+
+    # A second document evicts the first from memory but not from disk
+    cache._remember(fc.FilingDocument("other", "u", "x" * 20))
+    assert list(cache._memory) == ["other"]
+    assert await cache.get_text(INDEX_URL) and cache.stats()["disk_hits"] == 1
+    await cache.close()
+
+    # A new process reads the compressed copy without touching the network
+    offline = _FakeSec()
+    restarted = offline.cache(tmp_path)
+    assert await restarted.get_html(INDEX_URL) == DOC_HTML
+    assert offline.requests == [] and restarted.stats()["disk_hits"] == 1
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch_and_failures_are_not_cached(tmp_path):
+    sec = _FakeSec(delay=0.02)
+    cache = sec.cache(tmp_path)
+    texts = await asyncio.gather(*(cache.get_text(INDEX_URL) for _ in range(5)))
+    assert len(set(texts)) == 1 and sec.requests == [INDEX_URL, DOC_URL]
+
+    missing = "https://www.sec.gov/Archives/edgar/data/1/000000000126000001/missing.htm"
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await cache.get_text(missing)
+    assert sec.requests.count(missing) == 2
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_documents_of_one_accession_are_cached_separately(tmp_path):
+    sec = _FakeSec()
+    cache = sec.cache(tmp_path)
+    assert FilingCache.key_for(INDEX_URL) == "0001234567-26-000042"
+    assert FilingCache.key_for(EX_URL) == "0001234567-26-000042_dex991.htm"
+    assert FilingCache.key_for(f"https://www.sec.gov/ix?doc={EX_URL[len('https://www.sec.gov'):]}") \
+        == FilingCache.key_for(EX_URL)
+
+    await cache.get_text(INDEX_URL)
+    assert await cache.get_html(EX_URL) == EX_HTML  # the exhibit, not the primary document
+    assert await cache.get_html(DOC_URL) == DOC_HTML  # resolved by the index: shared entry
+    assert await cache.get_html(EX_URL) == EX_HTML
+    assert sec.requests == [INDEX_URL, DOC_URL, EX_URL]
+    assert sorted(p.name for p in tmp_path.glob("*.json.gz")) == [
+        "0001234567-26-000042.json.gz", "0001234567-26-000042_dex991.htm.json.gz"]
+
+    # Memory is accounted in UTF-8 bytes, not characters
+    exhibit = cache._memory["0001234567-26-000042_dex991.htm"]
+    assert exhibit.size == len(EX_HTML.encode("utf-8")) > len(EX_HTML)
+    assert cache.stats()["memory_bytes"] == len(DOC_HTML) + exhibit.size
+    await cache.close()
+
+    # After a restart the exhibit comes from its own disk entry
+    offline = _FakeSec()
+    restarted = offline.cache(tmp_path)
+    assert await restarted.get_html(EX_URL) == EX_HTML and offline.requests == []
+    await restarted.close()
@@ -0,0 +1,180 @@
+"""Tests for HaltMonitor dedupe, batched halt_events inserts and conditional feed fetches."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.monitors import halt_monitor as halt_mod
+from app.monitors.halt_monitor import HaltData, HaltMonitor, SeenHaltCache, halt_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConn:
+    def __init__(self, halt_rows=()):
+        self.halt_rows = list(halt_rows)
+        self.executed = []
+
+    async def fetch(self, sql, *args):
+        if "FROM halt_events" in sql:
+            return self.halt_rows
+        return [{"target_ticker": "ACME"}]
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _halt(n, code="T1", ticker=None):
+    return HaltData(ticker or f"T{n:04d}", datetime(2026, 3, 2, 9, 30) + timedelta(seconds=n), code)
+
+
+def _monitor(conn):
+    monitor = HaltMonitor("postgresql://unused")
+    monitor.db_pool = FakePool(conn)
+    monitor.alerts, monitor.investigations = [], []
+
+    async def trigger_halt_alert(halt):
+        monitor.alerts.append(halt.ticker)
+
+    async def create_halt_investigation_task(halt):
+        monitor.investigations.append(halt.ticker)
+
+    monitor.trigger_halt_alert = trigger_halt_alert
+    monitor.create_halt_investigation_task = create_halt_investigation_task
+    return monitor
+
+
+def test_seen_halt_cache_expires_in_last_seen_order():
+    clock = FakeClock()
+    cache = SeenHaltCache(ttl_seconds=10, max_size=3, clock=clock)
+    assert [cache.touch(k) for k in ("a", "b", "a")] == [False, False, True]
+    clock.now = 6
+    cache.touch("c")
+    clock.now = 11  # a and b (last seen at 0) expire
+    assert "b" not in cache and "c" in cache and len(cache) == 1
+    clock.now = 15
+    assert cache.touch("c") is True and cache.touch("b") is False
+    cache.touch("d"), cache.touch("e")
+    assert len(cache) == 3 and "c" not in cache  # least recently seen goes first
+
+
+@pytest.mark.asyncio
+async def test_new_halts_are_inserted_in_one_statement_and_never_realerted():
+    conn = FakeConn()
+    monitor = _monitor(conn)
+    await monitor.refresh_tracked_tickers()
+
+    feed = [_halt(n) for n in range(1500)] + [_halt(9000, ticker="ACME"), _halt(9001, code="LUDP")]
+    await monitor.process_halts(feed)
+    assert len(conn.executed) == 1
+    sql, args = conn.executed[0]
+    assert "unnest" in sql and len(args) == 7 and len(args[0]) == len(feed)
+    assert args[6].count(True) == 1 and monitor.alerts == ["ACME"] and len(monitor.investigations) == 1500
+
+    # The same feed again, and again with one new halt: no re-alerts, only the new row inserted
+    # (trimming a set to 500 arbitrary keys re-alerted ~1000 of these)
+    await monitor.process_halts(feed)
+    await monitor.process_halts(feed + [_halt(2000)])
+    assert len(conn.executed) == 2 and conn.executed[1][1][0] == ["T2000"]
+    assert len(monitor.investigations) == 1501 and monitor.alerts == ["ACME"]
+    assert (await monitor.get_status())["seen_halts_count"] == len(feed) + 1
+
+
+class VarcharConn(FakeConn):
+    """Rejects tickers longer than halt_events.ticker VARCHAR(10), as Postgres would."""
+
+    async def execute(self, sql, *args):
+        tickers = args[0] if isinstance(args[0], list) else [args[0]]
+        if any(len(t) > 10 for t in tickers):
+            raise ValueError("value too long for type character varying(10)")
+        await super().execute(sql, *args)
+
+
+@pytest.mark.asyncio
+async def test_bad_row_does_not_lose_the_rest_of_the_batch():
+    conn = VarcharConn()
+    monitor = _monitor(conn)
+    feed = [_halt(1), _halt(2, ticker="WAYTOOLONGTICKER"), _halt(3)]
+    await monitor.process_halts(feed)
+    assert [args[0] for _, args in conn.executed] == ["T0001", "T0003"]
+    assert len(monitor.investigations) == 3
+
+
+@pytest.mark.asyncio
+async def test_initialize_warm_starts_seen_halts_from_halt_events():
+    stored = [_halt(1), _halt(2, code="T2")]
+    conn = FakeConn([{"ticker": h.ticker, "halt_time": h.halt_time, "halt_code": h.halt_code} for h in stored])
+    monitor = _monitor(conn)
+    await monitor.initialize()
+    assert halt_key("t0001", stored[0].halt_time, "T1") in monitor.seen_halts
+
+    await monitor.process_halts(stored + [_halt(3)])
+    assert conn.executed[0][1][0] == ["T0003"] and monitor.investigations == ["T0003"]
+
+
+class FakeResponse:
+    def __init__(self, status, body="", headers=None):
+        self.status, self.body, self.headers = status, body, headers or {}
+
+    async def text(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    @asynccontextmanager
+    async def get(self, url, headers=None):
+        self.sent_headers.append(headers)
+        yield self.responses.pop(0)
+
+
+CSV = ("Halt Date,Halt Time,Symbol,Name,Exchange,Reason,Resume Date,NYSE Resume Time\n"
+       "2026-03-02,09:30:00,ACME,Acme Corp,NYSE,News pending,,\n")
+HTML = ("<table id='TradeHaltData'><tr><th>h</th></tr><tr><td>ACME</td><td>03/02/2026 09:30:00</td>"
+        "<td>T1</td><td></td><td></td></tr></table>")
+
+
+@pytest.mark.asyncio
+async def test_unchanged_feeds_are_not_reparsed(monkeypatch):
+    monitor = HaltMonitor("postgresql://unused")
+    monitor.session = FakeSession([
+        FakeResponse(200, CSV, {"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 14:30:00 GMT"}),
+        FakeResponse(304),
+        FakeResponse(200, CSV),  # validators ignored, same body
+    ])
+    first = await monitor.fetch_nyse_csv_halts()
+    assert [h.ticker for h in first] == ["ACME"]
+    assert await monitor.fetch_nyse_csv_halts() is first
+    assert await monitor.fetch_nyse_csv_halts() is first
+    assert monitor.session.sent_headers == [
+        {}, {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 02 Mar 2026 14:30:00 GMT"},
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 02 Mar 2026 14:30:00 GMT"},
+    ]
+
+    parses = []
+    real_soup = halt_mod.BeautifulSoup
+    monkeypatch.setattr(halt_mod, "BeautifulSoup", lambda html, parser: parses.append(html) or real_soup(html, parser))
+    monitor.session = FakeSession([FakeResponse(200, HTML, {"ETag": '"n1"'}), FakeResponse(304),
+                                   FakeResponse(200, HTML), FakeResponse(200, HTML.replace("T1", "T2"))])
+    results = [await monitor.fetch_nasdaq_halts() for _ in range(4)]
+    assert len(parses) == 2 and results[1] is results[2] is results[0]
+    assert [h.halt_code for h in results[3]] == ["T2"]
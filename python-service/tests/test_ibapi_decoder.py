@@ -0,0 +1,161 @@
+"""Tests for the vendored ibapi Decoder fast-path decoders.
+
+Every message type with a fast decoder is generated at several server
+versions, with the field layouts the generic process*Msg / signature path
+reads, and must produce exactly the wrapper calls the generic path does.
+tools/bench_ibapi_decoder.py replays message_stream() through IBMergerArbScanner.
+"""
+
+import random
+
+import pytest
+
+from tests.conftest import import_vendored_ibapi
+
+comm, decoder, message, server_versions, wrapper = import_vendored_ibapi(
+    "comm", "decoder", "message", "server_versions", "wrapper")
+IN = message.IN
+Decoder = decoder.Decoder
+MAX_CLIENT_VER = server_versions.MAX_CLIENT_VER
+
+CALLBACKS = ("tickPrice", "tickSize", "tickGeneric", "tickString", "tickOptionComputation",
+             "orderStatus", "execDetails", "error")
+
+
+def _plain(value):
+    # TickAttrib / Contract / Execution compare by their fields
+    return vars(value) if hasattr(value, "__dict__") else value
+
+
+class RecordingWrapper(wrapper.EWrapper):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+
+def _recorder(name):
+    def record(self, *args):
+        self.calls.append((name, tuple(_plain(a) for a in args)))
+    return record
+
+
+for _name in CALLBACKS:
+    setattr(RecordingWrapper, _name, _recorder(_name))
+
+
+def _sentinel(rng, value, sentinel):
+    return sentinel if rng.random() < 0.2 else value
+
+
+def make_message(kind, rng, serverVersion, req_id):
+    """Fields for one message of the given type, as TWS lays them out for serverVersion."""
+    price = lambda: round(rng.uniform(0.05, 60), 2)  # noqa: E731
+    if kind == IN.TICK_PRICE:
+        return [1, 6, req_id, rng.choice((1, 2, 4, 6, 9, 14, 66, 67, 68)), price(),
+                rng.choice((rng.randint(0, 900), "")), rng.randint(0, 7)]
+    if kind == IN.TICK_SIZE:
+        return [2, 6, req_id, rng.choice((0, 3, 5, 8, 27)), rng.randint(0, 5000)]
+    if kind == IN.TICK_GENERIC:
+        return [45, 6, req_id, rng.choice((23, 24, 49)), rng.uniform(0, 2)]
+    if kind == IN.TICK_STRING:
+        return [46, 6, req_id, 45, str(rng.randint(1700000000, 1800000000))]
+    if kind == IN.TICK_OPTION_COMPUTATION:
+        fields = [21] + ([6] if serverVersion < server_versions.MIN_SERVER_VER_PRICE_BASED_VOLATILITY else [])
+        fields += [req_id, rng.choice((10, 11, 12, 13))]
+        if serverVersion >= server_versions.MIN_SERVER_VER_PRICE_BASED_VOLATILITY:
+            fields.append(rng.randint(0, 1))
+        return fields + [_sentinel(rng, rng.uniform(0.05, 2), -1), _sentinel(rng, rng.uniform(-1, 1), -2),
+                         _sentinel(rng, price(), -1), _sentinel(rng, 0.0, -1), _sentinel(rng, rng.uniform(0, 0.2), -2),
+                         _sentinel(rng, rng.uniform(0, 0.5), -2), _sentinel(rng, -rng.uniform(0, 0.3), -2),
+                         _sentinel(rng, rng.uniform(50, 150), -1)]
+    fractional = serverVersion >= server_versions.MIN_SERVER_VER_FRACTIONAL_POSITIONS
+    qty = lambda: rng.randint(0, 10) + (rng.choice((0, 0.5)) if fractional else 0)  # noqa: E731
+    if kind == IN.ORDER_STATUS:
+        mkt_cap = serverVersion >= server_versions.MIN_SERVER_VER_MARKET_CAP_PRICE
+        return ([3] + ([6] if not mkt_cap else []) +
+                [req_id, rng.choice(("Submitted", "Filled", "Cancelled")), qty(), qty(), price(),
+                 rng.randint(1, 10 ** 9), 0, price(), 7, rng.choice(("", "locate"))] + ([price()] if mkt_cap else []))
+    assert kind == IN.EXECUTION_DATA
+    fields = [11] + ([10] if serverVersion < server_versions.MIN_SERVER_VER_LAST_LIQUIDITY else [])
+    fields += [req_id, rng.randint(1, 9999), rng.randint(1, 10 ** 8), "ACME", "OPT", "20260320", 50.0,
+               rng.choice("CP"), "100", "SMART", "USD", "ACME  260320C00050000", "ACME",
+               f"0000e0d5.{rng.randint(0, 99999)}.01.01", "20260115 10:30:00", "DU123", "CBOE",
+               rng.choice(("BOT", "SLD")), qty(), price(), rng.randint(1, 10 ** 9), 7, 0, qty(), price(),
+               "ref", "", ""]
+    if serverVersion >= server_versions.MIN_SERVER_VER_MODELS_SUPPORT:
+        fields.append("")
+    if serverVersion >= server_versions.MIN_SERVER_VER_LAST_LIQUIDITY:
+        fields.append(rng.randint(0, 3))
+    return fields
+
+
+def payload(fields) -> bytes:
+    return "".join(comm.make_field(f) for f in fields).encode()
+
+
+MIX = ((IN.TICK_PRICE, 0.38), (IN.TICK_SIZE, 0.3), (IN.TICK_OPTION_COMPUTATION, 0.2), (IN.TICK_GENERIC, 0.04),
+       (IN.TICK_STRING, 0.04), (IN.ORDER_STATUS, 0.03), (IN.EXECUTION_DATA, 0.01))
+
+
+def message_stream(n, serverVersion=MAX_CLIENT_VER, req_ids=range(1000, 1400), seed=5) -> list:
+    """Message payloads in roughly the mix an option-chain subscription produces."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*MIX)
+    return [payload(make_message(kind, rng, serverVersion, rng.choice(req_ids)))
+            for kind in rng.choices(kinds, weights, k=n)]
+
+
+def replay(msgs, serverVersion, fast=True):
+    recorder = RecordingWrapper()
+    dec = Decoder(recorder, serverVersion)
+    if not fast:
+        dec.fastDecoders = {}
+    for msg in msgs:
+        dec.interpret(comm.read_fields(msg))
+    return recorder.calls
+
+
+@pytest.mark.parametrize("serverVersion", [MAX_CLIENT_VER, 150, 133, 130, 100])
+def test_fast_decoders_make_the_same_wrapper_calls_as_generic_path(serverVersion):
+    msgs = message_stream(4000, serverVersion)
+    calls = replay(msgs, serverVersion)
+    assert calls == replay(msgs, serverVersion, fast=False)
+    assert {name for (name, _) in calls} == set(CALLBACKS) - {"error"}
+
+
+def test_fast_decoders_follow_server_version():
+    dec = Decoder(RecordingWrapper(), None)
+    assert dec.fastDecoders == {}
+    dec.serverVersion = 130
+    assert set(dec.fastDecoders) == {IN.TICK_PRICE, IN.TICK_SIZE, IN.TICK_GENERIC, IN.TICK_STRING, IN.ORDER_STATUS}
+    dec.serverVersion = MAX_CLIENT_VER
+    assert IN.TICK_OPTION_COMPUTATION in dec.fastDecoders and IN.EXECUTION_DATA in dec.fastDecoders
+
+
+def test_malformed_messages_take_the_generic_path():
+    rng = random.Random(1)
+    for kind in (IN.TICK_PRICE, IN.ORDER_STATUS, IN.TICK_OPTION_COMPUTATION, IN.EXECUTION_DATA):
+        short = comm.read_fields(payload(make_message(kind, rng, MAX_CLIENT_VER, 1000)[:-2]))
+        dec = Decoder(RecordingWrapper(), MAX_CLIENT_VER)
+        assert dec.fastDecoders[kind](short) is False
+        # Whatever the generic path raises (its BadMessage handler trips over bytes fields)
+        generic = Decoder(RecordingWrapper(), MAX_CLIENT_VER)
+        generic.fastDecoders = {}
+        with pytest.raises(Exception) as expected:
+            generic.interpret(short)
+        with pytest.raises(type(expected.value)):
+            dec.interpret(short)
+
+    # Signature messages with the wrong field count are logged and dropped, as before
+    recorder = RecordingWrapper()
+    Decoder(recorder, MAX_CLIENT_VER).interpret(comm.read_fields(payload([2, 6, 1000, 0, 5, 9])))
+    assert recorder.calls == []
+
+
+def test_wrapper_methods_swapped_at_runtime_are_called():
+    recorder = RecordingWrapper()
+    dec = Decoder(recorder, MAX_CLIENT_VER)
+    seen = []
+    recorder.tickPrice = lambda reqId, tickType, price, attrib: seen.append((reqId, tickType, price))
+    dec.interpret(comm.read_fields(payload([1, 6, 1000, 66, 1.25, 3, 0])))
+    assert seen == [(1000, 66, 1.25)] and recorder.calls == [("tickSize", (1000, 69, 3))]
@@ -0,0 +1,137 @@
+"""Tests for the vendored ibapi EReader framing (comm.FrameBuffer, reader.MessageQueue).
+
+LegacyEReader is the reader loop FrameBuffer replaced (buf += data, then
+comm.read_msg on the remaining buffer per message); the new reader must queue
+exactly the messages it did for any split of the byte stream.
+tools/bench_ibapi_reader.py replays streams through both.
+"""
+
+import logging
+import queue
+import random
+import struct
+
+from tests.conftest import import_vendored_ibapi
+
+comm, reader = import_vendored_ibapi("comm", "reader")
+FrameBuffer, make_field, make_msg = comm.FrameBuffer, comm.make_field, comm.make_msg
+EReader, MessageQueue = reader.EReader, reader.MessageQueue
+
+
+class ReplayConn:
+    """Connection stand-in: recvMsg returns the recorded reads, then disconnects."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.pos = 0
+
+    def isConnected(self):
+        return self.pos < len(self.chunks)
+
+    def recvMsg(self):
+        self.pos += 1
+        return self.chunks[self.pos - 1]
+
+
+class LegacyEReader(EReader):
+    def run(self):
+        buf = b""
+        while self.conn.isConnected():
+            data = self.conn.recvMsg()
+            reader.logger.debug("reader loop, recvd size %d", len(data))
+            buf += data
+            while len(buf) > 0:
+                (size, msg, buf) = comm.read_msg(buf)
+                reader.logger.debug("size:%d msg.size:%d msg:|%s| buf:%s|", size, len(msg), buf, "|")
+                if msg:
+                    self.msg_queue.put(msg)
+                else:
+                    reader.logger.debug("more incoming packet(s) are needed ")
+                    break
+
+
+def tick_stream(messages=20000, contracts=400, seed=7) -> bytes:
+    """Size-prefixed tickPrice / tickSize / tickOptionComputation messages, as TWS sends them."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(messages):
+        req_id = 1000 + rng.randrange(contracts)
+        kind = rng.random()
+        if kind < 0.45:
+            fields = (1, 6, req_id, rng.choice((1, 2, 4)), round(rng.uniform(0.05, 40), 2), rng.randint(1, 500), 0)
+        elif kind < 0.8:
+            fields = (2, 6, req_id, rng.choice((0, 3, 5, 8)), rng.randint(1, 5000))
+        else:
+            fields = (21, req_id, rng.choice((10, 11, 12, 13)), 1, rng.uniform(0.1, 2), rng.uniform(-1, 1),
+                      rng.uniform(0.05, 40), 0, rng.uniform(0, 0.2), rng.uniform(0, 0.5), -rng.uniform(0, 0.3),
+                      rng.uniform(50, 150))
+        out.append(make_msg("".join(make_field(f) for f in fields)))
+    return b"".join(out)
+
+
+def split_reads(stream: bytes, seed=1, max_read=65536) -> list:
+    """Cut a stream into reads of random size, most not on message boundaries."""
+    rng = random.Random(seed)
+    reads, pos = [], 0
+    while pos < len(stream):
+        n = rng.choice((1, 2, 3, 5, rng.randint(1, 4096), rng.randint(1, max_read)))
+        reads.append(stream[pos:pos + n])
+        pos += n
+    return reads
+
+
+def drain(reader_cls, reads, msg_queue=None):
+    msg_queue = MessageQueue() if msg_queue is None else msg_queue
+    reader_cls(ReplayConn(reads), msg_queue).run()
+    out = []
+    while not msg_queue.empty():
+        out.append(msg_queue.get_nowait())
+    return out
+
+
+def test_reader_queues_the_same_messages_as_legacy_reader_for_any_split():
+    stream = tick_stream(3000)
+    expected = drain(LegacyEReader, [stream])
+    assert len(expected) == 3000
+    for seed in range(5):
+        reads = split_reads(stream, seed=seed)
+        assert drain(EReader, reads) == drain(LegacyEReader, reads) == expected
+    # One byte at a time, including through every size prefix
+    assert drain(EReader, [stream[i:i + 1] for i in range(len(stream))]) == expected
+    assert all(type(m) is bytes for m in expected)
+
+
+def test_reader_falls_back_to_put_and_logs_when_debugging(caplog):
+    reads = split_reads(tick_stream(500), seed=3, max_read=2048)
+    expected = drain(LegacyEReader, reads)
+    assert drain(EReader, reads, queue.Queue()) == expected
+    with caplog.at_level(logging.DEBUG, logger=reader.logger.name):
+        assert drain(EReader, reads) == expected
+    assert sum(r.getMessage().startswith("size:") for r in caplog.records) == len(expected)
+
+
+def test_frame_buffer_grows_and_compacts():
+    frames = FrameBuffer(capacity=16)
+    big = b"x" * 100
+    frames.feed(struct.pack("!I", len(big)) + big[:50])
+    assert frames.read_msgs() == [] and len(frames) == 54
+    frames.feed(big[50:] + make_msg("a\0") + b"\0\0")
+    assert frames.read_msgs() == [big, b"a\0"] and len(frames) == 2
+    # Empty frames are skipped, as the legacy reader never queued them
+    frames.feed(b"\0\0" + make_msg("b\0"))
+    assert frames.read_msgs() == [b"b\0"] and len(frames) == 0 and frames.start == 0
+
+    frames = FrameBuffer(capacity=8)
+    for _ in range(50):
+        frames.feed(make_msg("hi\0")[:3])
+        frames.feed(make_msg("hi\0")[3:])
+        assert frames.read_msgs() == [b"hi\0"]
+    assert len(frames.buf) == 8
+
+
+def test_message_queue_put_many_keeps_order_and_counts():
+    q = MessageQueue()
+    q.put(b"a")
+    q.put_many([b"b", b"c"])
+    assert q.qsize() == 3 and [q.get_nowait() for _ in range(3)] == [b"a", b"b", b"c"] and q.empty()
+    assert q.unfinished_tasks == 3
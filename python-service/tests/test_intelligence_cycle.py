@@ -0,0 +1,198 @@
+"""Tests for concurrent intelligence monitoring cycles and batched mention ingestion."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.intelligence.aggregator import IntelligenceAggregator, tier_promotion
+from app.intelligence.models import DealMention, DealTier, MentionType, SourceType
+from app.intelligence.orchestrator import IntelligenceOrchestrator
+
+
+def _mention(source, target, ticker, url, source_type=SourceType.NEWS):
+    return DealMention(
+        source_name=source, source_type=source_type, mention_type=MentionType.RUMOR,
+        target_name=target, target_ticker=ticker, source_url=url, headline=f"{target} explores sale",
+    )
+
+
+def test_tier_promotion_rules():
+    assert tier_promotion(DealTier.WATCHLIST, 0.5, 1, 0) == (DealTier.ACTIVE, "official source")
+    assert tier_promotion(DealTier.RUMORED, 0.5, 0, 3) == (DealTier.ACTIVE, "3+ news sources")
+    assert tier_promotion(DealTier.WATCHLIST, 0.5, 0, 2) == (DealTier.RUMORED, "2+ news sources")
+    assert tier_promotion(DealTier.WATCHLIST, 0.85, 0, 1) == (DealTier.RUMORED, "high credibility")
+    assert tier_promotion(DealTier.RUMORED, 0.9, 0, 2) is None
+    assert tier_promotion(DealTier.ACTIVE, 0.9, 2, 5) is None
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator: concurrent fetch, timeouts, dedupe, status timings
+# ---------------------------------------------------------------------------
+
+
+class _Monitor:
+    def __init__(self, name, mentions=(), delay=0.0, error=None, config=None):
+        self.source_name = name
+        self.config = config or {}
+        self._mentions, self._delay, self._error = list(mentions), delay, error
+
+    async def monitor(self):
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise RuntimeError(self._error)
+        return list(self._mentions)
+
+
+class _Aggregator:
+    def __init__(self):
+        self.batches = []
+
+    async def process_mentions(self, mentions, timings=None):
+        self.batches.append(list(mentions))
+        timings.update(enrich_ms=1.0, resolve_ms=2.0, ingest_ms=3.0)
+        return ["deal-a" if m.target_ticker == "ACME" else None for m in mentions]
+
+
+class _TierManager:
+    def __init__(self):
+        self.calls = []
+
+    async def evaluate_tier_promotions(self, deal_ids):
+        self.calls.append(list(deal_ids))
+        return {"deal-a": True}
+
+
+@pytest.mark.asyncio
+async def test_cycle_fetches_monitors_concurrently_and_ingests_one_deduplicated_batch():
+    shared = _mention("reuters_ma", "Acme", "ACME", "https://x/acme")
+    monitors = [
+        _Monitor("reuters_ma", [shared, _mention("reuters_ma", "Widget", None, "https://x/widget")], delay=0.2),
+        _Monitor("globenewswire_ma", [_mention("globenewswire_ma", "Acme", "ACME", "https://x/acme")], delay=0.2),
+        _Monitor("seeking_alpha_ma", delay=5, config={"timeout_seconds": 0.1}),
+        _Monitor("ftc_early_termination", error="HTTP 503"),
+    ]
+    orchestrator = IntelligenceOrchestrator.__new__(IntelligenceOrchestrator)
+    orchestrator.monitors = monitors
+    orchestrator.aggregator = _Aggregator()
+    orchestrator.tier_manager = _TierManager()
+    statuses = []
+
+    async def update_status(source_name, status, deals_found=0, error=None, timings=None):
+        statuses.append((source_name, status, deals_found, error, timings))
+
+    orchestrator._update_monitor_status = update_status
+
+    start = asyncio.get_running_loop().time()
+    stats = await orchestrator.run_monitoring_cycle()
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed < 0.6  # fetched concurrently; the slow source was cut off at its timeout
+    assert len(orchestrator.aggregator.batches) == 1
+    assert [m.source_name for m in orchestrator.aggregator.batches[0]] == ["reuters_ma", "reuters_ma"]
+    assert orchestrator.tier_manager.calls == [["deal-a"]]
+    assert stats["total_mentions"] == 3 and stats["unique_mentions"] == 2
+    assert (stats["deals_created"], stats["deals_updated"]) == (0, 1)
+    assert sorted(e["source"] for e in stats["errors"]) == ["ftc_early_termination", "seeking_alpha_ma"]
+
+    final = {s[0]: s for s in statuses if s[1] != "polling"}
+    assert final["seeking_alpha_ma"][1:4] == ("error", 0, "Timed out after 0.1s")
+    assert final["ftc_early_termination"][3] == "HTTP 503"
+    _, status, found, _, timings = final["globenewswire_ma"]
+    assert (status, found, timings["mentions"], timings["duplicates"]) == ("success", 1, 1, 1)
+    assert timings["fetch_ms"] >= 200 and timings["ingest_ms"] == 3 and "tier_ms" in timings
+
+
+# ---------------------------------------------------------------------------
+# Aggregator: batch resolution and per-deal bulk ingestion
+# ---------------------------------------------------------------------------
+
+
+class _Conn:
+    def __init__(self, staged=(), deals=()):
+        self.staged, self.deals = list(staged), list(deals)
+        self.fetches, self.inserts, self.created = [], [], []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetch(self, sql, *args):
+        self.fetches.append(sql)
+        if "FROM staged_deals" in sql:
+            return [r for r in self.staged if r["target_ticker"] in args[0]]
+        return [r for r in self.deals if r["match_key"] in (args[0] if r["match_on"] == "ticker" else args[1])]
+
+    async def fetchval(self, sql, *args):
+        assert "INSERT INTO deal_intelligence" in sql
+        self.created.append(args[0])
+        return f"new-{args[0]}"
+
+    async def execute(self, sql, *args):
+        pass
+
+    async def executemany(self, sql, rows):
+        assert "INSERT INTO deal_sources" in sql
+        self.inserts.append([(r[0], r[1]) for r in rows])
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.mark.asyncio
+async def test_process_mentions_resolves_batch_once_and_inserts_sources_per_deal():
+    conn = _Conn(
+        staged=[{"staged_deal_id": "s1", "target_ticker": "PEND", "status": "pending"}],
+        deals=[{"match_on": "name", "match_key": "Old Co", "deal_id": "deal-old"}],
+    )
+    aggregator = IntelligenceAggregator.__new__(IntelligenceAggregator)
+    aggregator.pool = _Pool(conn)
+    calls = []
+
+    def record(name):
+        async def fn(conn, deal_id, mention):
+            calls.append((name, deal_id, mention.source_name))
+        return fn
+
+    async def enrich(mention):
+        mention.target_ticker = {"Old Co": "OLD"}.get(mention.target_name)
+
+    async def update(conn, deal_id):
+        calls.append(("update", deal_id))
+
+    aggregator._enrich_mention_with_tickers = enrich
+    aggregator._update_deal_intelligence = update
+    aggregator._sync_ticker_master = record("sync")
+    aggregator._perform_edgar_cross_reference = record("xref")
+    aggregator._scan_tickers_for_filings = record("scan")
+
+    mentions = [
+        _mention("reuters_ma", "Acme", "ACME", "https://r/1"),
+        _mention("seeking_alpha_ma", "Acme Corp", "acme", "https://sa/1"),
+        _mention("reuters_ma", "Old Co", None, "https://r/2"),
+        _mention("reuters_ma", "Private Co", None, "https://r/3"),
+        _mention("ftc_early_termination", "Pending Inc", "PEND", "https://ftc/1", SourceType.OFFICIAL),
+        _mention("globenewswire_ma", "Acme", "ACME", "https://g/1", SourceType.OFFICIAL),
+    ]
+    timings = {}
+    results = await aggregator.process_mentions(mentions, timings)
+
+    assert results == ["new-Acme", "new-Acme", "deal-old", None, None, "new-Acme"]
+    assert len(conn.fetches) == 2  # one staged_deals lookup, one deal resolution query
+    assert conn.created == ["Acme"]
+    assert conn.inserts == [
+        [("new-Acme", "reuters_ma")],  # with the new deal
+        [("new-Acme", "seeking_alpha_ma"), ("new-Acme", "globenewswire_ma")],
+        [("deal-old", "reuters_ma")],
+    ]
+    assert calls.count(("update", "new-Acme")) == 1
+    assert ("xref", "new-Acme", "globenewswire_ma") not in calls  # official sources skip cross-reference
+    # One ticker scan per deal and ticker pairing ("acme" and "ACME" are the same)
+    assert [c for c in calls if c[0] == "scan"] == [("scan", "new-Acme", "reuters_ma"), ("scan", "deal-old", "reuters_ma")]
+    assert set(timings) == {"enrich_ms", "resolve_ms", "ingest_ms"}
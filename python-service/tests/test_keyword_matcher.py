@@ -0,0 +1,212 @@
+"""Tests for the shared one-pass keyword matcher and its detector/headline users.
+
+The legacy_* functions are the per-keyword implementations the matcher
+replaced; the new code must return exactly what they return.
+"""
+
+import random
+import re
+
+import pytest
+
+from app.edgar.detector import (
+    HISTORICAL_REFERENCE_KEYWORDS,
+    MA_KEYWORDS,
+    NON_US_COMPANY_KEYWORDS,
+    RETROSPECTIVE_COMMUNICATION_KEYWORDS,
+    MADetector,
+)
+from app.intelligence.headline_parser import (
+    HISTORICAL_KEYWORDS,
+    MA_ANNOUNCEMENT_KEYWORDS,
+    RUMOR_KEYWORDS,
+    HeadlineParser,
+)
+from app.utils.keyword_matcher import KeywordMatcher
+
+LEGACY_METADATA_PATTERNS = [
+    r'ACCESSION NUMBER:', r'CONFORMED SUBMISSION TYPE:', r'PUBLIC DOCUMENT COUNT:',
+    r'CONFORMED PERIOD OF REPORT:', r'FILED AS OF DATE:', r'DATE AS OF CHANGE:', r'FILER:',
+    r'COMPANY DATA:', r'COMPANY CONFORMED NAME:', r'CENTRAL INDEX KEY:',
+    r'STANDARD INDUSTRIAL CLASSIFICATION:', r'IRS EMPLOYER IDENTIFICATION', r'STATE OF INCORPORATION:',
+    r'FISCAL YEAR END:', r'FILING VALUES:', r'FORM TYPE:', r'SEC ACT:', r'SEC FILE NUMBER:',
+    r'FILM NUMBER:', r'\d{10,}\.txt', r'\d{4}-\d{2}-\d{2}\.sgml',
+]
+
+
+def legacy_keyword_scan(text):
+    text_lower = text.lower()
+    return [keyword for keyword in MA_KEYWORDS if keyword in text_lower]
+
+
+def legacy_excerpt(text, detected_keywords, max_length=500):
+    if not detected_keywords or not text:
+        return None
+    text_lower = text.lower()
+    candidates = []
+    for keyword in detected_keywords:
+        pos = 0
+        while True:
+            pos = text_lower.find(keyword.lower(), pos)
+            if pos == -1:
+                break
+            context = text[max(0, pos - 200):min(len(text), pos + 200)]
+            if not any(re.search(p, context, re.IGNORECASE) for p in LEGACY_METADATA_PATTERNS):
+                nearby = sum(1 for kw in detected_keywords if kw.lower() in context.lower())
+                candidates.append((-nearby, pos, keyword))
+            pos += 1
+    if not candidates:
+        return None
+    _, pos, keyword = min(candidates, key=lambda c: (c[0], c[1]))
+    start = max(0, pos - max_length // 2)
+    end = min(len(text), pos + len(keyword) + max_length // 2)
+    excerpt = text[start:end].strip()
+    for entity, char in [('&#160;', ' '), ('&nbsp;', ' '), ('&#8220;', '"'), ('&#8221;', '"'),
+                         ('&#8217;', "'"), ('&amp;', '&'), ('&lt;', '<'), ('&gt;', '>')]:
+        excerpt = excerpt.replace(entity, char)
+    excerpt = re.sub(r'\s+', ' ', excerpt).strip()
+    return ("..." if start > 0 else "") + excerpt + ("..." if end < len(text) else "")
+
+
+def legacy_prefix_check(text, keywords, window):
+    text_to_check = text[:window].lower()
+    return any(keyword in text_to_check for keyword in keywords)
+
+
+def legacy_historical_near_keywords(text, detected_keywords, context_radius=300):
+    text_lower = text.lower()
+    for keyword in detected_keywords:
+        pos = 0
+        while True:
+            pos = text_lower.find(keyword.lower(), pos)
+            if pos == -1:
+                break
+            context = text_lower[max(0, pos - context_radius):min(len(text), pos + len(keyword) + context_radius)]
+            for hist_keyword in HISTORICAL_REFERENCE_KEYWORDS:
+                if re.search(r'\b' + re.escape(hist_keyword) + r'\b', context):
+                    return True
+            pos += 1
+    return False
+
+
+# ---------------------------------------------------------------------------
+# KeywordMatcher
+# ---------------------------------------------------------------------------
+
+
+def test_matcher_reports_every_overlapping_occurrence():
+    rng = random.Random(11)
+    for _ in range(300):
+        keywords = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        text = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 60)))
+        hits = KeywordMatcher(keywords).scan(text)
+        for keyword in set(keywords):
+            expected = [i for i in range(len(text)) if text.startswith(keyword, i)]
+            assert hits.starts(keyword) == expected
+        expected_between = sorted(
+            (i, k) for k in set(keywords) for i in range(len(text))
+            if text.startswith(k, i) and 5 <= i and i + len(k) <= 20
+        )
+        assert hits.hits_between(5, 20) == expected_between
+
+
+def test_matcher_is_case_sensitive_and_falls_back_for_unknown_keywords():
+    hits = KeywordMatcher(["HSR", "tender", "tender offer"]).scan("hsr tender offer; tender")
+    assert "HSR" not in hits  # same as `"HSR" in text.lower()`
+    assert hits.starts("tender") == [4, 18] and hits.starts("tender offer") == [4]
+    assert hits.starts("hsr") == [0]  # not compiled: direct search
+    assert hits.first_present(["tender offer", "tender"], end=10) == "tender"
+    assert hits.occurs_between("tender offer", 4, 16) and not hits.occurs_between("tender offer", 5, 30)
+
+
+# ---------------------------------------------------------------------------
+# MADetector: identical results to the per-keyword implementation
+# ---------------------------------------------------------------------------
+
+
+def _filing_corpus(n=150, seed=5):
+    rng = random.Random(seed)
+    fragments = (
+        MA_KEYWORDS + HISTORICAL_REFERENCE_KEYWORDS + NON_US_COMPANY_KEYWORDS + RETROSPECTIVE_COMMUNICATION_KEYWORDS
+        + ["FILER:", "ACCESSION NUMBER:", "0001234567890.txt", "2026-03-02.sgml", "&#160;", "&amp;"]
+    )
+    filler = ["the", "Company", "shall", "Item 1.01", "Agreement", "quarter", "Merger", "previously",
+              "İstanbul", "x_", "(", ")", ".", ",", "\n", "  "]
+    corpus = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(20, 600)):
+            word = rng.choice(fragments) if rng.random() < 0.25 else rng.choice(filler)
+            if rng.random() < 0.3:
+                word = word.upper() if rng.random() < 0.5 else word.title()
+            parts.append(word)
+            parts.append(rng.choice([" ", " ", " ", "", "-", "_", "\n"]))
+        corpus.append("".join(parts))
+    return corpus
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return MADetector(anthropic_api_key="test", filing_cache=object())
+
+
+def test_detector_checks_match_per_keyword_implementation(detector):
+    corpus = _filing_corpus()
+    assert any(len(t.lower()) != len(t) for t in corpus)  # exercises the unaligned fallback
+    for text in corpus:
+        scan = detector.scan_keywords(text)
+        keywords = detector.keyword_scan(text, scan=scan)
+        assert keywords == legacy_keyword_scan(text)
+        assert detector.extract_matched_text_excerpt(text, keywords, scan=scan) == legacy_excerpt(text, keywords)
+        assert detector.extract_matched_text_excerpt(text, ["HSR", "merger"]) == legacy_excerpt(text, ["HSR", "merger"])
+        for radius in (300, 500):
+            assert detector.detect_historical_reference_near_keywords(
+                text, keywords, context_radius=radius, scan=scan
+            ) == legacy_historical_near_keywords(text, keywords, radius)
+        for window in (100, 2000, 5000):
+            assert detector.detect_historical_reference(text, window, scan=scan) == legacy_prefix_check(
+                text, HISTORICAL_REFERENCE_KEYWORDS, window)
+            assert detector.detect_non_us_company(text, window, scan=scan) == legacy_prefix_check(
+                text, NON_US_COMPANY_KEYWORDS, window)
+            assert detector.detect_retrospective_communication(text, window, scan=scan) == legacy_prefix_check(
+                text, RETROSPECTIVE_COMMUNICATION_KEYWORDS, window)
+
+
+def test_historical_reference_near_keywords_respects_word_boundaries(detector):
+    text = "We have previously entered into a merger agreement with Acme."
+    assert detector.detect_historical_reference_near_keywords(text, ["merger agreement"])
+    # "entered into on" is a historical keyword; "reentered into on" is not a word-boundary match
+    assert not detector.detect_historical_reference_near_keywords(
+        "the company reentered into onward merger talks", ["merger"])
+    assert not detector.detect_historical_reference_near_keywords(
+        "previously disclosed" + " filler" * 100 + " merger", ["merger"], context_radius=50)
+
+
+# ---------------------------------------------------------------------------
+# HeadlineParser
+# ---------------------------------------------------------------------------
+
+
+def test_headline_checks_match_per_keyword_implementation():
+    parser = HeadlineParser()
+    rng = random.Random(8)
+    words = MA_ANNOUNCEMENT_KEYWORDS + RUMOR_KEYWORDS + HISTORICAL_KEYWORDS + [
+        "Acme Corp", "Widget Inc", "takeover", "(ACME)", "$4.2 billion", "for", "shares", "Merger",
+    ]
+    for _ in range(500):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        text_lower = text.lower()
+        assert parser._is_ma_relevant(text_lower) == (
+            any(k in text_lower for k in MA_ANNOUNCEMENT_KEYWORDS)
+            or (any(k in text_lower for k in RUMOR_KEYWORDS)
+                and any(k in text_lower for k in ['merger', 'acquisition', 'acquire', 'takeover']))
+        )
+        assert parser._is_historical(text_lower) == any(k in text_lower for k in HISTORICAL_KEYWORDS)
+        assert parser._is_rumor(text_lower) == any(k in text_lower for k in RUMOR_KEYWORDS)
+
+    deal = parser.parse("Acme Corp agrees to acquire Widget Inc (WIDG) for $4.2 billion")
+    assert deal.is_ma_relevant and not deal.is_rumor
+    assert (deal.target_name, deal.acquirer_name, deal.target_ticker, deal.deal_value) == (
+        "Widget", "Acme Corp", "WIDG", 4.2)
+    assert deal.confidence == pytest.approx(0.95)
+    assert parser.parse("Acme completed acquisition of Widget last year").confidence == 0.0
@@ -0,0 +1,146 @@
+"""Secondary-index consistency for ExecutionLedgerStore and PositionStore fill lookups."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+from execution_ledger import ExecutionLedgerStore
+from position_store import PositionStore
+
+
+def _instrument():
+    return {"symbol": "SPY", "secType": "OPT", "strike": 647.0, "expiry": "20260326", "right": "P", "multiplier": 100}
+
+
+def _linear_find_reservation(ledger, order_id=0, perm_id=0):
+    """Reference: the pre-index scan."""
+    for record in ledger._reservations.values():
+        if order_id and int(record.get("order_id") or 0) == order_id:
+            return record
+        if perm_id and int(record.get("perm_id") or 0) == perm_id:
+            return record
+    return None
+
+
+def _linear_exec_key(ledger, exec_id):
+    for key, record in ledger._executions.items():
+        if record.get("exec_id") == exec_id:
+            return key
+    return None
+
+
+def test_indexes_follow_fill_lifecycle_and_rekeying(tmp_path):
+    store = PositionStore(str(tmp_path / "position_store.json"))
+    ledger = store._execution_ledger
+    store.add_position("pos1", {}, _instrument(), {}, "bmc_spy")
+
+    # orderStatus first (provisional key), then execDetails re-keys to exec:
+    store.add_fill("pos1", {"time": 1774532701.0, "order_id": 901, "level": "entry", "qty_filled": 2, "avg_price": 1.5, "remaining_qty": 2, "pnl_pct": 0.0})
+    provisional = [k for k in ledger._executions if k.startswith("provisional:")]
+    assert len(provisional) == 1
+    assert ledger._order_id_index[901] == {provisional[0]: None}
+
+    store.update_fill_execution_details("pos1", 901, exec_id="E1", execution_analytics={"side": "BOT", "perm_id": 5})
+    assert ledger._exec_id_index["E1"] == {"exec::E1": None}
+    assert ledger._order_id_index[901] == {"exec::E1": None}
+    assert provisional[0] not in ledger._executions
+
+    # IB reconciliation re-keys again with the account
+    store.ingest_ib_execution_batch([{
+        "contract": {"symbol": "SPY", "secType": "OPT", "strike": 647.0, "lastTradeDateOrContractMonth": "20260326", "right": "P"},
+        "execution": {"execId": "E1", "orderId": 901, "account": "U1", "time": "20260326  09:45:01", "side": "BOT", "shares": 2, "price": 1.5, "permId": 5},
+    }])
+    assert ledger._exec_id_index["E1"] == {"exec:U1:E1": None}
+    assert ledger._order_id_index[901] == {"exec:U1:E1": None}
+
+    store.update_fill_commission("pos1", "E1", {"commission": 1.3})
+    assert ledger.get_all_executions()[0]["commission"] == 1.3
+    assert store.check_index_consistency() == []
+
+
+def test_reservation_indexes_track_bind_sync_and_release(tmp_path):
+    store = PositionStore(str(tmp_path / "position_store.json"))
+    ledger = store._execution_ledger
+    key = ("SPY", 647.0, "20260326", "P")
+    store.create_exit_reservation(reservation_id="r1", strategy_id="s1", contract_key=key, reserved_qty=2, source="risk")
+    store.create_exit_reservation(reservation_id="r2", strategy_id="s2", contract_key=key, reserved_qty=1, source="risk", order_id=7)
+    store.bind_exit_reservation("r1", order_id=11, perm_id=0)
+    store.sync_exit_reservation(order_id=11, remaining=1, status="Submitted", perm_id=99)
+
+    assert ledger._find_reservation_locked(order_id=11)["reservation_id"] == "r1"
+    assert ledger._find_reservation_locked(perm_id=99)["reservation_id"] == "r1"
+    assert ledger._find_reservation_locked(order_id=7)["reservation_id"] == "r2"
+    assert ledger._find_reservation_locked(order_id=12345) is None
+
+    # Rebinding moves the order_id index entry
+    store.bind_exit_reservation("r1", order_id=12)
+    assert 11 not in ledger._reservation_order_index
+    assert store.release_exit_reservation(order_id=12, release_reason="test") == 1
+    assert store.release_exit_reservation(strategy_id="s2") == 1
+    assert store.get_active_exit_reservations() == []
+    assert store.check_index_consistency() == []
+
+
+def test_indexes_survive_reload_and_rebuild(tmp_path):
+    path = str(tmp_path / "position_store.json")
+    store = PositionStore(path)
+    store.add_position("pos1", {}, _instrument(), {}, "bmc_spy")
+    for n in range(20):
+        store.add_fill("pos1", {"time": 1774532701.0 + n, "order_id": 100 + n, "exec_id": f"X{n}", "level": "entry", "qty_filled": 1, "avg_price": 1.0 + n / 10, "remaining_qty": 1, "pnl_pct": 0.0})
+
+    reloaded = PositionStore(path)
+    assert reloaded.check_index_consistency() == []
+    result = reloaded.rebuild_execution_ledger()
+    assert result["replayed"] == 20
+    assert reloaded.check_index_consistency() == []
+    assert reloaded._execution_ledger._exec_id_index["X3"] == {"exec::X3": None}
+
+
+def test_randomized_lookups_match_linear_scan(tmp_path):
+    rng = random.Random(42)
+    ledger = ExecutionLedgerStore(str(tmp_path / "ledger.json"), backend="snapshot")
+    exec_ids = []
+    for n in range(200):
+        op = rng.random()
+        if op < 0.5 or not exec_ids:
+            exec_id = f"E{n}" if rng.random() < 0.7 else ""
+            ledger.record_fill(
+                position_id=f"pos{rng.randint(0, 5)}",
+                strategy_id="s",
+                instrument=_instrument(),
+                fill_dict={"time": 1774532700.0 + n, "order_id": rng.randint(1, 40), "exec_id": exec_id,
+                           "level": "entry", "qty_filled": 1, "avg_price": 1.0},
+            )
+            if exec_id:
+                exec_ids.append(exec_id)
+        elif op < 0.7:
+            ledger.update_execution_details(position_id="", order_id=rng.randint(1, 40), exec_id=f"D{n}")
+            exec_ids.append(f"D{n}")
+        elif op < 0.85:
+            ledger.upsert_reservation({"reservation_id": f"r{rng.randint(0, 15)}", "order_id": rng.randint(0, 40),
+                                       "perm_id": rng.randint(0, 40), "reserved_qty": 1})
+        else:
+            ledger.release_reservation(order_id=rng.randint(1, 40))
+
+    for exec_id in exec_ids:
+        assert ledger._find_execution_key_locked(exec_id=exec_id) == _linear_exec_key(ledger, exec_id)
+    for value in range(0, 42):
+        assert ledger._find_reservation_locked(order_id=value) is _linear_find_reservation(ledger, order_id=value)
+        assert ledger._find_reservation_locked(perm_id=value) is _linear_find_reservation(ledger, perm_id=value)
+    assert ledger.check_index_consistency() == []
+
+
+def test_fill_lookup_rebuilds_when_shared_fill_log_is_cleared(tmp_path):
+    store = PositionStore(str(tmp_path / "position_store.json"))
+    store.add_position("pos1", {}, _instrument(), {}, "bmc_spy")
+    store.add_fill("pos1", {"time": 1.0, "order_id": 1, "level": "entry", "qty_filled": 1, "avg_price": 1.0, "remaining_qty": 1, "pnl_pct": 0.0})
+    assert store.update_fill_exec_id("pos1", 1, "A")
+
+    shared = store.get_position("pos1")["fill_log"]
+    shared.clear()  # risk manager reset
+    shared.append({"time": 2.0, "order_id": 2, "level": "entry", "qty_filled": 1, "avg_price": 2.0, "remaining_qty": 1, "pnl_pct": 0.0})
+
+    assert store.update_fill_exec_id("pos1", 2, "B")
+    assert shared[0]["exec_id"] == "B"
+    assert store.check_index_consistency() == []
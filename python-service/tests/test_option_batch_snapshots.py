@@ -0,0 +1,125 @@
+"""Tests for IBMergerArbScanner.get_option_data_batch sliding-window snapshots.
+
+SimulatedTWS (tests/conftest.py) answers reqMktData from a background thread
+the way the EReader thread delivers callbacks: tickPrice/tickSize for bid and
+ask after a quote latency, then model greeks via tickOptionComputation. Some
+contracts never quote and some are rejected with error 200. tools/bench_option_batch.py runs
+it against legacy_get_option_data_batch, the fixed-wait chunk loop it replaced.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+import ib_scanner
+from ib_scanner import IBMergerArbScanner, OptionData
+from tests.conftest import SimulatedTWS, StubResourceManager, chain
+
+
+def legacy_get_option_data_batch(scanner, ticker, contracts):
+    """get_option_data_batch before the sliding window: chunks, fixed BATCH_WAIT_SEC sleep, cancel."""
+    chunk_size = scanner._effective_batch_size
+    results = []
+    for start in range(0, len(contracts), chunk_size):
+        chunk = contracts[start:start + chunk_size]
+        req_ids = []
+        for expiry, strike, right in chunk:
+            contract = ib_scanner.Contract()
+            contract.symbol, contract.secType, contract.exchange, contract.currency = ticker, "OPT", "SMART", "USD"
+            contract.lastTradeDateOrContractMonth, contract.strike, contract.right = expiry, strike, right
+            contract.multiplier = "100"
+            req_id = scanner.get_next_req_id()
+            req_ids.append(req_id)
+            scanner.req_id_map[req_id] = f"option_{ticker}_{expiry}_{strike}_{right}"
+            scanner.option_chain[req_id] = {
+                "symbol": ticker, "strike": strike, "expiry": expiry, "right": right, "bid": 0, "ask": 0,
+                "last": 0, "volume": 0, "open_interest": 0, "implied_vol": 0, "delta": 0, "gamma": 0,
+                "theta": 0, "vega": 0, "bid_size": 0, "ask_size": 0,
+            }
+            scanner.reqMktData(req_id, contract, "100,101,104,106", False, False, [])
+        time.sleep(scanner.BATCH_WAIT_SEC)
+        for req_id in req_ids:
+            scanner.cancelMktData(req_id)
+        for req_id in req_ids:
+            data = scanner.option_chain.get(req_id)
+            results.append(OptionData(**data) if data else None)
+        for req_id in req_ids:
+            scanner.option_chain.pop(req_id, None)
+            scanner.req_id_map.pop(req_id, None)
+    return results
+
+
+@pytest.fixture
+def scanner():
+    scanner = IBMergerArbScanner()
+    yield scanner
+    scanner.executor.shutdown(wait=False)
+
+
+def test_window_retires_on_completion_and_keeps_lines_busy(scanner):
+    contracts = chain()
+    never, reject = {contracts[5], contracts[40]}, {contracts[7]}
+    scanner.BATCH_WAIT_SEC = 0.4
+    scanner.resource_manager = StubResourceManager(10)
+    tws = SimulatedTWS(scanner, never=never, reject=reject)
+    try:
+        start = time.monotonic()
+        results = scanner.get_option_data_batch("ACME", contracts)
+        elapsed = time.monotonic() - start
+    finally:
+        tws.stop()
+
+    assert len(results) == len(contracts) and sorted(tws.requested) == sorted(contracts)
+    for (expiry, strike, right), opt in zip(contracts, results):
+        assert (opt.expiry, opt.strike, opt.right) == (expiry, strike, right)
+        if (expiry, strike, right) in never | reject:
+            assert (opt.bid, opt.ask, opt.delta) == (0, 0, 0)
+        else:
+            contract = ib_scanner.Contract()
+            contract.strike, contract.right = strike, right
+            assert (opt.bid, opt.ask, opt.delta) == SimulatedTWS.quote(contract)
+            assert (opt.bid_size, opt.ask_size, opt.volume) == (10, 12, 100)
+
+    stats = scanner.last_batch_stats
+    assert (stats["complete"], stats["rejected"], stats["timed_out"]) == (len(contracts) - 3, 1, 2)
+    assert stats["lines"] == 10 and tws.peak <= 10 and stats["peak_in_flight"] == 10
+    assert sorted(tws.cancelled) == sorted(set(tws.cancelled)) and len(tws.cancelled) == len(contracts)
+    assert not scanner.option_chain and not scanner.req_id_map and not scanner._batch_snapshots
+    # 12 chunks x 0.4 s with the fixed wait; completions free lines in ~0.1 s
+    assert elapsed < 12 * scanner.BATCH_WAIT_SEC / 2
+
+
+def test_quote_only_requests_do_not_wait_for_greeks(scanner):
+    contracts = chain(n_strikes=3, expiries=("20260320",))
+    scanner.BATCH_WAIT_SEC = 1.0
+    tws = SimulatedTWS(scanner, greeks_delay=(5.0, 5.0))
+    try:
+        start = time.monotonic()
+        results = scanner.get_option_data_batch("ACME", contracts, require_greeks=False)
+        assert time.monotonic() - start < 0.5
+        assert all(opt.bid > 0 and opt.delta == 0 for opt in results)
+        assert scanner.last_batch_stats["complete"] == len(contracts)
+
+        # With greeks required the same requests run into the deadline
+        scanner.get_option_data_batch("ACME", contracts)
+        assert scanner.last_batch_stats["timed_out"] == len(contracts)
+    finally:
+        tws.stop()
+
+
+
+def test_only_model_greeks_complete_a_request(scanner):
+    contracts = chain(n_strikes=3, expiries=("20260320",))
+    scanner.BATCH_WAIT_SEC = 1.0
+    tws = SimulatedTWS(scanner, side_greeks=True, greeks_delay=(0.1, 0.1))
+    try:
+        results = scanner.get_option_data_batch("ACME", contracts)
+    finally:
+        tws.stop()
+    # Retiring on the bid/ask computation would report its IV and delta as the contract's greeks
+    assert all((opt.implied_vol, abs(opt.delta)) == (0.3, 0.5) for opt in results)
+    assert scanner.last_batch_stats["complete"] == len(contracts)
@@ -0,0 +1,138 @@
+"""Tests for the agent's contract-level OptionQuoteStore.
+
+The store is exercised directly with a fake clock (TTL per field group, LRU
+cap, purge), then through IBDataAgent's fetch_prices and sell_scan handlers on
+a scanner answered by SimulatedTWS: overlapping requests must only reach
+reqMktData for contracts the store does not hold fresh.
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+from ib_scanner import IBMergerArbScanner, OptionData
+from option_quote_store import OptionQuoteStore
+from tests.conftest import SimulatedTWS, chain
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def opt(expiry, strike, right, bid=1.0, ask=1.2, delta=0.5, implied_vol=0.3):
+    return OptionData(symbol="ACME", strike=strike, expiry=expiry, right=right, bid=bid, ask=ask, last=0,
+                      volume=5, open_interest=0, implied_vol=implied_vol, delta=delta, bid_size=3, ask_size=4)
+
+
+def test_lookup_serves_fresh_contracts_and_reports_missing_or_stale():
+    clock = FakeClock()
+    store = OptionQuoteStore(ttl_seconds=30, greeks_ttl_seconds=10, clock=clock)
+    contracts = [("20260320", 50.0, "C"), ("20260320", 55.0, "P")]
+    store.update("acme", contracts, [opt(*contracts[0]), None])
+
+    # Keys are normalized: symbol case, dashed expiry, int strike
+    results, missing = store.lookup("ACME", [("2026-03-20", 50, "c"), contracts[1]])
+    assert missing == [1] and results[0] == opt(*contracts[0]) and results[1] is None
+
+    # A greeks-less snapshot refreshes the quote and keeps the stored greeks
+    clock.now += 8
+    merged = store.update("ACME", contracts[:1], [opt(*contracts[0], bid=1.1, delta=0, implied_vol=0)])
+    assert (merged[0].bid, merged[0].delta, merged[0].implied_vol) == (1.1, 0.5, 0.3)
+    assert store.lookup("ACME", contracts[:1])[1] == []
+
+    # The kept greeks age from when they arrived, not from the quote refresh
+    clock.now += 8
+    assert store.lookup("ACME", contracts[:1])[1] == [0]
+    assert store.lookup("ACME", contracts[:1], require_greeks=False)[0][0].bid == 1.1
+
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (3, 2, 1)
+    assert stats["lines_saved"] == 3 and stats["contracts"] == 1
+
+
+def test_lru_cap_and_ttl_purge_bound_memory():
+    clock = FakeClock()
+    store = OptionQuoteStore(ttl_seconds=10, max_contracts=3, clock=clock)
+    contracts = chain(n_strikes=2, expiries=("20260320",))  # 4 contracts
+    store.update("ACME", contracts[:3], [opt(*c) for c in contracts[:3]])
+    store.lookup("ACME", contracts[:1])  # touch: contracts[1] is now least recent
+    store.update("ACME", contracts[3:], [opt(*contracts[3])])
+    assert len(store) == 3 and store.evicted == 1
+    assert store.lookup("ACME", contracts)[1] == [1]
+
+    clock.now += 11
+    store.update("ACME", [], [])
+    assert len(store) == 0 and store.expired == 3
+
+    # Snapshots without a quote or greeks are not stored
+    empty = opt(*contracts[0], bid=0, ask=0, delta=0, implied_vol=0)
+    assert store.update("ACME", contracts[:1], [empty]) == [empty]
+    assert len(store) == 0
+
+
+def test_last_only_snapshot_is_passed_through_but_not_cached():
+    # After hours IB sends -1 bid/ask with last, volume and open interest
+    store = OptionQuoteStore(ttl_seconds=60, clock=FakeClock())
+    contract = ("20260320", 50.0, "C")
+    after_hours = OptionData(symbol="ACME", strike=50.0, expiry="20260320", right="C", bid=-1, ask=-1, last=2.5,
+                             volume=12, open_interest=300, implied_vol=0, delta=0)
+    assert store.update("ACME", [contract], [after_hours]) == [after_hours]
+    assert len(store) == 0 and store.lookup("ACME", [contract])[1] == [0]
+
+
+@pytest.fixture
+def agent():
+    from ib_data_agent import IBDataAgent
+
+    agent = object.__new__(IBDataAgent)
+    agent.option_quote_store = OptionQuoteStore(ttl_seconds=60)
+    agent.scanner = IBMergerArbScanner()
+    agent.scanner.isConnected = lambda: True
+    agent.scanner.BATCH_WAIT_SEC = 0.3
+    agent.tws = SimulatedTWS(agent.scanner, never={("20260320", 90.0, "C")})
+    yield agent
+    agent.tws.stop()
+    agent.scanner.executor.shutdown(wait=False)
+
+
+def _prices_payload(contracts):
+    return {"contracts": [{"ticker": "ACME", "expiry": f"{e[:4]}-{e[4:6]}-{e[6:]}", "strike": s, "right": r}
+                          for e, s, r in contracts]}
+
+
+def test_handlers_only_request_missing_or_stale_contracts(agent):
+    tws, store = agent.tws, agent.option_quote_store
+    contracts = chain(n_strikes=8, expiries=("20260320",))
+    first = agent._handle_fetch_prices_sync(_prices_payload(contracts[:10]))
+    assert len(tws.requested) == 10
+
+    second = agent._handle_fetch_prices_sync(_prices_payload(contracts))
+    # Only the 6 new contracts plus the one that never quoted go to IB
+    assert len(tws.requested) == 17 and tws.requested[10:].count(("20260320", 90.0, "C")) == 1
+    assert second["contracts"][:10] == first["contracts"]
+    assert second["contracts"][contracts.index(("20260320", 90.0, "C"))] is None
+
+    # sell_scan over the same near-the-money calls is served from the store
+    expiry = (date.today() + timedelta(days=3)).strftime("%Y%m%d")
+    calls = [(expiry, 80.0 + 2.5 * k, "C") for k in range(8)]
+    agent._handle_fetch_prices_sync(_prices_payload(calls))
+    requested = len(tws.requested)
+    agent.scanner.fetch_underlying_data = lambda ticker: {"price": 88.0}
+    agent.scanner.resolve_contract = lambda ticker: 1
+    agent.scanner.get_available_expirations = lambda ticker, contract_id: [expiry]
+    agent.scanner.available_strikes = {expiry: [s for _, s, _ in calls]}
+    scan = agent._handle_sell_scan_sync({"ticker": "ACME", "right": "C", "ntm_pct": 0.1})
+    assert len(tws.requested) == requested
+    assert [c["strike"] for c in scan["contracts"]] == [80.0, 85.0, 90.0, 95.0]
+
+    stats = store.stats()
+    assert stats["lines_saved"] == stats["hits"] == 9 + 4
+    assert stats["misses"] == len(tws.requested)
@@ -0,0 +1,207 @@
+"""Tests for OptionsDataLoader per-contract bar range fetching, local chain pivot and bar cache.
+
+PolygonReplay serves a recording (contract list, underlying closes, every
+contract's daily bars) the way Polygon does, so the per-date and range paths
+can be compared request for request. tools/bench_options_bar_fetch.py reuses it.
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import random
+import re
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.research.market_data import bar_cache, options_loader
+from app.research.market_data.bar_cache import ContractBarCache
+from app.research.market_data.black_scholes import bs_price
+from app.research.market_data.options_loader import OptionsDataLoader
+
+_AGGS = re.compile(r"/v2/aggs/ticker/([^/]+)/range/1/day/(\d{4}-\d{2}-\d{2})/(\d{4}-\d{2}-\d{2})")
+
+
+def _ms(d: date) -> int:
+    # Polygon daily aggregates are stamped at midnight New York time
+    return int(datetime(d.year, d.month, d.day, 5, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def synthetic_recording(underlying="ACME", start=date(2024, 1, 2), days=150, strikes=12, seed=3):
+    """A recording shaped like Polygon responses for one underlying."""
+    rng = random.Random(seed)
+    trading = [start + timedelta(days=i) for i in range(days) if (start + timedelta(days=i)).weekday() < 5]
+    spot, closes = 50.0, {}
+    for d in trading:
+        spot *= math.exp(rng.gauss(0, 0.015))
+        closes[d] = round(spot, 2)
+
+    expirations = sorted({d for d in trading if d.weekday() == 4 and 15 <= d.day <= 21})
+    expirations.append(trading[-1] + timedelta(days=60))
+    contracts, bars = [], {}
+    for exp in expirations:
+        for k in range(strikes):
+            strike = 40 + 2.5 * k
+            for kind, flag in (("call", "C"), ("put", "P")):
+                occ = f"O:{underlying}{exp:%y%m%d}{flag}{int(strike * 1000):08d}"
+                contracts.append({"ticker": occ, "underlying_ticker": underlying, "contract_type": kind,
+                                  "expiration_date": exp.isoformat(), "strike_price": strike})
+                series = []
+                for d in trading:
+                    if d > exp or rng.random() > 0.6:
+                        continue
+                    t = max((exp - d).days, 1) / 365
+                    price = round(max(bs_price(closes[d], strike, t, 0.045, 0.35, flag), 0.01), 2)
+                    series.append({"v": rng.randint(1, 500), "vw": price, "o": price, "c": price,
+                                   "h": round(price * 1.05, 2), "l": round(price * 0.95, 2),
+                                   "t": _ms(d), "n": rng.randint(1, 40)})
+                bars[occ] = series
+    stock = [{"c": c, "o": c, "h": c, "l": c, "v": 1000000, "t": _ms(d)} for d, c in closes.items()]
+    return {"underlying": underlying, "contracts": contracts, "stock_bars": stock, "contract_bars": bars}
+
+
+class PolygonReplay:
+    """MockTransport handler replaying a recording, with optional per-request latency."""
+
+    def __init__(self, recording, latency=0.0):
+        self.recording = recording
+        self.latency = latency
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.url.path.startswith("/v3/reference/options/contracts"):
+            return httpx.Response(200, json={"results": self.recording["contracts"]})
+        match = _AGGS.match(request.url.path)
+        if not match:
+            return httpx.Response(404)
+        ticker, lo, hi = match.group(1), _ms(date.fromisoformat(match.group(2))), _ms(date.fromisoformat(match.group(3)))
+        if ticker == self.recording["underlying"]:
+            series = self.recording["stock_bars"]
+        elif ticker in self.recording["contract_bars"]:
+            series = self.recording["contract_bars"][ticker]
+        else:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"results": [b for b in series if lo <= b["t"] <= hi]})
+
+    def bar_requests(self):
+        return sum(1 for p in self.requests if p.startswith("/v2/aggs/ticker/O:"))
+
+
+class RecordingConn:
+    """asyncpg stand-in that records the rows load_options_for_deal writes."""
+
+    def __init__(self):
+        self.rows = []
+
+    async def execute(self, sql, *args):
+        self.rows.append((sql.split("(")[0].split()[-1], args))
+
+
+def make_loader(replay, cache_dir):
+    loader = OptionsDataLoader(bar_cache=ContractBarCache(str(cache_dir)))
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(replay))
+    return loader
+
+
+@pytest.fixture(autouse=True)
+def no_rate_delay(monkeypatch):
+    monkeypatch.setattr(options_loader, "POLYGON_RATE_DELAY", 0)
+    monkeypatch.setattr(options_loader, "OPTIONS_BAR_MAX_RPS", 0)
+
+
+async def _load(loader, recording, bar_range_fetch):
+    conn = RecordingConn()
+    counts = await loader.load_options_for_deal(
+        conn, "deal-1", recording["underlying"], announced_date=date(2024, 2, 14), deal_price=55.0,
+        end_date=date(2024, 5, 24), bar_range_fetch=bar_range_fetch,
+    )
+    return counts, conn.rows
+
+
+@pytest.mark.asyncio
+async def test_range_fetch_matches_per_date_chains_with_one_request_per_contract(tmp_path):
+    recording = synthetic_recording()
+    per_date = PolygonReplay(recording)
+    old_counts, old_rows = await _load(make_loader(per_date, tmp_path / "a"), recording, False)
+
+    ranged = PolygonReplay(recording)
+    loader = make_loader(ranged, tmp_path / "b")
+    new_counts, new_rows = await _load(loader, recording, True)
+
+    assert old_counts["daily_summaries"] > 10 and old_counts["chain_snapshots"] > 500
+    assert (new_counts, new_rows) == (old_counts, old_rows)
+    # Every contract still alive on the first processed date, once
+    first = date(2024, 2, 14)
+    alive = [c for c in recording["contracts"] if date.fromisoformat(c["expiration_date"]) >= first]
+    assert ranged.bar_requests() == loader.bar_requests == len(alive)
+    assert per_date.bar_requests() > 10 * ranged.bar_requests()
+
+    # Reloading the deal is served from the on-disk cache
+    again = PolygonReplay(recording)
+    assert await _load(make_loader(again, tmp_path / "b"), recording, True) == (new_counts, new_rows)
+    assert again.bar_requests() == 0
+
+
+@pytest.mark.asyncio
+async def test_pivot_falls_back_to_next_day_like_two_day_request(tmp_path):
+    occ = "O:ACME240315C00050000"
+    contract = {"ticker": occ, "contract_type": "call", "expiration_date": "2024-03-15", "strike_price": 50.0}
+    friday, monday = date(2024, 3, 1), date(2024, 3, 4)
+    recording = {"underlying": "ACME", "contracts": [contract], "stock_bars": [],
+                 "contract_bars": {occ: [{"c": 1.2, "h": 1.3, "l": 1.1, "v": 7, "t": _ms(monday)}]}}
+    loader = make_loader(PolygonReplay(recording), tmp_path)
+    bars = await loader.fetch_contract_bar_ranges("ACME", [contract], friday, monday)
+
+    for target in (friday - timedelta(days=1), friday, monday):
+        kwargs = dict(underlying_ticker="ACME", target_date=target, underlying_close=50.0, deal_price=None,
+                      contracts=[contract])
+        assert await loader.reconstruct_chain(**kwargs, bars_by_contract=bars) == await loader.reconstruct_chain(**kwargs)
+    assert [e["volume"] for e in await loader.reconstruct_chain(**kwargs, bars_by_contract=bars)] == [7]
+
+
+@pytest.mark.asyncio
+async def test_failed_fetches_are_not_cached(tmp_path):
+    recording = synthetic_recording(days=30, strikes=2)
+    replay = PolygonReplay(recording)
+    contracts = recording["contracts"][:4]
+    failing = contracts[0]["ticker"]
+
+    async def flaky(request):
+        if failing in request.url.path:
+            return httpx.Response(500)
+        return await replay(request)
+
+    loader = OptionsDataLoader(bar_cache=ContractBarCache(str(tmp_path)))
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(flaky))
+    bars = await loader.fetch_contract_bar_ranges("ACME", contracts, date(2024, 1, 2), date(2024, 1, 31))
+    assert failing not in bars and len(bars) == 3
+
+    replay = PolygonReplay(recording)
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(replay))
+    bars = await loader.fetch_contract_bar_ranges("ACME", contracts, date(2024, 1, 2), date(2024, 1, 31))
+    assert len(bars) == 4 and replay.bar_requests() == 1  # only the failed contract again
+    # Narrower windows are served from the cached range
+    await loader.fetch_contract_bar_ranges("ACME", contracts, date(2024, 1, 8), date(2024, 1, 19))
+    assert replay.bar_requests() == 1
+
+
+def test_bar_cache_round_trip_keeps_integer_fields(tmp_path):
+    cache = ContractBarCache(str(tmp_path))
+    cached = cache.load("ACME")
+    cached.put("O:A", date(2024, 1, 2), date(2024, 1, 5), [{"c": 1.5, "v": 10, "t": _ms(date(2024, 1, 3)), "x": 1}])
+    cached.put("O:B", date(2024, 1, 2), date(2024, 1, 5), [])
+    cache.save(cached)
+
+    loaded = ContractBarCache(str(tmp_path)).load("acme")
+    assert loaded.coverage == cached.coverage
+    assert loaded.bars_by_date("O:A") == {date(2024, 1, 3): {"c": 1.5, "v": 10, "t": _ms(date(2024, 1, 3))}}
+    assert isinstance(loaded.bars["O:A"][0]["v"], int)
+    assert loaded.bars_by_date("O:B") == {} and loaded.covers("O:B", date(2024, 1, 3), date(2024, 1, 4))
+    if not bar_cache._HAS_PYARROW:
+        with gzip.open(tmp_path / "ACME.json.gz", "rt") as f:
+            assert set(json.load(f)) == {"coverage", "bars"}
@@ -5,10 +5,13 @@ get_option_chain() handles pagination without dropping contracts, and
 check_options_available() gracefully handles empty/error states.
 """
 
+import asyncio
+from urllib.parse import parse_qsl, urlsplit
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
-from app.options.polygon_options import PolygonOptionsClient, PolygonError
+from app.options.polygon_options import PolygonOptionsClient, PolygonError, _chain_partitions
 
 
 # ---------------------------------------------------------------------------
@@ -322,6 +325,137 @@ class TestGetOptionChainPagination:
         assert second_call[0][1] is None  # no params on subsequent pages
 
 
+# ===========================================================================
+# get_option_chain — partitioned (parallel) fetch
+# ===========================================================================
+
+class _FakeSnapshotEndpoint:
+    """In-process stand-in for /v3/snapshot/options with filters and cursors."""
+
+    def __init__(self, expiries, strikes, page_size=7):
+        self.snapshots = [
+            _make_snapshot(strike=k, expiration_date=e, contract_type=t)
+            for e in expiries for k in strikes for t in ("call", "put")
+        ]
+        self.page_size = page_size
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _matches(self, snap, params):
+        d = snap["details"]
+        checks = [
+            ("expiration_date.gte", lambda v: d["expiration_date"] >= v),
+            ("expiration_date.lte", lambda v: d["expiration_date"] <= v),
+            ("strike_price.gte", lambda v: d["strike_price"] >= float(v)),
+            ("strike_price.lt", lambda v: d["strike_price"] < float(v)),
+            ("strike_price.lte", lambda v: d["strike_price"] <= float(v)),
+        ]
+        return all(fn(params[name]) for name, fn in checks if name in params)
+
+    async def get(self, url, params=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if params is None:  # next_url carries the query
+                params = dict(parse_qsl(urlsplit(url).query))
+            offset = int(params.get("cursor", 0))
+            matching = [s for s in self.snapshots if self._matches(s, params)]
+            page = {"results": matching[offset:offset + self.page_size]}
+            if offset + self.page_size < len(matching):
+                query = dict(params, cursor=offset + self.page_size)
+                page["next_url"] = "https://api.polygon.io/v3/snapshot/options/ACME?" + "&".join(
+                    f"{k}={v}" for k, v in query.items()
+                )
+            return page
+        finally:
+            self.in_flight -= 1
+
+
+class TestGetOptionChainPartitioned:
+    """Parallel expiration-window x strike-band fetch must match the serial walk."""
+
+    @pytest.fixture
+    def anyio_backend(self):
+        return "asyncio"  # the client fans out with asyncio primitives
+
+    EXPIRIES = ["2026-07-03", "2026-07-10", "2026-07-17", "2026-07-24", "2026-07-31", "2026-08-21"]
+    STRIKES = [90 + 2.5 * i for i in range(13)]  # 90 .. 120
+
+    def _query(self):
+        return dict(
+            expiration_date_gte="2026-07-01",
+            expiration_date_lte="2026-08-31",
+            strike_gte=90.0,
+            strike_lte=120.0,
+        )
+
+    @pytest.mark.anyio
+    async def test_parallel_matches_serial(self):
+        serial_endpoint = _FakeSnapshotEndpoint(self.EXPIRIES, self.STRIKES)
+        serial = PolygonOptionsClient(api_key="test-key")
+        serial._get = serial_endpoint.get
+        expected = await serial.get_option_chain("ACME", **self._query())
+
+        endpoint = _FakeSnapshotEndpoint(self.EXPIRIES, self.STRIKES)
+        client = PolygonOptionsClient(api_key="test-key")
+        client._get = endpoint.get
+        chain = await client.get_option_chain("ACME", max_concurrency=4, strike_bands=3, **self._query())
+
+        def key(c):
+            return c["expiry"], c["strike"], c["right"]
+
+        assert len(chain) == len(expected) == len(self.EXPIRIES) * len(self.STRIKES) * 2
+        assert sorted(map(key, chain)) == sorted(map(key, expected))
+        assert len(set(map(key, chain))) == len(chain)
+        assert 1 < endpoint.max_in_flight <= 4
+
+    @pytest.mark.anyio
+    async def test_unbounded_query_falls_back_to_serial_walk(self):
+        client = PolygonOptionsClient(api_key="test-key")
+        client._get = AsyncMock(return_value={"results": [_make_snapshot(strike=95)]})
+
+        chain = await client.get_option_chain("ACME", max_concurrency=8)
+        assert len(chain) == 1
+        assert client._get.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_partition_failure_propagates(self):
+        client = PolygonOptionsClient(api_key="test-key")
+        client._get = AsyncMock(side_effect=PolygonError("API failed"))
+
+        with pytest.raises(PolygonError):
+            await client.get_option_chain("ACME", max_concurrency=4, **self._query())
+
+    def test_partitions_are_disjoint_and_cover_bounds(self):
+        params = {
+            "limit": 250,
+            "expiration_date.gte": "2026-07-01",
+            "expiration_date.lte": "2026-07-20",
+            "strike_price.gte": 90.0,
+            "strike_price.lte": 120.0,
+            "contract_type": "call",
+        }
+        parts = _chain_partitions(params, partition_days=7, strike_bands=3)
+        windows = sorted({(p["expiration_date.gte"], p["expiration_date.lte"]) for p in parts})
+        assert windows == [
+            ("2026-07-01", "2026-07-07"), ("2026-07-08", "2026-07-14"), ("2026-07-15", "2026-07-20"),
+        ]
+        bands = [p for p in parts if p["expiration_date.gte"] == "2026-07-01"]
+        assert [(b["strike_price.gte"], b.get("strike_price.lt"), b.get("strike_price.lte")) for b in bands] == [
+            (90.0, 100.0, None), (100.0, 110.0, None), (110.0, None, 120.0),
+        ]
+        assert all(p["contract_type"] == "call" and p["limit"] == 250 for p in parts)
+
+    def test_exact_expiration_is_split_by_strike_only(self):
+        params = {"expiration_date": "2026-07-17", "strike_price.gte": 90.0, "strike_price.lte": 120.0}
+        parts = _chain_partitions(params, partition_days=7, strike_bands=2)
+        assert len(parts) == 2
+        assert all(p["expiration_date"] == "2026-07-17" for p in parts)
+
+
 # ===========================================================================
 # check_options_available
 # ===========================================================================
@@ -0,0 +1,177 @@
+"""Tests for PolygonOptionsClient request hygiene against a local stand-in server.
+
+The server speaks plain HTTP/1.1 on localhost and imitates the bits of
+Polygon the client depends on: option-chain snapshots, a slow response
+(so concurrent callers overlap) and 429s with Retry-After.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from app.options.polygon_options import PolygonError, PolygonOptionsClient, TokenBucket
+
+
+class _StandInPolygon:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.requests = []  # (monotonic time, path, params)
+        self.rate_limit_next = 0
+        self.retry_after = "0.2"
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = dict(parse_qsl(parts.query))
+                with stand_in.lock:
+                    stand_in.requests.append((time.monotonic(), parts.path, params))
+                    limited = stand_in.rate_limit_next > 0
+                    if limited:
+                        stand_in.rate_limit_next -= 1
+                if limited:
+                    self._reply(429, {"status": "ERROR"}, {"Retry-After": stand_in.retry_after})
+                    return
+                time.sleep(stand_in.delay)
+                if parts.path.startswith("/v3/snapshot/options/MISSING"):
+                    self._reply(404, {"status": "NOT_FOUND"})
+                    return
+                strike = float(params.get("strike_price.gte", 100))
+                self._reply(200, {"results": [{
+                    "details": {"strike_price": strike, "expiration_date": "2026-07-17", "contract_type": "call"},
+                    "last_quote": {"bid": 1.0, "ask": 1.2},
+                }]})
+
+            def _reply(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                return None
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = _StandInPolygon()
+    yield server
+    server.close()
+
+
+def _client(stand_in, **kwargs):
+    return PolygonOptionsClient(api_key="test-key", base_url=stand_in.url, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_chain_requests_share_one_fetch(stand_in):
+    client = _client(stand_in)
+    try:
+        results = await asyncio.gather(*[
+            client.get_option_chain("ACME", expiration_date="2026-07-17") for _ in range(8)
+        ])
+        assert len(stand_in.requests) == 1
+        assert all(r == results[0] for r in results)
+        assert client.stats["coalesced"] == 7
+
+        # Within the TTL a later caller is served from the snapshot cache
+        await client.get_option_chain("ACME", expiration_date="2026-07-17")
+        assert len(stand_in.requests) == 1 and client.stats["cache_hits"] == 1
+
+        # Different params are a different request
+        await client.get_option_chain("ACME", expiration_date="2026-08-21")
+        assert len(stand_in.requests) == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_chain_cache_expires_after_ttl(stand_in):
+    client = _client(stand_in, chain_cache_ttl=0.1)
+    try:
+        await client.get_option_chain("ACME")
+        await asyncio.sleep(0.15)
+        await client.get_option_chain("ACME")
+        assert len(stand_in.requests) == 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_every_request_for_retry_after(stand_in):
+    client = _client(stand_in)
+    stand_in.rate_limit_next = 1
+    try:
+        started = time.monotonic()
+        chains = await asyncio.gather(*[
+            client.get_option_chain("ACME", strike_gte=100 + i) for i in range(4)
+        ])
+        assert [c[0]["strike"] for c in chains] == [100, 101, 102, 103]
+        assert client.stats["rate_limited"] == 1
+
+        # Only requests already on the wire when the 429 came back may land
+        # inside the pause; everything sent afterwards waits it out.
+        limited_at = stand_in.requests[0][0]
+        later = [t for t, _, _ in stand_in.requests if t > limited_at + 0.03]
+        assert later and min(later) >= limited_at + 0.2 - 0.02
+        assert time.monotonic() - started >= 0.2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_failure_reaches_every_waiter_and_is_not_cached(stand_in):
+    client = _client(stand_in)
+    try:
+        results = await asyncio.gather(
+            *[client.get_option_chain("MISSING") for _ in range(3)], return_exceptions=True,
+        )
+        assert all(isinstance(r, PolygonError) for r in results)
+        assert len(stand_in.requests) == 1
+        assert client._inflight == {} and client._chain_cache == {}
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch(stand_in):
+    client = _client(stand_in)
+    try:
+        first = asyncio.ensure_future(client.get_option_chain("ACME"))
+        second = asyncio.ensure_future(client.get_option_chain("ACME"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        chain = await second
+        assert chain[0]["strike"] == 100 and len(stand_in.requests) == 1
+    finally:
+        await client.close()
+
+
+def test_token_bucket_spaces_requests_past_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    bucket.pause(1.0)
+    assert bucket.reserve() == pytest.approx(1.3, abs=0.02)
@@ -0,0 +1,146 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+from quote_cache import QUOTE_FIELDS, Quote, StreamingQuoteCache
+from quote_push import QuoteDeltaEncoder
+
+
+class StubResourceManager:
+    def acquire_execution_lines(self, n, allocation_key=None):
+        return True
+
+    def release_execution_lines(self, n, allocation_key=None):
+        return None
+
+
+class StubScanner:
+    def __init__(self):
+        self._next_req_id = 1000
+
+    def get_next_req_id(self):
+        self._next_req_id += 1
+        return self._next_req_id
+
+    def reqMktData(self, *args, **kwargs):
+        return None
+
+    def cancelMktData(self, *args, **kwargs):
+        return None
+
+
+def _cache(*keys):
+    cache = StreamingQuoteCache(StubResourceManager())
+    scanner = StubScanner()
+    req_ids = [cache.subscribe(scanner, object(), key) for key in keys]
+    return cache, scanner, req_ids
+
+
+def test_get_returns_detached_snapshot_with_seq():
+    cache, _, (req_id,) = _cache("SPY")
+    assert cache.get("SPY").seq == 0
+
+    cache.update_price(req_id, 1, 1.10)
+    cache.update_price(req_id, 2, 1.20)
+    cache.update_size(req_id, 8, 300)
+    quote = cache.get("SPY")
+    assert (quote.bid, quote.ask, quote.volume, quote.seq) == (1.10, 1.20, 300, 3)
+
+    cache.update_price(req_id, 1, 1.15)
+    assert quote.bid == 1.10  # earlier snapshot is not mutated
+    assert cache.get("SPY").bid == 1.15 and cache.get("SPY").seq == 4
+    assert cache.get("QQQ") is None
+
+
+def test_unknown_req_id_and_unsubscribe_stop_routing():
+    cache, _, (req_id,) = _cache("SPY")
+    cache.update_price(req_id + 99, 1, 5.0)
+    assert cache.get("SPY").seq == 0 and cache.subscription_count == 1
+
+    cache.unsubscribe(StubScanner(), "SPY")
+    cache.update_price(req_id, 1, 5.0)
+    assert cache.get("SPY") is None and cache.drain_dirty() == {}
+    assert cache.subscription_count == 0
+
+
+def test_resubscribe_keeps_values_and_routes_new_req_id():
+    cache, scanner, (old_req_id,) = _cache("SPY")
+    cache.update_price(old_req_id, 1, 2.0)
+    cache.resubscribe_all(scanner)
+    new_req_id = cache._key_to_req_id["SPY"]
+    assert new_req_id != old_req_id
+
+    cache.update_price(old_req_id, 1, 9.0)
+    cache.update_price(new_req_id, 2, 2.1)
+    quote = cache.get("SPY")
+    assert (quote.bid, quote.ask, quote.seq) == (2.0, 2.1, 2)
+
+
+def test_serialized_and_rows_match_quote_to_dict():
+    cache, _, (req_id, _) = _cache("SPY", "QQQ")
+    cache.update_price(req_id, 1, 1.0)
+    cache.update_price(req_id, 2, 1.1)
+    cache.update_greeks(req_id, 0.25, 0.5, 0.01, 0.1, -0.02)
+
+    rows = {key: (seq, values) for key, seq, values in cache.export_rows()}
+    assert rows["SPY"][0] == 3 and rows["QQQ"][0] == 0
+    serialized = cache.get_all_serialized()
+    for key, quote in cache.get_all().items():
+        assert tuple(getattr(quote, name) for name in QUOTE_FIELDS) == rows[key][1]
+        expected = quote.to_dict()
+        assert {k: v for k, v in serialized[key].items() if k != "age_seconds"} == \
+            {k: v for k, v in expected.items() if k != "age_seconds"}
+    assert serialized["QQQ"]["age_seconds"] == float("inf")
+
+
+def test_readers_never_see_torn_quotes_under_concurrent_writer():
+    cache, _, (req_id,) = _cache("SPY")
+    stop = threading.Event()
+
+    def writer():
+        # Each "tick" sets bid and ask to the same value; a torn read would
+        # observe them differing.
+        n = 0
+        while not stop.is_set():
+            n += 1
+            cache.update_price(req_id, 1, float(n))
+            cache.update_price(req_id, 2, float(n))
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        last_seq = 0
+        checked = 0
+        while checked < 20000:
+            quote = cache.get("SPY")
+            assert quote.seq >= last_seq
+            last_seq = quote.seq
+            # Odd seq = between the bid and ask update of one logical tick
+            expected_ask = quote.bid if quote.seq % 2 == 0 else quote.bid - 1
+            assert quote.ask == expected_ask
+            assert quote.seq == 2 * quote.ask + (quote.seq % 2)
+            checked += 1
+    finally:
+        stop.set()
+        thread.join()
+    assert last_seq > 0
+
+
+def test_encoder_skips_unchanged_cache_keys_but_keyframes_carry_them():
+    cache, _, (req_id, _) = _cache("SPY", "QQQ")
+    cache.update_price(req_id, 1, 1.0)
+    encoder = QuoteDeltaEncoder(keyframe_every=2)
+    first = encoder.encode(cache.get_all(), 10.0)
+    assert first["frame"] == "key" and set(first["quotes"]) == {"SPY", "QQQ"}
+
+    cache.update_price(req_id, 2, 1.1)
+    delta = encoder.encode(cache.get_all(), 12.0)
+    assert set(delta["quotes"]) == {"SPY"} and delta["quotes"]["SPY"]["ask"] == 1.1
+    assert delta["quotes"]["SPY"]["seq"] == 2
+
+    keyframe = encoder.encode(cache.get_all(), 14.0)
+    assert keyframe["frame"] == "key"
+    assert keyframe["quotes"]["SPY"]["ask"] == 1.1 and keyframe["quotes"]["SPY"]["seq"] == 2
+    assert isinstance(cache.get("SPY"), Quote)
@@ -0,0 +1,118 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "standalone_agent"))
+
+import quote_push
+from quote_cache import Quote
+from quote_push import QuoteDeltaEncoder
+
+from app.api.ws_relay import LiveQuoteBook
+
+
+def _quotes(n, rng):
+    return {
+        f"SPY:{600 + i}:20260320:C": Quote(
+            bid=round(rng.uniform(0.5, 5), 2), ask=round(rng.uniform(5, 6), 2), last=1.0,
+            bid_size=10, ask_size=12, volume=100, open_interest=500, implied_vol=0.2,
+            delta=0.5, gamma=0.01, theta=-0.02, vega=0.1, timestamp=1774532700.0 + i,
+        )
+        for i in range(n)
+    }
+
+
+def _tick(quotes, rng, fraction=0.1):
+    for key in rng.sample(sorted(quotes), max(1, int(len(quotes) * fraction))):
+        quote = quotes[key]
+        quote.bid = round(quote.bid + 0.01, 2)
+        quote.timestamp += 1.0
+
+
+def _v1_snapshot(quotes, push_ts):
+    # get_all_serialized() with age_seconds as of the push
+    snapshot = {}
+    for key, quote in quotes.items():
+        item = quote.to_dict()
+        item["age_seconds"] = round(push_ts - quote.timestamp, 2)
+        snapshot[key] = item
+    return snapshot
+
+
+def test_relay_book_matches_v1_snapshot_across_deltas_and_keyframes():
+    rng = random.Random(3)
+    quotes = _quotes(40, rng)
+    encoder = QuoteDeltaEncoder(keyframe_every=5)
+    book = LiveQuoteBook()
+    frames = []
+    for push in range(12):
+        if push == 6:
+            quotes.pop(sorted(quotes)[0])
+            quotes["QQQ:500:20260320:P"] = Quote(bid=1.0, ask=1.1, timestamp=1774532800.0)
+        push_ts = 1774533000.0 + push * 2
+        frame = encoder.encode(quotes, push_ts)
+        frames.append(frame["frame"])
+        assert book.apply(json.loads(json.dumps(frame))) is False
+        assert book.snapshot() == _v1_snapshot(quotes, push_ts)
+        _tick(quotes, rng)
+    assert frames[:6] == ["key", "delta", "delta", "delta", "delta", "key"]
+
+
+def test_delta_carries_only_changed_fields_with_advancing_seq():
+    quotes = {"K": Quote(bid=1.0, ask=1.2, timestamp=10.0)}
+    encoder = QuoteDeltaEncoder()
+    first = encoder.encode(quotes, 11.0)
+    assert first["frame"] == "key" and first["quotes"]["K"]["seq"] == 1
+
+    unchanged = encoder.encode(quotes, 13.0)
+    assert unchanged["frame"] == "delta" and unchanged["quotes"] == {}
+
+    quotes["K"].ask = 1.3
+    quotes["K"].timestamp = 14.0
+    delta = encoder.encode(quotes, 15.0)
+    assert delta["quotes"] == {"K": {"ask": 1.3, "timestamp": 14.0, "seq": 2}}
+    assert delta["frame_seq"] == 3
+
+
+def test_nan_fields_do_not_register_as_changes():
+    quotes = {"K": Quote(bid=float("nan"), ask=1.0, timestamp=10.0)}
+    encoder = QuoteDeltaEncoder()
+    assert encoder.encode(quotes, 11.0)["quotes"]["K"]["bid"] is None
+    assert encoder.encode(quotes, 13.0)["quotes"] == {}
+
+
+def test_gap_requests_one_keyframe_and_stale_seq_is_ignored():
+    quotes = {"K": Quote(bid=1.0, ask=1.2, timestamp=10.0)}
+    encoder = QuoteDeltaEncoder()
+    book = LiveQuoteBook()
+    assert book.apply(encoder.encode(quotes, 11.0)) is False
+
+    quotes["K"].bid = 1.1
+    lost = encoder.encode(quotes, 13.0)
+    quotes["K"].bid = 1.05
+    after_gap = encoder.encode(quotes, 15.0)
+    assert book.apply(after_gap) is True
+    assert book.quotes["K"]["bid"] == 1.05
+    # Late/duplicate frame: seq does not advance, value is not rolled back
+    assert book.apply(lost) is False
+    assert book.quotes["K"]["bid"] == 1.05
+
+    encoder.request_keyframe()
+    keyframe = encoder.encode(quotes, 17.0)
+    assert keyframe["frame"] == "key"
+    book.apply(keyframe)
+    assert book.synced and not book.keyframe_requested
+
+
+@pytest.mark.skipif(quote_push.msgpack is None, reason="msgpack not installed")
+def test_msgpack_frames_round_trip():
+    rng = random.Random(5)
+    encoder = QuoteDeltaEncoder()
+    frame = encoder.encode(_quotes(10, rng), 1774533000.0)
+    book = LiveQuoteBook()
+    book.apply(quote_push.msgpack.unpackb(quote_push.pack_frame(frame), raw=False))
+    assert len(book.snapshot()) == 10
+    assert quote_push.supported_encodings()[0] == "msgpack"
@@ -86,6 +86,26 @@ async def test_relay_execution_status_uses_fresh_cached_telemetry(monkeypatch):
     assert called["count"] == 0
 
 
+@pytest.mark.asyncio
+async def test_relay_execution_status_prefers_v2_quote_book(monkeypatch):
+    from app.api.ws_relay import LiveQuoteBook
+
+    now = time.time()
+    provider = make_provider(make_telemetry(received_at=now - 1, contracts=[make_contract()]))
+    provider._live_quote_book = LiveQuoteBook()
+    provider._live_quote_book.apply({
+        "v": 2, "frame": "key", "frame_seq": 1, "timestamp": now,
+        "quotes": {"SPY:650:20260326:P": {"seq": 1, "bid": 1.2, "ask": 1.3, "last": 0.0, "timestamp": now - 3}},
+    })
+    monkeypatch.setattr(options_routes, "get_registry", lambda: StubRegistry(provider))
+
+    result = await options_routes.relay_execution_status("user-1")
+
+    quote = result["quote_snapshot"]["SPY:650:20260326:P"]
+    assert quote["mid"] == pytest.approx(1.25)
+    assert quote["age_seconds"] == pytest.approx(3.0)
+
+
 @pytest.mark.asyncio
 async def test_relay_execution_status_bypasses_cache_when_telemetry_is_too_old(monkeypatch):
     provider = make_provider(
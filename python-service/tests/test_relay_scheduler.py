@@ -0,0 +1,211 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import ws_relay
+from app.api.ws_relay import DispatchTimeout, ProviderScheduler, request_class
+
+
+def _deadline(seconds=5.0):
+    return time.monotonic() + seconds
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_reserved_slots_keep_account_requests_undelayed():
+    scheduler = ProviderScheduler(max_in_flight=4)
+    held = [await scheduler.acquire("status", _deadline()) for _ in range(2)]
+    blocked = asyncio.ensure_future(scheduler.acquire("status", _deadline()))
+    await _settle()
+    assert not blocked.done()  # status may only use max_in_flight - reserved
+
+    account = await asyncio.wait_for(scheduler.acquire("account", _deadline()), 0.1)
+    execution = await asyncio.wait_for(scheduler.acquire("execution", _deadline()), 0.1)
+    assert scheduler.in_flight == 4
+
+    for ticket in held + [account, execution]:
+        scheduler.release(ticket)
+    scheduler.release(await blocked)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_weighted_dispatch_does_not_starve_scans():
+    # max_in_flight=3 leaves one non-priority slot: status and scan compete for it
+    scheduler = ProviderScheduler(max_in_flight=3)
+    first = await scheduler.acquire("status", _deadline())
+    order = []
+
+    async def request(kind):
+        ticket = await scheduler.acquire(kind, _deadline())
+        order.append(kind)
+        await asyncio.sleep(0)
+        scheduler.release(ticket)
+
+    waiters = [asyncio.ensure_future(request("status")) for _ in range(8)]
+    waiters += [asyncio.ensure_future(request("scan")) for _ in range(2)]
+    await _settle()
+    assert order == []
+
+    scheduler.release(first)
+    await asyncio.gather(*waiters)
+    assert order.count("scan") == 2
+    assert order[:5].count("status") == 4  # 4:1 weight between status and scan
+    assert order.index("scan") < 5
+
+
+@pytest.mark.asyncio
+async def test_scan_backpressure_follows_available_scan_lines():
+    scheduler = ProviderScheduler(max_in_flight=12, available_scan_lines=0)
+    assert scheduler.scan_capacity() == 1  # no free lines still dispatches one scan at a time
+    scans = [asyncio.ensure_future(scheduler.acquire("scan", _deadline())) for _ in range(4)]
+    await _settle()
+    assert [s.done() for s in scans] == [True, False, False, False]
+
+    scheduler.set_available_scan_lines(45)  # 45 // 20 -> two concurrent scans
+    await _settle()
+    assert [s.done() for s in scans] == [True, True, False, False]
+    assert scheduler.metrics()["classes"]["scan"]["queued"] == 2
+
+    scheduler.release(scans[0].result())
+    await _settle()
+    assert scans[2].done() and not scans[3].done()
+
+
+@pytest.mark.asyncio
+async def test_external_scans_run_one_at_a_time_without_blocking_owner_scans():
+    scheduler = ProviderScheduler()
+    external = await scheduler.acquire("scan", _deadline(), external=True)
+    second_external = asyncio.ensure_future(scheduler.acquire("scan", _deadline(), external=True))
+    owner = asyncio.ensure_future(scheduler.acquire("scan", _deadline()))
+    await _settle()
+    assert owner.done() and not second_external.done()
+
+    scheduler.release(external)
+    await _settle()
+    assert second_external.done()
+
+
+@pytest.mark.asyncio
+async def test_queued_request_expires_at_deadline():
+    scheduler = ProviderScheduler(max_in_flight=3)
+    held = await scheduler.acquire("scan", _deadline())
+    with pytest.raises(DispatchTimeout):
+        await scheduler.acquire("scan", _deadline(0.05))
+    metrics = scheduler.metrics()["classes"]["scan"]
+    assert metrics["expired"] == 1 and metrics["queued"] == 0
+    scheduler.release(held)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_close_fails_queued_requests():
+    scheduler = ProviderScheduler(max_in_flight=3)
+    await scheduler.acquire("status", _deadline())
+    queued = asyncio.ensure_future(scheduler.acquire("status", _deadline()))
+    await _settle()
+    scheduler.close()
+    with pytest.raises(ConnectionError):
+        await queued
+    with pytest.raises(ConnectionError):
+        await scheduler.acquire("account", _deadline())
+
+
+def test_request_classes():
+    assert request_class("place_order") == "account"
+    assert request_class("get_ib_executions") == "account"
+    assert request_class("execution_status") == "execution"
+    assert request_class("fetch_chain") == "scan"
+    assert request_class("ib_status") == "status"
+    assert request_class("fetch_historical_bars") == "status"
+
+
+class _FakeWebSocket:
+    def __init__(self, registry):
+        self.registry = registry
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+        message = json.loads(text)
+        # Agent answers asynchronously, like the real message loop
+        asyncio.get_running_loop().call_later(
+            0.01, lambda: asyncio.ensure_future(
+                self.registry.resolve_request(message["request_id"], {"ok": message["request_type"]}, 42)
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_send_request_to_provider_reports_scheduler_metrics(monkeypatch):
+    registry = ws_relay.ProviderRegistry()
+    monkeypatch.setattr(ws_relay, "registry", registry)
+    websocket = _FakeWebSocket(registry)
+    await registry.register_provider("p1", websocket, "user-1")
+
+    results = await asyncio.gather(*[
+        ws_relay.send_request_to_provider(kind, {"n": i}, timeout=5.0, user_id="user-1")
+        for i, kind in enumerate(["get_positions", "fetch_chain", "ib_status", "fetch_chain"])
+    ])
+    assert [r["ok"] for r in results] == ["get_positions", "fetch_chain", "ib_status", "fetch_chain"]
+    assert len(websocket.sent) == 4
+
+    scheduler_status = registry.get_status()["providers"][0]["scheduler"]
+    assert scheduler_status["in_flight"] == 0
+    assert scheduler_status["classes"]["scan"]["dispatched"] == 2
+    assert scheduler_status["classes"]["account"]["dispatched"] == 1
+
+    await registry.unregister_provider("p1")
+    with pytest.raises(HTTPException) as exc:
+        await ws_relay.send_request_to_provider("ib_status", {}, timeout=1.0, user_id="user-1")
+    assert exc.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_request_cancelled_before_send_releases_its_slot(monkeypatch):
+    registry = ws_relay.ProviderRegistry()
+    monkeypatch.setattr(ws_relay, "registry", registry)
+    websocket = _FakeWebSocket(registry)
+    await registry.register_provider("p1", websocket, "user-1")
+    scheduler = registry.providers["p1"]._scheduler
+
+    # Park the request in add_pending_request (waiting on the registry lock) with its slot taken
+    lock_free = asyncio.Event()
+    add_pending_request = registry.add_pending_request
+
+    async def contended_add_pending_request(pending):
+        await lock_free.wait()
+        await add_pending_request(pending)
+
+    monkeypatch.setattr(registry, "add_pending_request", contended_add_pending_request)
+    request = asyncio.ensure_future(
+        ws_relay.send_request_to_provider("fetch_chain", {}, timeout=5.0, user_id="user-1")
+    )
+    await _settle()
+    assert scheduler.in_flight == 1
+    request.cancel()  # e.g. the HTTP client went away
+    await _settle()
+    assert request.cancelled()
+    assert scheduler.in_flight == 0 and not registry.pending_requests and not websocket.sent
+
+    lock_free.set()
+    result = await ws_relay.send_request_to_provider("fetch_chain", {}, timeout=5.0, user_id="user-1")
+    assert result == {"ok": "fetch_chain"}
+
+
+@pytest.mark.asyncio
+async def test_text_frame_size_is_counted_in_bytes():
+    class FakeWebSocket:
+        async def receive(self):
+            return {"type": "websocket.receive", "text": json.dumps({"name": "Société Générale €"}, ensure_ascii=False)}
+
+    message, size = await ws_relay._receive_provider_message(FakeWebSocket())
+    assert message["name"] == "Société Générale €"
+    assert size == len(json.dumps(message, ensure_ascii=False).encode("utf-8")) > len(json.dumps(message, ensure_ascii=False))
@@ -0,0 +1,155 @@
+"""Tests for the shared SEC ticker <-> CIK index, offline against a fixture file."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services import sec_ticker_index as sti
+from app.services.sec_ticker_index import SecTickerIndex, get_sec_ticker_index
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sec_company_tickers.json"
+COMPANIES = json.loads(FIXTURE.read_text())
+
+
+class _FakeSec:
+    """MockTransport handler for sec.gov/files/company_tickers.json."""
+
+    def __init__(self, companies=COMPANIES, etag='"v1"'):
+        self.companies = companies
+        self.etag = etag
+        self.requests = []
+        self.fail = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail:
+            return httpx.Response(503)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=self.companies,
+            headers={"ETag": self.etag, "Last-Modified": "Mon, 06 Jul 2026 10:00:00 GMT"},
+        )
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "sec_company_tickers.json"
+    monkeypatch.setattr(sti, "SEC_TICKER_MAP_PATH", str(path))
+    sti.reset_sec_ticker_index()
+    yield path
+    sti.reset_sec_ticker_index()
+
+
+def test_lookups_in_both_directions_and_by_name_prefix():
+    index = SecTickerIndex(COMPANIES)
+    assert len(index) == 12  # the ticker-less row is skipped
+
+    assert index.by_ticker("staa").cik == "0001272661"
+    assert index.by_ticker("BRK-B").title == "BERKSHIRE HATHAWAY INC"
+    assert index.by_ticker("NOPE") is None
+
+    # CIK accepted as int, bare or padded string; dual-class CIK -> primary listing
+    assert index.by_cik(1652044).ticker == "GOOGL"
+    assert index.by_cik("0001652044").ticker == "GOOGL"
+    assert index.tickers_for_cik("1652044") == ["GOOGL", "GOOG"]
+    assert index.by_cik(999999) is None
+
+    assert index.by_title("microsoft corp").ticker == "MSFT"
+    assert [c.ticker for c in index.search_prefix("abb")] == ["ABT", "ABBV"]
+    assert {c.ticker for c in index.search_prefix("Alphabet")} == {"GOOGL", "GOOG"}
+    assert [c.ticker for c in index.search_prefix("cidara therap")] == ["CDTX"]
+    assert index.search_prefix("Electronic Arts Inc.", limit=1)[0].ticker == "EA"
+    assert index.search_prefix("") == [] and index.search_prefix("zzz") == []
+
+
+@pytest.mark.asyncio
+async def test_first_load_fetches_once_for_concurrent_callers_and_persists(cache_path):
+    sec = _FakeSec()
+    async with sec.client() as client:
+        indexes = await asyncio.gather(*(get_sec_ticker_index(client) for _ in range(5)))
+    assert len(sec.requests) == 1
+    assert all(i is indexes[0] for i in indexes)
+    assert sec.requests[0].headers["User-Agent"] == sti.SEC_USER_AGENT
+
+    saved = json.loads(cache_path.read_text())
+    assert saved["etag"] == '"v1"' and saved["companies"] == COMPANIES
+
+    # A new process starts from the local copy without touching the network
+    sti.reset_sec_ticker_index()
+    offline = _FakeSec()
+    offline.fail = True
+    async with offline.client() as client:
+        index = await get_sec_ticker_index(client)
+    assert offline.requests == [] and index.by_ticker("AAPL").cik == "0000320193"
+
+
+@pytest.mark.asyncio
+async def test_stale_index_is_revalidated_with_conditional_get(cache_path, monkeypatch):
+    sec = _FakeSec()
+    async with sec.client() as client:
+        first = await get_sec_ticker_index(client)
+        first.fetched_at = time.time() - sti.SEC_TICKER_MAP_MAX_AGE_SEC - 1
+
+        # Stale: served immediately, revalidated in the background
+        assert await get_sec_ticker_index(client) is first
+        await sti._refresh_task
+        assert sec.requests[-1].headers["If-None-Match"] == '"v1"'
+        assert sec.requests[-1].headers["If-Modified-Since"] == "Mon, 06 Jul 2026 10:00:00 GMT"
+        assert await get_sec_ticker_index(client) is first  # 304 keeps the index
+        assert time.time() - first.fetched_at < 5
+
+        # Changed upstream: the new map is swapped in
+        sec.companies = {**COMPANIES, "99": {"cik_str": 42, "ticker": "NEWCO", "title": "NEWCO INC"}}
+        sec.etag = '"v2"'
+        first.fetched_at = 0
+        await get_sec_ticker_index(client)
+        await sti._refresh_task
+        current = await get_sec_ticker_index(client)
+    assert current is not first and current.by_ticker("NEWCO").cik == "0000000042"
+    assert len(sec.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_cached_index(cache_path):
+    sec = _FakeSec()
+    async with sec.client() as client:
+        first = await get_sec_ticker_index(client)
+        first.fetched_at = 0
+        sec.fail = True
+        await get_sec_ticker_index(client)
+        await sti._refresh_task
+        assert await get_sec_ticker_index(client) is first
+
+
+@pytest.mark.asyncio
+async def test_edgar_components_share_the_index(cache_path):
+    from app.research.universe.edgar_scraper import CompanyMetadataResolver
+    from app.services.ticker_lookup import TickerLookupService
+
+    sec = _FakeSec()
+    async with sec.client() as client:
+        await get_sec_ticker_index(client)
+
+    resolver = CompanyMetadataResolver()
+    assert await resolver.cik_to_ticker("1652044") == "GOOGL"
+    assert await resolver.ticker_to_cik("staa") == "0001272661"
+    assert (await resolver.load_ticker_map())["0001652044"] == {"ticker": "GOOGL", "name": "Alphabet Inc."}
+
+    lookup = TickerLookupService()
+    try:
+        assert await lookup.lookup_by_ticker("abbv") == {
+            "ticker": "ABBV", "company_name": "ABBVIE INC.", "cik": "0001551152",
+        }
+        exact = await lookup.lookup_by_company_name("Microsoft Corp")
+        assert exact["ticker"] == "MSFT" and exact["similarity_score"] == 1.0
+    finally:
+        await lookup.close()
+    assert len(sec.requests) == 1
@@ -0,0 +1,309 @@
+"""Bulk (executemany) upsert path of TradeDatabase.
+
+The fake-pool tests always run.  The live tests exercise the real conflict
+semantics and only run when TRADE_HISTORY_TEST_DATABASE_URL points at a
+disposable local Postgres, e.g.
+
+    docker run --rm -p 5433:5432 -e POSTGRES_PASSWORD=pg postgres:16
+    TRADE_HISTORY_TEST_DATABASE_URL=postgresql://postgres:pg@localhost:5433/postgres \
+        pytest tests/test_trade_history_bulk_upsert.py
+
+Each live test runs in its own schema built from the algo_* migrations and
+drops it afterwards.
+"""
+
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.trade_history.database import TradeDatabase
+
+LIVE_DB_URL = os.getenv("TRADE_HISTORY_TEST_DATABASE_URL", "")
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations"
+ALGO_MIGRATIONS = (
+    "049_algo_trade_history.sql",
+    "052_position_annotations.sql",
+    "061_canonical_execution_ledger.sql",
+    "062_execution_ledger_spread_metrics.sql",
+)
+
+
+def _position(n, fills=2, **overrides):
+    pos = {
+        "id": f"bmc_risk_{n}",
+        "status": "closed",
+        "parent_strategy": "bmc_spy",
+        "instrument": {"symbol": "SPY", "secType": "OPT", "strike": 600.0, "expiry": "20260320", "right": "C"},
+        "entry": {"avg_price": 1.25, "quantity": 2, "fill_time": 1774532700.0 + n},
+        "fill_log": [
+            {
+                "time": 1774532700.0 + n + i,
+                "order_id": 1000 + n,
+                "exec_id": f"0000e1a7.{n:06d}.{i:02d}",
+                "level": "entry" if i == 0 else "trailing",
+                "qty_filled": 1,
+                "avg_price": 1.25 + 0.1 * i,
+                "execution_analytics": {"commission": 0.65},
+            }
+            for i in range(fills)
+        ],
+        "created_at": 1774532700.0 + n,
+    }
+    pos.update(overrides)
+    return pos
+
+
+def _execution(n, **overrides):
+    execution = {
+        "broker_execution_key": f"exec:U1:0000e1a7.{n:06d}.01",
+        "position_id": f"bmc_risk_{n}",
+        "exec_id": f"0000e1a7.{n:06d}.01",
+        "order_id": 1000 + n,
+        "perm_id": 900000 + n,
+        "contract_key": "SPY:600:20260320:C",
+        "side": "BOT",
+        "qty_filled": 1,
+        "avg_price": 1.25,
+        "fill_time": 1774532700.0 + n,
+    }
+    execution.update(overrides)
+    return execution
+
+
+def _reservation(n, **overrides):
+    reservation = {
+        "reservation_id": f"res{n}",
+        "strategy_id": "bmc_spy",
+        "contract_key": "SPY:600:20260320:C",
+        "reserved_qty": 1,
+        "order_id": 1000 + n,
+        "active": True,
+        "updated_at": 1774532700.0 + n,
+    }
+    reservation.update(overrides)
+    return reservation
+
+
+# ── Fake pool ──
+
+
+class _FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.savepoints.append(len(self.conn.calls))
+
+    async def __aexit__(self, exc_type, exc, tb):
+        mark = self.conn.savepoints.pop()
+        if exc_type is not None:
+            del self.conn.calls[mark:]
+        return False
+
+
+class _FakeConn:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.savepoints = []
+        self.fail_on = fail_on
+
+    def transaction(self):
+        return _FakeTransaction(self)
+
+    def _check(self, args):
+        if self.fail_on and self.fail_on in args:
+            raise ValueError(f"rejected {self.fail_on}")
+
+    async def execute(self, query, *args):
+        self._check(args)
+        self.calls.append(("execute", query, args))
+
+    async def executemany(self, query, rows):
+        for args in rows:
+            self._check(args)
+        self.calls.append(("executemany", query, list(rows)))
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def _db(conn):
+    db = TradeDatabase(database_url="postgresql://example")
+    db.pool = _FakePool(conn)
+    return db
+
+
+def _rows_written(conn):
+    """Flatten calls into (query, args) in execution order."""
+    rows = []
+    for kind, query, payload in conn.calls:
+        rows.extend((query, args) for args in (payload if kind == "executemany" else [payload]))
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_positions_batch_uses_one_executemany_per_statement():
+    conn = _FakeConn()
+    positions = [_position(n, fills=3) for n in range(50)]
+    positions[7]["annotation_hint"] = {"manual_intervention": True, "intervention_type": "manual_tws_exit"}
+
+    assert await _db(conn).upsert_positions("user-1", positions) == 50
+
+    assert [kind for kind, _, _ in conn.calls] == ["executemany"] * 4
+    sizes = [len(rows) for _, _, rows in conn.calls]
+    assert sizes == [50, 150, 50, 1]  # positions, fills, trims, hints (first-seen order)
+
+
+@pytest.mark.asyncio
+async def test_bulk_writes_same_rows_as_per_row_path():
+    positions = [_position(n, fills=n % 3) for n in range(10)]
+    bulk_conn, row_conn = _FakeConn(), _FakeConn()
+    await _db(bulk_conn).upsert_positions("user-1", positions)
+    db = _db(row_conn)
+    for pos in positions:
+        await db._upsert_one_position(row_conn, "user-1", pos)
+
+    def key(row):
+        return row[0], repr(row[1])
+
+    assert sorted(_rows_written(bulk_conn), key=key) == sorted(_rows_written(row_conn), key=key)
+
+
+@pytest.mark.asyncio
+async def test_rejected_row_falls_back_to_per_row_savepoints():
+    conn = _FakeConn(fail_on="exec:U1:0000e1a7.000003.01")
+    executions = [_execution(n) for n in range(6)]
+
+    assert await _db(conn).upsert_executions("user-1", executions) == 5
+
+    assert all(kind == "execute" for kind, _, _ in conn.calls)
+    keys = [args[1] for _, args in _rows_written(conn)]
+    assert keys == [e["broker_execution_key"] for i, e in enumerate(executions) if i != 3]
+
+
+@pytest.mark.asyncio
+async def test_unbuildable_record_is_skipped_before_bulk_write():
+    conn = _FakeConn()
+    executions = [_execution(n) for n in range(4)]
+    executions[1]["instrument"] = "SPY"  # not a dict: building its args raises
+
+    assert await _db(conn).upsert_executions("user-1", executions) == 3
+
+    assert [kind for kind, _, _ in conn.calls] == ["executemany"]
+    assert len(conn.calls[0][2]) == 3
+
+
+@pytest.mark.asyncio
+async def test_duplicate_position_ids_use_ordered_per_row_path():
+    conn = _FakeConn()
+    positions = [_position(1, fills=3), _position(1, fills=1)]
+
+    assert await _db(conn).upsert_positions("user-1", positions) == 2
+
+    assert all(kind == "execute" for kind, _, _ in conn.calls)
+    trims = [args for query, args in _rows_written(conn) if query.startswith("DELETE FROM algo_fills")]
+    assert trims[-1] == ("user-1", "bmc_risk_1", 1)
+
+
+# ── Live Postgres harness ──
+
+live = pytest.mark.skipif(not LIVE_DB_URL, reason="TRADE_HISTORY_TEST_DATABASE_URL not set")
+
+
+@pytest_asyncio.fixture
+async def live_db():
+    asyncpg = pytest.importorskip("asyncpg")
+    schema = f"trade_history_test_{uuid.uuid4().hex[:8]}"
+    admin = await asyncpg.connect(LIVE_DB_URL)
+    await admin.execute(f"CREATE SCHEMA {schema}")
+    await admin.execute(f"SET search_path TO {schema}, public")
+    for name in ALGO_MIGRATIONS:
+        await admin.execute((MIGRATIONS / name).read_text())
+
+    db = TradeDatabase(database_url=LIVE_DB_URL)
+    db.pool = await asyncpg.create_pool(
+        LIVE_DB_URL, min_size=1, max_size=2, server_settings={"search_path": f"{schema},public"},
+    )
+    try:
+        yield db
+    finally:
+        await db.disconnect()
+        await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+        await admin.close()
+
+
+@live
+@pytest.mark.asyncio
+async def test_live_bulk_positions_upsert_and_trim(live_db):
+    positions = [_position(n, fills=3) for n in range(200)]
+    assert await live_db.upsert_positions("user-1", positions) == 200
+
+    # Re-push: statuses change and fill logs shrink (purged phantom fills)
+    for pos in positions:
+        pos["status"] = "active"
+        pos["fill_log"] = pos["fill_log"][:1]
+    assert await live_db.upsert_positions("user-1", positions) == 200
+
+    async with live_db.pool.acquire() as conn:
+        assert await conn.fetchval("SELECT COUNT(*) FROM algo_positions WHERE status = 'active'") == 200
+        assert await conn.fetchval("SELECT COUNT(*) FROM algo_fills") == 200
+
+
+@live
+@pytest.mark.asyncio
+async def test_live_bad_row_keeps_rest_of_batch(live_db):
+    executions = [_execution(n) for n in range(20)]
+    executions[5]["side"] = "X" * 50  # exceeds VARCHAR(10)
+    assert await live_db.upsert_executions("user-1", executions) == 19
+
+    reservations = [_reservation(n) for n in range(20)]
+    assert await live_db.upsert_exit_reservations("user-1", reservations) == 20
+    reservations[0]["active"] = False
+    assert await live_db.upsert_exit_reservations("user-1", reservations[:1]) == 1
+
+    async with live_db.pool.acquire() as conn:
+        assert await conn.fetchval("SELECT COUNT(*) FROM algo_executions") == 19
+        assert await conn.fetchval("SELECT COUNT(*) FROM algo_exit_reservations WHERE active") == 19
+
+
+@live
+@pytest.mark.asyncio
+async def test_live_reconnect_sized_batch_timing(live_db):
+    """Full mark_all_dirty() re-push: bulk must beat the row-by-row path."""
+    positions = [_position(n, fills=4) for n in range(500)]
+
+    started = time.perf_counter()
+    assert await live_db.upsert_positions("user-1", positions) == 500
+    bulk_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async with live_db.pool.acquire() as conn:
+        async with conn.transaction():
+            for pos in positions:
+                async with conn.transaction():
+                    await live_db._upsert_one_position(conn, "user-1", pos)
+    per_row_sec = time.perf_counter() - started
+
+    print(f"500 positions x 4 fills: bulk {bulk_sec * 1000:.0f} ms, per-row {per_row_sec * 1000:.0f} ms")
+    assert bulk_sec < per_row_sec
@@ -0,0 +1,109 @@
+"""Black-Scholes IV + greeks throughput: per-contract scalar loop vs array functions.
+
+Times what OptionsDataLoader.reconstruct_chain does per chain (implied vol,
+then delta, gamma and theta where IV was found) for the scalar per-contract
+implementation and the array forms, at several chain sizes. Quotes are
+Black-Scholes prices with some noise, as in tests/test_black_scholes.py.
+
+    python tools/bench_black_scholes.py --sizes 50 500 5000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.research.market_data.black_scholes import (  # noqa: E402
+    bs_delta_array, bs_gamma_array, bs_theta_array, implied_volatility_array,
+)
+from test_black_scholes import (  # noqa: E402
+    legacy_delta, legacy_gamma, legacy_iv, legacy_price, legacy_theta,
+)
+
+
+def _chain(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    S = 100.0
+    rows = []
+    for _ in range(n):
+        K = S * rng.uniform(0.6, 1.5)
+        T = rng.randint(1, 720) / 365
+        kind = rng.choice("CP")
+        fair = legacy_price(S, K, T, 0.045, rng.uniform(0.15, 1.2), kind)
+        rows.append((max(round(fair * rng.uniform(0.97, 1.03), 2), 0.01), S, K, T, 0.045, kind))
+    return rows
+
+
+def scalar(rows):
+    out = []
+    for price, S, K, T, r, kind in rows:
+        iv = legacy_iv(price, S, K, T, r, kind)
+        if iv:
+            out.append((iv, legacy_delta(S, K, T, r, iv, kind), legacy_gamma(S, K, T, r, iv),
+                        legacy_theta(S, K, T, r, iv, kind)))
+        else:
+            out.append(None)
+    return out
+
+
+def vectorized(columns):
+    price, S, K, T, r, is_call = columns
+    iv = implied_volatility_array(price, S, K, T, r, is_call)
+    return iv, bs_delta_array(S, K, T, r, iv, is_call), bs_gamma_array(S, K, T, r, iv), \
+        bs_theta_array(S, K, T, r, iv, is_call)
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for n in args.sizes:
+        rows = _chain(n, seed=n)
+        price, S, K, T, r, kind = zip(*rows)
+        columns = (np.array(price), np.array(S), np.array(K), np.array(T), np.array(r), np.array(kind) == "C")
+
+        reference, (iv, *_) = scalar(rows), vectorized(columns)
+        found_old = sum(x is not None for x in reference)
+        agree = sum(1 for x, v in zip(reference, iv) if x is not None and abs(x[0] - v) < 1e-4)
+
+        old_s = _best(lambda: scalar(rows), args.repeat)
+        new_s = _best(lambda: vectorized(columns), args.repeat)
+        results.append({
+            "contracts": n,
+            "scalar_ms": round(old_s * 1e3, 2),
+            "array_ms": round(new_s * 1e3, 2),
+            "scalar_contracts_per_s": round(n / old_s),
+            "array_contracts_per_s": round(n / new_s),
+            "speedup": round(old_s / new_s, 1),
+            "iv_found_scalar": found_old,
+            "iv_found_array": int(np.count_nonzero(~np.isnan(iv))),
+            "iv_agree_1e-4": agree,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
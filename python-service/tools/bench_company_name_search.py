@@ -0,0 +1,200 @@
+"""Company-name lookup cost: ILIKE / LOWER() = LOWER() vs trigram-indexed keys.
+
+In process, always: company_name_key() over a synthetic 1M-filing name set,
+uncached vs through its LRU cache for a hot working set of names.
+
+Against Postgres, with --dsn: loads the same synthetic filings into a scratch
+schema, applies migrations/068_company_name_trigram.sql there and times
+EdgarCrossReference's old (ILIKE '%name%') and new (word similarity on
+company_name_key) filing searches, and the aggregator's old (LOWER = LOWER)
+and new (similarity on company_name_key) deal-name matches. Queries use
+spelling variants of the stored names ("Inc." vs "Incorporated", "Corp" vs
+"Corporation", dropped/added "The"), and recall is the share of queries that
+find the intended company. The scratch schema is dropped afterwards.
+
+    python tools/bench_company_name_search.py --filings 1000000 --dsn postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.utils.company_names import COMPANY_NAME_SIMILARITY_THRESHOLD, company_name_key  # noqa: E402
+
+MIGRATION = ROOT / "migrations" / "068_company_name_trigram.sql"
+SCHEMA = "bench_company_names"
+
+_WORDS = ["Acme", "Apex", "Blue", "Harbor", "Summit", "Nova", "Pioneer", "Granite", "Vertex", "Atlas", "Cedar",
+          "Quantum", "Silver", "Northern", "Pacific", "Bio", "Thera", "Energy", "Capital", "Systems", "Therapeutics",
+          "Financial", "Networks", "Pharma", "Foods", "Realty", "Semiconductor", "Mining", "Media", "Health"]
+_SUFFIX_VARIANTS = [("Inc.", "Incorporated"), ("Corp", "Corporation"), ("Ltd", "Limited"), ("Co.", "Company"),
+                    ("Holdings, Inc.", "Holdings Incorporated"), ("PLC", "plc")]
+
+
+def _companies(n: int, rng: random.Random) -> list:
+    """(stored name, query variant) pairs for n distinct synthetic companies."""
+    seen, out = set(), []
+    while len(out) < n:
+        base = " ".join(rng.sample(_WORDS, rng.randint(1, 3))) + f" {rng.randint(1, 999)}" * (rng.random() < 0.3)
+        if base in seen:
+            continue
+        seen.add(base)
+        stored_suffix, query_suffix = rng.choice(_SUFFIX_VARIANTS)
+        if rng.random() < 0.5:
+            stored_suffix, query_suffix = query_suffix, stored_suffix
+        stored = f"{base} {stored_suffix}"
+        query = f"{base}, {query_suffix}"
+        if rng.random() < 0.2:
+            stored = "The " + stored
+        out.append((stored.upper() if rng.random() < 0.5 else stored, query))
+    return out
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_keys(names: list, hot: list, repeat: int) -> dict:
+    uncached = company_name_key.__wrapped__
+    company_name_key.cache_clear()
+    cold_s = _best(lambda: [uncached(n) for n in names], repeat) / len(names)
+    lookups = hot * (200000 // len(hot))
+    uncached_hot_s = _best(lambda: [uncached(n) for n in lookups], repeat) / len(lookups)
+    cached_hot_s = _best(lambda: [company_name_key(n) for n in lookups], repeat) / len(lookups)
+    return {
+        "key_uncached_us": round(cold_s * 1e6, 3),
+        "hot_lookups": len(lookups),
+        "hot_distinct_names": len(hot),
+        "hot_uncached_us": round(uncached_hot_s * 1e6, 3),
+        "hot_cached_us": round(cached_hot_s * 1e6, 3),
+        "hot_speedup": round(uncached_hot_s / cached_hot_s, 1),
+    }
+
+
+async def bench_sql(dsn: str, companies: list, filings: int, queries: int, repeat: int, rng: random.Random) -> dict:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public")
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path = {SCHEMA}, public")
+        await conn.execute(
+            """CREATE TABLE edgar_filings (
+                   filing_id BIGSERIAL PRIMARY KEY, company_name TEXT, filing_date DATE, status TEXT);
+               CREATE INDEX ON edgar_filings (filing_date DESC);
+               CREATE TABLE deal_intelligence (
+                   deal_id BIGSERIAL PRIMARY KEY, target_name TEXT, deal_status TEXT,
+                   first_detected_at TIMESTAMPTZ DEFAULT now());"""
+        )
+        today = date.today()
+        rows = [(companies[i % len(companies)][0], today - timedelta(days=rng.randrange(730)),
+                 "analyzed" if rng.random() < 0.9 else "pending") for i in range(filings)]
+        load_start = time.perf_counter()
+        await conn.copy_records_to_table("edgar_filings", records=rows,
+                                         columns=["company_name", "filing_date", "status"])
+        await conn.copy_records_to_table("deal_intelligence", records=[(c[0], "rumored") for c in companies],
+                                         columns=["target_name", "deal_status"])
+        load_s = time.perf_counter() - load_start
+        index_start = time.perf_counter()
+        await conn.execute(MIGRATION.read_text())
+        index_s = time.perf_counter() - index_start
+
+        cutoff = today - timedelta(days=90)
+        sample = rng.sample(companies, min(queries, len(companies)))
+
+        async def filing_old(stored, query):
+            rows = await conn.fetch(
+                """SELECT filing_id, company_name FROM edgar_filings
+                   WHERE company_name ILIKE $1 AND filing_date >= $2 AND status = 'analyzed'
+                   ORDER BY filing_date DESC""", f"%{query}%", cutoff)
+            return any(r["company_name"] == stored for r in rows)
+
+        async def filing_new(stored, query):
+            rows = await conn.fetch(
+                """SELECT filing_id, company_name FROM edgar_filings
+                   WHERE $1 <% company_name_key(company_name)
+                     AND word_similarity($1, company_name_key(company_name)) >= $3
+                     AND filing_date >= $2 AND status = 'analyzed'
+                   ORDER BY filing_date DESC""", company_name_key(query), cutoff, COMPANY_NAME_SIMILARITY_THRESHOLD)
+            return any(r["company_name"] == stored for r in rows)
+
+        async def deal_old(stored, query):
+            row = await conn.fetchrow(
+                """SELECT target_name FROM deal_intelligence
+                   WHERE LOWER(target_name) = LOWER($1) AND deal_status NOT IN ('completed', 'terminated')
+                   ORDER BY first_detected_at DESC LIMIT 1""", query)
+            return row is not None and row["target_name"] == stored
+
+        async def deal_new(stored, query):
+            row = await conn.fetchrow(
+                """SELECT target_name FROM deal_intelligence
+                   WHERE company_name_key(target_name) % $1
+                     AND similarity(company_name_key(target_name), $1) >= $2
+                     AND deal_status NOT IN ('completed', 'terminated')
+                   ORDER BY similarity(company_name_key(target_name), $1) DESC, first_detected_at DESC
+                   LIMIT 1""", company_name_key(query), COMPANY_NAME_SIMILARITY_THRESHOLD)
+            return row is not None and row["target_name"] == stored
+
+        result = {"load_s": round(load_s, 1), "migration_s": round(index_s, 1), "queries": len(sample)}
+        for label, fn in (("filing_ilike", filing_old), ("filing_trgm", filing_new),
+                          ("deal_lower_eq", deal_old), ("deal_trgm", deal_new)):
+            timings, found = [], 0
+            for stored, query in sample:
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    hit = await fn(stored, query)
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+                found += hit
+            result[f"{label}_median_ms"] = round(statistics.median(timings) * 1e3, 2)
+            result[f"{label}_p95_ms"] = round(sorted(timings)[int(len(timings) * 0.95) - 1] * 1e3, 2)
+            result[f"{label}_recall"] = round(found / len(sample), 3)
+        return result
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filings", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=50_000, help="distinct filer names")
+    parser.add_argument("--hot", type=int, default=2_000, help="distinct names in the hot lookup set")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dsn", help="Postgres DSN; the SQL comparison is skipped without it")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    companies = _companies(args.companies, rng)
+    names = [companies[i % len(companies)][0] for i in range(args.filings)]
+    hot = [q for _, q in companies[:args.hot]]
+
+    result = {"filings": args.filings, "companies": len(companies)}
+    result.update(bench_keys(names, hot, args.repeat))
+    if args.dsn:
+        result.update(asyncio.run(bench_sql(args.dsn, companies, args.filings, args.queries, args.repeat, rng)))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
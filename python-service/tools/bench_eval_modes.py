@@ -0,0 +1,124 @@
+"""Compare tick-to-decision latency and CPU of the execution engine's eval modes.
+
+Drives a real StreamingQuoteCache + ExecutionEngine with synthetic ticks
+(no TWS needed) and prints the engine's tick-to-decision histogram for
+poll mode and event mode.
+
+    python tools/bench_eval_modes.py --strategies 50 --tick-hz 20 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGENT = ROOT / "standalone_agent"
+if str(AGENT) not in sys.path:
+    sys.path.insert(0, str(AGENT))
+
+from execution_engine import ExecutionEngine, ExecutionStrategy  # noqa: E402
+from quote_cache import StreamingQuoteCache  # noqa: E402
+
+
+class _ResourceManager:
+    execution_lines_held = 0
+    available_for_scan = 100
+
+    def acquire_execution_lines(self, n, allocation_key=None):
+        return True
+
+    def release_execution_lines(self, n, allocation_key=None):
+        return None
+
+
+class _Scanner:
+    connection_lost = False
+
+    def __init__(self):
+        self._req_id = 0
+
+    def get_next_req_id(self):
+        self._req_id += 1
+        return self._req_id
+
+    def reqMktData(self, *args):
+        return None
+
+    def cancelMktData(self, *args):
+        return None
+
+    def cancelOrder(self, *args):
+        return None
+
+    def add_order_status_listener(self, _):
+        return None
+
+    add_exec_details_listener = remove_order_status_listener = remove_exec_details_listener = add_order_status_listener
+
+
+class _NoopStrategy(ExecutionStrategy):
+    def __init__(self, key: str):
+        self.key = key
+
+    def get_subscriptions(self, config):
+        return [{"cache_key": self.key, "contract": {"symbol": self.key}}]
+
+    def evaluate(self, quotes, config):
+        return []
+
+    def on_fill(self, order_id, fill_data, config):
+        return None
+
+
+def run_mode(mode: str, strategies: int, tick_hz: float, seconds: float) -> dict:
+    cache = StreamingQuoteCache(_ResourceManager())
+    engine = ExecutionEngine(_Scanner(), cache, _ResourceManager(), eval_mode=mode)
+    keys = [f"SYM{i}" for i in range(strategies)]
+    for key in keys:
+        engine.load_strategy(key, _NoopStrategy(key), {})
+    req_ids = [cache._key_to_req_id[k] for k in keys]
+
+    stop = threading.Event()
+
+    def _ticker():
+        rng = random.Random(7)
+        period = 1.0 / tick_hz
+        while not stop.is_set():
+            cache.update_price(rng.choice(req_ids), 1, 100.0 + rng.random())
+            time.sleep(period * rng.random() * 2)
+
+    engine.start()
+    cpu_start = time.process_time()
+    feeder = threading.Thread(target=_ticker, daemon=True)
+    feeder.start()
+    time.sleep(seconds)
+    stop.set()
+    feeder.join()
+    cpu = time.process_time() - cpu_start
+    latency = engine.get_status()["tick_to_decision_latency"]
+    evals = sum(s.eval_count for s in engine._strategies.values())
+    engine.stop()
+    return {"mode": mode, "cpu_seconds": round(cpu, 3), "evaluations": evals, "latency": latency}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategies", type=int, default=50)
+    parser.add_argument("--tick-hz", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    results = [
+        run_mode(mode, args.strategies, args.tick_hz, args.seconds)
+        for mode in ExecutionEngine.EVAL_MODES
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""HTML-to-text cost and cache-tier latency for EDGAR filing documents.
+
+Builds a synthetic inline-styled filing (--kb of HTML, similar in tag density
+to iXBRL 8-K/DEFM14A documents) and compares:
+
+- old MADetector conversion: two full-document regex passes, then truncate
+- html_to_text(): windowed conversion that stops at max_chars
+- FilingCache memory-hit and disk-hit latency (gzip JSON on local disk)
+
+    python tools/bench_filing_cache.py --kb 2000 --max-chars 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.edgar.filing_cache import FilingCache, FilingDocument, html_to_text  # noqa: E402
+
+
+def _filing(kb: int) -> str:
+    rng = random.Random(7)
+    words = ["merger", "agreement", "the", "company", "shall", "per", "share", "consideration", "closing", "of"]
+    parts = ["<html><body>"]
+    size = 0
+    while size < kb * 1024:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(3, 15)))
+        row = (f'<div style="margin-top:0pt;font-family:Times New Roman;font-size:10pt">'
+               f'<span style="font-weight:bold">{sentence}</span>\n  </div>')
+        parts.append(row)
+        size += len(row)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb", type=int, default=2000)
+    parser.add_argument("--max-chars", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = _filing(args.kb)
+
+    def old():
+        text = re.sub(r'<[^>]+>', ' ', html)
+        return re.sub(r'\s+', ' ', text)[:args.max_chars]
+
+    assert old() == html_to_text(html, args.max_chars)
+    old_s = _best(old, args.repeat)
+    new_s = _best(lambda: html_to_text(html, args.max_chars), args.repeat)
+
+    cache_dir = tempfile.mkdtemp()
+    cache = FilingCache(cache_dir)
+    doc = FilingDocument("0000000000-26-000001", "https://www.sec.gov/x.htm", html)
+    cache._write_disk(doc)
+    cache._remember(doc)
+    disk_bytes = Path(cache._path(doc.key)).stat().st_size
+    disk_s = _best(lambda: cache._read_disk(doc.key), args.repeat)
+
+    async def memory_hits(n=1000):
+        for _ in range(n):
+            await cache.get_document(doc.url, doc.key)
+
+    mem_s = _best(lambda: asyncio.run(memory_hits()), args.repeat) / 1000
+
+    print(json.dumps({
+        "html_kb": len(html) // 1024,
+        "max_chars": args.max_chars,
+        "old_two_pass_ms": round(old_s * 1e3, 2),
+        "html_to_text_ms": round(new_s * 1e3, 2),
+        "conversion_speedup": round(old_s / new_s, 1),
+        "memory_hit_us": round(mem_s * 1e6, 2),
+        "disk_hit_ms": round(disk_s * 1e3, 2),
+        "disk_compression_ratio": round(len(html) / disk_bytes, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Messages/sec through IBMergerArbScanner, generic ibapi Decoder path vs fast-path decoders.
+
+Queues a message stream on an IBMergerArbScanner and drains it with
+EClient.run (queue.get, comm.read_fields, Decoder.interpret, the scanner's
+tick / order callbacks), once with Decoder.fastDecoders emptied (every
+message through process*Msg / interpretWithSignature, as before) and once
+with them. The scanner's option_chain holds every reqId in the stream, so
+ticks take the scan path that stores them. Both runs must leave the same
+option_chain.
+
+    python tools/bench_ibapi_decoder.py                              # synthetic stream
+    python tools/bench_ibapi_decoder.py --stream /tmp/tws.bin --server-version 176
+
+A recorded stream is the raw bytes TWS sent after the handshake, as for
+tools/bench_ibapi_reader.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "standalone_agent", ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import ib_scanner  # noqa: E402
+from ibapi import comm  # noqa: E402
+from ibapi.decoder import Decoder  # noqa: E402
+from ibapi.server_versions import MAX_CLIENT_VER  # noqa: E402
+from test_ibapi_decoder import message_stream  # noqa: E402
+
+
+def _scanner(req_ids, serverVersion: int, fast: bool):
+    scanner = ib_scanner.IBMergerArbScanner()
+    scanner.option_chain = {req_id: {} for req_id in req_ids}
+    scanner.decoder = Decoder(scanner, serverVersion)
+    if not fast:
+        scanner.decoder.fastDecoders = {}
+    return scanner
+
+
+def _run(msgs, req_ids, serverVersion: int, fast: bool, repeat: int):
+    best, chain = float("inf"), None
+    for _ in range(repeat):
+        scanner = _scanner(req_ids, serverVersion, fast)
+        scanner.msg_queue.put_many(msgs)
+        start = time.perf_counter()
+        scanner.run()  # not connected: drains the queue and returns
+        best = min(best, time.perf_counter() - start)
+        chain = scanner.option_chain
+        scanner.executor.shutdown(wait=False)
+    return best, copy.deepcopy(chain)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stream", help="raw TWS byte stream; synthetic when omitted")
+    parser.add_argument("--server-version", type=int, default=MAX_CLIENT_VER)
+    parser.add_argument("--messages", type=int, default=200000, help="synthetic stream length")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # orderStatus / execDetails log at INFO
+
+    if args.stream:
+        frames = comm.FrameBuffer()
+        frames.feed(Path(args.stream).read_bytes())
+        msgs, source = frames.read_msgs(), args.stream
+    else:
+        msgs, source = message_stream(args.messages, args.server_version), "synthetic"
+    fields = [comm.read_fields(m) for m in msgs]
+    req_ids = {int(f[2]) for f in fields if f[0] in (b"1", b"2", b"45", b"46")}
+    req_ids |= {int(f[1]) for f in fields if f[0] == b"21"}
+
+    generic_s, generic_chain = _run(msgs, req_ids, args.server_version, False, args.repeat)
+    fast_s, fast_chain = _run(msgs, req_ids, args.server_version, True, args.repeat)
+    assert generic_chain == fast_chain
+    print(json.dumps({
+        "stream": source,
+        "server_version": args.server_version,
+        "messages": len(msgs),
+        "mix": {k.decode(): v for k, v in Counter(f[0] for f in fields).most_common()},
+        "generic_msgs_per_s": round(len(msgs) / generic_s),
+        "fast_msgs_per_s": round(len(msgs) / fast_s),
+        "generic_us_per_msg": round(generic_s / len(msgs) * 1e6, 2),
+        "fast_us_per_msg": round(fast_s / len(msgs) * 1e6, 2),
+        "speedup": round(generic_s / fast_s, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
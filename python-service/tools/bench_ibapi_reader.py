@@ -0,0 +1,80 @@
+"""Replay a TWS byte stream through the legacy and FrameBuffer-based ibapi EReader.
+
+Each run feeds the same recvMsg() reads to both readers (the old buf += data /
+comm.read_msg loop and the current EReader) on the calling thread, with debug
+logging off, and times framing plus enqueueing. Queued messages are asserted
+identical. Reads are cut to --read-kb sizes; a large chain subscription's
+opening burst arrives as one big read, because Connection._recvAllMsg keeps
+reading while the socket returns full 4 KB chunks.
+
+    python tools/bench_ibapi_reader.py                          # synthetic tick stream
+    python tools/bench_ibapi_reader.py --stream /tmp/tws.bin    # recorded stream
+
+A recorded stream is the raw bytes TWS sent after the handshake (size-prefixed
+messages), e.g. the server-to-client half of a packet capture.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from test_ibapi_reader import EReader, LegacyEReader, MessageQueue, ReplayConn, drain, tick_stream  # noqa: E402
+
+
+def _reads(stream: bytes, size: int) -> list:
+    return [stream[i:i + size] for i in range(0, len(stream), size)]
+
+
+def _best(reader_cls, reads: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        reader = reader_cls(ReplayConn(reads), MessageQueue())
+        start = time.perf_counter()
+        reader.run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stream", help="raw TWS byte stream; synthetic ticks when omitted")
+    parser.add_argument("--messages", type=int, default=200000, help="synthetic stream length")
+    parser.add_argument("--read-kb", type=int, nargs="+", default=[4, 64, 1024])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.stream:
+        stream, source = Path(args.stream).read_bytes(), args.stream
+    else:
+        stream, source = tick_stream(args.messages), "synthetic"
+
+    runs = []
+    for kb in args.read_kb:
+        reads = _reads(stream, kb * 1024)
+        queued = drain(EReader, reads)
+        assert queued == drain(LegacyEReader, reads)
+        legacy_s = _best(LegacyEReader, reads, args.repeat)
+        new_s = _best(EReader, reads, args.repeat)
+        runs.append({
+            "read_kb": kb,
+            "reads": len(reads),
+            "legacy_ms": round(legacy_s * 1e3, 1),
+            "framebuffer_ms": round(new_s * 1e3, 1),
+            "legacy_msgs_per_s": round(len(queued) / legacy_s),
+            "framebuffer_msgs_per_s": round(len(queued) / new_s),
+            "speedup": round(legacy_s / new_s, 1),
+        })
+    print(json.dumps({"stream": source, "bytes": len(stream), "messages": len(queued), "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
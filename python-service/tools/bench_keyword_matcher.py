@@ -0,0 +1,153 @@
+"""Keyword-scan cost for EDGAR detection and headline parsing.
+
+Compares the per-keyword implementations (one ``in``/``find``/``re.search``
+per keyword, per occurrence) with the one-pass KeywordMatcher for the
+keyword checks MADetector.detect_ma_relevance() and the orchestrator's
+excerpt step run on every filing, and for HeadlineParser keyword checks.
+Results are asserted identical before timing.
+
+Corpus: filings saved by FilingCache under FILING_CACHE_DIR (converted with
+html_to_text at the detector's 50k-char limit); synthetic filings otherwise.
+
+    python tools/bench_keyword_matcher.py --filings 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.edgar.detector import MA_KEYWORDS, HISTORICAL_REFERENCE_KEYWORDS, MADetector  # noqa: E402
+from app.edgar.filing_cache import FILING_CACHE_DIR, html_to_text  # noqa: E402
+from app.intelligence.headline_parser import (  # noqa: E402
+    HEADLINE_KEYWORD_MATCHER, HISTORICAL_KEYWORDS, MA_ANNOUNCEMENT_KEYWORDS, RUMOR_KEYWORDS,
+    STRONG_ANNOUNCEMENT_KEYWORDS, HeadlineParser,
+)
+from test_keyword_matcher import (  # noqa: E402
+    legacy_excerpt, legacy_historical_near_keywords, legacy_keyword_scan, legacy_prefix_check,
+)
+
+
+def _cached_filings(limit: int) -> list:
+    texts = []
+    for path in sorted(glob.glob(os.path.join(FILING_CACHE_DIR, "*.json.gz")))[:limit]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            texts.append(html_to_text(json.load(f)["html"], 50000))
+    return texts
+
+
+def _synthetic_filings(n: int, density: float) -> list:
+    rng = random.Random(3)
+    words = ["the", "Company", "shall", "Agreement", "of", "per", "share", "closing", "Parent", "Merger Sub",
+             "pursuant", "to", "Section", "2.1", "effective", "time", "stockholders", "board", "directors"]
+    signal = MA_KEYWORDS + HISTORICAL_REFERENCE_KEYWORDS
+    texts = []
+    for _ in range(n):
+        parts = [rng.choice(signal) if rng.random() < density else rng.choice(words) for _ in range(9000)]
+        texts.append(" ".join(parts)[:50000])
+    return texts
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filings", type=int, default=50)
+    parser.add_argument("--density", type=float, default=0.01, help="keyword share of synthetic filing words")
+    parser.add_argument("--headlines", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = _cached_filings(args.filings)
+    source = "filing cache"
+    if not texts:
+        texts, source = _synthetic_filings(args.filings, args.density), "synthetic"
+
+    detector = MADetector(anthropic_api_key="bench", filing_cache=object())
+
+    def old_filing(text):
+        keywords = legacy_keyword_scan(text)
+        return (keywords, legacy_prefix_check(text, HISTORICAL_REFERENCE_KEYWORDS, 2000),
+                legacy_historical_near_keywords(text, keywords, 500), legacy_excerpt(text, keywords))
+
+    def new_filing(text):
+        scan = detector.scan_keywords(text)
+        keywords = detector.keyword_scan(text, scan=scan)
+        return (keywords, detector.detect_historical_reference(text, 2000, scan=scan),
+                detector.detect_historical_reference_near_keywords(text, keywords, 500, scan=scan),
+                detector.extract_matched_text_excerpt(text, keywords, scan=scan))
+
+    for text in texts:
+        assert old_filing(text) == new_filing(text)
+    old_s = _best(lambda: [old_filing(t) for t in texts], args.repeat) / len(texts)
+    new_s = _best(lambda: [new_filing(t) for t in texts], args.repeat) / len(texts)
+
+    rng = random.Random(5)
+    filler = ("Acme Corp Widget Inc shares rise after earnings beat guidance quarter revenue analysts "
+              "said on Tuesday (ACME) $4.2 billion").split()
+    signal = MA_ANNOUNCEMENT_KEYWORDS + RUMOR_KEYWORDS + HISTORICAL_KEYWORDS
+    headlines = []
+    for _ in range(args.headlines):
+        words = [rng.choice(filler) for _ in range(rng.randint(6, 14))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words)), rng.choice(signal))
+        headlines.append(" ".join(words))
+    headline_parser = HeadlineParser()
+
+    # Keyword checks HeadlineParser.parse() runs per headline (relevance,
+    # historical, rumor, confidence bonus)
+    def old_headline(text_lower):
+        rumor = any(k in text_lower for k in RUMOR_KEYWORDS)
+        relevant = any(k in text_lower for k in MA_ANNOUNCEMENT_KEYWORDS) or (
+            any(k in text_lower for k in RUMOR_KEYWORDS)
+            and any(k in text_lower for k in ["merger", "acquisition", "acquire", "takeover"]))
+        strong = any(k in text_lower for k in STRONG_ANNOUNCEMENT_KEYWORDS)
+        return relevant, any(k in text_lower for k in HISTORICAL_KEYWORDS), rumor, strong
+
+    def new_headline(text_lower):
+        hits = HEADLINE_KEYWORD_MATCHER.scan(text_lower)
+        return (headline_parser._is_ma_relevant(text_lower, hits), headline_parser._is_historical(text_lower, hits),
+                headline_parser._is_rumor(text_lower, hits),
+                hits.first_present(STRONG_ANNOUNCEMENT_KEYWORDS) is not None)
+
+    lowered = [h.lower() for h in headlines]
+    for h in lowered:
+        assert old_headline(h) == new_headline(h)
+    old_h = _best(lambda: [old_headline(h) for h in lowered], args.repeat) / len(lowered)
+    new_h = _best(lambda: [new_headline(h) for h in lowered], args.repeat) / len(lowered)
+
+    print(json.dumps({
+        "corpus": source,
+        "filings": len(texts),
+        "avg_filing_chars": sum(map(len, texts)) // len(texts),
+        "filing_old_ms": round(old_s * 1e3, 2),
+        "filing_new_ms": round(new_s * 1e3, 2),
+        "filing_speedup": round(old_s / new_s, 1),
+        "headlines": len(lowered),
+        "headline_old_us": round(old_h * 1e6, 2),
+        "headline_new_us": round(new_h * 1e6, 2),
+        "headline_speedup": round(old_h / new_h, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Microbenchmark ExecutionLedgerStore lookups against a large historical ledger.
+
+Writes a synthetic ledger snapshot with --executions historical executions
+(and one reservation per 10 executions), loads it, then times the hot-path
+lookups run on every execDetails / commission / orderStatus event using the
+maintained hash indexes versus the original linear scans.
+
+    python tools/bench_ledger_indexes.py --executions 50000 --lookups 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGENT = ROOT / "standalone_agent"
+if str(AGENT) not in sys.path:
+    sys.path.insert(0, str(AGENT))
+
+from execution_ledger import ExecutionLedgerStore  # noqa: E402
+
+
+def _write_snapshot(path: str, executions: int) -> None:
+    records = {}
+    reservations = {}
+    for n in range(executions):
+        exec_id = f"0000e1a7.{n:08d}.01.01"
+        key = f"exec:U1:{exec_id}"
+        records[key] = {
+            "broker_execution_key": key, "position_id": f"pos{n // 4}", "strategy_id": f"bmc_{n // 4}",
+            "account": "U1", "exec_id": exec_id, "order_id": 10_000 + n // 2, "perm_id": 900_000 + n // 2,
+            "contract_key": "SPY:600:20260320:C", "side": "BOT" if n % 2 == 0 else "SLD",
+            "level": "entry" if n % 2 == 0 else "trailing", "qty_filled": 1, "avg_price": 1.25,
+            "fill_time": 1774532700.0 + n, "commission": 0.65, "updated_at": 1774532700.0 + n,
+        }
+        if n % 10 == 0:
+            rid = f"res{n}"
+            reservations[rid] = {
+                "reservation_id": rid, "strategy_id": f"bmc_{n // 4}", "order_id": 10_000 + n // 2,
+                "perm_id": 900_000 + n // 2, "reserved_qty": 0, "active": False, "status": "Filled",
+            }
+    with open(path, "w") as fh:
+        json.dump({"schema_version": 1, "executions": records, "reservations": reservations,
+                   "pending_commissions": {}}, fh)
+
+
+def _linear_exec_key(ledger, exec_id):
+    for key, record in ledger._executions.items():
+        if record.get("exec_id") == exec_id:
+            return key
+    return None
+
+
+def _linear_order_keys(ledger, order_id):
+    return [key for key, record in ledger._executions.items()
+            if ledger._coerce_int(record.get("order_id")) == order_id]
+
+
+def _linear_reservation(ledger, order_id=0, perm_id=0):
+    for record in ledger._reservations.values():
+        if order_id and ledger._coerce_int(record.get("order_id")) == order_id:
+            return record
+        if perm_id and ledger._coerce_int(record.get("perm_id")) == perm_id:
+            return record
+    return None
+
+
+def _time(fn, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executions", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "position_store.ledger.json")
+        _write_snapshot(path, args.executions)
+        t0 = time.perf_counter()
+        ledger = ExecutionLedgerStore(path)
+        load_sec = time.perf_counter() - t0
+
+        exec_ids = [(f"0000e1a7.{rng.randrange(args.executions):08d}.01.01",) for _ in range(args.lookups)]
+        order_ids = [(10_000 + rng.randrange(args.executions // 2),) for _ in range(args.lookups)]
+        perm_ids = [(900_000 + rng.randrange(args.executions // 2),) for _ in range(args.lookups)]
+
+        results = {
+            "executions": args.executions,
+            "reservations": len(ledger._reservations),
+            "load_sec": round(load_sec, 3),
+            "us_per_lookup": {
+                "exec_id": {
+                    "indexed": round(_time(lambda e: ledger._find_execution_key_locked(exec_id=e), exec_ids), 2),
+                    "linear": round(_time(lambda e: _linear_exec_key(ledger, e), exec_ids[:200]), 2),
+                },
+                "order_id": {
+                    "indexed": round(_time(lambda o: ledger._find_execution_key_locked(order_id=o), order_ids), 2),
+                    "linear": round(_time(lambda o: _linear_order_keys(ledger, o), order_ids[:200]), 2),
+                },
+                "reservation_perm_id": {
+                    "indexed": round(_time(lambda p: ledger._find_reservation_locked(perm_id=p), perm_ids), 2),
+                    "linear": round(_time(lambda p: _linear_reservation(ledger, perm_id=p), perm_ids[:200]), 2),
+                },
+            },
+        }
+        start = time.perf_counter()
+        problems = ledger.check_index_consistency()
+        results["consistency_check_sec"] = round(time.perf_counter() - start, 3)
+        results["consistency_problems"] = len(problems)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the scalar vs columnar engines of find_best_opportunities.
+
+Builds --deals synthetic deals, each with a --contracts contract chain
+(calls and puts over --expiries expirations on a $0.50 strike grid), runs
+MergerArbAnalyzer.find_best_opportunities with both engines and checks
+that they return identical opportunities.
+
+    python tools/bench_opportunity_engines.py --contracts 5000 --deals 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.options.analyzer import DealInput, MergerArbAnalyzer, OptionData  # noqa: E402
+
+
+def _chain(rng: random.Random, contracts: int, deal_price: float, expiries: list) -> list:
+    chain = []
+    for _ in range(contracts):
+        strike = round(deal_price * rng.uniform(0.6, 1.2) * 2) / 2
+        right = rng.choice("CP")
+        intrinsic = max(0.0, deal_price - strike) if right == "C" else max(0.0, strike - deal_price)
+        bid = round(intrinsic * 0.9 + rng.uniform(0.0, 3.0), 2)
+        ask = round(bid + rng.choice([0.05, 0.10, 0.25, 0.5]), 2)
+        chain.append(OptionData(
+            symbol="ACME", strike=strike, expiry=rng.choice(expiries), right=right,
+            bid=bid, ask=ask, last=round((bid + ask) / 2, 2), volume=rng.randint(0, 500),
+            open_interest=rng.choice([0, 5, 50, 500, 5000]), implied_vol=rng.choice([0.0, 0.2, 0.35, 0.6]),
+            delta=0.5, gamma=0.02, theta=-0.05, vega=0.1,
+        ))
+    return chain
+
+
+def _time(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=5000)
+    parser.add_argument("--deals", type=int, default=5)
+    parser.add_argument("--expiries", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    today = datetime.now()
+    expiries = [(today + timedelta(days=30 * (i + 1))).strftime("%Y%m%d") for i in range(args.expiries)]
+
+    scalar_sec = columnar_sec = 0.0
+    opportunities = 0
+    mismatches = 0
+    for _ in range(args.deals):
+        deal_price = rng.choice([25.0, 60.0, 100.0, 180.0])
+        deal = DealInput("ACME", deal_price, today + timedelta(days=rng.randint(60, 240)),
+                         confidence=rng.choice([0.7, 0.85, 0.95]))
+        analyzer = MergerArbAnalyzer(deal)
+        chain = _chain(rng, args.contracts, deal_price, expiries)
+        price = deal_price * rng.uniform(0.9, 0.99)
+
+        scalar, t_scalar = _time(lambda: analyzer.find_best_opportunities(chain, price, engine="scalar"))
+        columnar, t_columnar = _time(lambda: analyzer.find_best_opportunities(chain, price, engine="columnar"))
+        scalar_sec += t_scalar
+        columnar_sec += t_columnar
+        opportunities += len(columnar)
+        mismatches += columnar != scalar
+
+    results = {
+        "deals": args.deals,
+        "contracts_per_chain": args.contracts,
+        "expiries": args.expiries,
+        "opportunities": opportunities,
+        "ms_per_chain": {
+            "scalar": round(scalar_sec / args.deals * 1e3, 1),
+            "columnar": round(columnar_sec / args.deals * 1e3, 1),
+        },
+        "speedup": round(scalar_sec / columnar_sec, 1) if columnar_sec else None,
+        "mismatched_chains": mismatches,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Chain fetch latency of IBMergerArbScanner.get_option_data_batch, fixed-wait chunks vs sliding window.
+
+Runs one chain through the scanner against SimulatedTWS (tests/conftest.py),
+which answers each reqMktData after a quote latency drawn from --quote-ms,
+sends model greeks --greeks-ms later, and never quotes --no-quote-pct of
+contracts. The legacy run is the chunked
+loop the window replaced (BATCH_WAIT_SEC sleep per chunk of lines).
+
+    python tools/bench_option_batch.py --contracts 300 --lines 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "standalone_agent", ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from ib_scanner import IBMergerArbScanner  # noqa: E402
+from tests.conftest import SimulatedTWS, StubResourceManager  # noqa: E402
+from tests.test_option_batch_snapshots import legacy_get_option_data_batch  # noqa: E402
+
+
+def _contracts(n: int) -> list:
+    expiries = ("20260320", "20260417", "20260515", "20260619")
+    per_expiry = -(-n // (2 * len(expiries)))
+    return [(e, 50.0 + 2.5 * k, r) for e in expiries for k in range(per_expiry) for r in "CP"][:n]
+
+
+def _run(label: str, contracts: list, args, never: set) -> dict:
+    scanner = IBMergerArbScanner()
+    scanner.resource_manager = StubResourceManager(args.lines)
+    tws = SimulatedTWS(scanner, quote_latency=(args.quote_ms[0] / 1000, args.quote_ms[1] / 1000),
+                       greeks_delay=(args.greeks_ms[0] / 1000, args.greeks_ms[1] / 1000), never=never)
+    try:
+        start = time.monotonic()
+        if label == "legacy":
+            results = legacy_get_option_data_batch(scanner, "ACME", contracts)
+        else:
+            results = scanner.get_option_data_batch("ACME", contracts)
+        elapsed = time.monotonic() - start
+    finally:
+        tws.stop()
+        scanner.executor.shutdown(wait=False)
+    quoted = sum(1 for opt in results if opt and opt.bid > 0 and opt.ask > 0)
+    with_greeks = sum(1 for opt in results if opt and opt.delta != 0)
+    return {"elapsed_s": round(elapsed, 2), "quoted": quoted, "with_greeks": with_greeks,
+            "peak_lines": tws.peak, "requests": len(tws.requested)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=50, help="resource_manager.scan_batch_size")
+    parser.add_argument("--quote-ms", type=float, nargs=2, default=[150, 500])
+    parser.add_argument("--greeks-ms", type=float, nargs=2, default=[20, 250])
+    parser.add_argument("--no-quote-pct", type=float, default=3.0)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    contracts = _contracts(args.contracts)
+    rng = random.Random(1)
+    never = set(rng.sample(contracts, int(len(contracts) * args.no_quote_pct / 100)))
+    result = {"contracts": len(contracts), "lines": args.lines, "never_quoted": len(never),
+              "batch_wait_s": IBMergerArbScanner.BATCH_WAIT_SEC}
+    if not args.skip_legacy:
+        result["legacy"] = _run("legacy", contracts, args, never)
+    result["window"] = _run("window", contracts, args, never)
+    if "legacy" in result:
+        result["speedup"] = round(result["legacy"]["elapsed_s"] / result["window"]["elapsed_s"], 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
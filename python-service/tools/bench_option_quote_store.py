@@ -0,0 +1,94 @@
+"""Market data lines and wall time for overlapping option requests, with and without OptionQuoteStore.
+
+Replays a dashboard-style workload against IBMergerArbScanner answered by the
+SimulatedTWS of tests/conftest.py: a chain fetch per ticker, then rounds of
+fetch_prices polls for a watchlist inside each chain and a near-the-money sell
+scan, all over the same strikes. Each request goes
+through IBDataAgent._get_option_quotes, once with the store disabled
+(everything reaches get_option_data_batch, as with the per-deal chain cache
+when deal parameters differ) and once with it.
+
+    python tools/bench_option_quote_store.py
+    python tools/bench_option_quote_store.py --tickers 4 --rounds 10 --wait 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "standalone_agent", ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import ib_scanner  # noqa: E402
+from ib_data_agent import IBDataAgent  # noqa: E402
+from option_quote_store import OptionQuoteStore  # noqa: E402
+from tests.conftest import SimulatedTWS, StubResourceManager, chain  # noqa: E402
+
+
+def workload(tickers: int, rounds: int, seed: int = 3) -> list:
+    """(ticker, contracts) requests: chains, then watchlist polls and sell scans."""
+    rng = random.Random(seed)
+    requests = []
+    names = [f"T{i:02d}" for i in range(tickers)]
+    chains = {t: chain(n_strikes=20, expiries=("20260320", "20260417", "20260515")) for t in names}
+    for t in names:
+        requests.append((t, chains[t]))
+    for _ in range(rounds):
+        for t in names:
+            requests.append((t, rng.sample(chains[t], 12)))  # fetch_prices watchlist
+            requests.append((t, [c for c in chains[t] if c[0] == "20260320" and c[2] == "C"][6:14]))  # sell_scan
+    return requests
+
+
+def _run(requests, use_store: bool, lines: int, wait: float) -> dict:
+    agent = object.__new__(IBDataAgent)
+    agent.option_quote_store = OptionQuoteStore(ttl_seconds=3600 if use_store else 0)
+    agent.scanner = ib_scanner.IBMergerArbScanner()
+    agent.scanner.BATCH_WAIT_SEC = wait
+    agent.scanner.resource_manager = StubResourceManager(lines)
+    tws = SimulatedTWS(agent.scanner, never=set(chain()[::25]))
+    try:
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for ticker, contracts in requests:
+                agent._get_option_quotes(ticker, contracts)
+        elapsed = time.perf_counter() - start
+    finally:
+        tws.stop()
+        agent.scanner.executor.shutdown(wait=False)
+    return {"elapsed_s": round(elapsed, 2), "reqMktData": len(tws.requested),
+            **({"store": agent.option_quote_store.stats()} if use_store else {})}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--lines", type=int, default=50, help="market data lines (batch window)")
+    parser.add_argument("--wait", type=float, default=0.5, help="BATCH_WAIT_SEC per contract")
+    args = parser.parse_args()
+
+    requests = workload(args.tickers, args.rounds)
+    without = _run(requests, False, args.lines, args.wait)
+    with_store = _run(requests, True, args.lines, args.wait)
+    print(json.dumps({
+        "requests": len(requests),
+        "contracts_requested": sum(len(c) for _, c in requests),
+        "without_store": without,
+        "with_store": with_store,
+        "lines_saved": without["reqMktData"] - with_store["reqMktData"],
+        "speedup": round(without["elapsed_s"] / with_store["elapsed_s"], 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""API calls and wall time of OptionsDataLoader.load_options_for_deal, per-date vs range bar fetch.
+
+Replays a recording of Polygon responses (contract list, underlying daily
+closes, each contract's daily bars) through httpx.MockTransport with a fixed
+per-request latency, and runs one deal load three ways:
+
+  per_date   bar_range_fetch=False: one request per active contract per date
+  range      each contract's bars for the whole window once, concurrently
+  cached     range again, served from the on-disk bar cache
+
+The rows written (daily summaries and chain snapshots) are asserted identical.
+POLYGON_RATE_DELAY and OPTIONS_BAR_MAX_RPS keep their configured values unless
+--rate-delay / --max-rps are given.
+
+    python tools/bench_options_bar_fetch.py                       # synthetic recording
+    python tools/bench_options_bar_fetch.py --record ATVI --announced 2022-01-18 \\
+        --end 2022-06-30 --fixture /tmp/atvi.json.gz              # record (POLYGON_API_KEY)
+    python tools/bench_options_bar_fetch.py --fixture /tmp/atvi.json.gz --announced 2022-01-18 --end 2022-06-30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.research.market_data import options_loader  # noqa: E402
+from app.research.market_data.options_loader import POLYGON_BASE_URL, OptionsDataLoader  # noqa: E402
+from test_options_bar_ranges import PolygonReplay, RecordingConn, make_loader, synthetic_recording  # noqa: E402
+
+
+async def record(ticker: str, announced: date, end: date) -> dict:
+    """Fetch what load_options_for_deal reads for one deal, in recording form."""
+    loader = OptionsDataLoader()
+    try:
+        window_start = announced - timedelta(days=5)
+        contracts = await loader.list_historical_contracts(ticker, window_start, end + timedelta(days=180))
+        client = await loader._get_client()
+        response = await client.get(
+            f"{POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day/{window_start}/{end}",
+            params={"adjusted": "true", "sort": "asc", "limit": 5000},
+        )
+        response.raise_for_status()
+        bars = await loader.fetch_contract_bar_ranges(ticker, contracts, window_start, end + timedelta(days=1))
+        return {
+            "underlying": ticker,
+            "contracts": contracts,
+            "stock_bars": response.json().get("results", []),
+            "contract_bars": {t: list(by_date.values()) for t, by_date in bars.items()},
+        }
+    finally:
+        await loader.close()
+
+
+async def run(recording: dict, announced: date, end: date, latency: float) -> dict:
+    cache_dir = tempfile.mkdtemp(prefix="bench-option-bars-")
+    result, rows = {}, {}
+    for label, range_fetch in (("per_date", False), ("range", True), ("cached", True)):
+        replay = PolygonReplay(recording, latency=latency)
+        loader = make_loader(replay, cache_dir)
+        conn = RecordingConn()
+        start = time.perf_counter()
+        counts = await loader.load_options_for_deal(
+            conn, "bench-deal", recording["underlying"], announced_date=announced, deal_price=None,
+            end_date=end, bar_range_fetch=range_fetch,
+        )
+        elapsed = time.perf_counter() - start
+        await loader.close()
+        rows[label] = conn.rows
+        result[f"{label}_requests"] = len(replay.requests)
+        result[f"{label}_bar_requests"] = replay.bar_requests()
+        result[f"{label}_s"] = round(elapsed, 2)
+        result.setdefault("daily_summaries", counts["daily_summaries"])
+        result.setdefault("chain_rows", counts["chain_snapshots"])
+    assert rows["per_date"] == rows["range"] == rows["cached"]
+    result["request_reduction"] = round(result["per_date_requests"] / result["range_requests"], 1)
+    result["wall_speedup"] = round(result["per_date_s"] / result["range_s"], 1)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", help="recording (.json.gz); synthetic when omitted")
+    parser.add_argument("--record", metavar="TICKER", help="record a deal from Polygon into --fixture")
+    parser.add_argument("--announced", type=date.fromisoformat, default=date(2024, 2, 14))
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2024, 5, 24))
+    parser.add_argument("--strikes", type=int, default=6, help="strikes per expiration (synthetic)")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="simulated Polygon round trip")
+    parser.add_argument("--rate-delay", type=float, help="override POLYGON_RATE_DELAY (s)")
+    parser.add_argument("--max-rps", type=float, help="override OPTIONS_BAR_MAX_RPS")
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.fixture:
+            parser.error("--record needs --fixture")
+        recording = asyncio.run(record(args.record, args.announced, args.end))
+        with gzip.open(args.fixture, "wt", encoding="utf-8") as f:
+            json.dump(recording, f)
+        print(f"Recorded {len(recording['contracts'])} contracts to {args.fixture}")
+        return
+
+    if args.rate_delay is not None:
+        options_loader.POLYGON_RATE_DELAY = args.rate_delay
+    if args.max_rps is not None:
+        options_loader.OPTIONS_BAR_MAX_RPS = args.max_rps
+
+    if args.fixture and os.path.exists(args.fixture):
+        with gzip.open(args.fixture, "rt", encoding="utf-8") as f:
+            recording, source = json.load(f), args.fixture
+    else:
+        recording, source = synthetic_recording(strikes=args.strikes), "synthetic"
+
+    result = {"recording": source, "contracts": len(recording["contracts"]),
+              "rate_delay_s": options_loader.POLYGON_RATE_DELAY, "max_rps": options_loader.OPTIONS_BAR_MAX_RPS,
+              "concurrency": options_loader.OPTIONS_BAR_CONCURRENCY, "latency_ms": args.latency_ms}
+    result.update(asyncio.run(run(recording, args.announced, args.end, args.latency_ms / 1000)))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
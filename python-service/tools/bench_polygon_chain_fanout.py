@@ -0,0 +1,152 @@
+"""Wall-clock of serial vs partitioned PolygonOptionsClient.get_option_chain.
+
+Starts a local fake Polygon snapshot endpoint (filters, 250-contract pages,
+next_url cursors, --latency-ms per request) serving a synthetic chain of
+--expiries weekly expirations x --strikes strikes x calls/puts, then times
+a /fetch-chain style query (all expirations, full strike range) with the
+serial cursor walk and with each --fan-out cap.
+
+    python tools/bench_polygon_chain_fanout.py --expiries 16 --strikes 400 --latency-ms 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.options.polygon_options import PolygonOptionsClient  # noqa: E402
+
+PAGE_SIZE = 250
+_FILTERS = {
+    "expiration_date.gte": lambda c, v: c["details"]["expiration_date"] >= v,
+    "expiration_date.lte": lambda c, v: c["details"]["expiration_date"] <= v,
+    "strike_price.gte": lambda c, v: c["details"]["strike_price"] >= float(v),
+    "strike_price.lt": lambda c, v: c["details"]["strike_price"] < float(v),
+    "strike_price.lte": lambda c, v: c["details"]["strike_price"] <= float(v),
+}
+
+
+def _chain(expiries: list[str], strikes: int) -> list[dict]:
+    return [
+        {
+            "details": {"strike_price": 300 + i, "expiration_date": expiry, "contract_type": kind},
+            "last_quote": {"bid": 1.0, "ask": 1.1, "bid_size": 5, "ask_size": 7},
+            "greeks": {"delta": 0.5, "implied_volatility": 0.2},
+            "day": {"volume": 10},
+            "open_interest": 100,
+        }
+        for expiry in expiries for i in range(strikes) for kind in ("call", "put")
+    ]
+
+
+def _serve(expiries: list[str], strikes: int, latency: float, port_queue) -> None:
+    """Server process body (own interpreter, so it does not compete for the client's GIL)."""
+    chain = _chain(expiries, strikes)
+    matches: dict[tuple, list] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = dict(parse_qsl(parts.query))
+            offset = int(params.pop("cursor", 0))
+            key = tuple(sorted(params.items()))
+            matching = matches.get(key)
+            if matching is None:  # keep server CPU out of the measurement
+                matching = matches[key] = [
+                    c for c in chain if all(fn(c, params[k]) for k, fn in _FILTERS.items() if k in params)
+                ]
+            body = {"results": matching[offset:offset + PAGE_SIZE]}
+            if offset + PAGE_SIZE < len(matching):
+                query = urlencode(dict(params, cursor=offset + PAGE_SIZE))
+                body["next_url"] = f"http://{self.headers['Host']}{parts.path}?{query}"
+            time.sleep(latency)
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+async def _timed_fetch(base_url: str, query: dict, fan_out: int, strike_bands: int) -> tuple[float, int, int]:
+    # No rate cap and no snapshot cache: measure the fetch itself
+    client = PolygonOptionsClient(api_key="bench", base_url=base_url, max_rps=0, chain_cache_ttl=0)
+    try:
+        start = time.perf_counter()
+        contracts = await client.get_option_chain(
+            "SPY", max_concurrency=fan_out, strike_bands=strike_bands, **query,
+        )
+        return time.perf_counter() - start, len(contracts), client.stats["upstream"]
+    finally:
+        await client.close()
+
+
+async def _main(args) -> dict:
+    first = date(2026, 7, 3)
+    expiries = [(first + timedelta(weeks=i)).isoformat() for i in range(args.expiries)]
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=_serve, args=(expiries, args.strikes, args.latency_ms / 1000.0, port_queue), daemon=True,
+    )
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+    query = dict(
+        expiration_date_gte=expiries[0],
+        expiration_date_lte=expiries[-1],
+        strike_gte=300.0,
+        strike_lte=300.0 + args.strikes - 1,
+    )
+    try:
+        runs = {}
+        for fan_out in [1] + args.fan_out:
+            elapsed, contracts, requests = await _timed_fetch(base_url, query, fan_out, args.strike_bands)
+            runs[f"fan_out={fan_out}"] = {
+                "seconds": round(elapsed, 3),
+                "contracts": contracts,
+                "requests": requests,
+            }
+    finally:
+        server.terminate()
+        server.join()
+
+    serial = runs["fan_out=1"]["seconds"]
+    for run in runs.values():
+        run["speedup"] = round(serial / run["seconds"], 1)
+    return {"chain_contracts": len(expiries) * args.strikes * 2, "latency_ms": args.latency_ms, "runs": runs}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--expiries", type=int, default=16)
+    parser.add_argument("--strikes", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="simulated server time per request")
+    parser.add_argument("--strike-bands", type=int, default=2)
+    parser.add_argument("--fan-out", type=int, nargs="+", default=[4, 8, 16])
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
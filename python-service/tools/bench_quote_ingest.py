@@ -0,0 +1,156 @@
+"""Measure StreamingQuoteCache memory, tick ingest and read costs.
+
+Subscribes --contracts keys, replays --ticks synthetic tickPrice/tickSize/
+tickOptionComputation callbacks (the IB message thread's work) and times
+the read paths used by the evaluation loop (get) and the push loop
+(get_all, get_all_serialized), best of --repeat runs. With --baseline REF
+the same workload also runs against quote_cache.py as of git REF:
+
+    python tools/bench_quote_ingest.py --contracts 500 --ticks 200000 --baseline HEAD~1
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGENT = ROOT / "standalone_agent"
+if str(AGENT) not in sys.path:
+    sys.path.insert(0, str(AGENT))
+
+import quote_cache  # noqa: E402
+
+
+class _ResourceManager:
+    def acquire_execution_lines(self, n, allocation_key=None):
+        return True
+
+    def release_execution_lines(self, n, allocation_key=None):
+        return None
+
+
+class _Scanner:
+    def __init__(self):
+        self._req_id = 0
+
+    def get_next_req_id(self):
+        self._req_id += 1
+        return self._req_id
+
+    def reqMktData(self, *args):
+        return None
+
+
+def _load_baseline(ref: str):
+    source = subprocess.run(
+        ["git", "show", f"{ref}:python-service/standalone_agent/quote_cache.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    path = Path(tempfile.mkdtemp()) / "quote_cache_baseline.py"
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location("quote_cache_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _best(fn, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds (filters scheduler noise)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run(module, contracts: int, ticks: int, reads: int, repeat: int) -> dict:
+    rng = random.Random(11)
+    cache = module.StreamingQuoteCache(_ResourceManager())
+    scanner = _Scanner()
+    keys = [f"SPY:{500 + i * 0.5:g}:20260320:{'CP'[i % 2]}" for i in range(contracts)]
+    contract = object()
+    tracemalloc.start()
+    req_ids = [cache.subscribe(scanner, contract, key) for key in keys]
+    subscribed_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # 70% price, 25% size, 5% greeks — roughly the mix of a streaming chain
+    events = []
+    for _ in range(ticks):
+        req_id = rng.choice(req_ids)
+        roll = rng.random()
+        if roll < 0.7:
+            events.append((0, req_id, rng.choice((1, 2, 4)), round(rng.uniform(0.5, 20), 2)))
+        elif roll < 0.95:
+            events.append((1, req_id, rng.choice((0, 3, 8)), rng.randint(1, 500)))
+        else:
+            events.append((2, req_id, rng.uniform(0.1, 0.6), rng.uniform(-1, 1)))
+
+    update_price, update_size, update_greeks = cache.update_price, cache.update_size, cache.update_greeks
+    drain_every = max(1, contracts // 2)  # the eval loop drains dirty keys between bursts
+
+    def ingest():
+        for i, (kind, req_id, a, b) in enumerate(events):
+            if i % drain_every == 0:
+                cache.drain_dirty()
+            if kind == 0:
+                update_price(req_id, a, b)
+            elif kind == 1:
+                update_size(req_id, a, b)
+            else:
+                update_greeks(req_id, a, b, 0.01, 0.1, -0.02)
+
+    get = cache.get
+    sample = [rng.choice(keys) for _ in range(reads)]
+
+    def read():
+        for key in sample:
+            get(key).mid
+
+    ingest_sec = _best(ingest, repeat)
+    get_sec = _best(read, repeat)
+    get_all_sec = _best(cache.get_all, repeat * 10)
+    serialized_sec = _best(cache.get_all_serialized, repeat * 10)
+
+    return {
+        "bytes_per_subscription": subscribed_bytes // contracts,
+        "ticks_per_sec": round(ticks / ingest_sec),
+        "ns_per_tick": round(ingest_sec / ticks * 1e9),
+        "ns_per_get": round(get_sec / reads * 1e9),
+        "get_all_us": round(get_all_sec * 1e6, 1),
+        "get_all_serialized_us": round(serialized_sec * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--reads", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="git ref of a quote_cache.py to compare against")
+    args = parser.parse_args()
+
+    modules = {"current": quote_cache}
+    if args.baseline:
+        modules[f"baseline ({args.baseline})"] = _load_baseline(args.baseline)
+    results = {
+        "contracts": args.contracts,
+        "ticks": args.ticks,
+        "results": {name: _run(module, args.contracts, args.ticks, args.reads, args.repeat) for name, module in modules.items()},
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
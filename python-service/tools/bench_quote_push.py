@@ -0,0 +1,116 @@
+"""Measure bytes and CPU per execution_quotes push: v1 snapshot vs v2 deltas.
+
+Simulates --pushes pushes over --contracts subscribed quotes, with
+--changed of the contracts ticking between pushes, and reports per push:
+payload bytes, agent encode CPU and relay decode+merge CPU for
+
+- v1:          get_all_serialized() as JSON, relay replaces its dict
+- v2 json:     QuoteDeltaEncoder frames as JSON, relay LiveQuoteBook.apply
+- v2 msgpack:  the same frames as msgpack (if installed)
+
+    python tools/bench_quote_push.py --contracts 500 --changed 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "standalone_agent"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import quote_push  # noqa: E402
+from quote_cache import Quote  # noqa: E402
+from quote_push import QuoteDeltaEncoder  # noqa: E402
+
+from app.api.ws_relay import LiveQuoteBook  # noqa: E402
+
+
+def _make_quotes(rng: random.Random, contracts: int) -> dict:
+    now = time.time()
+    return {
+        f"SPY:{500 + i * 0.5:g}:2026{3 + i % 6:02d}20:{'CP'[i % 2]}": Quote(
+            bid=round(rng.uniform(0.1, 20), 2), ask=round(rng.uniform(20, 21), 2), last=round(rng.uniform(0.1, 20), 2),
+            bid_size=rng.randint(1, 500), ask_size=rng.randint(1, 500), volume=rng.randint(0, 50000),
+            open_interest=rng.randint(0, 90000), implied_vol=rng.uniform(0.1, 0.6), delta=rng.uniform(-1, 1),
+            gamma=rng.uniform(0, 0.05), theta=-rng.uniform(0, 0.2), vega=rng.uniform(0, 0.5), timestamp=now,
+        )
+        for i in range(contracts)
+    }
+
+
+def _tick(rng: random.Random, quotes: dict, keys: list, changed: float) -> None:
+    for key in rng.sample(keys, int(len(keys) * changed)):
+        quote = quotes[key]
+        quote.bid = round(quote.bid + rng.choice([-0.01, 0.01]), 2)
+        quote.ask = round(quote.ask + rng.choice([-0.01, 0.0, 0.01]), 2)
+        quote.bid_size = rng.randint(1, 500)
+        quote.timestamp = time.time()
+
+
+def _run(mode: str, contracts: int, changed: float, pushes: int) -> dict:
+    rng = random.Random(7)
+    quotes = _make_quotes(rng, contracts)
+    keys = list(quotes)
+    encoder = QuoteDeltaEncoder()
+    book = LiveQuoteBook()
+    total_bytes = 0
+    encode_sec = decode_sec = 0.0
+
+    for _ in range(pushes):
+        _tick(rng, quotes, keys, changed)
+
+        start = time.process_time()
+        if mode == "v1":
+            payload = json.dumps({
+                "type": "execution_quotes",
+                "quote_snapshot": {key: quote.to_dict() for key, quote in quotes.items()},
+                "timestamp": time.time(),
+            })
+        else:
+            frame = encoder.encode(quotes, time.time())
+            payload = quote_push.pack_frame(frame) if mode == "v2 msgpack" else json.dumps(frame)
+        encode_sec += time.process_time() - start
+        total_bytes += len(payload)
+
+        start = time.process_time()
+        if mode == "v1":
+            live_quotes = json.loads(payload)["quote_snapshot"]  # noqa: F841
+        elif mode == "v2 msgpack":
+            book.apply(quote_push.msgpack.unpackb(payload, raw=False))
+        else:
+            book.apply(json.loads(payload))
+        decode_sec += time.process_time() - start
+
+    return {
+        "bytes_per_push": total_bytes // pushes,
+        "agent_encode_us": round(encode_sec / pushes * 1e6, 1),
+        "relay_decode_merge_us": round(decode_sec / pushes * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--changed", type=float, default=0.1, help="fraction of contracts ticking per push")
+    parser.add_argument("--pushes", type=int, default=300)
+    args = parser.parse_args()
+
+    modes = ["v1", "v2 json"] + (["v2 msgpack"] if quote_push.msgpack is not None else [])
+    results = {
+        "contracts": args.contracts,
+        "changed_per_push": args.changed,
+        "pushes": args.pushes,
+        "per_push": {mode: _run(mode, args.contracts, args.changed, args.pushes) for mode in modes},
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Lookup cost of the shared SEC ticker index vs the old per-call scan.
+
+Generates a synthetic company_tickers.json (--companies entries, the real
+file has ~10k) and compares, excluding network time:
+
+- old TickerScanner.get_cik_from_ticker: parse the JSON body and scan it
+  linearly on every call
+- SecTickerIndex: ticker -> CIK, CIK -> ticker and name-prefix lookups
+- cold start from the persisted local copy (read + parse + build)
+
+    python tools/bench_sec_ticker_index.py --companies 10000 --lookups 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.services import sec_ticker_index as sti  # noqa: E402
+
+
+def _payload(n: int) -> dict:
+    rng = random.Random(5)
+    words = ["GLOBAL", "HOLDINGS", "THERAPEUTICS", "BANCORP", "ENERGY", "SYSTEMS", "PARTNERS", "TECH"]
+    seen = set()
+    out = {}
+    while len(out) < n:
+        ticker = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        if ticker in seen:
+            continue
+        seen.add(ticker)
+        name = f"{ticker.title()}{rng.choice(string.ascii_lowercase)} {rng.choice(words)} INC"
+        out[str(len(out))] = {"cik_str": 1000 + len(out), "ticker": ticker, "title": name}
+    return out
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--old-lookups", type=int, default=50, help="old path is slow; sample fewer calls")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = _payload(args.companies)
+    body = json.dumps(raw)
+    rng = random.Random(9)
+    tickers = [e["ticker"] for e in raw.values()]
+    sample = [rng.choice(tickers) for _ in range(args.lookups)]
+    ciks = [rng.randint(1000, 1000 + args.companies - 1) for _ in range(args.lookups)]
+    prefixes = [t[:3] for t in rng.sample([e["title"] for e in raw.values()], 1000)]
+
+    def old_lookup(ticker):
+        data = json.loads(body)  # the old code re-downloaded and re-parsed per call
+        for entry in data.values():
+            if entry.get("ticker", "").upper() == ticker:
+                return str(entry["cik_str"]).zfill(10)
+        return None
+
+    old_sample = sample[:args.old_lookups]
+    old_sec = _best(lambda: [old_lookup(t) for t in old_sample], args.repeat)
+    old_scan_only = _best(lambda: [next((e for e in raw.values() if e["ticker"] == t), None) for t in old_sample], args.repeat)
+
+    index = sti.SecTickerIndex(raw)
+    by_ticker = _best(lambda: [index.by_ticker(t) for t in sample], args.repeat)
+    by_cik = _best(lambda: [index.by_cik(c) for c in ciks], args.repeat)
+    prefix = _best(lambda: [index.search_prefix(p) for p in prefixes], args.repeat)
+
+    path = Path(tempfile.mkdtemp()) / "sec_company_tickers.json"
+    sti._write_cache_file(str(path), index)
+    cold = _best(lambda: sti._read_cache_file(str(path)), args.repeat)
+
+    result = {
+        "companies": len(index),
+        "old_get_cik_us_per_call": round(old_sec / len(old_sample) * 1e6, 1),
+        "old_linear_scan_only_us_per_call": round(old_scan_only / len(old_sample) * 1e6, 1),
+        "index_by_ticker_ns": round(by_ticker / len(sample) * 1e9),
+        "index_by_cik_ns": round(by_cik / len(ciks) * 1e9),
+        "index_prefix_search_us": round(prefix / len(prefixes) * 1e6, 2),
+        "cold_start_from_local_copy_ms": round(cold * 1e3, 1),
+        "local_copy_bytes": path.stat().st_size,
+    }
+    result["speedup_vs_old_get_cik"] = round(result["old_get_cik_us_per_call"] * 1000 / result["index_by_ticker_ns"])
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
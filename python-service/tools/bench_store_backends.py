@@ -0,0 +1,104 @@
+"""Replay synthetic fills through PositionStore with the journal and snapshot backends.
+
+Each fill runs the live IB callback sequence the engine drives on the store:
+add_fill (orderStatus) -> update_fill_execution_details (execDetails) ->
+update_fill_commission (commissionReport). Reports total and per-fill
+persistence cost, tail latency, and the time to reload the store.
+
+The snapshot backend is quadratic in ledger size, so by default it replays
+only the first --snapshot-max-fills fills; pass --snapshot-max-fills 0 to
+replay the full set (expect this to take a long time at 10k fills).
+
+    python tools/bench_store_backends.py --fills 10000 --positions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+AGENT = ROOT / "standalone_agent"
+if str(AGENT) not in sys.path:
+    sys.path.insert(0, str(AGENT))
+
+from position_store import PositionStore  # noqa: E402
+
+
+def _instrument(i: int) -> dict:
+    return {"symbol": "SPY", "secType": "OPT", "strike": 600.0 + i, "expiry": "20260320", "right": "C", "multiplier": 100}
+
+
+def run_backend(backend: str, fills: int, positions: int, fsync: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "position_store.json")
+        store = PositionStore(path, backend=backend)
+        if not fsync:
+            for journal in (store._journal, store._execution_ledger._journal):
+                if journal is not None:
+                    journal._fsync = False
+        for p in range(positions):
+            store.add_position(f"pos{p}", {"order_id": p + 1}, _instrument(p), {}, f"bmc_{p}")
+
+        per_fill_ms = []
+        start = time.perf_counter()
+        for n in range(fills):
+            pid = f"pos{n % positions}"
+            order_id = 10_000 + n
+            exec_id = f"0000e1a7.{n:08d}.01.01"
+            t0 = time.perf_counter()
+            store.add_fill(pid, {
+                "time": 1774532700.0 + n, "order_id": order_id, "level": "entry" if n % 2 == 0 else "trailing",
+                "qty_filled": 1, "avg_price": 1.0 + (n % 50) / 100.0, "remaining_qty": 1, "pnl_pct": 0.0,
+            })
+            store.update_fill_execution_details(pid, order_id, exec_id=exec_id,
+                                                execution_analytics={"exchange": "CBOE", "perm_id": 900_000 + n})
+            store.update_fill_commission(pid, exec_id, {"commission": 0.65, "realized_pnl": None})
+            per_fill_ms.append((time.perf_counter() - t0) * 1000.0)
+        total = time.perf_counter() - start
+
+        t0 = time.perf_counter()
+        reloaded = PositionStore(path, backend=backend)
+        reload_sec = time.perf_counter() - t0
+        assert sum(len(p["fill_log"]) for p in reloaded.get_all_positions()) == fills
+
+        # Chronological deciles show whether cost grows with store size
+        decile = max(1, len(per_fill_ms) // 10)
+        first, last = per_fill_ms[:decile], per_fill_ms[-decile:]
+        per_fill_ms.sort()
+        return {
+            "backend": backend,
+            "fills": fills,
+            "total_sec": round(total, 3),
+            "mean_ms_per_fill": round(statistics.mean(per_fill_ms), 3),
+            "p99_ms_per_fill": round(per_fill_ms[int(len(per_fill_ms) * 0.99) - 1], 3),
+            "first_10pct_mean_ms": round(statistics.mean(first), 3),
+            "last_10pct_mean_ms": round(statistics.mean(last), 3),
+            "reload_sec": round(reload_sec, 3),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fills", type=int, default=10_000)
+    parser.add_argument("--positions", type=int, default=100)
+    parser.add_argument("--no-fsync", action="store_true", help="Disable journal fsync (isolates serialization cost)")
+    parser.add_argument("--backends", default="journal,snapshot")
+    parser.add_argument("--snapshot-max-fills", type=int, default=1000)
+    args = parser.parse_args()
+    results = []
+    for backend in (b.strip() for b in args.backends.split(",")):
+        fills = args.fills
+        if backend == PositionStore.BACKEND_SNAPSHOT and args.snapshot_max_fills > 0:
+            fills = min(fills, args.snapshot_max_fills)
+        results.append(run_backend(backend, fills, args.positions, fsync=not args.no_fsync))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()